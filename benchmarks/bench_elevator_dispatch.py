@@ -0,0 +1,117 @@
+"""
+Benchmark: offline elevator dispatch on a tower layout
+
+Usage: python benchmarks/bench_elevator_dispatch.py [--layout FILE] [--trace FILE]
+           [--patterns up_peak lunch down_peak] [--policies scan nearest destination corridor]
+           [--cars N] [--preposition] [--window START END] [--seed N] [--output FILE]
+           [--save-trace FILE]
+
+Replays synthetic traffic (morning up-peak, lunch two-way, evening
+down-peak) or a recorded passenger trace through each dispatch policy,
+headless. With --preposition every policy also runs with idle cars
+parked ahead of the scheduled peaks ('<policy>+preposition'). Wait-time
+percentiles are also reported for the passengers arriving in the --window
+hours (default 8:45-9:30, the end of the morning rush). Prints a summary
+and writes machine-readable JSON so results can be compared across commits.
+
+Shafts run DEFAULT_CARS cars each unless --cars says otherwise: with one
+car per shaft there is nothing to assign, and scan, destination and (in
+up- and down-peak) corridor give identical waits. With four cars on the
+bundled office tower, destination dispatch is worse than SCAN in every
+pattern (average wait up-peak 8.1 s vs 1.5 s, lunch 39.3 s vs 20.8 s,
+down-peak 37.6 s vs 31.7 s). It is kept as an option, not a default.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+# Add project root to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tower_simulator.constants import DEFAULT_SIMULATION_SEED
+from tower_simulator.systems.elevator_dispatch import DISPATCH_SCAN, DISPATCH_DESTINATION, DISPATCH_CORRIDOR
+from tower_simulator.systems.elevator_harness import (
+    DispatchHarness, PassengerTrace, TRAFFIC_PATTERNS, synthetic_trace,
+)
+from tower_simulator.utils.layout import load_layout
+
+DEFAULT_LAYOUT = os.path.join(ROOT, 'benchmarks', 'layouts', 'office_tower.json')
+# Policy name -> (SCAN enabled, shaft dispatch mode)
+POLICIES = {
+    'scan': (True, DISPATCH_SCAN),
+    'nearest': (False, DISPATCH_SCAN),
+    'destination': (True, DISPATCH_DESTINATION),
+    'corridor': (True, DISPATCH_CORRIDOR),  # Cars stacked in one hoistway, never passing
+}
+DEFAULT_WINDOW_HOURS = (8.75, 9.5)  # 8:45 to 9:30
+DEFAULT_CARS = 4  # Cars per shaft; assignment policies only differ with several
+
+
+def git_commit() -> str | None:
+    """Current commit hash, so saved results say what they measured"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline elevator dispatch benchmark")
+    parser.add_argument('--layout', default=DEFAULT_LAYOUT, help="JSON tower layout")
+    parser.add_argument('--trace', help="JSON passenger trace to replay instead of synthetic traffic")
+    parser.add_argument('--patterns', nargs='+', default=list(TRAFFIC_PATTERNS), choices=list(TRAFFIC_PATTERNS))
+    parser.add_argument('--policies', nargs='+', default=list(POLICIES), choices=list(POLICIES))
+    parser.add_argument('--cars', type=int, default=DEFAULT_CARS, help="Cars per shaft")
+    parser.add_argument('--preposition', action='store_true',
+                        help="Also run each policy with idle cars parked ahead of the scheduled peaks")
+    parser.add_argument('--window', nargs=2, type=float, default=list(DEFAULT_WINDOW_HOURS),
+                        metavar=('START', 'END'), help="Hours of the day for the windowed wait statistics")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SIMULATION_SEED)
+    parser.add_argument('--output', help="Write JSON results here (default: stdout)")
+    parser.add_argument('--save-trace', help="Save the synthetic traffic of all patterns as one trace")
+    args = parser.parse_args()
+
+    rooms = load_layout(args.layout)
+    if args.trace:
+        traces = {os.path.basename(args.trace): PassengerTrace.load(args.trace)}
+    else:
+        traces = {pattern: synthetic_trace(rooms, pattern, args.seed) for pattern in args.patterns}
+    if args.save_trace:
+        PassengerTrace(*(np.concatenate([getattr(t, column) for t in traces.values()])
+                         for column in ('time', 'origin', 'destination'))).save(args.save_trace)
+
+    runs = [(policy, False) for policy in args.policies]
+    if args.preposition:
+        runs += [(policy, True) for policy in args.policies]
+    results = {}
+    for policy, preposition in runs:
+        scan, mode = POLICIES[policy]
+        name = f"{policy}+preposition" if preposition else policy
+        harness = DispatchHarness(rooms, scan=scan, cars_per_shaft=args.cars, modes=mode,
+                                  preposition=preposition, window_hours=tuple(args.window))
+        results[name] = {pattern: harness.run(trace) for pattern, trace in traces.items()}
+        for pattern, report in results[name].items():
+            window = report['window']
+            print(f"{name:>22} {pattern:>10}: {report['passengers']:5d} calls, "
+                  f"avg wait {report['avg_wait_s']:7.1f} s, p95 {report['p95_wait_s']:7.1f} s, "
+                  f"window p50/p95 {window['p50_wait_s']:6.1f}/{window['p95_wait_s']:6.1f} s, "
+                  f"red {report['stress_crossings']['red']:5d}, "
+                  f"{report['cpu_ms_per_1k_calls']:7.1f} ms CPU / 1k calls", file=sys.stderr)
+
+    output = {'commit': git_commit(), 'layout': os.path.relpath(args.layout, ROOT), 'seed': args.seed,
+              'cars_per_shaft': args.cars, 'window_hours': args.window, 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+    else:
+        print(json.dumps(output, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: parallel tuning of per-shaft elevator settings
+
+Usage: python benchmarks/bench_elevator_tuner.py [--layout FILE] [--workers 1 4 ...]
+           [--rounds N] [--cars N] [--seed N] [--output FILE]
+
+Tunes Waiting Car Response and Standard Floor Departure per shaft over a
+synthetic day, once per worker count, and reports the best settings and
+how wall time scales with the size of the process pool.
+"""
+import argparse
+import json
+import os
+import sys
+
+# Add project root to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tower_simulator.constants import DEFAULT_SIMULATION_SEED
+from tower_simulator.systems.elevator_harness import synthetic_day_trace
+from tower_simulator.systems.elevator_tuner import ElevatorTuner
+from tower_simulator.utils.layout import load_layout
+
+DEFAULT_LAYOUT = os.path.join(ROOT, 'benchmarks', 'layouts', 'office_tower.json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel elevator settings tuner")
+    parser.add_argument('--layout', default=DEFAULT_LAYOUT, help="JSON tower layout")
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, os.cpu_count() or 1}))
+    parser.add_argument('--rounds', type=int, default=1, help="Coordinate descent rounds over all shafts")
+    parser.add_argument('--cars', type=int, help="Cars per shaft (default: ENTITY_DATA default)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SIMULATION_SEED)
+    parser.add_argument('--output', help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    rooms = load_layout(args.layout)
+    trace = synthetic_day_trace(rooms, args.seed)
+    runs = []
+    for workers in args.workers:
+        result = ElevatorTuner(rooms, trace, cars_per_shaft=args.cars, workers=workers).tune(args.rounds)
+        runs.append(result)
+        speedup = runs[0]['wall_s'] / result['wall_s']
+        print(f"{workers:3d} workers: {result['evaluations']} days in {result['wall_s']:.2f} s "
+              f"(speedup {speedup:.2f}x), best p95 wait {result['report']['p95_wait_s']:.1f} s, "
+              f"{result['unserved']} unserved",
+              file=sys.stderr)
+
+    output = {'layout': os.path.relpath(args.layout, ROOT), 'seed': args.seed, 'passengers': len(trace),
+              'settings': runs[-1]['settings'], 'report': runs[-1]['report'],
+              'scaling': [{'workers': run['workers'], 'wall_s': run['wall_s'], 'evaluations': run['evaluations']}
+                          for run in runs]}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+    else:
+        print(json.dumps(output, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: full-agent simulation vs level of detail (aggregate flow model off-screen)
+
+Usage: python benchmarks/bench_sim_lod.py [sims] [ticks]
+Runs the same seeded tower twice - every Sim individually, and with only a
+viewport's worth of levels individual - and compares time per tick and the
+tower-wide stress statistics, which must agree. The movement and stress
+systems scan only the active span of the on-screen world, and the LOD
+controller compacts that world once demotions leave it sparse, so the LOD
+tick follows the number of individual Sims (about 0.10 vs 0.15 ms/tick
+at 15,000 Sims, 0.23 vs 0.46 ms/tick at 60,000 on the development box).
+"""
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import POPULATION_TARGET_TOWER, SIM_TICK_SECONDS, LOD_LEVEL_MARGIN
+from tower_simulator.systems.sim_systems import MovementSystem, StressSystem
+from tower_simulator.systems.sim_lod import SimLevelOfDetail
+
+from bench_sim_tick import build_world
+
+VISIBLE_LEVELS = (40, 62)  # 720 px viewport = 22 levels
+
+
+def run(sim_count: int, ticks: int, lod_enabled: bool) -> tuple[float, SimLevelOfDetail, StressSystem]:
+    """Return mean milliseconds per tick, the LOD controller and the stress system"""
+    world = build_world(sim_count)
+    movement = MovementSystem()
+    stress = StressSystem()
+    lod = SimLevelOfDetail(world, stress)
+    if lod_enabled:
+        low, high = VISIBLE_LEVELS
+        lod.set_visible_levels(low - LOD_LEVEL_MARGIN, high + LOD_LEVEL_MARGIN)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        movement.update(world, SIM_TICK_SECONDS)
+        stress.update(world, SIM_TICK_SECONDS)
+        if lod_enabled:
+            lod.update(SIM_TICK_SECONDS)
+    elapsed = time.perf_counter() - start
+    lod.flush()
+    return elapsed * 1000.0 / ticks, lod, stress
+
+
+def main():
+    sim_count = int(sys.argv[1]) if len(sys.argv) > 1 else POPULATION_TARGET_TOWER
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    full_ms, full_lod, full_stress = run(sim_count, ticks, lod_enabled=False)
+    lod_ms, lod, lod_stress = run(sim_count, ticks, lod_enabled=True)
+
+    print(f"{sim_count} Sims, {ticks} ticks")
+    print(f"  Full agents: {full_ms:.3f} ms/tick")
+    print(f"  LOD:         {lod_ms:.3f} ms/tick "
+          f"({lod.world.active_count} individual, {lod.dormant.active_count} aggregate)")
+    print(f"  Stress distribution (black/pink/red): full {full_lod.stress_distribution().tolist()}, "
+          f"LOD {lod.stress_distribution().tolist()}")
+    print(f"  Red crossings: full {full_stress.red_total}, LOD {lod_stress.red_total}")
+    consistent = (np.array_equal(full_lod.stress_distribution(), lod.stress_distribution())
+                  and full_stress.red_total == lod_stress.red_total)
+    print(f"  Statistics consistent: {'PASS' if consistent else 'FAIL'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: simulation time per tick for a full tower of Sims
+
+Usage: python benchmarks/bench_sim_tick.py [sims] [ticks] [levels]
+Two measurements. The first times only the per-Sim ECS systems (movement
+and stress) on a synthetic world of `sims` Sims in a mix of states,
+against the target of 15,000 active Sims in under 5 ms per tick. The
+second times the game's whole simulation step (transit, movement, stress,
+level of detail, scheduling of on-screen and dormant Sims) through a
+workday in a generated office tower of `levels` floors, plus the time per
+tick with the clock events (elevator motion, trips) included. The trip
+planner keeps a few hundred Sims in such a tower, not the target
+population, so the second is not checked against the target.
+"""
+import sys
+import os
+import io
+import time
+import logging
+import contextlib
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# No window: pygame renders to a dummy video driver
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from tower_simulator.constants import (
+    POPULATION_TARGET_TOWER, SIM_TICK_SECONDS, GRID_WIDTH, SECONDS_PER_DAY, SECONDS_PER_HOUR,
+)
+from tower_simulator.entities.ecs import (
+    SimWorld, SIM_STATE_IDLE, SIM_STATE_WALKING, SIM_STATE_WAITING, SIM_STATE_RIDING,
+)
+from tower_simulator.game import TowerSimulatorGame
+from tower_simulator.systems.sim_systems import MovementSystem, StressSystem
+from tower_simulator.world.coordinate import Coordinate
+
+TARGET_MS_PER_TICK = 5.0
+DEFAULT_LEVELS = 20
+WORKDAY_HOURS = (8, 20)  # Morning commute to evening commute of day 1
+
+
+def build_world(sim_count: int, seed: int = 1994) -> SimWorld:
+    """Spawn Sims spread over the tower in a mix of states"""
+    rng = np.random.default_rng(seed)
+    world = SimWorld(capacity=sim_count)
+    ids = world.spawn(sim_count,
+                      floor=rng.integers(0, 100, sim_count),
+                      segment=rng.uniform(0, GRID_WIDTH, sim_count))
+    world.target_floor[ids] = rng.integers(0, 100, sim_count)
+    world.target_segment[ids] = rng.uniform(0, GRID_WIDTH, sim_count)
+    world.state[ids] = rng.choice([SIM_STATE_IDLE, SIM_STATE_WALKING, SIM_STATE_WAITING, SIM_STATE_RIDING],
+                                  sim_count, p=[0.4, 0.3, 0.2, 0.1])
+    world.ride_remaining[ids] = rng.uniform(0, 60, sim_count)
+    return world
+
+
+def run(sim_count: int, ticks: int) -> float:
+    """Return mean milliseconds per tick"""
+    world = build_world(sim_count)
+    movement = MovementSystem()
+    stress = StressSystem()
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        movement.update(world, SIM_TICK_SECONDS)
+        stress.update(world, SIM_TICK_SECONDS)
+    return (time.perf_counter() - start) * 1000.0 / ticks
+
+
+def build_game(levels: int, seed: int = 1994) -> TowerSimulatorGame:
+    """A lobby with four elevator shafts at its end and `levels` floors of offices running into them"""
+    game = TowerSimulatorGame(seed=seed)
+    game.funds = 10 ** 12
+    for segment in range(100, 244, 4):
+        game.place_room('lobby', Coordinate(segment, 0), 4)
+    for segment in range(244, 260, 4):
+        game.place_room('elevator_shaft', Coordinate(segment, 0), 4, levels + 1)
+    for level in range(1, levels + 1):
+        for segment in range(100, 244, 9):
+            game.place_room('office', Coordinate(segment, level), 9)
+    return game
+
+
+def run_game(levels: int) -> tuple[float, float, float, int]:
+    """
+    Return mean and max milliseconds per simulation step through the
+    workday, mean milliseconds per tick including clock events, and the
+    most Sims in the tower at once
+    """
+    logging.disable(logging.CRITICAL)
+    with contextlib.redirect_stdout(io.StringIO()):  # Placement and day rollover chatter
+        game = build_game(levels)
+        game.time_warp.run_for(SECONDS_PER_DAY + WORKDAY_HOURS[0] * SECONDS_PER_HOUR - game.time_manager.now)
+
+        step = game.time_warp.step_callback
+        times = []
+        peak = 0
+
+        def timed_step(dt: int):
+            nonlocal peak
+            start = time.perf_counter()
+            step(dt)
+            times.append(time.perf_counter() - start)
+            peak = max(peak, game.sim_lod.population)
+
+        game.time_warp.step_callback = timed_step
+        start = time.perf_counter()
+        game.time_warp.run_for((WORKDAY_HOURS[1] - WORKDAY_HOURS[0]) * SECONDS_PER_HOUR)
+        elapsed = time.perf_counter() - start
+    logging.disable(logging.NOTSET)
+    return float(np.mean(times)) * 1000.0, max(times) * 1000.0, elapsed * 1000.0 / len(times), peak
+
+
+def main():
+    sim_count = int(sys.argv[1]) if len(sys.argv) > 1 else POPULATION_TARGET_TOWER
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    levels = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_LEVELS
+    ms_per_tick = run(sim_count, ticks)
+    status = "PASS" if ms_per_tick < TARGET_MS_PER_TICK else "FAIL"
+    print(f"ECS systems, {sim_count} Sims, {ticks} ticks: {ms_per_tick:.3f} ms/tick "
+          f"(target < {TARGET_MS_PER_TICK} ms) {status}")
+
+    step_ms, max_step_ms, tick_ms, peak = run_game(levels)
+    print(f"Game step, {levels}-level office tower ({peak} Sims at most), "
+          f"{WORKDAY_HOURS[0]}:00-{WORKDAY_HOURS[1]}:00: {step_ms:.3f} ms/step (max {max_step_ms:.2f} ms), "
+          f"{tick_ms:.3f} ms/tick with clock events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Test suite for ring-buffer elevator boarding queues
+"""
+import unittest
+import sys
+import os
+import random
+from collections import deque
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.systems.boarding_queues import BoardingQueues, RingQueue, INITIAL_QUEUE_SLOTS
+from tower_simulator.systems.elevator_dispatch import DIRECTION_UP, DIRECTION_DOWN
+
+
+class TestRingQueue(unittest.TestCase):
+    """Test the FIFO ring buffer"""
+
+    def test_fifo_across_wrap_and_growth(self):
+        """Random pushes and batch takes match a deque, through wrap-around and resizing"""
+        rng = random.Random(41)
+        queue, reference = RingQueue(), deque()
+        next_id = 0
+        for _ in range(2000):
+            if rng.random() < 0.6:
+                queue.push(next_id, next_id % 100)
+                reference.append(next_id)
+                next_id += 1
+            else:
+                count = rng.randint(0, 3)
+                ids, stops = queue.take(count)
+                expected = [reference.popleft() for _ in range(min(count, len(reference)))]
+                self.assertEqual(ids.tolist(), expected)
+                self.assertEqual(stops.tolist(), [i % 100 for i in expected])
+            self.assertEqual(len(queue), len(reference))
+
+        print(f"\n[TEST] Buffer grew from {INITIAL_QUEUE_SLOTS} to {len(queue.ids)} slots")
+        self.assertGreater(len(queue.ids), INITIAL_QUEUE_SLOTS)
+
+
+class TestBoardingQueues(unittest.TestCase):
+    """Test batch boarding by shaft, floor and direction"""
+
+    def setUp(self):
+        self.queues = BoardingQueues()
+        self.shaft = object()
+
+    def test_batch_respects_capacity(self):
+        """A 9:00 lobby crowd boards at most the car's free capacity per batch, oldest first"""
+        for sim_id in range(300):
+            self.queues.push(self.shaft, 0, DIRECTION_UP, sim_id, 1 + sim_id % 3)
+
+        ids, stops = self.queues.board(self.shaft, 0, DIRECTION_UP, capacity=21)
+        self.assertEqual(ids.tolist(), list(range(21)))
+        self.assertEqual(stops, 0b1110)
+        self.assertEqual(self.queues.waiting(self.shaft, 0, DIRECTION_UP), 279)
+
+        ids, _ = self.queues.board(self.shaft, 0, DIRECTION_UP, capacity=5)
+        self.assertEqual(ids.tolist(), list(range(21, 26)))
+
+    def test_directions_and_floors_are_separate(self):
+        """Sims only board a car going their way from their floor"""
+        self.queues.push(self.shaft, 4, DIRECTION_DOWN, 7, 0)
+        self.queues.push(self.shaft, 4, DIRECTION_UP, 8, 90)
+
+        ids, stops = self.queues.board(self.shaft, 4, DIRECTION_UP, capacity=21)
+        self.assertEqual(ids.tolist(), [8])
+        self.assertEqual(stops, 1 << 90)
+        self.assertEqual(len(self.queues.board(self.shaft, 5, DIRECTION_DOWN, capacity=21)[0]), 0)
+        self.assertEqual(self.queues.waiting(self.shaft, 4, DIRECTION_DOWN), 1)
+
+    def test_assigned_car_queues(self):
+        """Destination dispatch Sims wait for their own car but count towards the floor"""
+        first, second = object(), object()
+        self.queues.push(self.shaft, 0, DIRECTION_UP, 1, 10, first)
+        self.queues.push(self.shaft, 0, DIRECTION_UP, 2, 20, second)
+        self.assertEqual(self.queues.waiting(self.shaft, 0, DIRECTION_UP), 2)
+
+        ids, stops = self.queues.board(self.shaft, 0, DIRECTION_UP, capacity=21, car=second)
+        self.assertEqual(ids.tolist(), [2])
+        self.assertEqual(stops, 1 << 20)
+        self.assertEqual(self.queues.waiting(self.shaft, 0, DIRECTION_UP, first), 1)
+        self.assertEqual(self.queues.waiting(self.shaft, 0, DIRECTION_UP), 1)
+
+    def test_full_car_boards_nobody(self):
+        """No free capacity means an empty batch and nothing leaves the queue"""
+        self.queues.push(self.shaft, 0, DIRECTION_UP, 1, 3)
+        ids, stops = self.queues.board(self.shaft, 0, DIRECTION_UP, capacity=0)
+        self.assertEqual((len(ids), stops), (0, 0))
+        self.assertEqual(self.queues.waiting(self.shaft, 0, DIRECTION_UP), 1)
+        self.assertEqual(ids.dtype, np.int32)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Boarding Queues")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
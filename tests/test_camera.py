@@ -90,6 +90,21 @@ class TestCameraInitialization(unittest.TestCase):
         self.assertLess(screen_y, self.screen_height,
                        f"Level 0 should be visible on screen")
 
+    def test_visible_levels_cover_viewport(self):
+        """Visible level range spans the screen and is widened by the margin"""
+        camera = Camera(self.screen_width, self.screen_height)
+        low, high = camera.visible_levels()
+        wide_low, wide_high = camera.visible_levels(margin=3)
+        
+        print(f"\n[TEST] Visible Levels")
+        print(f"  No margin: {low} to {high}")
+        print(f"  Margin 3:  {wide_low} to {wide_high}")
+        
+        self.assertEqual(low, GRID_MIN_LEVEL)
+        self.assertEqual(high, (camera.y + self.screen_height) // 32)
+        self.assertEqual(wide_low, GRID_MIN_LEVEL, "Margin should be clamped to the grid")
+        self.assertEqual(wide_high, high + 3)
+
 
 class TestCameraScrolling(unittest.TestCase):
     """Test camera scrolling mechanics"""
@@ -0,0 +1,206 @@
+"""
+Test suite for bitmask SCAN elevator dispatching
+"""
+import unittest
+import sys
+import os
+import random
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import MAX_ELEVATOR_SHAFTS, MAX_CARS_PER_SHAFT
+from tower_simulator.systems.elevator_dispatch import (
+    ElevatorShaft, ElevatorDispatcher, DIRECTION_UP, DIRECTION_DOWN, DIRECTION_IDLE, DISPATCH_DESTINATION,
+)
+
+
+def naive_next_stop(position: int, direction: int, up: set, down: set, car: set):
+    """Reference SCAN: the same rules as ElevatorShaft.next_stop, as list scans"""
+    def sweep_up():
+        ahead = [s for s in sorted(car | up) if s > position]
+        if ahead:
+            return ahead[0]
+        reverse = [s for s in down if s > position]
+        return max(reverse) if reverse else None
+
+    def sweep_down():
+        ahead = [s for s in sorted(car | down) if s < position]
+        if ahead:
+            return ahead[-1]
+        reverse = [s for s in up if s < position]
+        return min(reverse) if reverse else None
+
+    def nearest():
+        calls = up | down | car
+        if position in calls and not car - {position}:
+            return position, DIRECTION_IDLE
+        if not calls:
+            return None, DIRECTION_IDLE
+        best = min(calls - {position}, key=lambda s: (abs(s - position), s < position))
+        return best, DIRECTION_UP if best > position else DIRECTION_DOWN
+
+    if direction == DIRECTION_IDLE:
+        return nearest()
+    order = [(sweep_up, DIRECTION_UP), (sweep_down, DIRECTION_DOWN)]
+    if direction == DIRECTION_DOWN:
+        order.reverse()
+    for sweep, sweep_direction in order:
+        stop = sweep()
+        if stop is not None:
+            return stop, sweep_direction
+    return nearest()
+
+
+def as_set(mask: int) -> set:
+    """Bit indices set in a mask"""
+    return {i for i in range(mask.bit_length()) if mask >> i & 1}
+
+
+class TestShaftCalls(unittest.TestCase):
+    """Test call registration and bit queries"""
+
+    def setUp(self):
+        self.shaft = ElevatorShaft(bottom_level=-2, top_level=20, car_count=2)
+        self.car = self.shaft.cars[0]
+
+    def test_calls_are_bits_over_served_levels(self):
+        """Calls set one bit per level, relative to the shaft bottom"""
+        self.shaft.call(-2, DIRECTION_UP)
+        self.shaft.call(5, DIRECTION_DOWN)
+        self.shaft.press(self.car, 20)
+        self.assertEqual(self.shaft.up_calls, 1)
+        self.assertEqual(self.shaft.down_calls, 1 << 7)
+        self.assertEqual(self.car.car_calls, 1 << 22)
+        with self.assertRaises(ValueError):
+            self.shaft.call(21, DIRECTION_UP)
+
+    def test_calls_above_and_below(self):
+        """Above/below queries see hall and car calls"""
+        self.car.position = self.shaft.stop_index(10)
+        self.assertFalse(self.shaft.has_calls_above(self.car))
+        self.shaft.press(self.car, 15)
+        self.shaft.call(3, DIRECTION_UP)
+        self.assertTrue(self.shaft.has_calls_above(self.car))
+        self.assertTrue(self.shaft.has_calls_below(self.car))
+
+    def test_limits(self):
+        """Car and shaft counts are capped"""
+        with self.assertRaises(ValueError):
+            ElevatorShaft(0, 10, car_count=MAX_CARS_PER_SHAFT + 1)
+        dispatcher = ElevatorDispatcher()
+        for i in range(MAX_ELEVATOR_SHAFTS):
+            dispatcher.add_shaft(0, 10, segment=i * 4)
+        with self.assertRaises(ValueError):
+            dispatcher.add_shaft(0, 10)
+        self.assertEqual(len(dispatcher.shafts_serving(5)), MAX_ELEVATOR_SHAFTS)
+        self.assertEqual(dispatcher.shafts_serving(11), [])
+
+
+class TestScanDispatch(unittest.TestCase):
+    """Test SCAN decisions against the naive reference"""
+
+    def test_scan_sweep(self):
+        """A car going up serves up calls in order, then sweeps down"""
+        shaft = ElevatorShaft(0, 30)
+        car = shaft.cars[0]
+        for level, direction in ((5, DIRECTION_UP), (12, DIRECTION_UP), (20, DIRECTION_DOWN), (2, DIRECTION_DOWN)):
+            shaft.call(level, direction)
+
+        stops = []
+        stop, direction = shaft.next_stop(car)
+        while stop is not None:
+            shaft.arrive(car, stop, direction)
+            stops.append(shaft.level_of(stop))
+            stop, direction = shaft.next_stop(car)
+
+        print(f"\n[TEST] SCAN stop order: {stops}")
+        self.assertEqual(stops, [2, 5, 12, 20])
+        self.assertEqual(car.direction, DIRECTION_IDLE)
+        self.assertEqual(shaft.hall_calls, 0)
+
+    def test_next_stop_matches_reference(self):
+        """Random call patterns give the same decision as the list-scan reference"""
+        rng = random.Random(36)
+        for _ in range(2000):
+            stops = rng.randint(2, 110)
+            shaft = ElevatorShaft(0, stops - 1)
+            car = shaft.cars[0]
+            car.position = rng.randrange(stops)
+            car.direction = rng.choice((DIRECTION_UP, DIRECTION_DOWN, DIRECTION_IDLE))
+            for _ in range(rng.randint(0, 8)):
+                shaft.call(rng.randrange(stops), rng.choice((DIRECTION_UP, DIRECTION_DOWN)))
+            for _ in range(rng.randint(0, 4)):
+                shaft.press(car, rng.randrange(stops))
+
+            expected = naive_next_stop(car.position, car.direction, as_set(shaft.up_calls),
+                                       as_set(shaft.down_calls), as_set(car.car_calls))
+            self.assertEqual(shaft.next_stop(car), expected)
+
+    def test_every_call_is_served(self):
+        """Running the car to completion clears every call"""
+        rng = random.Random(7)
+        shaft = ElevatorShaft(-5, 40, car_count=1)
+        car = shaft.cars[0]
+        for _ in range(30):
+            shaft.call(rng.randint(-5, 40), rng.choice((DIRECTION_UP, DIRECTION_DOWN)))
+            shaft.press(car, rng.randint(-5, 40))
+
+        for _ in range(200):
+            stop, direction = shaft.next_stop(car)
+            if stop is None:
+                break
+            shaft.arrive(car, stop, direction)
+        self.assertEqual(shaft.hall_calls | car.car_calls, 0)
+
+    def test_nearest_first_when_scan_disabled(self):
+        """Without SCAN the car always takes the closest call"""
+        shaft = ElevatorShaft(0, 30, scan=False)
+        car = shaft.cars[0]
+        car.position, car.direction = 10, DIRECTION_UP
+        shaft.call(25, DIRECTION_UP)
+        shaft.call(8, DIRECTION_DOWN)
+        self.assertEqual(shaft.next_stop(car), (8, DIRECTION_DOWN))
+
+
+class TestDestinationDispatch(unittest.TestCase):
+    """Test grouping lobby passengers into cars by destination zone"""
+
+    def setUp(self):
+        self.shaft = ElevatorShaft(0, 39, car_count=4, mode=DISPATCH_DESTINATION)
+
+    def test_groups_by_zone(self):
+        """Passengers bound for the same band of floors share a car"""
+        cars = [self.shaft.assign(0, level, capacity=21).index for level in (35, 5, 38, 15, 7, 25)]
+        print(f"\n[TEST] Assigned cars: {cars}")
+        self.assertEqual(cars, [3, 0, 3, 1, 0, 2])
+        # Coming down, the origin picks the car
+        self.assertEqual(self.shaft.assign(36, 0, capacity=21).index, 3)
+        self.assertEqual(self.shaft.car_hall_calls(self.shaft.cars[3]), 1 | (1 << 36))
+
+    def test_full_car_is_skipped(self):
+        """Once a car has a full load waiting, the next passenger goes elsewhere"""
+        first = [self.shaft.assign(0, 35, capacity=2) for _ in range(3)]
+        self.assertEqual([car.index for car in first[:2]], [3, 3])
+        self.assertNotEqual(first[2].index, 3)
+
+        car = first[0]
+        self.shaft.boarded(car, 2, 0, DIRECTION_UP, waiting_left=False)
+        self.assertEqual(car.pending, 0)
+        self.assertEqual(car.up_calls, 0)
+        self.assertEqual(self.shaft.assign(0, 35, capacity=2), car)
+
+    def test_cars_only_see_their_own_calls(self):
+        """A destination car answers its assigned pickups, not the shared hall calls"""
+        car = self.shaft.assign(0, 12, capacity=21)
+        other = self.shaft.cars[0]
+        self.assertEqual(self.shaft.next_stop(car), (0, DIRECTION_IDLE))
+        self.assertEqual(self.shaft.next_stop(other), (None, DIRECTION_IDLE))
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Elevator Dispatch")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
@@ -0,0 +1,161 @@
+"""
+Test suite for the headless elevator dispatch harness and JSON layouts
+"""
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import STRESS_LEVEL_RED
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.entities.rooms.lobby import Lobby
+from tower_simulator.systems.elevator_dispatch import DISPATCH_DESTINATION
+from tower_simulator.systems.elevator_harness import (
+    DispatchHarness, PassengerTrace, dispatcher_for_layout, synthetic_trace, DRAIN_SECONDS,
+)
+from tower_simulator.utils.layout import layout_to_dict, layout_from_dict, save_layout, load_layout
+from tower_simulator.world.coordinate import Coordinate
+
+
+def build_rooms() -> list[RoomEntity]:
+    """Lobby, two shafts over levels 0-10, offices on 1-10 and a fast food on 5"""
+    rooms = [Lobby(Coordinate(100, 0), 40)]
+    for segment in (100, 104):
+        rooms.append(RoomEntity(Coordinate(segment, 0), 4, 11, 'elevator_shaft', 0, (0, 0, 0)))
+    for level in range(1, 11):
+        if level == 5:
+            rooms.append(RoomEntity(Coordinate(108, level), 16, 1, 'fast_food', 0, (0, 0, 0)))
+        else:
+            rooms.append(RoomEntity(Coordinate(108, level), 9, 1, 'office', 0, (0, 0, 0)))
+    return rooms
+
+
+class TestLayout(unittest.TestCase):
+    """Test JSON tower layouts"""
+
+    def test_round_trip(self):
+        """Saving and loading keeps every room's type and footprint"""
+        rooms = build_rooms()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tower.json')
+            save_layout(path, rooms)
+            loaded = load_layout(path)
+        self.assertEqual(layout_to_dict(loaded), layout_to_dict(rooms))
+        self.assertIsInstance(loaded[0], Lobby)
+
+    def test_shafts_from_layout(self):
+        """Elevator shaft rooms become dispatcher shafts over the levels they span"""
+        dispatcher = dispatcher_for_layout(layout_from_dict(layout_to_dict(build_rooms())))
+        self.assertEqual(len(dispatcher.shafts), 2)
+        self.assertEqual((dispatcher.shafts[0].bottom_level, dispatcher.shafts[0].top_level), (0, 10))
+
+
+class TestSyntheticTraffic(unittest.TestCase):
+    """Test traffic patterns built from the trip table"""
+
+    def setUp(self):
+        self.rooms = build_rooms()
+
+    def test_patterns(self):
+        """Up-peak leaves the lobby, down-peak returns to it, lunch goes both ways"""
+        up = synthetic_trace(self.rooms, 'up_peak', seed=5)
+        down = synthetic_trace(self.rooms, 'down_peak', seed=5)
+        lunch = synthetic_trace(self.rooms, 'lunch', seed=5)
+
+        print(f"\n[TEST] Trace sizes: up {len(up)}, lunch {len(lunch)}, down {len(down)}")
+        self.assertEqual(len(up), 9 * 6)
+        self.assertTrue(np.all(up.origin == 0))
+        self.assertTrue(np.all(down.destination == 0))
+        self.assertTrue(np.all(np.diff(up.time) >= 0))
+        # Out to the restaurant on level 5, and back from it
+        self.assertEqual(np.count_nonzero(lunch.destination == 5), np.count_nonzero(lunch.origin == 5))
+
+    def test_trace_file_round_trip(self):
+        """A saved trace replays identically"""
+        trace = synthetic_trace(self.rooms, 'lunch', seed=5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            trace.save(path)
+            loaded = PassengerTrace.load(path)
+        np.testing.assert_array_equal(loaded.time, trace.time)
+        np.testing.assert_array_equal(loaded.destination, trace.destination)
+
+
+class TestDispatchHarness(unittest.TestCase):
+    """Test replaying traffic through the dispatcher"""
+
+    def setUp(self):
+        self.rooms = build_rooms()
+
+    def test_every_passenger_is_served(self):
+        """All passengers board and arrive; the report is JSON-serializable"""
+        trace = synthetic_trace(self.rooms, 'up_peak', seed=5)
+        report = DispatchHarness(self.rooms).run(trace)
+
+        print(f"\n[TEST] Up-peak report: {report}")
+        self.assertEqual(report['served'], len(trace))
+        self.assertEqual(report['unserved'], 0)
+        self.assertLessEqual(report['avg_wait_s'], report['p95_wait_s'])
+        self.assertLessEqual(report['p95_wait_s'], report['p99_wait_s'])
+        json.dumps(report)
+
+    def test_deterministic(self):
+        """The same trace gives the same wait statistics"""
+        trace = synthetic_trace(self.rooms, 'lunch', seed=5)
+        first = DispatchHarness(self.rooms).run(trace)
+        second = DispatchHarness(self.rooms).run(trace)
+        first.pop('cpu_ms_per_1k_calls')
+        second.pop('cpu_ms_per_1k_calls')
+        self.assertEqual(first, second)
+
+    def test_crowd_exceeding_car_capacity(self):
+        """A crowd larger than a car is carried over several trips, with long waits counted"""
+        trace = PassengerTrace(np.zeros(60), np.zeros(60), np.full(60, 10))
+        report = DispatchHarness(self.rooms[:2], car_capacity=10).run(trace)
+        self.assertEqual(report['served'], 60)
+        self.assertGreater(report['stress_crossings']['red'], 0)
+        self.assertGreaterEqual(report['max_wait_s'], STRESS_LEVEL_RED)
+
+    def test_unserved_passengers_wait_until_the_horizon(self):
+        """Passengers a car never reaches are counted unserved, with waits running to the horizon"""
+        trace = PassengerTrace(np.zeros(1000), np.zeros(1000), np.full(1000, 10))
+        report = DispatchHarness(self.rooms[:2], car_capacity=1).run(trace)
+        print(f"\n[TEST] Overloaded car: {report['served']} served, {report['unserved']} unserved, "
+              f"max wait {report['max_wait_s']} s")
+        self.assertGreater(report['unserved'], 0)
+        self.assertEqual(report['served'] + report['unserved'], 999)  # One is still riding at the horizon
+        self.assertEqual(report['max_wait_s'], DRAIN_SECONDS)
+        self.assertEqual(report['p95_wait_s'], DRAIN_SECONDS)
+
+    def test_destination_dispatch_serves_everyone(self):
+        """Destination mode carries every passenger of each pattern, crowds included"""
+        for pattern in ('up_peak', 'lunch', 'down_peak'):
+            trace = synthetic_trace(self.rooms, pattern, seed=5)
+            report = DispatchHarness(self.rooms, cars_per_shaft=2, modes=DISPATCH_DESTINATION).run(trace)
+            print(f"\n[TEST] Destination {pattern}: avg {report['avg_wait_s']} s, p95 {report['p95_wait_s']} s")
+            self.assertEqual(report['served'], len(trace))
+        crowd = PassengerTrace(np.zeros(60), np.zeros(60), np.full(60, 10))
+        report = DispatchHarness(self.rooms[:2], car_capacity=10, cars_per_shaft=2,
+                                 modes=DISPATCH_DESTINATION).run(crowd)
+        self.assertEqual(report['served'], 60)
+
+    def test_unroutable_passengers(self):
+        """Trips between levels no shaft connects are reported, not dropped silently"""
+        trace = PassengerTrace(np.array([0]), np.array([0]), np.array([50]))
+        report = DispatchHarness(self.rooms).run(trace)
+        self.assertEqual(report['unroutable'], 1)
+        self.assertEqual(report['unserved'], 0)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Elevator Dispatch Harness")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
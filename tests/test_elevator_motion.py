@@ -0,0 +1,127 @@
+"""
+Test suite for event-driven elevator kinematics
+"""
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import ELEVATOR_DOOR_SECONDS
+from tower_simulator.systems.elevator_dispatch import (
+    ElevatorDispatcher, DIRECTION_UP, DIRECTION_DOWN, CAR_IDLE, CAR_MOVING, CAR_DOORS_OPEN,
+)
+from tower_simulator.systems.elevator_motion import ElevatorMotion
+from tower_simulator.systems.time_manager import TimeManager
+
+
+class TestElevatorMotion(unittest.TestCase):
+    """Test car journeys driven by World Clock events"""
+
+    def setUp(self):
+        self.time_manager = TimeManager(start_time=0)
+        self.dispatcher = ElevatorDispatcher()
+        self.shaft = self.dispatcher.add_shaft(0, 30, car_count=1, segment=40)
+        self.car = self.shaft.cars[0]
+        self.stops = []
+        self.motion = ElevatorMotion(self.time_manager, self.dispatcher, seconds_per_level=2,
+                                     on_doors_open=lambda shaft, car: self.stops.append(
+                                         (self.time_manager.now, shaft.level_of(car.position))))
+
+    def test_journey_is_three_events(self):
+        """A call costs one arrival and one doors-close event, then the car parks"""
+        self.motion.call(self.shaft, 10, DIRECTION_DOWN)
+        self.assertEqual(self.car.phase, CAR_MOVING)
+        self.assertEqual(self.time_manager.pending_count, 1)
+
+        fired = self.time_manager.advance(1000)
+        print(f"\n[TEST] Stops: {self.stops}, events fired: {fired}")
+        self.assertEqual(self.stops, [(20, 10)])
+        self.assertEqual(fired, 2)
+        self.assertEqual(self.car.phase, CAR_IDLE)
+        self.assertEqual(self.time_manager.pending_count, 0)
+
+    def test_doors_close_after_floor_departure(self):
+        """The next journey starts when the floor departure time is up"""
+        self.shaft.departure_seconds = 45
+        self.motion.call(self.shaft, 5, DIRECTION_UP)
+        self.time_manager.advance(10)
+        self.assertEqual(self.car.phase, CAR_DOORS_OPEN)
+        self.motion.press(self.shaft, self.car, 8)
+
+        self.time_manager.advance(44)
+        self.assertEqual(self.car.phase, CAR_DOORS_OPEN)
+        self.time_manager.advance(1)
+        self.assertEqual(self.car.phase, CAR_MOVING)
+        self.time_manager.advance(6)
+        self.assertEqual(self.stops, [(10, 5), (61, 8)])
+
+    def test_interpolated_position(self):
+        """Rendering positions are interpolated between departure and arrival"""
+        self.motion.call(self.shaft, 20, DIRECTION_DOWN)
+        self.time_manager.advance(10)
+        self.assertAlmostEqual(self.motion.car_level(self.shaft, self.car), 5.0)
+
+        visible = list(self.motion.visible_cars(0, 10))
+        self.assertEqual(len(visible), 1)
+        self.assertEqual(list(self.motion.visible_cars(15, 25)), [])
+        self.assertEqual(list(self.motion.visible_cars(50, 60)), [])
+
+    def test_new_call_ahead_stops_car_early(self):
+        """A call between the car and its target shortens the journey"""
+        self.motion.press(self.shaft, self.car, 20)
+        self.time_manager.advance(10)  # Car is passing level 5
+        self.motion.call(self.shaft, 12, DIRECTION_UP)
+        self.motion.call(self.shaft, 3, DIRECTION_UP)  # Already passed
+        self.assertEqual(self.motion.retargets, 1)
+
+        self.time_manager.advance(1000)
+        self.assertEqual([level for _, level in self.stops][:3], [12, 20, 3])
+        self.assertEqual(self.stops[0][0], 24)
+
+    def test_waiting_car_response(self):
+        """A far-off moving car leaves the call to an idle car; a close one takes it"""
+        shaft = self.dispatcher.add_shaft(0, 30, car_count=3)
+        first, second, third = shaft.cars
+        self.motion.press(shaft, first, 20)
+        self.time_manager.advance(4)  # First car passing level 2
+
+        shaft.waiting_car_response = 1
+        self.motion.call(shaft, 10, DIRECTION_UP)
+        self.assertEqual(second.phase, CAR_MOVING)
+
+        shaft.waiting_car_response = 5
+        self.motion.call(shaft, 6, DIRECTION_UP)
+        self.assertEqual(first.target, shaft.stop_index(6))
+        self.assertEqual(third.phase, CAR_IDLE)
+
+    def test_short_stop_when_nobody_boards(self):
+        """Doors are held for the floor departure time only after someone boards"""
+        motion = ElevatorMotion(TimeManager(start_time=0), self.dispatcher, on_doors_open=lambda shaft, car: 0)
+        motion.call(self.shaft, 3, DIRECTION_UP)
+        motion.time_manager.advance(3)
+        self.assertEqual(self.car.phase, CAR_DOORS_OPEN)
+        motion.time_manager.advance(ELEVATOR_DOOR_SECONDS)
+        self.assertEqual(self.car.phase, CAR_IDLE)
+
+    def test_wake_without_calls(self):
+        """Waking a shaft whose idle car has nowhere to go leaves it parked"""
+        self.motion.wake(self.shaft)
+        self.assertEqual(self.car.phase, CAR_IDLE)
+        self.assertEqual(self.time_manager.pending_count, 0)
+
+    def test_idle_cars_cost_nothing(self):
+        """Parked cars schedule no events however long time runs"""
+        self.dispatcher.add_shaft(-5, 100, car_count=8)
+        fired = self.time_manager.advance(86400)
+        self.assertEqual(fired, 0)
+        self.assertEqual(self.motion.departures, 0)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Elevator Motion")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
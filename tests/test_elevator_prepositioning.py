@@ -0,0 +1,92 @@
+"""
+Test suite for predictive elevator pre-positioning
+"""
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import SECONDS_PER_DAY, SECONDS_PER_HOUR, PREPOSITION_LEAD_SECONDS
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.systems.elevator_dispatch import ElevatorDispatcher, CAR_IDLE, DISPATCH_SCAN, DISPATCH_DESTINATION
+from tower_simulator.systems.elevator_harness import DispatchHarness, synthetic_trace
+from tower_simulator.systems.elevator_motion import ElevatorMotion
+from tower_simulator.systems.elevator_prepositioning import ElevatorPrepositioner, PEAK_UP, PEAK_LUNCH
+from tower_simulator.systems.time_manager import TimeManager, EVENT_ELEVATOR_PREPOSITION
+from tests.test_elevator_harness import build_rooms
+
+
+class TestPrepositioner(unittest.TestCase):
+    """Test planning from the World Clock and parking idle cars"""
+
+    def setUp(self):
+        self.clock = TimeManager(start_time=0)
+        self.clock.install_default_schedule()
+        self.dispatcher = ElevatorDispatcher()
+        self.shaft = self.dispatcher.add_shaft(0, 10, car_count=2)
+        self.motion = ElevatorMotion(self.clock, self.dispatcher)
+        self.prepositioner = ElevatorPrepositioner(self.clock, self.motion, RoomTable(build_rooms()))
+
+    def test_peaks_planned_from_schedule(self):
+        """A weekday gets a morning and a lunch peak; the Weekend has no office work to prepare for"""
+        planned = self.clock.upcoming((EVENT_ELEVATOR_PREPOSITION,), SECONDS_PER_DAY)
+        print(f"\n[TEST] Planned: {[(e.time / SECONDS_PER_HOUR, e.payload[0]) for e in planned]}")
+        self.assertEqual([e.payload[0] for e in planned], [PEAK_UP, PEAK_LUNCH])
+        self.assertEqual(planned[0].time, 8 * SECONDS_PER_HOUR - PREPOSITION_LEAD_SECONDS)
+
+        self.clock.advance(3 * SECONDS_PER_DAY)  # Through the Weekend (day 2)
+        self.assertEqual(self.prepositioner.peaks, 5)
+
+    def test_lunch_posts_follow_office_seats(self):
+        """Cars split the office seats: offices on 1-4 and 6-10, so one car each side of the restaurant"""
+        self.assertEqual(self.prepositioner.posts(self.shaft, PEAK_LUNCH), [3, 8])
+        self.assertEqual(self.prepositioner.posts(self.shaft, PEAK_UP), [0, 0])
+        upper = self.dispatcher.add_shaft(20, 30)
+        self.assertIsNone(self.prepositioner.posts(upper, PEAK_LUNCH))
+        self.assertIsNone(self.prepositioner.posts(upper, PEAK_UP))
+
+    def test_idle_cars_return_to_post_during_peak(self):
+        """Cars are parked at the lobby before 8:00 and come back after each trip until 9:00"""
+        for car in self.shaft.cars:
+            car.position = 6
+        self.clock.advance_to(8 * SECONDS_PER_HOUR)
+        self.assertEqual([car.position for car in self.shaft.cars], [0, 0])
+
+        self.motion.press(self.shaft, self.shaft.cars[0], 10)
+        self.clock.advance(5 * 60)
+        self.assertEqual((self.shaft.cars[0].position, self.shaft.cars[0].phase), (0, CAR_IDLE))
+
+        # After the up-peak a car parks where it stops
+        self.clock.advance_to(9 * SECONDS_PER_HOUR)
+        self.motion.press(self.shaft, self.shaft.cars[0], 10)
+        self.clock.advance(5 * 60)
+        self.assertEqual(self.shaft.cars[0].position, 10)
+
+
+class TestPrepositionedDispatch(unittest.TestCase):
+    """Test pre-positioning on synthetic peak traffic"""
+
+    def test_up_peak_waits_drop(self):
+        """With cars waiting at the lobby the morning rush waits less, in both elevator modes"""
+        rooms = build_rooms()
+        trace = synthetic_trace(rooms, 'up_peak')
+        for mode in (DISPATCH_SCAN, DISPATCH_DESTINATION):
+            plain = DispatchHarness(rooms, cars_per_shaft=2, modes=mode, window_hours=(8.75, 9.5)).run(trace)
+            parked = DispatchHarness(rooms, cars_per_shaft=2, modes=mode, preposition=True,
+                                     window_hours=(8.75, 9.5)).run(trace)
+            print(f"\n[TEST] Mode {mode}: avg wait {plain['avg_wait_s']} -> {parked['avg_wait_s']} s, "
+                  f"8:45-9:30 p95 {plain['window']['p95_wait_s']} -> {parked['window']['p95_wait_s']} s")
+            self.assertEqual(parked['served'], len(trace))
+            self.assertGreater(parked['preposition_moves'], 0)
+            self.assertLess(parked['avg_wait_s'], plain['avg_wait_s'])
+            self.assertGreater(parked['window']['passengers'], 0)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Elevator Pre-positioning")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
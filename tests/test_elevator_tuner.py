@@ -0,0 +1,83 @@
+"""
+Test suite for the parallel elevator settings tuner
+"""
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import WAITING_CAR_RESPONSE_RANGE, STANDARD_FLOOR_DEPARTURE
+from tower_simulator.systems.elevator_harness import (
+    DispatchHarness, PassengerTrace, apply_shaft_settings, dispatcher_for_layout, synthetic_trace,
+)
+from tower_simulator.systems.elevator_tuner import ElevatorTuner, RESPONSE_CHOICES, DEPARTURE_CHOICES, score
+from tests.test_elevator_harness import build_rooms
+
+
+class TestElevatorTuner(unittest.TestCase):
+    """Test the per-shaft settings sweep"""
+
+    def setUp(self):
+        self.rooms = build_rooms()
+        trace = synthetic_trace(self.rooms, 'lunch', seed=5)
+        self.trace = PassengerTrace(trace.time[:40], trace.origin[:40], trace.destination[:40])
+
+    def test_settings_stay_in_range(self):
+        """Every tuned setting is one of the documented values, one per shaft"""
+        tuner = ElevatorTuner(self.rooms, self.trace, cars_per_shaft=2, workers=1)
+        result = tuner.tune()
+
+        print(f"\n[TEST] Tuned settings: {result['settings']} p95 {result['report']['p95_wait_s']}")
+        self.assertEqual(len(result['settings']), 2)
+        self.assertEqual(result['evaluations'], 1 + 2 * len(RESPONSE_CHOICES) * len(DEPARTURE_CHOICES))
+        for setting in result['settings']:
+            self.assertTrue(WAITING_CAR_RESPONSE_RANGE[0] <= setting['waiting_car_response']
+                            <= WAITING_CAR_RESPONSE_RANGE[1])
+            self.assertTrue(STANDARD_FLOOR_DEPARTURE[0] <= setting['floor_departure_s']
+                            <= STANDARD_FLOOR_DEPARTURE[1])
+
+    def test_never_worse_than_defaults(self):
+        """The tuned p95 wait is at most the default settings' p95 wait"""
+        default = DispatchHarness(self.rooms, cars_per_shaft=2).run(self.trace)
+        result = ElevatorTuner(self.rooms, self.trace, cars_per_shaft=2, workers=1).tune()
+        self.assertLessEqual(result['report']['p95_wait_s'], default['p95_wait_s'])
+
+    def test_process_pool_matches_serial(self):
+        """Spreading runs over worker processes finds the same settings"""
+        serial = ElevatorTuner(self.rooms, self.trace, cars_per_shaft=2, workers=1).tune()
+        parallel = ElevatorTuner(self.rooms, self.trace, cars_per_shaft=2, workers=2).tune()
+        self.assertEqual(serial['settings'], parallel['settings'])
+        self.assertEqual(serial['report']['p95_wait_s'], parallel['report']['p95_wait_s'])
+
+    def test_stranding_passengers_never_wins(self):
+        """A setting with short waits but unserved passengers loses to one that serves everyone"""
+        tuner = ElevatorTuner(self.rooms, self.trace, cars_per_shaft=2, workers=1)
+        stranding = (RESPONSE_CHOICES[-1], DEPARTURE_CHOICES[-1])
+
+        def evaluate(candidates):
+            return [{'p95_wait_s': 5.0, 'avg_wait_s': 2.0, 'unserved': 3} if stranding in candidate
+                    else {'p95_wait_s': 90.0, 'avg_wait_s': 40.0, 'unserved': 0} for candidate in candidates]
+
+        best, report = tuner._descend(((RESPONSE_CHOICES[0], DEPARTURE_CHOICES[0]),) * 2, 1, evaluate)
+        self.assertNotIn(stranding, best)
+        self.assertEqual(report['unserved'], 0)
+        self.assertGreater(score({'p95_wait_s': 0.0, 'unserved': 1}), score({'p95_wait_s': 3600.0, 'unserved': 0}))
+
+    def test_apply_settings(self):
+        """Tuned settings can be applied to a live dispatcher"""
+        tuner = ElevatorTuner(self.rooms, self.trace, cars_per_shaft=2, workers=1)
+        tuner.tune()
+        dispatcher = dispatcher_for_layout(self.rooms)
+        apply_shaft_settings(dispatcher, tuner.best_settings)
+        self.assertEqual([(s.waiting_car_response, s.departure_seconds) for s in dispatcher.shafts],
+                         tuner.best_settings)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Elevator Settings Tuner")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
@@ -0,0 +1,127 @@
+"""
+Test suite for the game loop run headless - seeded runs and Sim journeys end to end
+"""
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# No window: pygame renders to a dummy video driver
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from tower_simulator.constants import SECONDS_PER_HOUR, SECONDS_PER_DAY
+from tower_simulator.entities.ecs import BEHAVIOR_IN_ROOM
+from tower_simulator.game import TowerSimulatorGame
+from tower_simulator.utils.determinism import StateHashLogger
+from tower_simulator.world.coordinate import Coordinate
+
+
+def office_tower_game(seed: int, hash_interval_ticks: int = 0, shaft: bool = True) -> TowerSimulatorGame:
+    """A game with a lobby, one elevator shaft to level 2 (unless `shaft` is off) and three offices (18 workers)"""
+    game = TowerSimulatorGame(seed=seed, hash_interval_ticks=hash_interval_ticks)
+    for segment in range(100, 120, 4):
+        game.place_room('lobby', Coordinate(segment, 0), 4)
+    if shaft:
+        game.place_room('elevator_shaft', Coordinate(120, 0), 4, 3)
+    for segment, level in ((102, 1), (111, 1), (111, 2)):  # Each floor runs on into the shaft
+        game.place_room('office', Coordinate(segment, level), 9)
+    return game
+
+
+class TestSeededRuns(unittest.TestCase):
+    """Test that the seed alone controls the simulation"""
+
+    def run_hashes(self, seed: int) -> list[tuple[int, str]]:
+        """State hash history of a game run into the next morning's commute"""
+        game = office_tower_game(seed, hash_interval_ticks=SECONDS_PER_HOUR)
+        game.time_warp.run_for(SECONDS_PER_DAY + 6 * SECONDS_PER_HOUR)
+        return game.state_hash_logger.history
+
+    def test_same_seed_same_hashes(self):
+        """Two games with the same seed hash identically; another seed diverges"""
+        first, second, other = self.run_hashes(7), self.run_hashes(7), self.run_hashes(8)
+        print(f"\n[TEST] {len(first)} hashes, seed 8 diverges at tick "
+              f"{StateHashLogger.first_divergence(first, other)}")
+        self.assertEqual(len(first), 30)
+        self.assertIsNone(StateHashLogger.first_divergence(first, second))
+        self.assertIsNotNone(StateHashLogger.first_divergence(first, other))
+
+
+class TestWorkday(unittest.TestCase):
+    """Test that Sims ride to their offices, work and leave again"""
+
+    def run_workday(self, game: TowerSimulatorGame) -> int:
+        """Run to mid-afternoon of the first full weekday, check everyone is at work; returns Sims at work"""
+        game.time_warp.run_for(SECONDS_PER_DAY + 10 * SECONDS_PER_HOUR)  # 15:00 on day 1
+        game.sim_lod.flush()
+        working = 0
+        for world in (game.sims, game.sim_lod.dormant):
+            ids = world.active_ids()
+            at_desk = (world.behavior[ids] == BEHAVIOR_IN_ROOM) & (world.floor[ids] == world.target_floor[ids])
+            working += int(at_desk.sum())
+
+        game.time_warp.run_for(6 * SECONDS_PER_HOUR)  # 21:00, after the evening commute
+        return working
+
+    def test_workers_arrive_and_leave(self):
+        """All 18 workers ride up to their offices and are despawned after riding home"""
+        game = office_tower_game(3)
+        working = self.run_workday(game)
+        print(f"\n[TEST] {working} at work, {game.transit_system.boarded} boardings, "
+              f"{game.sims.despawned_total} despawned")
+        self.assertEqual(working, 18)
+        self.assertEqual(game.sim_lod.population, 0)
+        self.assertEqual(game.sims.despawned_total, 18)
+        self.assertEqual(game.sims.free_count, game.sims.capacity)  # Slots back on the free list
+        self.assertEqual(game.transit_system.boarded, 36)
+        self.assertEqual(game.scheduling_system.behavior.invalid_total, 0)
+        self.assertEqual(game.route_weights.samples_total, 36)  # Every boarding's wait
+
+    def test_commute_from_the_lobby(self):
+        """Placement reports the route table's cost, and no commute where the shaft is missing"""
+        game = office_tower_game(3)
+        commute = game.commute_seconds(2)
+        print(f"\n[TEST] Commute to level 2: {commute:.1f} s")
+        self.assertEqual(commute, game.route_table.route(0, 2)[1])
+        self.assertEqual(office_tower_game(3, shaft=False).commute_seconds(2), float('inf'))
+
+    def test_no_commute_across_a_walkway_gap(self):
+        """A second shaft set apart from the first by a gap on level 2 gives no commute above it"""
+        game = office_tower_game(3)
+        self.assertIsNotNone(game.place_room('elevator_shaft', Coordinate(104, 2), 4, 3))  # Levels 2-4
+        print(f"\n[TEST] Level 4: hub estimate {game.zone_router.hub_cost(0, 4):.1f} s, "
+              f"commute {game.commute_seconds(4)}")
+        self.assertLess(game.zone_router.hub_cost(0, 4), float('inf'))  # Blind to the gap
+        self.assertEqual(game.commute_seconds(4), float('inf'))
+        self.assertEqual(game.route_table.route(0, 4)[0], -1)
+
+    def test_stranded_workers_give_up(self):
+        """With no way up, workers go red waiting at the lobby and leave the tower"""
+        game = office_tower_game(3, shaft=False)
+        game.time_warp.run_for(SECONDS_PER_DAY + 8 * SECONDS_PER_HOUR)  # 13:00 on day 1
+        print(f"\n[TEST] Stranded: {game.stress_system.red_total} red, {game.sims.despawned_total} despawned")
+        self.assertEqual(game.stress_system.red_total, 18)
+        self.assertEqual(game.transit_system.unroutable, 18)  # Marked as they spawned
+        self.assertEqual(game.sim_lod.population, 0)
+        self.assertEqual(game.sims.free_count, game.sims.capacity)
+
+    def test_workers_off_screen_arrive_and_leave(self):
+        """With the office levels off-screen the dormant world carries the workers on timed legs"""
+        game = office_tower_game(3)
+        game.sim_lod.set_visible_levels(-5, 0)
+        working = self.run_workday(game)
+        print(f"\n[TEST] Off-screen: {working} at work, "
+              f"{game.dormant_transit_system.legs_planned} dormant legs planned")
+        self.assertEqual(working, 18)
+        self.assertEqual(game.sim_lod.population, 0)
+        self.assertGreater(game.dormant_transit_system.legs_planned, 0)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Game")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
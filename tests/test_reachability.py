@@ -0,0 +1,153 @@
+"""
+Test suite for the reachability map
+"""
+import unittest
+import sys
+import os
+import random
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import GRID_MIN_LEVEL, GRID_MAX_LEVEL
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.systems.reachability import ReachabilityMap, UNREACHABLE
+from tower_simulator.systems.route_table import RouteTable
+from tower_simulator.systems.transit_graph import TransitGraph
+from tower_simulator.systems.walkways import WalkingModel
+from tower_simulator.systems.zone_router import ZoneRouter
+from tower_simulator.world.coordinate import Coordinate
+from tests.test_transit_graph import transit_room
+from tests.test_route_table import random_tower
+from tests.test_walkways import office
+
+
+def room(room_type: str, level: int, height: int = 1) -> RoomEntity:
+    """A 10-segment room of any type"""
+    return RoomEntity(Coordinate(0, level), 10, height, room_type, 0, (0, 0, 0))
+
+
+class TestReachabilityMap(unittest.TestCase):
+    """Test trip counts from the entrances, metro sources and skipped edits"""
+
+    def setUp(self):
+        self.graph = TransitGraph()
+        # A shaft 0-10, stairs 10-11 and a separate shaft 60-80
+        for room_id, transit in enumerate([transit_room('elevator_shaft', 140, 0, 11),
+                                           transit_room('stairs', 100, 10),
+                                           transit_room('elevator_shaft', 140, 60, 21)]):
+            self.graph.add_room(room_id, transit)
+        self.reachability = ReachabilityMap(RouteTable(self.graph))
+
+    def test_trip_counts(self):
+        """The lobby is 0 trips, the shaft's levels 1, the stairs' top 2, the high block unreachable"""
+        print(f"\n[TEST] Trips to 0, 5, 11, 70: "
+              f"{[self.reachability.trips_to(level) for level in (0, 5, 11, 70)]}")
+        self.assertEqual(self.reachability.trips_to(0), 0)
+        self.assertEqual(self.reachability.trips_to(5), 1)
+        self.assertEqual(self.reachability.trips_to(11), 2)
+        self.assertEqual(self.reachability.trips_to(70), UNREACHABLE)
+        self.assertEqual(self.reachability.trips_to(-3), UNREACHABLE)
+
+    def test_metro_is_an_entrance(self):
+        """A metro station's levels count as zero trips, and stairs from it reach further down"""
+        self.reachability.add_room(10, room('metro_station', -4, 3))
+        self.graph.add_room(11, transit_room('stairs', 100, -5))
+        self.assertEqual([self.reachability.trips_to(level) for level in (-5, -4, -2, -1)],
+                         [1, 0, 0, UNREACHABLE])
+
+    def test_edits_out_of_reach_are_skipped(self):
+        """Transit only reachable beyond the trip limit leaves the map and its version alone"""
+        self.reachability.refresh()
+        searches, version = self.reachability.searches, self.reachability.version
+        self.graph.add_room(20, transit_room('stairs', 100, 90))
+        self.graph.add_room(21, transit_room('escalator', 100, 70))
+        self.assertFalse(self.reachability.refresh())
+        self.assertEqual((self.reachability.searches, self.reachability.version), (searches, version))
+        self.assertEqual(self.reachability.skipped_edits, 2)
+
+        # Joining the high block makes it reachable and bumps the version
+        self.graph.add_room(22, transit_room('elevator_shaft', 180, 11, 50))
+        self.assertEqual(self.reachability.trips_to(70), 4)
+        self.assertEqual(self.reachability.version, version + 1)
+
+    def test_unreachable_rooms(self):
+        """Destination rooms on cut-off levels are listed; lobbies, transit and basements are not"""
+        rooms = [room('basement_floor_level_-1', -1), room('lobby', 0), room('office', 5),
+                 room('office', 70), transit_room('elevator_shaft', 140, 60, 21), room('condo', 30)]
+        unreachable = self.reachability.unreachable_rooms(RoomTable(rooms))
+        print(f"\n[TEST] Unreachable room ids: {unreachable.tolist()}")
+        self.assertEqual(unreachable.tolist(), [3, 5])
+
+    def test_matches_route_table(self):
+        """Trip counts equal the fewest legs from the lobby in the route table after random edits"""
+        rng = random.Random(49)
+        graph = TransitGraph()
+        table = RouteTable(graph)
+        reachability = ReachabilityMap(table)
+        placed = []
+        for room_id, transit in random_tower(rng, 60).items():
+            graph.add_room(room_id, transit)
+            placed.append(room_id)
+            if rng.random() < 0.3:
+                graph.remove_room(placed.pop(rng.randrange(len(placed))))
+            reachability.refresh()
+        table.refresh()
+        levels = np.arange(GRID_MIN_LEVEL, GRID_MAX_LEVEL + 1)
+        np.testing.assert_array_equal(reachability.trips, table.hops[0 - GRID_MIN_LEVEL])
+        print(f"\n[TEST] {np.count_nonzero(reachability.trips >= 0)} of {len(levels)} levels reachable, "
+              f"{reachability.searches} searches, {reachability.skipped_edits} edits skipped")
+
+
+class TestReachabilityWithWalkways(unittest.TestCase):
+    """Test that the map, the route table and the zone router agree on what Sims can reach"""
+
+    def setUp(self):
+        # A shaft 0-10; on level 10 a gap parts it from the stairs up to level 11
+        self.graph = TransitGraph()
+        self.walkways = WalkingModel(self.graph)
+        self.table = RouteTable(self.graph, walkways=self.walkways)
+        self.reachability = ReachabilityMap(self.table)
+        self.router = ZoneRouter(self.table)
+        self.rooms = rooms = [office(0, 0, 100), office(0, 10, 40), office(60, 10, 40),
+                              transit_room('elevator_shaft', 10, 0, 11), transit_room('stairs', 86, 10)]
+        for room_id, placed in enumerate(rooms):
+            self.graph.add_room(room_id, placed)
+            self.walkways.add_room(room_id, placed)
+
+    def test_gap_cuts_off_the_level_above(self):
+        """Stairs across a gap from the shaft reach nothing, for the map and the router alike"""
+        self.assertEqual(self.reachability.trips_to(10), 1)
+        self.assertEqual(self.reachability.trips_to(11), UNREACHABLE)
+        self.assertEqual(self.router.route_cost(0, 11), np.inf)
+        version = self.reachability.version
+
+        self.walkways.add_room(5, office(40, 10, 20))
+        print(f"\n[TEST] Bridged: level 11 in {self.reachability.trips_to(11)} trips, "
+              f"{self.router.route_cost(0, 11):.1f} s")
+        self.assertEqual(self.reachability.trips_to(11), 2)
+        self.assertLess(self.router.route_cost(0, 11), np.inf)
+        self.assertEqual(self.reachability.version, version + 1)
+
+    def test_rooms_across_a_gap_are_unreachable(self):
+        """A room on a reached level is only reachable from the run where Sims get off"""
+        self.assertTrue(self.reachability.is_reachable(self.rooms[1]))
+        self.assertFalse(self.reachability.is_reachable(self.rooms[2]))
+        self.assertEqual(self.reachability.unreachable_rooms(RoomTable(self.rooms)).tolist(), [2])
+        version = self.reachability.version
+
+        self.walkways.add_room(5, office(40, 10, 20))
+        print(f"\n[TEST] Bridged: unreachable {self.reachability.unreachable_rooms(RoomTable(self.rooms)).tolist()}")
+        self.assertTrue(self.reachability.is_reachable(self.rooms[2]))
+        self.assertEqual(self.reachability.version, version + 1)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Reachability")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
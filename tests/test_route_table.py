@@ -0,0 +1,152 @@
+"""
+Test suite for the precomputed floor-to-floor route table
+"""
+import unittest
+import sys
+import os
+import heapq
+import random
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import GRID_MIN_LEVEL, GRID_MAX_LEVEL, MAX_SIM_TRIPS
+from tower_simulator.systems.route_table import RouteTable, UNREACHABLE
+from tower_simulator.systems.transit_graph import TransitGraph
+from tests.test_transit_graph import transit_room
+
+
+def reference_costs(graph: TransitGraph, origin: int) -> dict[int, float]:
+    """Cheapest cost to every level within MAX_SIM_TRIPS legs, by Dijkstra over (level, legs) states"""
+    best = {}
+    queue = [(0.0, 0, origin)]
+    seen = set()
+    while queue:
+        cost, legs, level = heapq.heappop(queue)
+        if (level, legs) in seen:
+            continue
+        seen.add((level, legs))
+        best.setdefault(level, cost)
+        if legs == MAX_SIM_TRIPS:
+            continue
+        for other, link in graph.neighbours(level):
+            heapq.heappush(queue, (cost + link.cost(level, other), legs + 1, other))
+    return best
+
+
+def random_tower(rng: random.Random, count: int) -> dict:
+    """Random stairs, escalators and shafts by room id"""
+    rooms = {}
+    for room_id in range(count):
+        room_type = rng.choice(['stairs', 'escalator', 'elevator_shaft'])
+        height = rng.randint(3, 25) if room_type == 'elevator_shaft' else 2
+        rooms[room_id] = transit_room(room_type, rng.randint(0, 300), rng.randint(-5, 109 - height + 1), height)
+    return rooms
+
+
+class TestRouteTable(unittest.TestCase):
+    """Test route costs, legs and row invalidation"""
+
+    def setUp(self):
+        self.graph = TransitGraph()
+        # Stairs B2-B1, escalator B1-0, a local shaft 0-10 and an express 0-30
+        for room_id, room in enumerate([transit_room('stairs', 100, -2), transit_room('escalator', 120, -1),
+                                        transit_room('elevator_shaft', 140, 0, 11),
+                                        transit_room('elevator_shaft', 150, 0, 31)]):
+            self.graph.add_room(room_id, room)
+        self.table = RouteTable(self.graph)
+
+    def test_route_legs(self):
+        """Basement to level 10 is stairs, escalator and the local shaft"""
+        legs, cost, links, stops = self.table.route(-2, 10)
+        print(f"\n[TEST] B2 -> 10: {legs} legs, {cost} s via {links.tolist()} ending at {stops.tolist()}")
+        self.assertEqual(links.tolist(), [0, 1, 2])
+        self.assertEqual(stops.tolist(), [-1, 0, 10])
+        self.assertEqual(cost, 2.0 + 2.0 + 10.0 + 10.0)
+        self.assertEqual(self.table.route(5, 5)[:2], (0, 0.0))
+        self.assertEqual(self.table.route(5, 50)[0], UNREACHABLE)
+
+    def test_trip_limit(self):
+        """A fifth leg is never taken: a chain of 5 stairs leaves its top unreachable from its bottom"""
+        graph = TransitGraph()
+        for room_id in range(5):
+            graph.add_room(room_id, transit_room('stairs', 100, 40 + room_id))
+        table = RouteTable(graph)
+        self.assertEqual(table.trips_between(np.array([40, 40, 41]), np.array([44, 45, 45])).tolist(),
+                         [4, UNREACHABLE, 4])
+
+    def test_matches_reference_after_edits(self):
+        """Costs and routes equal a Dijkstra reference and a full rebuild after random edits"""
+        rng = random.Random(45)
+        rooms = random_tower(rng, 60)
+        graph, placed = TransitGraph(), []
+        table = RouteTable(graph)
+        for room_id, room in rooms.items():
+            graph.add_room(room_id, room)
+            placed.append(room_id)
+            if rng.random() < 0.3:
+                graph.remove_room(placed.pop(rng.randrange(len(placed))))
+            table.refresh()
+
+        rebuilt = RouteTable(graph)
+        np.testing.assert_array_equal(table.cost, rebuilt.cost)
+        np.testing.assert_array_equal(table.links, rebuilt.links)
+        for origin in range(GRID_MIN_LEVEL, GRID_MAX_LEVEL + 1, 7):
+            expected = reference_costs(graph, origin)
+            for destination in range(GRID_MIN_LEVEL, GRID_MAX_LEVEL + 1):
+                legs, cost, links, stops = table.route(origin, destination)
+                self.assertEqual(cost, expected.get(destination, np.inf))
+                # The stored legs add up to the stored cost
+                level, total = origin, 0.0
+                for link_id, stop in zip(links.tolist(), stops.tolist()):
+                    link = graph.links[link_id]
+                    self.assertTrue(link.serves(level) and link.serves(stop))
+                    total, level = total + link.cost(level, stop), stop
+                if legs != UNREACHABLE:
+                    self.assertEqual((level, total), (destination, cost))
+        print(f"\n[TEST] {table.rows_recomputed} rows recomputed over {table.refreshes} refreshes, "
+              f"{len(graph.links)} links")
+
+    def test_edit_recomputes_only_affected_rows(self):
+        """Stairs placed in a separate high block only dirty the rows that can reach them"""
+        self.graph.add_room(10, transit_room('stairs', 200, 80))
+        print(f"\n[TEST] Dirty rows after stairs on 80-81: {np.flatnonzero(self.table.dirty) + GRID_MIN_LEVEL}")
+        self.assertEqual(self.table.refresh(), 2)
+
+        # A shaft from the express's top joins the blocks, within four legs of B2 only up to level 80
+        self.graph.add_room(11, transit_room('elevator_shaft', 200, 30, 51))
+        self.assertEqual(self.table.route(-2, 80)[0], 4)
+        self.assertEqual(self.table.route(-2, 81)[0], UNREACHABLE)
+        self.assertEqual(self.table.route(0, 81)[0], 3)
+
+    def test_bulk_resolve(self):
+        """A crowd's routes are resolved once per distinct pair"""
+        rng = np.random.default_rng(50)
+        graph = TransitGraph()
+        for room_id, room in random_tower(random.Random(50), 60).items():
+            graph.add_room(room_id, room)
+        origins = rng.choice(np.arange(-5, 15), size=3000)
+        destinations = rng.choice(np.arange(0, 100, 4), size=3000)
+
+        serial = RouteTable(graph)
+        serial.dirty[:] = True
+        batch = serial.resolve(origins, destinations)
+        print(f"\n[TEST] {len(origins)} spawns -> {batch.unique_pairs} unique pairs, "
+              f"{serial.rows_recomputed - len(serial.dirty)} rows recomputed")
+
+        self.assertEqual(batch.unique_pairs, len(set(zip(origins.tolist(), destinations.tolist()))))
+        self.assertEqual(serial.rows_recomputed - len(serial.dirty), 20)  # Only the origin rows
+        for index in range(0, 3000, 97):
+            legs, cost, links, stops = serial.route(int(origins[index]), int(destinations[index]))
+            self.assertEqual((int(batch.trips[index]), float(batch.cost[index])), (legs, cost))
+            self.assertEqual(batch.links[index, :max(legs, 0)].tolist(), links.tolist())
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Route Table")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
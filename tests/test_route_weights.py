@@ -0,0 +1,80 @@
+"""
+Test suite for congestion-aware route weights
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import CONGESTION_REFRESH_SECONDS, CONGESTION_WINDOW_REFRESHES
+from tower_simulator.systems.route_table import RouteTable
+from tower_simulator.systems.route_weights import CongestionWeights
+from tower_simulator.systems.time_manager import TimeManager
+from tower_simulator.systems.transit_graph import TransitGraph
+from tests.test_transit_graph import transit_room
+
+
+class TestCongestionWeights(unittest.TestCase):
+    """Test batched re-weighting of two parallel elevator banks"""
+
+    def setUp(self):
+        self.clock = TimeManager(start_time=0)
+        self.graph = TransitGraph()
+        self.graph.add_room(1, transit_room('elevator_shaft', 100, 0, 21))
+        self.graph.add_room(2, transit_room('elevator_shaft', 110, 0, 21))
+        self.table = RouteTable(self.graph)
+        self.weights = CongestionWeights(self.clock, self.graph, self.table)
+
+    def first_link(self) -> int:
+        return int(self.table.route(0, 20)[2][0])
+
+    def test_congested_bank_is_avoided(self):
+        """Long waits at the first bank move every route between the two banks' levels to the second"""
+        self.assertEqual(self.first_link(), 1)
+        for _ in range(10):
+            self.weights.record_wait(1, 90.0)
+        self.assertEqual(self.first_link(), 1)  # Nothing changes before the batch refresh
+
+        self.clock.advance(CONGESTION_REFRESH_SECONDS)
+        print(f"\n[TEST] Refresh {self.weights.refreshes}: {self.weights.routes_changed} routes changed, "
+              f"wait {self.graph.links[1].expected_wait} s")
+        self.assertEqual(self.weights.refreshes, 1)
+        self.assertEqual(self.graph.links[1].expected_wait, 90.0)
+        self.assertEqual(self.first_link(), 2)
+        self.assertEqual(self.weights.routes_changed, 21 * 20)
+
+    def test_hysteresis_ignores_noise(self):
+        """Waits a little off the current weight change nothing"""
+        self.weights.record_waits(np.array([1, 1, 2]), np.array([22.0, 24.0, 16.0]))
+        self.assertEqual(self.weights.refresh(), 0)
+        self.assertEqual(self.weights.weight_updates, 0)
+        self.assertEqual(self.graph.links[1].expected_wait, 20.0)
+
+    def test_layout_edits_are_not_counted(self):
+        """Routes changed by placing transit are not counted as re-weighted"""
+        self.graph.add_room(3, transit_room('stairs', 120, 21))  # New levels 21-22
+        self.assertEqual(self.weights.refresh(), 0)
+        self.assertEqual(self.weights.routes_changed_total, 0)
+
+    def test_idle_bank_drifts_back(self):
+        """Once its samples leave the window a shaft returns to its placed wait and wins routes back"""
+        self.weights.record_wait(1, 90.0)
+        self.weights.refresh()
+        self.assertEqual(self.first_link(), 2)
+        for _ in range(CONGESTION_WINDOW_REFRESHES):
+            self.weights.refresh()
+        self.assertEqual(self.graph.links[1].expected_wait, 20.0)
+        self.assertEqual(self.first_link(), 1)
+        self.assertEqual(self.weights.routes_changed_total, 2 * 21 * 20)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Congestion Routing")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
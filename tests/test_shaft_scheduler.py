@@ -0,0 +1,113 @@
+"""
+Test suite for corridor scheduling of stacked elevator cars
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.systems.elevator_dispatch import ElevatorShaft, DISPATCH_CORRIDOR
+from tower_simulator.systems.elevator_harness import DispatchHarness, PassengerTrace
+from tower_simulator.systems.shaft_scheduler import CorridorScheduler
+from tests.test_elevator_harness import build_rooms
+
+
+class TestCorridorScheduler(unittest.TestCase):
+    """Test trip assignment with non-overlapping corridors"""
+
+    def setUp(self):
+        self.shaft = ElevatorShaft(0, 20, car_count=3, mode=DISPATCH_CORRIDOR)
+        self.scheduler = CorridorScheduler(self.shaft)
+        self.bottom, self.middle, self.top = self.shaft.cars
+
+    def assert_ordered(self):
+        corridors = [self.scheduler.corridor(car) for car in self.shaft.cars]
+        for lower, upper in zip(corridors, corridors[1:]):
+            self.assertLess(lower[1], upper[0])
+
+    def test_cars_parked_in_order(self):
+        """Stacked cars start spread out from the bottom to the top stop"""
+        self.assertEqual([car.position for car in self.shaft.cars], [0, 10, 20])
+        with self.assertRaises(ValueError):
+            CorridorScheduler(ElevatorShaft(0, 2, car_count=4))
+
+    def test_trip_goes_to_a_car_with_room(self):
+        """A trip is given to the car whose corridor can cover it without meeting a neighbour"""
+        car, moved = self.scheduler.assign(3, 12, capacity=21)
+        print(f"\n[TEST] Corridors: {[self.scheduler.corridor(c) for c in self.shaft.cars]}")
+        self.assertIs(car, self.middle)
+        self.assertEqual(moved, [])
+        self.assert_ordered()
+
+        # The bottom car cannot reach level 5 now that the middle car owns 3-12
+        car, _ = self.scheduler.assign(0, 5, capacity=21)
+        self.assertIsNone(car)
+        self.assert_ordered()
+
+    def test_idle_neighbour_makes_room(self):
+        """A parked car in the way is sent clear of the trip, which is then assigned"""
+        car, moved = self.scheduler.assign(0, 12, capacity=21)
+        self.assertIsNone(car)
+        self.assertEqual(moved, [self.middle])
+        self.assertEqual(self.middle.car_calls, 1 << 13)
+        self.assertIs(self.scheduler.claim[0], self.bottom)
+
+        self.shaft.arrive(self.middle, 13, 1)  # The middle car parks at 13
+        car, _ = self.scheduler.assign(0, 12, capacity=21)
+        self.assertIs(car, self.bottom)
+        self.assertIsNone(self.scheduler.claim)
+        self.assert_ordered()
+
+    def test_trips_longer_than_the_stack_allows(self):
+        """The bottom car can never reach the top two stops, so lobby-to-top is impossible"""
+        self.assertTrue(self.scheduler.can_serve(0, 18))
+        self.assertFalse(self.scheduler.can_serve(0, 19))
+
+    def test_batch_filter(self):
+        """The batch filter passes exactly the trips some car could take"""
+        self.scheduler.assign(3, 12, capacity=21)
+        lows, highs = np.array([1, 14, 0, 4]), np.array([2, 18, 5, 11])
+        fits = self.scheduler.fits(lows, highs, capacity=21)
+        self.assertEqual(fits.tolist(), [True, True, False, True])
+
+
+class TestStackedCarsInHarness(unittest.TestCase):
+    """Test stacked cars carrying real traffic"""
+
+    def test_cars_never_pass(self):
+        """With dense two-way traffic the cars never meet and every possible trip is made"""
+        rng = np.random.default_rng(42)
+        origin = rng.integers(0, 11, 400)
+        destination = (origin + rng.integers(1, 11, 400)) % 11
+        trace = PassengerTrace(np.sort(rng.integers(0, 1800, 400)), origin, destination)
+        harness = DispatchHarness(build_rooms()[:2], cars_per_shaft=3, modes=DISPATCH_CORRIDOR)
+
+        crossings = []
+        on_doors_open = harness._on_doors_open
+
+        def check_order(shaft, car):
+            levels = [harness.motion.car_level(shaft, c) for c in shaft.cars]
+            crossings.extend(1 for lower, upper in zip(levels, levels[1:]) if lower >= upper)
+            return on_doors_open(shaft, car)
+
+        harness._on_doors_open = check_order
+        report = harness.run(trace)
+        scheduler = next(iter(harness.schedulers.values()))
+
+        print(f"\n[TEST] Stacked report: served {report['served']}, unroutable {report['unroutable']}, "
+              f"avg wait {report['avg_wait_s']} s, yields {scheduler.yields}")
+        self.assertEqual(crossings, [])
+        self.assertEqual(report['served'] + report['unroutable'], len(trace))
+        self.assertEqual(report['unroutable'], int(np.count_nonzero(np.abs(destination - origin) > 8)))
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Stacked Car Scheduling")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
@@ -0,0 +1,168 @@
+"""
+Test suite for the table-driven Sim behavioral state machine
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.entities.ecs import (
+    SimWorld, PROFILE_OFFICE_WORKER, PROFILE_HOTEL_GUEST, PROFILE_SHOPPER,
+    BEHAVIOR_OUTSIDE, BEHAVIOR_HEADING_IN, BEHAVIOR_IN_ROOM, BEHAVIOR_HEADING_OUT,
+    BEHAVIOR_VISITING, BEHAVIOR_HEADING_BACK, BEHAVIOR_LEAVING, SIM_STATE_IDLE, SIM_STATE_WALKING,
+)
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.systems.sim_behavior import (
+    BehaviorStateMachine, compile_transition_table, BEHAVIOR_COUNT, BEHAVIOR_RULES, HEADING_STATES,
+    SIM_EVENT_ENTER, SIM_EVENT_VISIT, SIM_EVENT_RETURN, SIM_EVENT_LEAVE, SIM_EVENT_ARRIVED, SIM_EVENT_STRESSED,
+    ACTION_NONE, ACTION_TRAVEL, ACTION_DESPAWN, ACTION_INVALID,
+)
+from tower_simulator.systems.sim_systems import SchedulingSystem
+from tower_simulator.world.coordinate import Coordinate
+
+
+class TestTransitionTable(unittest.TestCase):
+    """Test the compiled transition tables"""
+
+    def setUp(self):
+        self.machine = BehaviorStateMachine()
+
+    def step(self, profile: int, state: int, event: int) -> tuple[int, int]:
+        """Single transition through the vectorized lookup"""
+        next_state, action = self.machine.transition(np.array([profile]), np.array([state]), event)
+        return int(next_state[0]), int(action[0])
+
+    def test_tables_are_uint8(self):
+        """Both tables are compact uint8 arrays"""
+        next_state, action = compile_transition_table()
+        self.assertEqual(next_state.dtype, np.uint8)
+        self.assertEqual(action.dtype, np.uint8)
+        self.assertEqual(next_state.shape[1], BEHAVIOR_COUNT)
+
+    def test_office_worker_day(self):
+        """An office worker's day walks the expected chain of states"""
+        state = BEHAVIOR_OUTSIDE
+        visited = [state]
+        for event in (SIM_EVENT_ENTER, SIM_EVENT_ARRIVED, SIM_EVENT_VISIT, SIM_EVENT_ARRIVED,
+                      SIM_EVENT_RETURN, SIM_EVENT_ARRIVED, SIM_EVENT_LEAVE, SIM_EVENT_ARRIVED):
+            state, action = self.step(PROFILE_OFFICE_WORKER, state, event)
+            self.assertNotEqual(action, ACTION_INVALID)
+            visited.append(state)
+
+        print(f"\n[TEST] Office worker states: {visited}")
+        self.assertEqual(visited, [BEHAVIOR_OUTSIDE, BEHAVIOR_HEADING_IN, BEHAVIOR_IN_ROOM,
+                                   BEHAVIOR_HEADING_OUT, BEHAVIOR_VISITING, BEHAVIOR_HEADING_BACK,
+                                   BEHAVIOR_IN_ROOM, BEHAVIOR_LEAVING, BEHAVIOR_OUTSIDE])
+        self.assertEqual(action, ACTION_DESPAWN)
+
+    def test_invalid_event_keeps_state(self):
+        """Events that do not apply leave the state unchanged and are counted"""
+        state, action = self.step(PROFILE_HOTEL_GUEST, BEHAVIOR_IN_ROOM, SIM_EVENT_VISIT)
+        self.assertEqual(state, BEHAVIOR_IN_ROOM)
+        self.assertEqual(action, ACTION_INVALID)
+        self.assertEqual(self.machine.invalid_total, 1)
+
+    def test_stress_reaction(self):
+        """Stressed Sims turn back to the lobby; stressed on the way out, they give up and leave"""
+        self.assertEqual(self.step(PROFILE_SHOPPER, BEHAVIOR_HEADING_OUT, SIM_EVENT_STRESSED),
+                         (BEHAVIOR_LEAVING, ACTION_TRAVEL))
+        self.assertEqual(self.step(PROFILE_OFFICE_WORKER, BEHAVIOR_HEADING_IN, SIM_EVENT_STRESSED),
+                         (BEHAVIOR_LEAVING, ACTION_TRAVEL))
+        self.assertEqual(self.step(PROFILE_HOTEL_GUEST, BEHAVIOR_LEAVING, SIM_EVENT_STRESSED),
+                         (BEHAVIOR_OUTSIDE, ACTION_DESPAWN))
+        # Sims settled in a room are not waiting for anything
+        self.assertEqual(self.step(PROFILE_OFFICE_WORKER, BEHAVIOR_IN_ROOM, SIM_EVENT_STRESSED),
+                         (BEHAVIOR_IN_ROOM, ACTION_NONE))
+
+    def test_every_journey_can_end(self):
+        """Every journey state a profile can reach has a way out on LEAVE and on STRESSED"""
+        next_state, action = compile_transition_table()
+        for profile, rules in BEHAVIOR_RULES.items():
+            reachable = {target for _, _, target, _ in rules}
+            for state in sorted(reachable & set(HEADING_STATES)):
+                if state != BEHAVIOR_LEAVING:
+                    self.assertEqual(next_state[profile, state, SIM_EVENT_LEAVE], BEHAVIOR_LEAVING)
+                    self.assertEqual(action[profile, state, SIM_EVENT_LEAVE], ACTION_TRAVEL)
+                self.assertIn(action[profile, state, SIM_EVENT_STRESSED], (ACTION_TRAVEL, ACTION_DESPAWN),
+                              (profile, state))
+
+    def test_behavior_is_data(self):
+        """A custom rule set changes behavior without new code"""
+        machine = BehaviorStateMachine({
+            PROFILE_HOTEL_GUEST: [(BEHAVIOR_IN_ROOM, SIM_EVENT_VISIT, BEHAVIOR_HEADING_OUT, ACTION_TRAVEL)],
+        })
+        next_state, action = machine.transition(np.array([PROFILE_HOTEL_GUEST]),
+                                                np.array([BEHAVIOR_IN_ROOM]), SIM_EVENT_VISIT)
+        self.assertEqual((next_state[0], action[0]), (BEHAVIOR_HEADING_OUT, ACTION_TRAVEL))
+
+    def test_mixed_batch(self):
+        """One lookup handles a batch of different profiles, states and events"""
+        profile = np.array([PROFILE_OFFICE_WORKER, PROFILE_SHOPPER, PROFILE_HOTEL_GUEST], dtype=np.uint8)
+        state = np.array([BEHAVIOR_IN_ROOM, BEHAVIOR_OUTSIDE, BEHAVIOR_LEAVING], dtype=np.uint8)
+        event = np.array([SIM_EVENT_LEAVE, SIM_EVENT_ENTER, SIM_EVENT_ARRIVED], dtype=np.uint8)
+        next_state, action = self.machine.transition(profile, state, event)
+        np.testing.assert_array_equal(next_state, [BEHAVIOR_LEAVING, BEHAVIOR_HEADING_OUT, BEHAVIOR_OUTSIDE])
+        np.testing.assert_array_equal(action, [ACTION_TRAVEL, ACTION_TRAVEL, ACTION_DESPAWN])
+
+
+class TestSchedulingActions(unittest.TestCase):
+    """Test that SchedulingSystem carries out state machine actions"""
+
+    def setUp(self):
+        self.table = RoomTable([
+            RoomEntity(Coordinate(100, 0), 4, 1, 'lobby', 0, (0, 0, 0)),
+            RoomEntity(Coordinate(20, 10), 12, 1, 'retail_shop', 0, (0, 0, 0)),
+        ])
+        self.world = SimWorld(capacity=16)
+        self.scheduling = SchedulingSystem(self.world, self.table)
+
+    def test_shopper_visit_and_give_up(self):
+        """A shopper travels to the shop and leaves for the lobby when stressed"""
+        ids = self.world.spawn(2, floor=0, segment=50.0, profile=PROFILE_SHOPPER)
+        self.scheduling.fire(ids, SIM_EVENT_ENTER, dest_rooms=1)
+        self.assertTrue(np.all(self.world.state[ids] == SIM_STATE_WALKING))
+        self.assertTrue(np.all(self.world.target_floor[ids] == 10))
+
+        self.scheduling.on_stressed(ids[:1])
+        self.assertEqual(self.world.behavior[ids[0]], BEHAVIOR_LEAVING)
+        self.assertEqual(self.world.target_floor[ids[0]], 0)
+
+        # Reaching the lobby while leaving removes the Sim from the tower
+        self.world.state[ids[0]] = SIM_STATE_IDLE
+        self.scheduling.update()
+        self.assertFalse(self.world.active[ids[0]])
+        self.assertEqual(self.world.behavior[ids[1]], BEHAVIOR_HEADING_OUT)
+
+    def test_stressed_worker_leaves(self):
+        """A worker stuck on the way in turns back; stuck again on the way out, it is despawned"""
+        ids = self.world.spawn(2, floor=0, segment=50.0, profile=PROFILE_OFFICE_WORKER, work_room=1)
+        self.scheduling.fire(ids, SIM_EVENT_ENTER, dest_rooms=1)
+        self.world.floor[ids[1]] = 5  # Set down at a transfer level
+
+        self.scheduling.on_stressed(ids)
+        print(f"\n[TEST] Stressed worker behaviors: {self.world.behavior[ids].tolist()}")
+        self.assertTrue(np.all(self.world.behavior[ids] == BEHAVIOR_LEAVING))
+        self.assertTrue(np.all(self.world.target_floor[ids] == 0))
+
+        # Back at the lobby: gone
+        self.world.state[ids[0]] = SIM_STATE_IDLE
+        self.scheduling.update()
+        self.assertFalse(self.world.active[ids[0]])
+        # No way down either: gives up and walks out
+        self.scheduling.on_stressed(ids[1:])
+        self.assertFalse(self.world.active[ids[1]])
+        self.assertEqual(self.scheduling.departed_total, 2)
+        self.assertEqual(self.scheduling.behavior.invalid_total, 0)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Sim Behavioral State Machine")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
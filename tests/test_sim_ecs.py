@@ -0,0 +1,255 @@
+"""
+Test suite for the Sim ECS (component arrays and vectorized systems)
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import STRESS_LEVEL_PINK, STRESS_LEVEL_RED
+from tower_simulator.entities.ecs import (
+    SimWorld, NO_ROOM, SIM_STATE_IDLE, SIM_STATE_WALKING, SIM_STATE_WAITING, SIM_STATE_RIDING,
+    STRESS_BLACK, STRESS_PINK, STRESS_RED,
+)
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.systems.sim_systems import MovementSystem, StressSystem, SchedulingSystem
+from tower_simulator.world.coordinate import Coordinate
+
+
+class TestSimWorld(unittest.TestCase):
+    """Test component storage"""
+
+    def test_spawn_and_despawn(self):
+        """Spawning fills free slots in id order; despawning frees them"""
+        world = SimWorld(capacity=10)
+        ids = world.spawn(4, floor=0, segment=[1, 2, 3, 4], work_room=7)
+        self.assertEqual(list(ids), [0, 1, 2, 3])
+        self.assertEqual(world.active_count, 4)
+        self.assertEqual(list(world.work_room[ids]), [7] * 4)
+        self.assertEqual(world.home_room[0], NO_ROOM)
+
+        world.despawn(ids[:2])
+        self.assertEqual(world.active_count, 2)
+        self.assertEqual(list(world.spawn(1, floor=0, segment=0)), [0])
+
+    def test_spawn_beyond_fixed_capacity_rejected(self):
+        """A fixed-size pool (growth factor 1.0) rejects spawns beyond its capacity"""
+        world = SimWorld(capacity=3, growth_factor=1.0)
+        with self.assertRaises(ValueError):
+            world.spawn(4, floor=0, segment=0)
+
+    def test_components_are_preallocated_arrays(self):
+        """Components are fixed-size NumPy arrays with compact dtypes"""
+        world = SimWorld(capacity=100)
+        self.assertEqual(world.state.dtype, np.uint8)
+        self.assertEqual(world.floor.shape, (100,))
+        self.assertEqual(world.stress.dtype, np.float32)
+
+
+class TestSimPool(unittest.TestCase):
+    """Test free-list slot recycling and pool statistics"""
+
+    def test_despawned_slots_are_recycled_first(self):
+        """Released slots are reused (LIFO) before untouched ones"""
+        world = SimWorld(capacity=10)
+        ids = world.spawn(5, floor=0, segment=0)
+        world.despawn([1, 3])
+        reused = world.spawn(3, floor=0, segment=0)
+        self.assertEqual(sorted(reused[:2]), [1, 3])
+        self.assertEqual(reused[2], 5)
+
+        stats = world.stats()
+        self.assertEqual(stats.recycled_total, 2)
+        self.assertEqual(stats.spawned_total, 8)
+        self.assertAlmostEqual(stats.recycle_rate, 0.25)
+
+    def test_daily_commuters_reuse_slots(self):
+        """A repeated arrive/leave cycle never grows the pool past its peak"""
+        world = SimWorld(capacity=600)
+        for day in range(5):
+            ids = world.spawn(600, floor=0, segment=100.0, work_room=1)
+            world.despawn(ids)
+
+        stats = world.stats()
+        print(f"\n[TEST] Pool after 5 days: {stats}, recycle rate {stats.recycle_rate:.0%}")
+        self.assertEqual(stats.high_water, 600)
+        self.assertEqual(stats.growth_count, 0)
+        self.assertAlmostEqual(stats.recycle_rate, 0.8)
+        self.assertEqual(world.active_count, 0)
+
+    def test_pool_grows_when_full(self):
+        """A full pool grows by its growth factor and keeps existing Sims"""
+        world = SimWorld(capacity=4, growth_factor=2.0)
+        first = world.spawn(4, floor=3, segment=7.0)
+        more = world.spawn(2, floor=5, segment=1.0)
+        self.assertEqual(world.capacity, 8)
+        self.assertEqual(list(more), [4, 5])
+        self.assertTrue(np.all(world.floor[first] == 3))
+        self.assertEqual(world.home_room[7], NO_ROOM)
+        self.assertEqual(world.stats().growth_count, 1)
+
+    def test_growth_capped_by_max_capacity(self):
+        """Growth stops at max_capacity"""
+        world = SimWorld(capacity=4, growth_factor=4.0, max_capacity=6)
+        world.spawn(6, floor=0, segment=0)
+        self.assertEqual(world.capacity, 6)
+        with self.assertRaises(ValueError):
+            world.spawn(1, floor=0, segment=0)
+
+    def test_reserve_preallocates_for_peak(self):
+        """reserve() grows ahead of time so the peak spawn does not reallocate"""
+        world = SimWorld(capacity=10)
+        world.reserve(100)
+        growths = world.growth_count
+        world.spawn(100, floor=0, segment=0)
+        self.assertEqual(world.growth_count, growths)
+
+    def test_compact_packs_the_active_span(self):
+        """Compacting moves Sims into the lowest slots in order, except pinned ones"""
+        world = SimWorld(capacity=10)
+        ids = world.spawn(10, floor=np.arange(10), segment=0)
+        world.despawn(ids[[0, 2, 3, 5, 6, 8]])
+        self.assertEqual(world.extent, 10)
+        pinned = np.zeros(world.capacity, dtype=bool)
+        pinned[4] = True
+        old, new = world.compact(pinned)
+        print(f"\n[TEST] Moved {old.tolist()} -> {new.tolist()}, extent {world.extent}")
+        self.assertEqual((old.tolist(), new.tolist()), ([1, 7, 9], [0, 1, 2]))
+        self.assertEqual(world.floor[world.active_ids()].tolist(), [1, 7, 9, 4])
+        self.assertEqual(world.extent, 5)
+        self.assertEqual(world.spawn(1, floor=0, segment=0).tolist(), [3])  # Lowest free slot first
+
+    def test_double_despawn_is_harmless(self):
+        """Despawning an inactive Sim does not corrupt the free-list"""
+        world = SimWorld(capacity=3, growth_factor=1.0)
+        ids = world.spawn(2, floor=0, segment=0)
+        world.despawn(ids)
+        world.despawn(ids)
+        self.assertEqual(world.free_count, 3)
+        self.assertEqual(len(set(world.spawn(3, floor=0, segment=0))), 3)
+
+
+class TestSimSystems(unittest.TestCase):
+    """Test movement, stress and scheduling systems"""
+
+    def setUp(self):
+        """Set up a world with a small room table"""
+        self.world = SimWorld(capacity=50)
+        rooms = [
+            RoomEntity(Coordinate(100, 0), 4, 1, 'lobby', 0, (0, 0, 0)),
+            RoomEntity(Coordinate(20, 10), 9, 1, 'office', 0, (0, 0, 0)),
+        ]
+        self.table = RoomTable(rooms)
+
+    def test_walkers_reach_target_segment(self):
+        """Walkers move at walk speed and go idle on arrival on the target floor"""
+        ids = self.world.spawn(2, floor=3, segment=0.0)
+        self.world.target_floor[ids] = 3
+        self.world.target_segment[ids] = [3.0, 30.0]
+        self.world.state[ids] = SIM_STATE_WALKING
+
+        movement = MovementSystem(walk_speed=1.5)
+        for _ in range(2):
+            movement.update(self.world, 1)
+        self.assertEqual(self.world.state[0], SIM_STATE_IDLE)
+        self.assertAlmostEqual(float(self.world.segment[0]), 3.0)
+        self.assertEqual(self.world.state[1], SIM_STATE_WALKING)
+        self.assertAlmostEqual(float(self.world.segment[1]), 3.0)
+
+    def test_walkers_needing_another_floor_start_waiting(self):
+        """Walkers whose target is on another level wait for transit"""
+        ids = self.world.spawn(1, floor=0, segment=10.0)
+        self.world.target_floor[ids] = 5
+        self.world.target_segment[ids] = 10.0
+        self.world.state[ids] = SIM_STATE_WALKING
+        MovementSystem().update(self.world, 1)
+        self.assertEqual(self.world.state[0], SIM_STATE_WAITING)
+
+    def test_stress_accumulates_only_while_waiting(self):
+        """Only waiting Sims gain stress"""
+        ids = self.world.spawn(3, floor=0, segment=0.0)
+        self.world.state[ids] = [SIM_STATE_IDLE, SIM_STATE_WAITING, SIM_STATE_RIDING]
+        stress = StressSystem()
+        for _ in range(30):
+            stress.update(self.world, 1)
+        self.assertEqual(list(self.world.stress[ids]), [0.0, 30.0, 0.0])
+
+    def test_threshold_crossings_emitted_once(self):
+        """Pink and red crossings are reported once, on the tick they happen"""
+        ids = self.world.spawn(2, floor=0, segment=0.0, work_room=1)
+        self.world.state[ids[0]] = SIM_STATE_WAITING
+        stress = StressSystem()
+        pink_ticks, red_ticks = [], []
+        for tick in range(1, STRESS_LEVEL_RED + 10):
+            crossings = stress.update(self.world, 1)
+            if len(crossings.pink):
+                pink_ticks.append((tick, list(crossings.pink)))
+            if len(crossings.red):
+                red_ticks.append((tick, list(crossings.red)))
+
+        print(f"\n[TEST] Stress crossings: pink={pink_ticks} red={red_ticks}")
+        self.assertEqual(pink_ticks, [(STRESS_LEVEL_PINK, [0])])
+        self.assertEqual(red_ticks, [(STRESS_LEVEL_RED, [0])])
+        self.assertEqual(stress.red_counts_by_room[1], 1)
+
+    def test_stress_level_tracks_color_state(self):
+        """The stress_level component follows black -> pink -> red"""
+        ids = self.world.spawn(3, floor=0, segment=0.0)
+        self.world.state[ids] = SIM_STATE_WAITING
+        self.world.stress[ids] = [0.0, STRESS_LEVEL_PINK, STRESS_LEVEL_RED]
+        StressSystem().update(self.world, 1)
+        self.assertEqual(list(self.world.stress_level[ids]), [STRESS_BLACK, STRESS_PINK, STRESS_RED])
+
+    def test_large_step_crosses_both_thresholds(self):
+        """A single big step can cross pink and red together"""
+        ids = self.world.spawn(1, floor=0, segment=0.0)
+        self.world.state[ids] = SIM_STATE_WAITING
+        crossings = StressSystem().update(self.world, STRESS_LEVEL_RED)
+        self.assertEqual(list(crossings.pink), [0])
+        self.assertEqual(list(crossings.red), [0])
+
+    def test_ride_counts_trip_and_arrives(self):
+        """Riding takes seconds_per_level per level and uses one trip leg"""
+        ids = self.world.spawn(1, floor=0, segment=0.0)
+        self.world.target_floor[ids] = 5
+        movement = MovementSystem(seconds_per_level=2.0)
+        movement.start_ride(self.world, ids)
+        self.assertEqual(self.world.trips[0], 1)
+        for _ in range(9):
+            movement.update(self.world, 1)
+        self.assertEqual(self.world.state[0], SIM_STATE_RIDING)
+        movement.update(self.world, 1)
+        self.assertEqual(self.world.state[0], SIM_STATE_IDLE)
+        self.assertEqual(self.world.floor[0], 5)
+
+    def test_work_start_sends_workers_to_offices(self):
+        """At work start idle office workers walk towards their office"""
+        workers = self.world.spawn(6, floor=0, segment=100.0, work_room=1)
+        visitors = self.world.spawn(2, floor=0, segment=100.0)
+        scheduling = SchedulingSystem(self.world, self.table)
+        scheduling.on_work_start()
+
+        self.assertTrue(np.all(self.world.state[workers] == SIM_STATE_WALKING))
+        self.assertTrue(np.all(self.world.target_floor[workers] == 10))
+        self.assertTrue(np.all(self.world.target_segment[workers] == 24.5))
+        self.assertTrue(np.all(self.world.state[visitors] == SIM_STATE_IDLE))
+
+    def test_work_end_sends_commuters_to_lobby(self):
+        """At work end commuters without a home head to the lobby level"""
+        ids = self.world.spawn(3, floor=10, segment=24.5, work_room=1)
+        scheduling = SchedulingSystem(self.world, self.table)
+        scheduling.on_work_end()
+        self.assertTrue(np.all(self.world.target_floor[ids] == 0))
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Sim ECS")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
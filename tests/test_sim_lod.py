@@ -0,0 +1,240 @@
+"""
+Test suite for simulation level of detail (aggregate flow model)
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import GRID_MIN_LEVEL
+from tower_simulator.entities.ecs import (
+    SimWorld, COMPONENTS, HELD_BY_CAR, SIM_STATE_IDLE, SIM_STATE_WALKING, SIM_STATE_WAITING, SIM_STATE_RIDING,
+)
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.systems.sim_systems import MovementSystem, StressSystem, SchedulingSystem
+from tower_simulator.systems.sim_lod import AggregateFlowModel, SimLevelOfDetail
+
+
+def build_world(count: int, seed: int = 7) -> SimWorld:
+    """Sims spread over 20 levels in a mix of states"""
+    rng = np.random.default_rng(seed)
+    world = SimWorld(capacity=count)
+    ids = world.spawn(count, floor=rng.integers(0, 20, count), segment=rng.uniform(0, 300, count),
+                      home_room=rng.integers(0, 5, count), work_room=rng.integers(0, 5, count))
+    world.target_floor[ids] = rng.integers(0, 20, count)
+    world.target_segment[ids] = rng.uniform(0, 300, count).astype(np.float32)
+    world.state[ids] = rng.choice([SIM_STATE_IDLE, SIM_STATE_WALKING, SIM_STATE_WAITING, SIM_STATE_RIDING],
+                                  count)
+    world.stress[ids] = np.where(world.state[ids] == SIM_STATE_WAITING,
+                                 rng.integers(0, 150, count), 0).astype(np.float32)
+    world.ride_remaining[ids] = rng.integers(1, 90, count).astype(np.float32)
+    return world
+
+
+class TestAggregateFlowModel(unittest.TestCase):
+    """Bucketed advance must match tick-by-tick simulation"""
+
+    def test_matches_individual_simulation(self):
+        """One 90-second bucket lands Sims where 90 individual ticks do"""
+        individual, aggregate = build_world(500), build_world(500)
+        movement, stress = MovementSystem(), StressSystem(room_count=5)
+        for _ in range(90):
+            movement.update(individual, 1)
+            stress.update(individual, 1)
+
+        model = AggregateFlowModel(stress_system=StressSystem(room_count=5))
+        model.advance(aggregate, 90)
+
+        print(f"\n[TEST] Aggregate vs individual after 90 s")
+        print(f"  Red crossings: individual={stress.red_total}, aggregate={model.stress_system.red_total}")
+        for name in ('floor', 'state', 'stress_level', 'target_floor'):
+            np.testing.assert_array_equal(getattr(aggregate, name), getattr(individual, name), name)
+        np.testing.assert_allclose(aggregate.segment, individual.segment, atol=1e-2)
+        np.testing.assert_allclose(aggregate.stress, individual.stress)
+        self.assertEqual(model.stress_system.pink_total, stress.pink_total)
+        self.assertEqual(model.stress_system.red_total, stress.red_total)
+        np.testing.assert_array_equal(model.stress_system.red_counts_by_room, stress.red_counts_by_room)
+
+    def test_timed_legs_match_individual_simulation(self):
+        """Waits that come due and rides that land mid-bucket match tick-by-tick simulation"""
+        def planned_world() -> SimWorld:
+            world = build_world(300, seed=11)
+            ids = world.active_ids()
+            waiting = ids[world.state[ids] == SIM_STATE_WAITING]
+            world.leg_link[waiting] = 0
+            world.leg_floor[waiting] = (world.floor[waiting] + 1) % 20  # Often short of the target
+            world.leg_wait[waiting] = np.arange(len(waiting)) % 70
+            return world
+
+        individual, aggregate = planned_world(), planned_world()
+        movement, stress = MovementSystem(), StressSystem(room_count=5)
+        for _ in range(90):
+            movement.update(individual, 1)
+            stress.update(individual, 1)
+        model = AggregateFlowModel(stress_system=StressSystem(room_count=5))
+        model.advance(aggregate, 90)
+
+        for name in ('floor', 'state', 'stress_level', 'trips', 'leg_link'):
+            np.testing.assert_array_equal(getattr(aggregate, name), getattr(individual, name), name)
+        np.testing.assert_allclose(aggregate.stress, individual.stress)
+        np.testing.assert_allclose(aggregate.ride_remaining, individual.ride_remaining)
+        self.assertEqual(model.stress_system.red_total, stress.red_total)
+
+    def test_flows_counted_per_level(self):
+        """Finished rides are recorded as departures and arrivals per level"""
+        world = SimWorld(capacity=10)
+        ids = world.spawn(4, floor=2, segment=10.0)
+        world.target_floor[ids] = 6
+        world.ride_remaining[ids] = 8.0
+        world.state[ids] = SIM_STATE_RIDING
+
+        model = AggregateFlowModel()
+        model.advance(world, 10)
+        flows = model.flows()
+        self.assertEqual(flows.departed[2 - GRID_MIN_LEVEL], 4)
+        self.assertEqual(flows.arrived[6 - GRID_MIN_LEVEL], 4)
+        self.assertTrue(np.all(world.floor[ids] == 6))
+
+    def test_flows_counted_per_link(self):
+        """Timed legs are counted into their link where they board and out of it where they land"""
+        world = SimWorld(capacity=10)
+        ids = world.spawn(5, floor=2, segment=10.0)
+        world.target_floor[ids] = 9
+        world.state[ids] = SIM_STATE_WAITING
+        world.leg_link[ids] = [7, 7, 7, 8, 8]
+        world.leg_floor[ids] = [6, 6, 9, 9, 9]
+        world.leg_wait[ids] = 5.0
+
+        model = AggregateFlowModel()
+        model.advance(world, 30)
+        print(f"\n[TEST] Link 7 flows: {model.link_flows(7)}")
+        self.assertEqual(model.link_flows(7), ({2: 3}, {6: 2, 9: 1}))
+        self.assertEqual(model.link_flows(8), ({2: 2}, {9: 2}))
+        self.assertEqual(model.link_flows(9), ({}, {}))
+
+    def test_flow_buckets_roll(self):
+        """A full bucket moves counting on to a fresh bucket"""
+        world = SimWorld(capacity=10)
+        ids = world.spawn(1, floor=1, segment=0.0)
+        world.target_floor[ids] = 3
+        world.target_segment[ids] = 1.0
+        world.state[ids] = SIM_STATE_WALKING
+
+        model = AggregateFlowModel(bucket_seconds=60)
+        model.advance(world, 60)
+        self.assertEqual(model.flows(1).queued[1 - GRID_MIN_LEVEL], 1)
+        self.assertEqual(model.flows().queued.sum(), 0)
+
+
+class TestSimLevelOfDetail(unittest.TestCase):
+    """Conversion between individual and aggregate fidelity"""
+
+    def test_round_trip_is_lossless(self):
+        """Hiding and revealing levels preserves every component"""
+        world = build_world(200)
+        before = {name: np.sort(getattr(world, name)[world.active_ids()]) for name in COMPONENTS}
+        lod = SimLevelOfDetail(world)
+
+        lod.set_visible_levels(0, 5)
+        self.assertEqual(lod.population, 200)
+        self.assertTrue(np.all(world.floor[world.active_ids()] <= 5))
+        lod.set_visible_levels(0, 19)
+
+        print(f"\n[TEST] LOD round trip: {lod.demoted_total} demoted, {lod.promoted_total} promoted")
+        self.assertEqual(lod.dormant.active_count, 0)
+        for name in COMPONENTS:
+            np.testing.assert_array_equal(np.sort(getattr(world, name)[world.active_ids()]), before[name], name)
+
+    def test_lod_matches_full_agent_statistics(self):
+        """Stress distribution with most levels off-screen equals the full-agent run"""
+        full, mixed = build_world(1000), build_world(1000)
+        movement = MovementSystem()
+        full_stress, mixed_stress = StressSystem(), StressSystem()
+        lod = SimLevelOfDetail(mixed, mixed_stress)
+        lod.set_visible_levels(8, 11)
+
+        for _ in range(150):
+            movement.update(full, 1)
+            full_stress.update(full, 1)
+            movement.update(mixed, 1)
+            mixed_stress.update(mixed, 1)
+            lod.update(1)
+        lod.flush()
+
+        full_lod = SimLevelOfDetail(full)
+        np.testing.assert_array_equal(lod.stress_distribution(), full_lod.stress_distribution())
+        np.testing.assert_array_equal(lod.population_by_level(), full_lod.population_by_level())
+        self.assertEqual(mixed_stress.red_total, full_stress.red_total)
+
+    def test_sims_joining_mid_bucket(self):
+        """Sims that start a journey or are demoted partway through a bucket only advance from then on"""
+        def run(off_screen: bool) -> np.ndarray:
+            world = SimWorld(capacity=10)
+            movement, stress = MovementSystem(), StressSystem()
+            lod = SimLevelOfDetail(world, stress)
+            lod.set_visible_levels(0, 5 if off_screen else 40)
+            world.spawn(2, floor=10, segment=50.0)
+            rider = world.spawn(1, floor=1, segment=50.0)
+            world.target_floor[rider] = 30
+            world.leg_link[rider] = 0
+            movement.start_ride(world, rider, np.array([10]))  # Lands on the 18th tick, short of its target
+            lod.update(0)  # The idle Sims go dormant straight away
+
+            idle_world = lod.dormant if off_screen else world
+            scheduling = SchedulingSystem(idle_world, RoomTable([]), journey_callback=lod.mark_joined)
+            for tick in range(60):
+                if tick == 29:
+                    ids = idle_world.active_ids()
+                    scheduling.send_to_level(ids[idle_world.state[ids] == SIM_STATE_IDLE], 20)
+                movement.update(world, 1)
+                stress.update(world, 1)
+                lod.update(1)
+            self.assertEqual(lod.demoted_total, 3 if off_screen else 0)
+            return np.sort(idle_world.stress[idle_world.active_ids()])
+
+        individual, aggregate = run(off_screen=False), run(off_screen=True)
+        print(f"\n[TEST] Stress after one bucket: individual {individual.tolist()}, aggregate {aggregate.tolist()}")
+        np.testing.assert_array_equal(aggregate, individual)
+        np.testing.assert_array_equal(individual, [31, 31, 43])
+
+    def test_on_screen_world_is_compacted(self):
+        """Demoting most Sims packs the rest into a short span; Sims held by cars keep their slots"""
+        world = build_world(1000)
+        held = np.flatnonzero((world.state == SIM_STATE_WAITING) & (world.floor <= 3))[-1]
+        world.leg_wait[held] = HELD_BY_CAR
+        lod = SimLevelOfDetail(world)
+        lod.set_visible_levels(0, 3)
+        print(f"\n[TEST] {world.active_count} on screen in a span of {world.extent}")
+        self.assertEqual(world.compactions, 1)
+        self.assertLessEqual(world.extent, held + 1)
+        self.assertEqual(world.leg_wait[held], HELD_BY_CAR)
+        self.assertEqual(np.count_nonzero(world.active[:world.active_count]), world.active_count - 1)
+        self.assertEqual(lod.population, 1000)
+
+    def test_riders_landing_off_screen_are_demoted(self):
+        """A Sim riding to a hidden level joins the aggregate model on arrival"""
+        world = SimWorld(capacity=10)
+        movement = MovementSystem()
+        lod = SimLevelOfDetail(world)
+        lod.set_visible_levels(0, 5)
+        ids = world.spawn(1, floor=1, segment=0.0)
+        world.target_floor[ids] = 30
+        movement.start_ride(world, ids)
+
+        for _ in range(int(world.ride_remaining[ids[0]])):
+            movement.update(world, 1)
+            lod.update(1)
+        self.assertEqual(world.active_count, 0)
+        self.assertEqual(lod.dormant.active_count, 1)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Simulation Level of Detail")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
@@ -0,0 +1,282 @@
+"""
+Test suite for Sim transit legs (routing, elevator boarding and timed legs)
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.entities.ecs import (
+    SimWorld, NO_LEG, NO_ROUTE, SIM_STATE_IDLE, SIM_STATE_WALKING, SIM_STATE_WAITING, SIM_STATE_RIDING,
+)
+from tower_simulator.systems.elevator_dispatch import ElevatorDispatcher, DISPATCH_DESTINATION, DISPATCH_CORRIDOR
+from tower_simulator.systems.elevator_motion import ElevatorMotion
+from tower_simulator.systems.route_table import RouteTable
+from tower_simulator.systems.route_weights import CongestionWeights
+from tower_simulator.systems.sim_systems import MovementSystem
+from tower_simulator.systems.sim_transit import TransitSystem
+from tower_simulator.systems.time_manager import TimeManager
+from tower_simulator.systems.transit_graph import TransitGraph
+from tower_simulator.systems.walkways import WalkingModel
+from tests.test_transit_graph import transit_room
+from tests.test_walkways import office
+
+
+def waiting_sims(world: SimWorld, count: int, floor: int, target_floor: int) -> np.ndarray:
+    """Sims standing at a floor waiting to get to another"""
+    ids = world.spawn(count, floor=floor, segment=50.0)
+    world.target_floor[ids] = target_floor
+    world.state[ids] = SIM_STATE_WAITING
+    return ids
+
+
+class TestTransitSystem(unittest.TestCase):
+    """Test that waiting Sims are routed, boarded and set down leg by leg"""
+
+    def setUp(self):
+        # A shaft 0-10 and stairs 10-11 on top of it
+        self.graph = TransitGraph()
+        self.graph.add_room(0, transit_room('elevator_shaft', 140, 0, 11))
+        self.graph.add_room(1, transit_room('stairs', 100, 10))
+        self.time_manager = TimeManager(start_time=0)
+        self.dispatcher = ElevatorDispatcher()
+        shaft = self.dispatcher.add_shaft(0, 10, car_count=1, segment=140)
+        self.motion = ElevatorMotion(self.time_manager, self.dispatcher)
+        self.world = SimWorld(capacity=32)
+        table = RouteTable(self.graph)
+        self.weights = CongestionWeights(self.time_manager, self.graph, table)
+        self.transit = TransitSystem(self.world, table, self.motion, weights=self.weights)
+        self.transit.add_shaft(0, shaft)
+        self.motion.on_doors_open = self.transit.on_doors_open
+        self.movement = MovementSystem()
+
+    def step(self, seconds: int):
+        """Run the transit and movement systems tick by tick"""
+        for _ in range(seconds):
+            self.transit.update()
+            self.movement.update(self.world, 1)
+            self.time_manager.advance(1)
+
+    def test_elevator_then_stairs(self):
+        """Sims ride the car to the transfer level, then take the stairs to their target"""
+        ids = waiting_sims(self.world, 5, 0, 11)
+        self.step(1)
+        self.assertTrue(np.all(self.world.leg_link[ids] == 0))
+        self.assertTrue(np.all(self.world.leg_floor[ids] == 10))
+
+        self.step(120)
+        print(f"\n[TEST] Boarded {self.transit.boarded}, set down {self.transit.set_down}, "
+              f"legs planned {self.transit.legs_planned}")
+        self.assertTrue(np.all(self.world.state[ids] == SIM_STATE_IDLE))
+        self.assertTrue(np.all(self.world.floor[ids] == 11))
+        self.assertTrue(np.all(self.world.trips[ids] == 2))
+        self.assertEqual(self.transit.boarded, 5)
+        self.assertEqual(self.transit.legs_planned, 10)  # One elevator and one stairs leg each
+
+    def test_boarding_waits_feed_route_weights(self):
+        """Every boarding reports how long the Sim queued for the shaft"""
+        ids = waiting_sims(self.world, 3, 0, 10)
+        self.step(5)
+        more = waiting_sims(self.world, 2, 5, 0)  # Called while the car is busy upstairs
+        self.step(200)
+        self.assertTrue(np.all(self.world.floor[np.concatenate((ids, more))] == [10, 10, 10, 0, 0]))
+        self.weights.refresh()
+        total = sum(wait for wait, _ in self.weights.history[0])
+        samples = sum(count for _, count in self.weights.history[0])
+        print(f"\n[TEST] {samples} boardings, average wait {total / samples:.1f} s")
+        self.assertEqual(samples, 5)
+        self.assertGreater(total, 0.0)
+
+    def test_stale_queue_entries_are_skipped(self):
+        """A Sim that left the queue is not boarded, even if its slot is reused"""
+        ids = waiting_sims(self.world, 2, 5, 0)
+        self.transit.update()
+        self.world.despawn(ids[:1])
+        reused = waiting_sims(self.world, 1, 5, 8)  # Same slot, other direction
+        self.assertEqual(reused[0], ids[0])
+        self.step(120)
+        self.assertEqual(self.world.floor[ids[1]], 0)
+        self.assertEqual(self.world.floor[reused[0]], 8)
+        self.assertEqual(self.transit.boarded, 2)
+
+    def test_sims_leaving_the_queue_take_no_room(self):
+        """Sims that gave up or left are skipped without using car capacity or keeping a queue time"""
+        transit = TransitSystem(self.world, self.transit.route_table, self.motion, car_capacity=2)
+        transit.add_shaft(0, self.dispatcher.shafts[0])
+        self.motion.on_doors_open = transit.on_doors_open
+        batches = []
+        transit.boarding_callback = lambda ids: batches.append(len(ids))
+        ids = waiting_sims(self.world, 4, 5, 0)
+        transit.update()
+        self.world.despawn(ids[:1])
+        self.world.state[ids[1]] = SIM_STATE_IDLE  # Gave up waiting
+        transit.plan_journeys(ids[1:2])
+        self.assertNotIn(int(ids[1]), transit._queued_at)
+
+        for _ in range(60):
+            self.movement.update(self.world, 1)
+            self.time_manager.advance(1)
+        print(f"\n[TEST] Boarding batches {batches}")
+        self.assertEqual(batches, [2])  # Both Sims still waiting got on the first car
+        self.assertTrue(np.all(self.world.floor[ids[2:]] == 0))
+        self.assertEqual(transit._queued_at, {})
+
+    def test_sims_back_on_the_same_leg_wait_for_their_walk(self):
+        """A Sim that left the queue and set off again on the same leg is not boarded on its old entry"""
+        graph = TransitGraph()
+        walkways = WalkingModel(graph)
+        for room_id, room in enumerate([office(100, 0, 60), office(100, 5, 60),
+                                        transit_room('elevator_shaft', 140, 0, 11)]):
+            graph.add_room(room_id, room)
+            walkways.add_room(room_id, room)
+        world = SimWorld(capacity=8)
+        transit = TransitSystem(world, RouteTable(graph, walkways=walkways), self.motion)
+        transit.add_shaft(2, self.dispatcher.shafts[0])
+        self.motion.on_doors_open = transit.on_doors_open
+        batches = []
+        transit.boarding_callback = lambda ids: batches.append(ids.tolist())
+        ids = waiting_sims(world, 2, 5, 0)
+        world.segment[ids] = world.target_segment[ids] = 142.0
+        transit.update()
+        self.assertEqual(sorted(transit._queued_at), ids.tolist())
+
+        world.segment[ids[0]] = 110.0  # Starts over from the far end of the floor
+        world.leg_link[ids[0]] = NO_LEG
+        world.leg_wait[ids[0]] = 0.0
+        transit.plan_journeys(ids[:1])
+        for _ in range(120):
+            transit.update()
+            self.movement.update(world, 1)
+            self.time_manager.advance(1)
+        print(f"\n[TEST] Boarding batches {batches}")
+        self.assertEqual(batches, [[int(ids[1])], [int(ids[0])]])
+        self.assertTrue(np.all(world.floor[ids] == 0))
+        self.assertEqual(transit._queued_at, {})
+
+    def test_destination_and_corridor_shafts(self):
+        """Sims on destination dispatch and stacked car shafts are assigned cars and carried"""
+        for mode in (DISPATCH_DESTINATION, DISPATCH_CORRIDOR):
+            time_manager = TimeManager(start_time=0)
+            dispatcher = ElevatorDispatcher()
+            shaft = dispatcher.add_shaft(0, 10, car_count=2, segment=140)
+            shaft.mode = mode
+            motion = ElevatorMotion(time_manager, dispatcher)
+            world = SimWorld(capacity=32)
+            transit = TransitSystem(world, self.transit.route_table, motion)
+            transit.add_shaft(0, shaft)
+            motion.on_doors_open = transit.on_doors_open
+            up = waiting_sims(world, 6, 0, 9)
+            down = waiting_sims(world, 4, 8, 2)
+            too_far = waiting_sims(world, 1, 0, 10)  # Longer than any stacked car can ride
+            for _ in range(300):
+                transit.update()
+                self.movement.update(world, 1)
+                time_manager.advance(1)
+
+            print(f"\n[TEST] Mode {mode}: boarded {transit.boarded}, unroutable {transit.unroutable}")
+            self.assertTrue(np.all(world.floor[up] == 9))
+            self.assertTrue(np.all(world.floor[down] == 2))
+            self.assertEqual(transit.boarded, 11 if mode == DISPATCH_DESTINATION else 10)
+            if mode == DISPATCH_CORRIDOR:
+                self.assertEqual(world.leg_link[too_far[0]], NO_ROUTE)
+            else:
+                self.assertEqual(world.floor[too_far[0]], 10)
+
+    def test_no_route_waits_until_the_graph_changes(self):
+        """Sims with nowhere to go are marked, then routed once transit reaches their target"""
+        ids = waiting_sims(self.world, 3, 0, 20)
+        self.step(5)
+        self.assertTrue(np.all(self.world.leg_link[ids] == NO_ROUTE))
+        self.assertEqual(self.transit.unroutable, 3)
+
+        self.graph.add_room(2, transit_room('escalator', 60, 11, 10))
+        self.assertTrue(np.all(self.world.leg_link[ids] == NO_LEG))
+        self.step(300)
+        self.assertTrue(np.all(self.world.floor[ids] == 20))
+
+    def test_journeys_resolved_in_bulk(self):
+        """Sims setting off together share one bulk lookup that plans their first leg"""
+        ids = self.world.spawn(6, floor=0, segment=50.0)
+        self.world.target_floor[ids] = [11, 11, 10, 10, 20, 0]
+        self.world.state[ids] = SIM_STATE_WALKING
+        requests = self.transit.route_table.bulk_requests
+        self.transit.plan_journeys(ids)
+        table = self.transit.route_table
+        print(f"\n[TEST] {table.bulk_pairs} pairs, {table.bulk_unique_pairs} unique")
+        self.assertEqual(table.bulk_requests, requests + 1)
+        self.assertEqual(table.bulk_unique_pairs, 3)  # The Sim already on its floor is not looked up
+        self.assertEqual(self.world.leg_link[ids].tolist(), [0] * 4 + [NO_ROUTE, NO_LEG])
+        self.assertEqual(self.world.leg_floor[ids[:4]].tolist(), [10] * 4)
+        self.assertEqual(self.transit.unroutable, 1)
+
+        # Reaching the shaft queues them with the planned leg, without another lookup
+        self.world.despawn(ids[4:])
+        self.world.state[ids[:4]] = SIM_STATE_WAITING
+        self.step(120)
+        self.assertEqual(table.bulk_requests, requests + 2)  # Only the stairs legs from level 10
+        self.assertEqual(self.world.floor[ids[:4]].tolist(), [11, 11, 10, 10])
+        self.assertEqual(self.transit.boarded, 4)
+
+    def test_walkway_edits_retry_unroutable_sims(self):
+        """Sims cut off by a walkway gap are routed once a walkway bridges it"""
+        graph = TransitGraph()
+        walkways = WalkingModel(graph)
+        world = SimWorld(capacity=8)
+        transit = TransitSystem(world, RouteTable(graph, walkways=walkways))
+        rooms = [office(0, 0, 100), office(0, 10, 40), office(60, 10, 40),
+                 transit_room('elevator_shaft', 10, 0, 11), transit_room('stairs', 86, 10)]
+        for room_id, room in enumerate(rooms):
+            graph.add_room(room_id, room)
+            walkways.add_room(room_id, room)
+        ids = waiting_sims(world, 2, 0, 11)
+        world.target_segment[ids] = 90.0  # The stairs' landing
+        transit.update()
+        self.assertTrue(np.all(world.leg_link[ids] == NO_ROUTE))
+
+        walkways.add_room(5, office(40, 10, 20))
+        transit.update()
+        self.assertTrue(np.all(world.leg_link[ids] == 3))
+
+    def test_room_walks_are_part_of_the_journey(self):
+        """The walk to the first link and on to the room is added to the leg; a room past a gap has no route"""
+        graph = TransitGraph()
+        walkways = WalkingModel(graph)
+        world = SimWorld(capacity=8)
+        transit = TransitSystem(world, RouteTable(graph, walkways=walkways))
+        rooms = [office(0, 0, 100), office(0, 1, 40), office(60, 1, 40), transit_room('elevator_shaft', 10, 0)]
+        for room_id, room in enumerate(rooms):
+            graph.add_room(room_id, room)
+            walkways.add_room(room_id, room)
+        ids = waiting_sims(world, 2, 0, 1)
+        world.target_segment[ids] = [20.0, 80.0]  # Across the gap on level 1 for the second
+        transit.update()
+
+        walk = (abs(50.0 - 12.0) + abs(20.0 - 12.0)) / walkways.walk_speed
+        print(f"\n[TEST] Leg wait {world.leg_wait[ids[0]]:.1f} s including {walk:.1f} s walking")
+        self.assertEqual(world.leg_link[ids].tolist(), [3, NO_ROUTE])
+        self.assertAlmostEqual(float(world.leg_wait[ids[0]]), graph.links[3].expected_wait + walk, places=3)
+        self.assertEqual(transit.route_table.route(0, 1)[0], 1)  # The level itself is reachable
+
+    def test_timed_legs_without_cars(self):
+        """In a world with no cars the elevator is a timed leg after its expected wait"""
+        world = SimWorld(capacity=8)
+        transit = TransitSystem(world, self.transit.route_table)
+        ids = waiting_sims(world, 1, 0, 10)
+        transit.update()
+        wait = self.graph.links[0].expected_wait
+        self.assertEqual(world.leg_wait[ids[0]], wait)
+        for _ in range(int(wait)):
+            self.movement.update(world, 1)
+        self.assertEqual(world.state[ids[0]], SIM_STATE_RIDING)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Sim Transit")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
@@ -0,0 +1,265 @@
+"""
+Test suite for the World Clock (TimeManager)
+"""
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import (
+    SECONDS_PER_DAY, SECONDS_PER_HOUR, DAYS_PER_QUARTER, DAYS_PER_YEAR, WEEKEND,
+)
+from tower_simulator.systems.time_manager import (
+    TimeManager, EVENT_DAY_START, EVENT_QUARTER_START, EVENT_YEAR_START,
+    EVENT_OFFICE_WORK_START, EVENT_LUNCH_START,
+)
+
+
+class TestClockCalendar(unittest.TestCase):
+    """Test calendar properties derived from the clock"""
+
+    def test_clock_starts_at_5am_day_one(self):
+        """Clock should start at 05:00 on Weekday 1 of Year 1"""
+        clock = TimeManager()
+        print(f"\n[TEST] Clock Start: {clock}")
+        self.assertEqual((clock.hour, clock.minute), (5, 0))
+        self.assertEqual(clock.day, 0)
+        self.assertEqual(clock.year, 1)
+        self.assertTrue(clock.is_weekday)
+
+    def test_calendar_rolls_over(self):
+        """Quarter and year should follow DAYS_PER_QUARTER and DAYS_PER_YEAR"""
+        clock = TimeManager(start_time=0)
+        clock.advance(DAYS_PER_QUARTER * SECONDS_PER_DAY)
+        self.assertEqual(clock.quarter, 1)
+        clock.advance((DAYS_PER_YEAR - DAYS_PER_QUARTER) * SECONDS_PER_DAY)
+        self.assertEqual(clock.year, 2)
+        self.assertEqual(clock.quarter, 0)
+
+
+class TestEventScheduling(unittest.TestCase):
+    """Test the discrete-event queue"""
+
+    def setUp(self):
+        """Set up a clock at midnight and a recorder subscriber"""
+        self.clock = TimeManager(start_time=0)
+        self.fired = []
+
+    def _record(self, event):
+        self.fired.append((self.clock.now, event.name, event.payload))
+
+    def test_events_fire_in_time_order(self):
+        """Events fire in timestamp order with the clock set to each timestamp"""
+        for name in ('c', 'a', 'b'):
+            self.clock.subscribe(name, self._record)
+        self.clock.schedule_at(300, 'c')
+        self.clock.schedule_at(100, 'a')
+        self.clock.schedule_at(200, 'b')
+
+        fired = self.clock.advance(1000)
+
+        print(f"\n[TEST] Event Order: {self.fired}")
+        self.assertEqual(fired, 3)
+        self.assertEqual([(t, n) for t, n, _ in self.fired], [(100, 'a'), (200, 'b'), (300, 'c')])
+        self.assertEqual(self.clock.now, 1000)
+
+    def test_equal_time_events_fire_by_priority_then_insertion(self):
+        """Ties break on priority, then on scheduling order"""
+        self.clock.subscribe('tick', self._record)
+        self.clock.schedule_at(50, 'tick', payload='second')
+        self.clock.schedule_at(50, 'tick', payload='third')
+        self.clock.schedule_at(50, 'tick', payload='first', priority=-1)
+
+        self.clock.advance(50)
+        self.assertEqual([p for _, _, p in self.fired], ['first', 'second', 'third'])
+
+    def test_events_not_due_do_not_fire(self):
+        """Advancing short of an event leaves it pending"""
+        self.clock.subscribe('later', self._record)
+        self.clock.schedule_at(500, 'later')
+        self.clock.advance(499)
+        self.assertEqual(self.fired, [])
+        self.assertEqual(self.clock.next_event_time(), 500)
+
+    def test_cancel_prevents_firing(self):
+        """Cancelled events never reach subscribers"""
+        self.clock.subscribe('x', self._record)
+        keep = self.clock.schedule_at(10, 'x', payload='keep')
+        drop = self.clock.schedule_at(5, 'x', payload='drop')
+        self.clock.cancel(drop)
+
+        self.assertEqual(self.clock.pending_count, 1)
+        self.assertEqual(self.clock.next_event_time(), keep.time)
+        self.clock.advance(20)
+        self.assertEqual([p for _, _, p in self.fired], ['keep'])
+
+    def test_cancel_after_fire(self):
+        """Cancelling a one-shot that already fired leaves the live count alone"""
+        fired = self.clock.schedule_at(5, 'x')
+        self.clock.schedule_at(50, 'x')
+        self.clock.advance(10)
+        self.clock.cancel(fired)
+        self.assertEqual(self.clock.pending_count, 1)
+        self.assertEqual(self.clock.pending_count, len(self.clock._queue))
+
+        # A recurring event stays in the heap after firing, so cancelling it does count
+        tick = self.clock.schedule_in(10, 'tick', interval=10)
+        self.clock.advance(15)
+        self.clock.cancel(tick)
+        self.assertEqual(self.clock.pending_count, 1)
+
+    def test_timers_interleave_with_heap_events(self):
+        """Timing-wheel waits and heap events fire in time order through the same subscriptions"""
+        self.clock.subscribe('x', self._record)
+        self.clock.schedule_at(30, 'x', payload='heap')
+        self.clock.schedule_timer(20, 'x', payload='timer')
+        late = self.clock.schedule_timer(1000, 'x', payload='cancelled')
+        self.clock.schedule_timer(10 ** 9, 'x', payload='beyond horizon')  # Falls back to the heap
+        self.assertEqual(self.clock.pending_count, 4)
+        self.clock.cancel(late)
+        self.assertEqual(self.clock.next_event_time(), 20)
+
+        self.clock.advance(2000)
+        self.assertEqual([(t, p) for t, _, p in self.fired], [(20, 'timer'), (30, 'heap')])
+        self.assertEqual((self.clock.pending_count, self.clock.timers.current_tick), (1, 2000))
+
+    def test_timers_and_heap_events_due_together_fire_by_priority(self):
+        """In the same second rollovers beat timers, and timers beat default-priority heap events"""
+        self.clock.subscribe('x', self._record)
+        self.clock.schedule_at(40, 'x', payload='heap')
+        self.clock.schedule_timer(40, 'x', payload='timer')
+        self.clock.schedule_at(40, 'x', payload='rollover', priority=-1)
+
+        self.clock.advance(40)
+        print(f"\n[TEST] Same-second order: {[p for _, _, p in self.fired]}")
+        self.assertEqual([p for _, _, p in self.fired], ['rollover', 'timer', 'heap'])
+        self.assertEqual(self.clock.pending_count, 0)
+
+    def test_cannot_schedule_in_past(self):
+        """Scheduling before the current time is an error"""
+        self.clock.advance(100)
+        with self.assertRaises(ValueError):
+            self.clock.schedule_at(50, 'late')
+
+    def test_mass_cancellation_compacts_queue(self):
+        """Cancelling most events shrinks the heap instead of leaking dead entries"""
+        events = [self.clock.schedule_at(i + 1, 'bulk') for i in range(1000)]
+        for event in events[:900]:
+            self.clock.cancel(event)
+        print(f"\n[TEST] Heap size after cancelling 900/1000: {len(self.clock._queue)}")
+        self.assertEqual(self.clock.pending_count, 100)
+        self.assertLess(len(self.clock._queue), 1000)
+
+
+class TestRecurringEvents(unittest.TestCase):
+    """Test daily and weekly recurring events"""
+
+    def test_daily_event_repeats(self):
+        """A daily event fires once per simulated day"""
+        clock = TimeManager(start_time=0)
+        hits = []
+        clock.subscribe('noon', lambda e: hits.append(clock.day))
+        clock.schedule_daily(12.0, 'noon')
+        clock.advance(5 * SECONDS_PER_DAY)
+        self.assertEqual(hits, [0, 1, 2, 3, 4])
+
+    def test_daily_event_in_past_starts_tomorrow(self):
+        """A daily event whose hour has passed first fires the next day"""
+        clock = TimeManager(start_time=TimeManager.time_at(0, 13.0))
+        event = clock.schedule_daily(12.0, 'noon')
+        self.assertEqual(event.time, TimeManager.time_at(1, 12.0))
+
+    def test_weekly_event_fires_on_its_day_only(self):
+        """A weekly event fires every third day on the requested day of week"""
+        clock = TimeManager(start_time=0)
+        hits = []
+        clock.subscribe('weekend', lambda e: hits.append(clock.day))
+        clock.schedule_weekly(WEEKEND, 10.0, 'weekend')
+        clock.advance(9 * SECONDS_PER_DAY)
+        self.assertEqual(hits, [2, 5, 8])
+
+    def test_cancelling_recurring_event_stops_series(self):
+        """Cancelling from inside a subscriber stops further repeats"""
+        clock = TimeManager(start_time=0)
+        hits = []
+
+        def on_tick(event):
+            hits.append(clock.now)
+            if len(hits) == 3:
+                clock.cancel(event)
+
+        clock.subscribe('tick', on_tick)
+        clock.schedule_in(60, 'tick', interval=60)
+        clock.advance(SECONDS_PER_HOUR)
+        self.assertEqual(hits, [60, 120, 180])
+        self.assertEqual(clock.pending_count, 0)
+
+
+class TestDefaultSchedule(unittest.TestCase):
+    """Test the tower's standing schedule"""
+
+    def test_rollovers_over_one_year(self):
+        """One year produces 12 day starts, 4 quarter starts and 1 year start"""
+        clock = TimeManager(start_time=0)
+        clock.install_default_schedule()
+        counts = {EVENT_DAY_START: 0, EVENT_QUARTER_START: 0, EVENT_YEAR_START: 0}
+        for name in counts:
+            clock.subscribe(name, lambda e: counts.__setitem__(e.name, counts[e.name] + 1))
+        quarters = []
+        clock.subscribe(EVENT_QUARTER_START, lambda e: quarters.append((clock.quarter, clock.seconds_into_day)))
+
+        clock.advance(DAYS_PER_YEAR * SECONDS_PER_DAY)
+
+        print(f"\n[TEST] One Year of Rollovers: {counts}")
+        self.assertEqual(counts[EVENT_DAY_START], DAYS_PER_YEAR)
+        self.assertEqual(counts[EVENT_QUARTER_START], 4)
+        self.assertEqual(counts[EVENT_YEAR_START], 1)
+        # Each fires at the midnight the quarter it announces begins
+        self.assertEqual(quarters, [(1, 0), (2, 0), (3, 0), (0, 0)])
+
+    def test_rollovers_fire_before_day_start(self):
+        """At midnight the year and quarter rollover precede the day start"""
+        clock = TimeManager(start_time=0)
+        clock.install_default_schedule()
+        order = []
+        for name in (EVENT_DAY_START, EVENT_QUARTER_START, EVENT_YEAR_START):
+            clock.subscribe(name, lambda e: order.append(e.name))
+        clock.advance(DAYS_PER_YEAR * SECONDS_PER_DAY)
+        self.assertEqual(order[-3:], [EVENT_YEAR_START, EVENT_QUARTER_START, EVENT_DAY_START])
+
+    def test_offices_wake_on_weekdays_only(self):
+        """Office work start fires on Weekday 1 and 2 but not the Weekend"""
+        clock = TimeManager(start_time=0)
+        clock.install_default_schedule()
+        office_days, lunch_days = [], []
+        clock.subscribe(EVENT_OFFICE_WORK_START, lambda e: office_days.append(clock.day))
+        clock.subscribe(EVENT_LUNCH_START, lambda e: lunch_days.append(clock.day))
+        clock.advance(6 * SECONDS_PER_DAY)
+
+        print(f"\n[TEST] Office days: {office_days}, Lunch days: {lunch_days}")
+        self.assertEqual(office_days, [0, 1, 3, 4])
+        self.assertEqual(lunch_days, [0, 1, 2, 3, 4, 5])
+        self.assertEqual(clock.time_of_day, 0.0)
+
+    def test_upcoming_peeks_without_firing(self):
+        """upcoming() lists the live events due by a time, in firing order, and fires nothing"""
+        clock = TimeManager(start_time=0)
+        clock.install_default_schedule()
+        cancelled = clock.schedule_at(11 * SECONDS_PER_HOUR, EVENT_OFFICE_WORK_START)
+        clock.cancel(cancelled)
+
+        events = clock.upcoming((EVENT_OFFICE_WORK_START, EVENT_LUNCH_START), SECONDS_PER_DAY - 1)
+        self.assertEqual([(e.name, e.time) for e in events],
+                         [(EVENT_OFFICE_WORK_START, 9 * SECONDS_PER_HOUR),
+                          (EVENT_LUNCH_START, 12 * SECONDS_PER_HOUR)])
+        self.assertEqual(clock.events_fired, 0)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - World Clock")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
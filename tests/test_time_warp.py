@@ -0,0 +1,131 @@
+"""
+Test suite for the time warp controller
+"""
+import unittest
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import SIMULATION_SPEED, SECONDS_PER_MINUTE, TIME_WARP_SPEEDS
+from tower_simulator.systems.time_manager import TimeManager
+from tower_simulator.systems.time_warp import TimeWarp
+
+
+class TestWarpSpeeds(unittest.TestCase):
+    """Test batched stepping at each warp speed"""
+
+    def setUp(self):
+        """Set up a clock at midnight"""
+        self.clock = TimeManager(start_time=0)
+
+    def test_1x_follows_simulation_speed(self):
+        """One real second at 1x advances 1 / SIMULATION_SPEED game minutes"""
+        warp = TimeWarp(self.clock)
+        warp.update(1000)
+        expected = int(SECONDS_PER_MINUTE / SIMULATION_SPEED)
+        print(f"\n[TEST] 1x: {self.clock.now} game seconds per real second (expected {expected})")
+        self.assertEqual(self.clock.now, expected)
+
+    def test_higher_speeds_multiply_game_time(self):
+        """10x and 100x advance ten and a hundred times further"""
+        for index, multiplier in ((1, 10), (2, 100)):
+            clock = TimeManager(start_time=0)
+            warp = TimeWarp(clock)
+            warp.set_speed(index)
+            warp.update(1000)
+            self.assertEqual(clock.now, int(SECONDS_PER_MINUTE / SIMULATION_SPEED) * multiplier)
+
+    def test_fractional_frames_accumulate(self):
+        """Sub-second frames carry their remainder instead of losing time"""
+        warp = TimeWarp(self.clock)
+        for _ in range(60):
+            warp.update(1000 / 60)
+        self.assertEqual(self.clock.now, int(SECONDS_PER_MINUTE / SIMULATION_SPEED))
+
+    def test_steps_are_batched_through_callback(self):
+        """Every simulation step runs before the clock advances past it"""
+        steps = []
+        warp = TimeWarp(self.clock, step_callback=lambda dt: steps.append(self.clock.now))
+        warp.set_speed(1)
+        ran = warp.update(100)
+        self.assertEqual(ran, len(steps))
+        self.assertEqual(steps, list(range(ran)))
+
+    def test_max_speed_runs_within_budget(self):
+        """Max speed runs as many steps as fit in the frame budget"""
+        warp = TimeWarp(self.clock)
+        warp.set_speed(len(TIME_WARP_SPEEDS) - 1)
+        ran = warp.update(16)
+        print(f"\n[TEST] MAX speed: {ran} steps in one frame")
+        self.assertEqual(warp.label, "MAX")
+        self.assertGreater(ran, 0)
+        self.assertEqual(self.clock.now, ran)
+
+    def test_invalid_speed_rejected(self):
+        """Unknown speed indices are rejected"""
+        warp = TimeWarp(self.clock)
+        with self.assertRaises(ValueError):
+            warp.set_speed(len(TIME_WARP_SPEEDS))
+
+
+class TestSkipToNextEvent(unittest.TestCase):
+    """Test jumping over idle periods"""
+
+    def test_skip_runs_steps_to_next_event(self):
+        """While idle the clock runs every simulation step up to the next scheduled event"""
+        clock = TimeManager(start_time=0)
+        fired, steps = [], []
+        clock.subscribe('wake', lambda e: fired.append(clock.now))
+        clock.schedule_at(9 * 3600, 'wake')
+        warp = TimeWarp(clock, step_callback=steps.append, is_idle=lambda: True)
+
+        skipped = warp.skip_to_next_event()
+        self.assertEqual(skipped, 9 * 3600)
+        self.assertEqual(fired, [9 * 3600])
+        self.assertEqual(sum(steps), 9 * 3600)  # No game second skipped without a step
+
+    def test_skip_budget_spreads_over_frames(self):
+        """A budgeted skip stops early and the following frames carry on to the event"""
+        clock = TimeManager(start_time=0)
+        clock.schedule_at(9 * 3600, 'wake')
+        warp = TimeWarp(clock, step_callback=lambda dt: time.sleep(0.0001), is_idle=lambda: True)
+        warp.toggle_skip_mode()
+        frames = 1
+        while warp.update(16) and clock.now < 9 * 3600:
+            frames += 1
+        print(f"\n[TEST] Skip to 9:00 with a slow step: {frames} frames")
+        self.assertGreater(frames, 1)
+        self.assertEqual(clock.now, 9 * 3600)
+
+    def test_skip_refused_while_busy(self):
+        """Nothing is skipped while Sims are moving"""
+        clock = TimeManager(start_time=0)
+        clock.schedule_at(3600, 'wake')
+        warp = TimeWarp(clock, is_idle=lambda: False)
+        self.assertEqual(warp.skip_to_next_event(), 0)
+        self.assertEqual(clock.now, 0)
+
+    def test_skip_mode_stops_at_each_event(self):
+        """In skip mode each frame fast-forwards exactly to the next event"""
+        clock = TimeManager(start_time=0)
+        clock.install_default_schedule()
+        warp = TimeWarp(clock)
+        warp.toggle_skip_mode()
+        times = []
+        for _ in range(3):
+            warp.update(16)
+            times.append(clock.time_of_day)
+        print(f"\n[TEST] Skip mode stops: {times}")
+        self.assertEqual(warp.label, "SKIP")
+        self.assertEqual(times, [6.5, 9.0, 12.0])
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Time Warp")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
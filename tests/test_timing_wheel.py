@@ -0,0 +1,130 @@
+"""
+Test suite for the hierarchical timing wheel
+"""
+import random
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import STRESS_LEVEL_PINK, STRESS_LEVEL_RED
+from tower_simulator.systems.timing_wheel import HierarchicalTimingWheel
+
+
+class TestTimerScheduling(unittest.TestCase):
+    """Test basic schedule, cancel and expiry"""
+
+    def setUp(self):
+        """Set up an empty wheel"""
+        self.wheel = HierarchicalTimingWheel()
+
+    def test_timer_fires_on_its_tick(self):
+        """A timer fires exactly `delay` ticks later, not before"""
+        self.wheel.schedule(STRESS_LEVEL_PINK, 'pink')
+        self.assertEqual(self.wheel.advance(STRESS_LEVEL_PINK - 1), [])
+        self.assertEqual(self.wheel.advance(1), ['pink'])
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_bulk_expiry_returns_all_timers_for_tick(self):
+        """All timers due on the same tick come back as one batch in schedule order"""
+        for sim_id in range(500):
+            self.wheel.schedule(STRESS_LEVEL_RED, sim_id)
+        self.wheel.advance(STRESS_LEVEL_RED - 1)
+        expired = self.wheel.advance(1)
+        print(f"\n[TEST] Bulk expiry: {len(expired)} timers on one tick")
+        self.assertEqual(expired, list(range(500)))
+
+    def test_cancel_is_idempotent(self):
+        """Cancelled timers never fire and cannot be cancelled twice"""
+        handle = self.wheel.schedule(10, 'boarded')
+        self.assertTrue(self.wheel.cancel(handle))
+        self.assertFalse(self.wheel.cancel(handle))
+        self.assertFalse(handle.active)
+        self.assertEqual(self.wheel.advance(20), [])
+
+    def test_long_delay_cascades_to_exact_tick(self):
+        """Timers on coarse levels cascade down and fire on the exact tick"""
+        delays = [255, 256, 257, 16383, 16384, 100000]
+        for delay in delays:
+            self.wheel.schedule(delay, delay)
+        fired = {}
+        for tick in range(1, max(delays) + 1):
+            for payload in self.wheel.advance(1):
+                fired[payload] = tick
+        self.assertEqual(fired, {d: d for d in delays})
+
+    def test_rejects_past_and_out_of_horizon(self):
+        """Zero delay and delays beyond the horizon are rejected"""
+        with self.assertRaises(ValueError):
+            self.wheel.schedule(0)
+        with self.assertRaises(ValueError):
+            self.wheel.schedule(self.wheel.horizon)
+
+    def test_horizon_check_matches_top_level(self):
+        """Off a top-level slot boundary the check rejects what the top level cannot hold"""
+        wheel = HierarchicalTimingWheel(start_tick=(1 << 20) - 1)
+        with self.assertRaises(ValueError):
+            wheel.schedule(wheel.horizon - 1)
+        furthest = wheel.schedule((((wheel.current_tick >> 20) + 64) << 20) - 1 - wheel.current_tick)
+        self.assertTrue(furthest.active)
+
+    def test_idle_wheel_jumps_forward(self):
+        """An empty wheel advances to the target in one step"""
+        self.wheel.advance(10 ** 6)
+        self.assertEqual(self.wheel.current_tick, 10 ** 6)
+
+    def test_next_expiry_lower_bound(self):
+        """The skip-ahead bound never overshoots the earliest timer"""
+        self.assertIsNone(self.wheel.next_expiry_lower_bound())
+        self.wheel.advance(200)
+        self.wheel.schedule(5000)
+        self.wheel.schedule(40)
+        self.assertEqual(self.wheel.next_expiry_lower_bound(), 240)
+
+
+class TestAgainstReference(unittest.TestCase):
+    """Randomized comparison with a naive sorted-list timer service"""
+
+    def test_matches_naive_reference(self):
+        """Expiry ticks and order match a brute-force reference"""
+        rng = random.Random(1234)
+        wheel = HierarchicalTimingWheel(level_bits=(4, 3, 3, 4))
+        reference = {}  # key -> expiry tick
+        handles = {}
+        order = 0
+
+        for _ in range(3000):
+            action = rng.random()
+            if action < 0.5:
+                delay = rng.choice([1, 2, 15, 16, 17, 127, 128, 129, rng.randint(1, 5000)])
+                handle = wheel.schedule(delay, order)
+                handles[order] = handle
+                reference[order] = wheel.current_tick + delay
+                order += 1
+            elif action < 0.7 and handles:
+                key = rng.choice(sorted(handles))
+                wheel.cancel(handles.pop(key))
+                del reference[key]
+            else:
+                ticks = rng.randint(1, 300)
+                start = wheel.current_tick
+                expired = wheel.advance(ticks)
+                expected = sorted((t, k) for k, t in reference.items() if t <= start + ticks)
+                expiry_ticks = [reference[k] for k in expired]
+                self.assertEqual(expiry_ticks, sorted(expiry_ticks))
+                self.assertEqual(sorted(expired), sorted(k for _, k in expected))
+                for key in expired:
+                    del reference[key]
+                    del handles[key]
+
+        self.assertEqual(len(wheel), len(reference))
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Timing Wheel")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
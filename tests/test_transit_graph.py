@@ -0,0 +1,96 @@
+"""
+Test suite for the incrementally maintained transit graph
+"""
+import unittest
+import sys
+import os
+import random
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import ELEVATOR_CAR_CAPACITY
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.systems.transit_graph import (
+    TransitGraph, MODE_STAIRS, MODE_ESCALATOR, MODE_ELEVATOR,
+)
+from tower_simulator.world.coordinate import Coordinate
+
+
+def transit_room(room_type: str, segment: int, level: int, height: int = 2) -> RoomEntity:
+    """A stairs, escalator or elevator shaft room"""
+    width = 4 if room_type == 'elevator_shaft' else 8
+    return RoomEntity(Coordinate(segment, level), width, height, room_type, 0, (0, 0, 0))
+
+
+class TestTransitGraph(unittest.TestCase):
+    """Test links, edge annotations and local edits"""
+
+    def setUp(self):
+        self.rooms = [
+            RoomEntity(Coordinate(100, 0), 40, 1, 'lobby', 0, (0, 0, 0)),
+            transit_room('stairs', 100, -2),
+            transit_room('escalator', 120, -1),
+            transit_room('elevator_shaft', 140, 0, height=11),
+        ]
+        self.graph = TransitGraph.from_rooms(self.rooms)
+
+    def test_links_and_annotations(self):
+        """Each transit object is one link; elevators carry cars and an expected wait"""
+        self.assertEqual(sorted(self.graph.links), [1, 2, 3])
+        stairs, escalator, shaft = (self.graph.links[i] for i in (1, 2, 3))
+        self.assertEqual((stairs.mode, stairs.capacity, stairs.expected_wait), (MODE_STAIRS, None, 0.0))
+        self.assertEqual(escalator.mode, MODE_ESCALATOR)
+        self.assertEqual((shaft.mode, shaft.capacity), (MODE_ELEVATOR, ELEVATOR_CAR_CAPACITY))
+        self.assertEqual(shaft.expected_wait, 10.0)
+        self.assertEqual(shaft.cost(0, 10), 20.0)
+
+        print(f"\n[TEST] Links at level 0: {sorted(link.link_id for link in self.graph.links_at(0))}")
+        self.assertEqual(sorted(link.link_id for link in self.graph.links_at(0)), [2, 3])
+        self.assertEqual(sorted(level for level, _ in self.graph.neighbours(-1)), [-2, 0])
+        self.assertEqual(len(list(self.graph.neighbours(5))), 10)
+
+    def test_edits_touch_only_spanned_levels(self):
+        """Adding or removing a link reports only the levels it spans"""
+        edits = []
+        self.graph.subscribe(lambda levels: edits.append(list(levels)))
+        self.graph.add_room(4, transit_room('stairs', 200, 20))
+        self.graph.remove_room(2)
+        self.assertEqual(edits, [[20, 21], [-1, 0]])
+        self.assertEqual(self.graph.adjacency[-1], {1})
+        self.assertIsNone(self.graph.remove_room(0))  # The lobby has no link
+        with self.assertRaises(ValueError):
+            self.graph.add_room(3, self.rooms[3])
+
+    def test_incremental_matches_full_rebuild(self):
+        """After random placements and removals the graph equals one built from scratch"""
+        rng = random.Random(44)
+        rooms, placed = {}, set()
+        graph = TransitGraph()
+        for room_id in range(300):
+            if placed and rng.random() < 0.3:
+                removed = rng.choice(sorted(placed))
+                placed.discard(removed)
+                graph.remove_room(removed)
+            room_type = rng.choice(['stairs', 'escalator', 'elevator_shaft', 'office'])
+            height = rng.randint(2, 30) if room_type == 'elevator_shaft' else 2 if room_type != 'office' else 1
+            rooms[room_id] = transit_room(room_type, rng.randint(0, 300), rng.randint(-5, 108 - height), height)
+            placed.add(room_id)
+            graph.add_room(room_id, rooms[room_id])
+
+            if room_id % 50 == 49:
+                rebuilt = TransitGraph()
+                for other in sorted(placed):
+                    rebuilt.add_room(other, rooms[other])
+                self.assertEqual(graph.edges(), rebuilt.edges())
+                self.assertEqual(graph.adjacency, rebuilt.adjacency)
+
+        print(f"\n[TEST] {len(graph.links)} links after {graph.edits} edits, {len(graph.edges())} edges")
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Transit Graph")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
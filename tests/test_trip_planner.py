@@ -0,0 +1,157 @@
+"""
+Test suite for daily trip tables (TripPlanner / TripQueue)
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import (
+    SECONDS_PER_DAY, SECONDS_PER_HOUR, OFFICE_WORK_START, OFFICE_WORK_END, WEEKEND,
+)
+from tower_simulator.entities.ecs import (
+    SimWorld, NO_ROOM, SIM_STATE_IDLE, SIM_STATE_WALKING, BEHAVIOR_IN_ROOM,
+    TRIP_TO_WORK, TRIP_LUNCH_OUT, TRIP_LUNCH_RETURN, TRIP_FROM_WORK, TRIP_HOTEL_CHECKOUT, TRIP_HOTEL_CHECKIN,
+)
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.systems.sim_systems import SchedulingSystem, LOBBY_LEVEL
+from tower_simulator.systems.time_manager import TimeManager
+from tower_simulator.systems.trip_planner import TripPlanner, TripQueue
+from tower_simulator.utils.determinism import SimulationRNG
+from tower_simulator.world.coordinate import Coordinate
+
+
+def build_table() -> RoomTable:
+    """Lobby, two offices (6 seats each), a fast food and a twin hotel room (2 seats)"""
+    return RoomTable([
+        RoomEntity(Coordinate(100, 0), 4, 1, 'lobby', 0, (0, 0, 0)),
+        RoomEntity(Coordinate(20, 10), 9, 1, 'office', 0, (0, 0, 0)),
+        RoomEntity(Coordinate(40, 12), 9, 1, 'office', 0, (0, 0, 0)),
+        RoomEntity(Coordinate(60, 5), 16, 1, 'fast_food', 0, (0, 0, 0)),
+        RoomEntity(Coordinate(80, 20), 6, 1, 'hotel_twin', 0, (0, 0, 0)),
+    ])
+
+
+class TestTripPlanner(unittest.TestCase):
+    """Test trip table generation"""
+
+    def setUp(self):
+        self.table = build_table()
+        self.planner = TripPlanner(SimulationRNG(11))
+
+    def test_weekday_trips_follow_capacities(self):
+        """Every office seat commutes and lunches; every hotel seat checks out and in"""
+        trips = self.planner.plan_day(self.table, day=0)
+        counts = {kind: int(np.count_nonzero(trips.kind == kind)) for kind in
+                  (TRIP_TO_WORK, TRIP_LUNCH_OUT, TRIP_LUNCH_RETURN, TRIP_FROM_WORK,
+                   TRIP_HOTEL_CHECKOUT, TRIP_HOTEL_CHECKIN)}
+
+        print(f"\n[TEST] Weekday trip counts: {counts}")
+        self.assertEqual(counts[TRIP_TO_WORK], 12)
+        self.assertEqual(counts[TRIP_LUNCH_OUT], 12)
+        self.assertEqual(counts[TRIP_LUNCH_RETURN], 12)
+        self.assertEqual(counts[TRIP_FROM_WORK], 12)
+        self.assertEqual(counts[TRIP_HOTEL_CHECKOUT], 2)
+        self.assertEqual(counts[TRIP_HOTEL_CHECKIN], 2)
+        self.assertTrue(np.all(trips.dest_room[trips.kind == TRIP_LUNCH_OUT] == 3))
+
+    def test_trips_sorted_and_inside_windows(self):
+        """The table is time-sorted and commutes fall in their windows"""
+        trips = self.planner.plan_day(self.table, day=3)
+        self.assertTrue(np.all(np.diff(trips.time) >= 0))
+        to_work = trips.time[trips.kind == TRIP_TO_WORK] - 3 * SECONDS_PER_DAY
+        from_work = trips.time[trips.kind == TRIP_FROM_WORK] - 3 * SECONDS_PER_DAY
+        self.assertTrue(np.all(to_work <= OFFICE_WORK_START * SECONDS_PER_HOUR))
+        self.assertTrue(np.all(from_work >= OFFICE_WORK_END * SECONDS_PER_HOUR))
+
+    def test_weekend_has_no_office_trips(self):
+        """Offices are closed on the weekend; hotels still turn over"""
+        trips = self.planner.plan_day(self.table, day=WEEKEND)
+        self.assertFalse(np.isin(trips.kind, (TRIP_TO_WORK, TRIP_FROM_WORK)).any())
+        self.assertEqual(len(trips), 4)
+
+    def test_deterministic_per_seed_and_day(self):
+        """Same seed and day give the same table; another day differs"""
+        first = self.planner.plan_day(self.table, day=4)
+        again = TripPlanner(SimulationRNG(11)).plan_day(self.table, day=4)
+        other = self.planner.plan_day(self.table, day=5)
+        np.testing.assert_array_equal(first.time, again.time)
+        np.testing.assert_array_equal(first.room, again.room)
+        self.assertFalse(np.array_equal(first.time - 4 * SECONDS_PER_DAY, other.time - 5 * SECONDS_PER_DAY))
+
+    def test_start_time_drops_past_trips(self):
+        """Loading mid-day keeps only trips still to come"""
+        noon = 12 * SECONDS_PER_HOUR
+        trips = self.planner.plan_day(self.table, day=0, start_time=noon)
+        self.assertTrue(np.all(trips.time >= noon))
+        self.assertFalse(np.any(trips.kind == TRIP_TO_WORK))
+
+
+class TestTripQueue(unittest.TestCase):
+    """Test draining the trip table with the World Clock"""
+
+    def test_clock_drains_trips_in_batches(self):
+        """Every trip is delivered once, in time order, when its second arrives"""
+        time_manager = TimeManager(start_time=0)
+        trips = TripPlanner(SimulationRNG(3)).plan_day(build_table(), day=0)
+        batches = []
+        queue = TripQueue(time_manager, lambda batch: batches.append((time_manager.now, batch)))
+        queue.load(trips)
+
+        time_manager.advance(SECONDS_PER_DAY - 1)
+        delivered = np.concatenate([batch.time for _, batch in batches])
+
+        print(f"\n[TEST] Trip queue: {len(trips)} trips in {len(batches)} batches")
+        np.testing.assert_array_equal(delivered, trips.time)
+        self.assertTrue(all(np.all(batch.time == now) for now, batch in batches))
+        self.assertEqual(len(queue), 0)
+
+    def test_scheduling_executes_commute(self):
+        """Workers spawn at the lobby, head to their office and leave the tower after work"""
+        table = build_table()
+        world = SimWorld(capacity=64)
+        scheduling = SchedulingSystem(world, table)
+        trips = TripPlanner(SimulationRNG(3)).plan_day(table, day=0)
+
+        scheduling.execute_trips(trips.rows(trips.kind == TRIP_TO_WORK))
+        workers = world.active_ids()
+        self.assertEqual(len(workers), 12)
+        self.assertTrue(np.all(world.floor[workers] == LOBBY_LEVEL))
+        self.assertTrue(np.all(world.state[workers] == SIM_STATE_WALKING))
+        self.assertTrue(np.all(world.home_room[workers] == NO_ROOM))
+
+        # Pretend they arrived, then send them home
+        world.floor[workers] = world.target_floor[workers]
+        world.state[workers] = SIM_STATE_IDLE
+        scheduling.update()
+        self.assertTrue(np.all(world.behavior[workers] == BEHAVIOR_IN_ROOM))
+        unmatched = scheduling.execute_trips(trips.rows(trips.kind == TRIP_FROM_WORK))
+        self.assertEqual(len(unmatched), 0)
+        self.assertTrue(np.all(world.target_floor[workers] == LOBBY_LEVEL))
+
+        world.floor[workers] = LOBBY_LEVEL
+        world.state[workers] = SIM_STATE_IDLE
+        scheduling.update()
+        self.assertEqual(world.active_count, 0)
+        self.assertEqual(scheduling.departed_total, 12)
+
+    def test_missing_occupants_are_returned(self):
+        """Trips for Sims not in the world come back unmatched"""
+        table = build_table()
+        scheduling = SchedulingSystem(SimWorld(capacity=8), table)
+        trips = TripPlanner(SimulationRNG(3)).plan_day(table, day=0)
+        checkouts = trips.rows(trips.kind == TRIP_HOTEL_CHECKOUT)
+        self.assertEqual(len(scheduling.execute_trips(checkouts)), len(checkouts))
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Daily Trip Tables")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
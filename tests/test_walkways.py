@@ -0,0 +1,178 @@
+"""
+Test suite for the horizontal walking model
+"""
+import unittest
+import sys
+import os
+import random
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import SIM_WALK_SPEED, GRID_MIN_LEVEL, GRID_MAX_LEVEL
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.systems.route_table import RouteTable
+from tower_simulator.systems.transit_graph import TransitGraph
+from tower_simulator.systems.walkways import WalkingModel
+from tower_simulator.world.coordinate import Coordinate
+from tests.test_transit_graph import transit_room
+from tests.test_route_table import random_tower
+
+
+def office(segment: int, level: int, width: int = 9) -> RoomEntity:
+    """A room that is only floor space to walk on"""
+    return RoomEntity(Coordinate(segment, level), width, 1, 'office', 0, (0, 0, 0))
+
+
+def coverage_runs(spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Walkable runs by painting every segment, for reference"""
+    covered = np.zeros(400, dtype=bool)
+    for start, end in spans:
+        covered[start:end] = True
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], covered.astype(np.int8), [0]))))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+class TestWalkableRuns(unittest.TestCase):
+    """Test interval runs per level"""
+
+    def test_runs_merge_on_placement(self):
+        """Touching or overlapping rooms join one run; a gap keeps runs apart"""
+        model = WalkingModel(TransitGraph())
+        model.add_room(0, office(0, 3, 10))
+        model.add_room(1, office(20, 3, 10))
+        self.assertEqual((model.starts[3], model.ends[3]), ([0, 20], [10, 30]))
+        self.assertIsNone(model.walk_seconds(3, 5, 25))
+        self.assertIsNone(model.run_at(3, 15))
+
+        model.add_room(2, office(10, 3, 10))
+        self.assertEqual((model.starts[3], model.ends[3]), ([0], [30]))
+        self.assertEqual(model.walk_seconds(3, 5, 25), 20 / SIM_WALK_SPEED)
+
+        model.remove_room(2, office(10, 3, 10))
+        self.assertEqual((model.starts[3], model.ends[3]), ([0, 20], [10, 30]))
+
+    def test_matches_painted_segments(self):
+        """After random placements and removals the runs equal the painted coverage"""
+        rng = random.Random(47)
+        model = WalkingModel(TransitGraph())
+        rooms = {}
+        for room_id in range(400):
+            if rooms and rng.random() < 0.25:
+                removed = rng.choice(sorted(rooms))
+                model.remove_room(removed, rooms.pop(removed))
+            rooms[room_id] = office(rng.randint(0, 360), rng.randint(0, 3), rng.randint(1, 30))
+            model.add_room(room_id, rooms[room_id])
+
+        for level in range(4):
+            expected = coverage_runs([room.get_segments() for room in rooms.values()
+                                      if room.coordinate.level == level])
+            self.assertEqual(list(zip(model.starts[level], model.ends[level])), expected)
+        print(f"\n[TEST] Level 0 runs: {len(model.starts[0])}")
+
+
+class TestTransitEndpoints(unittest.TestCase):
+    """Test walking between transit endpoints and along routes"""
+
+    def setUp(self):
+        self.graph = TransitGraph()
+        self.model = WalkingModel(self.graph)
+        self.table = RouteTable(self.graph)
+        rooms = [office(0, 0, 100), office(0, 10, 40), office(60, 10, 40),
+                 transit_room('elevator_shaft', 10, 0, 11), transit_room('elevator_shaft', 80, 0, 11)]
+        for room_id, room in enumerate(rooms):
+            self.graph.add_room(room_id, room)
+            self.model.add_room(room_id, room)
+
+    def test_transfer_times(self):
+        """Shafts share the lobby run, but a gap parts them on level 10"""
+        self.assertEqual(self.model.transfer_seconds(0, 3, 4), 70 / SIM_WALK_SPEED)
+        self.assertEqual(self.model.transfer_seconds(10, 3, 4), np.inf)
+        rebuilds = self.model.endpoint_rebuilds
+        self.model.transfer_seconds(0, 4, 3)
+        self.assertEqual(self.model.endpoint_rebuilds, rebuilds)  # Cached until the level is edited
+
+        self.model.add_room(5, office(40, 10, 20))  # Bridge the gap
+        self.assertEqual(self.model.transfer_seconds(10, 3, 4), 70 / SIM_WALK_SPEED)
+
+    def test_route_walking(self):
+        """A route adds its walks; a destination across a gap from the shaft used is unreachable"""
+        legs, _, links, stops = self.table.route(0, 10)
+        self.assertEqual(links.tolist(), [3])
+        walk = self.model.route_walk_seconds(0, 50, 30, links, stops)
+        print(f"\n[TEST] Lobby segment 50 -> level 10 segment 30: {walk} s walking")
+        self.assertAlmostEqual(walk, (38 + 18) / SIM_WALK_SPEED)
+        self.assertIsNone(self.model.route_walk_seconds(0, 50, 90, links, stops))
+        self.assertIsNone(self.model.route_walk_seconds(0, 150, 30, links, stops))
+
+
+class TestWalkingRoutes(unittest.TestCase):
+    """Test walking costs and walkway gaps in route choice"""
+
+    def setUp(self):
+        # Two shafts 0-10; on level 10 a gap parts the first shaft from the stairs up to level 11
+        self.graph = TransitGraph()
+        self.model = WalkingModel(self.graph)
+        self.table = RouteTable(self.graph, walkways=self.model)
+        rooms = [office(0, 0, 100), office(0, 10, 40), office(60, 10, 40),
+                 transit_room('elevator_shaft', 10, 0, 11), transit_room('elevator_shaft', 80, 0, 11),
+                 transit_room('stairs', 86, 10)]
+        for room_id, room in enumerate(rooms):
+            self.graph.add_room(room_id, room)
+            self.model.add_room(room_id, room)
+        self.graph.set_expected_wait(3, 5.0)  # The first shaft is the quicker ride to level 10
+
+    def test_transfer_across_a_gap_is_not_taken(self):
+        """The quicker shaft ends across a gap from the stairs, so the route takes the other one"""
+        legs, cost, links, _ = self.table.route(0, 11)
+        plain = RouteTable(self.graph).route(0, 11)
+        print(f"\n[TEST] Level 0 -> 11 via {links.tolist()} in {cost:.1f} s (ignoring walkways: "
+              f"{plain[2].tolist()})")
+        self.assertEqual(plain[2].tolist(), [3, 5])
+        self.assertEqual(links.tolist(), [4, 5])
+        walk = self.model.transfer_seconds(10, 4, 5)
+        self.assertAlmostEqual(cost, self.graph.links[4].cost(0, 10) + walk + self.graph.links[5].cost(10, 11),
+                               places=4)
+        # The direct ride to level 10 has no transfer to walk
+        self.assertEqual(self.table.route(0, 10)[2].tolist(), [3])
+
+    def test_bridging_the_gap_reroutes(self):
+        """A walkway placed across the gap makes the quicker shaft usable, if the walk is worth it"""
+        self.graph.set_expected_wait(3, 0.0)
+        self.graph.set_expected_wait(4, 200.0)
+        self.assertEqual(self.table.route(0, 11)[2].tolist(), [4, 5])
+        self.model.add_room(6, office(40, 10, 20))
+        self.assertEqual(self.table.route(0, 11)[2].tolist(), [3, 5])
+
+    def test_instant_walks_match_the_plain_table(self):
+        """With every level one run and walking free, walking routes cost the same as level-to-level ones"""
+        rng = random.Random(47)
+        graph = TransitGraph()
+        model = WalkingModel(graph, walk_speed=np.inf)
+        for level in range(GRID_MIN_LEVEL, GRID_MAX_LEVEL + 1):
+            model.add_room(1000 + level, office(0, level, 400))
+        walking, plain = RouteTable(graph, walkways=model), RouteTable(graph)
+        for room_id, transit in random_tower(rng, 40).items():
+            graph.add_room(room_id, transit)
+        walking.refresh()
+        plain.refresh()
+        print(f"\n[TEST] {np.count_nonzero(np.isfinite(plain.cost))} reachable pairs compared")
+        np.testing.assert_allclose(walking.cost, plain.cost, rtol=1e-6)
+        np.testing.assert_array_equal(walking.trips, plain.trips)
+        np.testing.assert_array_equal(walking.hops, plain.hops)
+
+    def test_edits_without_transit_are_ignored(self):
+        """Walkways on levels no transit stops at leave the route table alone"""
+        self.table.refresh()
+        self.model.add_room(7, office(0, 30, 40))
+        self.assertFalse(self.table.dirty.any())
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Walkways")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
@@ -0,0 +1,122 @@
+"""
+Test suite for hierarchical zone-based pathfinding
+"""
+import unittest
+import sys
+import os
+import random
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tower_simulator.constants import ZONE_LEVELS
+from tower_simulator.systems.route_table import RouteTable
+from tower_simulator.systems.transit_graph import TransitGraph
+from tower_simulator.systems.zone_router import ZoneRouter, zone_of
+from tests.test_transit_graph import transit_room
+from tests.test_route_table import random_tower
+
+
+def skylobby_tower(blocks: int) -> TransitGraph:
+    """A local shaft per block and a shuttle shaft from each block's hub to the next one's"""
+    graph = TransitGraph()
+    for block in range(blocks):
+        graph.add_room(2 * block, transit_room('elevator_shaft', 100, block * ZONE_LEVELS, ZONE_LEVELS))
+        if block + 1 < blocks:
+            graph.add_room(2 * block + 1, transit_room('elevator_shaft', 140, block * ZONE_LEVELS,
+                                                       ZONE_LEVELS + 1))
+    return graph
+
+
+class TestZoneRouter(unittest.TestCase):
+    """Test block hubs, route costs and per-block invalidation"""
+
+    def setUp(self):
+        self.graph = skylobby_tower(4)
+        self.table = RouteTable(self.graph)
+        self.router = ZoneRouter(RouteTable(self.graph))
+
+    def test_hubs(self):
+        """The hub of a block is its level served by the most links leaving it"""
+        hubs = [self.router.block(zone)[0] for zone in range(4)]
+        print(f"\n[TEST] Hubs: {hubs}")
+        self.assertEqual(hubs, [0, 15, 30, 45])
+        self.assertEqual(zone_of(-3), -1)
+
+    def test_costs_match_route_table_through_hubs(self):
+        """Within a block and between hubs the costs are exact; elsewhere never below the best route"""
+        for origin in range(0, 4 * ZONE_LEVELS):
+            for destination in range(0, 4 * ZONE_LEVELS, 3):
+                exact = self.table.route(origin, destination)[1]
+                cost = self.router.hub_cost(origin, destination)
+                self.assertGreaterEqual(cost, exact - 1e-3)
+                if zone_of(origin) == zone_of(destination) or (origin % ZONE_LEVELS == 0
+                                                                and destination % ZONE_LEVELS == 0):
+                    self.assertAlmostEqual(cost, exact, places=3)
+        # Lobby to the top block is three shuttles
+        self.assertEqual(self.router.hub_cost(0, 45), self.table.route(0, 45)[1])
+        self.assertEqual(self.table.route(0, 45)[0], 3)
+
+    def test_edit_invalidates_only_its_block(self):
+        """A shaft inside one block rebuilds that block alone and keeps the zone graph"""
+        self.router.hub_cost(3, 50)
+        blocks, graphs = self.router.block_builds, self.router.zone_graph_builds
+        self.graph.add_room(20, transit_room('stairs', 200, 33))
+        self.router.hub_cost(3, 50)
+        self.router.hub_cost(33, 34)
+        print(f"\n[TEST] Block builds {blocks} -> {self.router.block_builds}, "
+              f"zone graph builds {graphs} -> {self.router.zone_graph_builds}")
+        self.assertEqual(self.router.block_builds, blocks + 1)
+        self.assertEqual(self.router.zone_graph_builds, graphs)
+        self.assertEqual(self.router.hub_cost(33, 35), self.table.route(33, 35)[1])
+
+        # A shuttle crossing blocks rebuilds the zone graph
+        self.graph.add_room(21, transit_room('elevator_shaft', 180, 0, 31))
+        self.assertEqual(self.router.hub_cost(0, 30), self.table.route(0, 30)[1])
+        self.assertEqual(self.router.zone_graph_builds, graphs + 1)
+
+    def test_random_towers_never_undercut(self):
+        """Every hub cost is a real route: never cheaper than the exact table, finite only if reachable"""
+        rng = random.Random(48)
+        graph = TransitGraph()
+        for room_id, room in random_tower(rng, 50).items():
+            graph.add_room(room_id, room)
+        table = RouteTable(graph)
+        router = ZoneRouter(table)
+        for _ in range(500):
+            origin, destination = rng.randint(-5, 109), rng.randint(-5, 109)
+            cost, exact = router.hub_cost(origin, destination), table.route(origin, destination)[1]
+            self.assertGreaterEqual(cost, exact - 1e-3)
+            if exact == np.inf:
+                self.assertEqual(cost, np.inf)
+
+    def test_route_cost_always_exact(self):
+        """Route costs come from the table, refreshing only stale origin rows, so they are finite exactly when
+        the table has a route"""
+        rng = random.Random(48)
+        graph = TransitGraph()
+        for room_id, room in random_tower(rng, 50).items():
+            graph.add_room(room_id, room)
+        exact, table = RouteTable(graph), RouteTable(graph)
+        router = ZoneRouter(table)
+        pairs = [(rng.randint(-5, 109), rng.randint(-5, 109)) for _ in range(500)]
+        for origin, destination in pairs:
+            table.dirty[:] = True
+            self.assertEqual(router.route_cost(origin, destination), exact.route(origin, destination)[1])
+        table.refresh()
+        refreshes, rows = router.row_refreshes, table.rows_recomputed
+        for origin, destination in pairs:
+            self.assertEqual(router.route_cost(origin, destination), exact.route(origin, destination)[1])
+        print(f"\n[TEST] {router.row_refreshes} row refreshes for {len(pairs)} queries on stale rows")
+        self.assertEqual(refreshes, len(pairs))
+        self.assertEqual((router.row_refreshes, table.rows_recomputed), (refreshes, rows))
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("TOWER SIMULATOR TEST SUITE - Zone Router")
+    print("=" * 70)
+
+    unittest.main(verbosity=2)
@@ -387,6 +387,22 @@ WEEKEND = 2
 DAYS_PER_YEAR = 12
 QUARTERS_PER_YEAR = 4
 DAYS_PER_QUARTER = 3
+DAYS_PER_WEEK = 3  # WD1, WD2, WE
+
+# World Clock (game time is tracked in whole game seconds)
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+CLOCK_START_HOUR = 5.0  # 5:00 AM on Weekday 1 of Year 1
+SIM_TICK_SECONDS = 1  # Game seconds advanced per simulation step
+
+# Time Warp
+TIME_WARP_SPEEDS = (1, 10, 100, None)  # Multipliers of SIMULATION_SPEED; None = as fast as possible
+TIME_WARP_MAX_FRAME_BUDGET_MS = 12  # Simulation time per frame at max speed and in skip mode
+
+# Determinism
+DEFAULT_SIMULATION_SEED = 1994
+STATE_HASH_LOG_INTERVAL = 0  # Simulation ticks between logged state hashes (0 = disabled)
 
 # Work Hours
 OFFICE_WORK_START = 9.0  # 9:00 AM
@@ -395,6 +411,8 @@ LUNCH_START = 12.0  # Noon
 LUNCH_END = 13.0  # 1:00 PM
 CONDO_SALES_START = 9.0  # 9:00 AM
 CONDO_SALES_END = 13.0  # 1:00 PM
+COMMUTE_SPREAD_HOURS = 1.0  # Arrivals spread over the hour before a window opens, departures over the hour after
+LUNCH_BREAK_HOURS = 0.5  # Time office workers spend away at lunch
 
 # Hotel Check Times
 HOTEL_CHECKOUT_START = 6.5  # 6:30 AM
@@ -408,11 +426,37 @@ WAITING_CAR_RESPONSE_RANGE = (1, 5)  # Floors
 STANDARD_FLOOR_DEPARTURE = (30, 60)  # Seconds
 MAX_ELEVATOR_SHAFTS = 24
 MAX_CARS_PER_SHAFT = 8
+ELEVATOR_SECONDS_PER_LEVEL = 1  # Car travel time per level
+ELEVATOR_CAR_CAPACITY = 21  # Passengers per car
+ELEVATOR_DOOR_SECONDS = 5  # Doors open and close at a stop where nobody boards
+PREPOSITION_LEAD_SECONDS = 300  # Idle cars are parked for a peak this long before its first trips
+
+# Sim Agents
+MAX_SIMS = POPULATION_TARGET_TOWER  # Preallocated agent slots
+SIM_POOL_GROWTH_FACTOR = 1.5  # Slot pool growth when full (1.0 = fixed size)
+SIM_WALK_SPEED = 1.5  # Segments per game second
+TRANSIT_SECONDS_PER_LEVEL = 2.0  # Generic vertical travel time per level
+LOD_LEVEL_MARGIN = 4  # Levels beyond the viewport that keep individually simulated Sims
+LOD_BUCKET_SECONDS = 60  # Aggregate flow model time bucket for off-screen levels
+LOD_FLOW_HISTORY_BUCKETS = 60  # Buckets of per-level flow counts kept (one game hour)
+LOD_COMPACT_RATIO = 2  # Pack the on-screen world once its active span is this many times its Sims
 
 # Stress/Satisfaction
 MAX_SIM_TRIPS = 4  # Maximum transit legs per destination
 STRESS_LEVEL_PINK = 60  # Seconds
 STRESS_LEVEL_RED = 120  # Seconds
+STRESS_COLORS = (
+    (0, 0, 0),  # Black - calm
+    (255, 105, 180),  # Pink - waited past STRESS_LEVEL_PINK
+    (255, 0, 0),  # Red - waited past STRESS_LEVEL_RED, hurts room evaluation
+)
+
+# Pathfinding
+CONGESTION_REFRESH_SECONDS = 60  # Route weights are refreshed from measured waits in one batch this often
+CONGESTION_WINDOW_REFRESHES = 10  # Refresh periods of wait samples in each shaft's rolling average
+CONGESTION_HYSTERESIS_SECONDS = 5.0  # A shaft's weight only moves if its measured wait differs by more than this
+CONGESTION_HYSTERESIS_RATIO = 0.2  # ... and by more than this fraction of its current weight
+ZONE_LEVELS = 15  # Levels per block in hierarchical pathfinding (hub-and-spoke skylobby spacing)
 
 # Notes
 NOTES = {
@@ -0,0 +1,334 @@
+"""
+Entity-Component-System storage for Sim agents.
+Every component lives in a preallocated NumPy array indexed by Sim id;
+systems (see systems/sim_systems.py) operate on masked slices of these arrays.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from tower_simulator.constants import MAX_SIMS, SIM_POOL_GROWTH_FACTOR
+
+# Sim states (values of the uint8 `state` component)
+SIM_STATE_IDLE = 0  # Inside a room
+SIM_STATE_WALKING = 1  # Walking along a floor towards target_segment
+SIM_STATE_WAITING = 2  # Waiting for vertical transit - accumulates stress
+SIM_STATE_RIDING = 3  # Travelling between levels
+
+# Stress color levels (values of the uint8 `stress_level` component, index into STRESS_COLORS)
+STRESS_BLACK = 0
+STRESS_PINK = 1
+STRESS_RED = 2
+
+# Trip kinds (values of the uint8 `trip` component, see systems/trip_planner.py)
+TRIP_NONE = 0
+TRIP_TO_WORK = 1
+TRIP_LUNCH_OUT = 2
+TRIP_LUNCH_RETURN = 3
+TRIP_FROM_WORK = 4
+TRIP_HOTEL_CHECKOUT = 5
+TRIP_HOTEL_CHECKIN = 6
+TRIP_CONDO_OUT = 7
+TRIP_CONDO_RETURN = 8
+
+# Sim profiles (values of the uint8 `profile` component)
+PROFILE_OFFICE_WORKER = 0
+PROFILE_CONDO_RESIDENT = 1
+PROFILE_HOTEL_GUEST = 2
+PROFILE_SHOPPER = 3
+
+# Behavior states (values of the uint8 `behavior` component, see systems/sim_behavior.py)
+BEHAVIOR_OUTSIDE = 0  # Not in the tower
+BEHAVIOR_HEADING_IN = 1  # Travelling from the lobby to the Sim's own room
+BEHAVIOR_IN_ROOM = 2  # At work, at home or in the hotel room
+BEHAVIOR_HEADING_OUT = 3  # Travelling to another room (lunch, shopping)
+BEHAVIOR_VISITING = 4  # In another room
+BEHAVIOR_HEADING_BACK = 5  # Travelling back to the Sim's own room
+BEHAVIOR_LEAVING = 6  # Travelling to the lobby to leave the tower
+
+NO_ROOM = -1
+NO_SEAT = -1
+
+# Values of the `leg_link` component other than a transit link id
+NO_LEG = -1  # No leg planned (rides started without one go straight to target_floor)
+NO_ROUTE = -2  # No route to target_floor; replanned when the transit graph changes
+
+# `leg_wait` / `ride_remaining` of a Sim an elevator car is responsible for
+HELD_BY_CAR = np.float32(np.inf)
+
+# Component name -> (dtype, value of an unused slot)
+COMPONENTS = {
+    'active': (bool, False),
+    'floor': (np.int16, 0),  # Current level
+    'segment': (np.float32, 0.0),  # Horizontal position
+    'target_floor': (np.int16, 0),
+    'target_segment': (np.float32, 0.0),
+    'home_room': (np.int32, NO_ROOM),
+    'work_room': (np.int32, NO_ROOM),
+    'seat': (np.int16, NO_SEAT),  # Occupant index within the Sim's home or work room
+    'state': (np.uint8, SIM_STATE_IDLE),
+    'stress': (np.float32, 0.0),  # Seconds spent waiting
+    'stress_level': (np.uint8, STRESS_BLACK),  # STRESS_BLACK / PINK / RED
+    'trips': (np.uint8, 0),  # Transit legs used on current journey
+    'ride_remaining': (np.float32, 0.0),  # Seconds left on current ride
+    'leg_link': (np.int32, NO_LEG),  # Transit link of the leg being waited for or ridden
+    'leg_floor': (np.int16, 0),  # Level the current leg ends at
+    'leg_wait': (np.float32, 0.0),  # Seconds left before a timed leg departs
+    'trip': (np.uint8, TRIP_NONE),  # Kind of the trip in progress
+    'profile': (np.uint8, PROFILE_OFFICE_WORKER),
+    'behavior': (np.uint8, BEHAVIOR_OUTSIDE),
+}
+
+
+@dataclass
+class PoolStats:
+    """Slot pool statistics"""
+    capacity: int
+    active: int
+    high_water: int  # Most Sims active at once
+    spawned_total: int
+    recycled_total: int  # Spawns that reused a previously used slot
+    despawned_total: int
+    growth_count: int  # Times the component arrays were reallocated
+
+    @property
+    def recycle_rate(self) -> float:
+        """Fraction of spawns served from recycled slots"""
+        return self.recycled_total / self.spawned_total if self.spawned_total else 0.0
+
+
+class SimWorld:
+    """
+    Component arrays for a fixed-capacity pool of Sim slots.
+    Free slots sit on a LIFO free-list, so daily commuters are recycled into
+    recently released slots instead of being constructed: spawn and despawn
+    are O(count) with no per-Sim allocation. When the pool runs dry it grows
+    by `growth_factor` (up to `max_capacity`); call reserve() ahead of a
+    known peak to keep reallocation out of the rush entirely.
+    Sim ids are slot indices, so iterating active ids in ascending order is
+    stable between runs. Every active Sim sits below `extent`, and per-tick
+    queries (active_ids, ids_in_state) scan only that span; compact() moves
+    Sims down into free slots when a pool that emptied out (the on-screen
+    world once most Sims went dormant) keeps a long, sparse span.
+    """
+
+    def __init__(self, capacity: int = MAX_SIMS, growth_factor: float = SIM_POOL_GROWTH_FACTOR,
+                 max_capacity: int | None = None):
+        """Preallocate all component arrays"""
+        if growth_factor < 1.0:
+            raise ValueError("growth_factor must be >= 1.0")
+        self.capacity = capacity
+        self.growth_factor = growth_factor
+        self.max_capacity = max_capacity
+
+        for name, (dtype, fill) in COMPONENTS.items():
+            setattr(self, name, np.full(capacity, fill, dtype=dtype))
+
+        # Free-list stack: top of stack is the end; pops yield ascending fresh ids
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self._free_top = capacity
+        self._fresh_watermark = 0  # Slots below this id have been used before
+
+        self.active_count = 0
+        self.extent = 0  # One past the highest active slot
+
+        # Statistics
+        self.high_water = 0
+        self.spawned_total = 0
+        self.recycled_total = 0
+        self.despawned_total = 0
+        self.growth_count = 0
+        self.compactions = 0
+
+    @property
+    def free_count(self) -> int:
+        """Number of unused slots"""
+        return self._free_top
+
+    # ------------------------------------------------------------------
+    # Pool management
+    # ------------------------------------------------------------------
+    def reserve(self, count: int):
+        """Ensure at least `count` free slots, growing now rather than mid-rush (even for fixed pools)"""
+        if count > self._free_top:
+            self._grow(self.capacity + count - self._free_top)
+
+    def _grow(self, min_capacity: int):
+        """Reallocate component arrays to at least min_capacity slots"""
+        new_capacity = max(min_capacity, int(np.ceil(self.capacity * self.growth_factor)))
+        if self.max_capacity is not None:
+            new_capacity = min(new_capacity, self.max_capacity)
+        if new_capacity < min_capacity or new_capacity <= self.capacity:
+            raise ValueError(f"SimWorld full: capacity {self.capacity}, "
+                             f"{self._free_top} slots free, cannot grow to {min_capacity}")
+
+        old_capacity = self.capacity
+        for name, (dtype, fill) in COMPONENTS.items():
+            grown = np.full(new_capacity, fill, dtype=dtype)
+            grown[:old_capacity] = getattr(self, name)
+            setattr(self, name, grown)
+
+        # New slots go beneath existing free slots so recycled ones are used first
+        new_slots = np.arange(new_capacity - 1, old_capacity - 1, -1, dtype=np.int32)
+        free = np.empty(new_capacity, dtype=np.int32)
+        free[:len(new_slots)] = new_slots
+        free[len(new_slots):len(new_slots) + self._free_top] = self._free[:self._free_top]
+        self._free = free
+        self._free_top += len(new_slots)
+
+        self.capacity = new_capacity
+        self.growth_count += 1
+
+    def stats(self) -> PoolStats:
+        """Snapshot of pool statistics"""
+        return PoolStats(self.capacity, self.active_count, self.high_water, self.spawned_total,
+                         self.recycled_total, self.despawned_total, self.growth_count)
+
+    # ------------------------------------------------------------------
+    # Spawning
+    # ------------------------------------------------------------------
+    def spawn(self, count: int, floor, segment, home_room=NO_ROOM, work_room=NO_ROOM,
+              seat=NO_SEAT, profile=PROFILE_OFFICE_WORKER) -> np.ndarray:
+        """
+        Activate `count` Sims. Positions and rooms may be scalars or arrays of length count.
+        Returns the new Sim ids.
+        """
+        if count > self._free_top:
+            if self.growth_factor <= 1.0:
+                raise ValueError(f"SimWorld full: requested {count}, {self._free_top} slots free")
+            self._grow(self.capacity + count - self._free_top)
+
+        top = self._free_top
+        ids = self._free[top - count:top][::-1].copy()
+        self._free_top = top - count
+
+        if count:
+            self.recycled_total += int(np.count_nonzero(ids < self._fresh_watermark))
+            self._fresh_watermark = max(self._fresh_watermark, int(ids.max()) + 1)
+
+        self.active[ids] = True
+        if count:
+            self.extent = max(self.extent, int(ids.max()) + 1)
+        self.floor[ids] = floor
+        self.segment[ids] = segment
+        self.target_floor[ids] = floor
+        self.target_segment[ids] = segment
+        self.home_room[ids] = home_room
+        self.work_room[ids] = work_room
+        self.seat[ids] = seat
+        self.state[ids] = SIM_STATE_IDLE
+        self.stress[ids] = 0.0
+        self.stress_level[ids] = STRESS_BLACK
+        self.trips[ids] = 0
+        self.ride_remaining[ids] = 0.0
+        self.leg_link[ids] = NO_LEG
+        self.leg_floor[ids] = floor
+        self.leg_wait[ids] = 0.0
+        self.trip[ids] = TRIP_NONE
+        self.profile[ids] = profile
+        self.behavior[ids] = BEHAVIOR_OUTSIDE
+
+        self.active_count += count
+        self.spawned_total += count
+        self.high_water = max(self.high_water, self.active_count)
+        return ids
+
+    def despawn(self, ids: np.ndarray):
+        """Deactivate Sims and return their slots to the free-list"""
+        ids = np.unique(np.asarray(ids, dtype=np.int32))
+        ids = ids[self.active[ids]]
+        count = len(ids)
+        if count == 0:
+            return
+
+        self.active[ids] = False
+        self._free[self._free_top:self._free_top + count] = ids[::-1]
+        self._free_top += count
+        if ids[-1] == self.extent - 1:
+            self._shrink_extent()
+
+        self.active_count -= count
+        self.despawned_total += count
+
+    def compact(self, pinned: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Move active Sims down into the lowest free slots, keeping their
+        order, so the active span is as short as it can be. Sims in the
+        `pinned` mask keep their slots (others hold their ids). Returns the
+        old and new ids of the Sims that moved; free slots are handed out
+        lowest first afterwards.
+        """
+        extent = self.extent
+        active = self.active[:extent]
+        keep = active & pinned[:extent] if pinned is not None else np.zeros(extent, dtype=bool)
+        sources = np.flatnonzero(active & ~keep)
+        targets = np.flatnonzero(~keep)[:len(sources)]  # Never above its source: order is kept
+        moved = sources != targets
+        sources, targets = sources[moved], targets[moved]
+        if len(sources):
+            for name in COMPONENTS:
+                if name != 'active':
+                    array = getattr(self, name)
+                    array[targets] = array[sources]
+            self.active[sources] = False
+            self.active[targets] = True
+        free = np.flatnonzero(~self.active)[::-1].astype(np.int32)
+        self._free[:len(free)] = free
+        self._free_top = len(free)
+        self._shrink_extent()
+        self.compactions += 1
+        return sources, targets
+
+    def _shrink_extent(self):
+        """Pull `extent` down to one past the highest active slot"""
+        ids = np.flatnonzero(self.active[:self.extent])
+        self.extent = int(ids[-1]) + 1 if len(ids) else 0
+
+    def transfer_to(self, other: 'SimWorld', ids: np.ndarray) -> np.ndarray:
+        """
+        Move Sims into another world with every component intact.
+        Returns their ids in `other` (in the same order as `ids`).
+        """
+        ids = np.asarray(ids, dtype=np.int32)
+        new_ids = other.spawn(len(ids), floor=self.floor[ids], segment=self.segment[ids])
+        for name in COMPONENTS:
+            if name != 'active':
+                getattr(other, name)[new_ids] = getattr(self, name)[ids]
+        self.despawn(ids)
+        return new_ids
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def active_ids(self) -> np.ndarray:
+        """Ids of active Sims in ascending order"""
+        return np.flatnonzero(self.active[:self.extent])
+
+    def ids_in_state(self, state: int) -> np.ndarray:
+        """Ids of active Sims in the given state, ascending; scans only the active span"""
+        extent = self.extent
+        return np.flatnonzero(self.active[:extent] & (self.state[:extent] == state))
+
+    def mask_in_state(self, state: int) -> np.ndarray:
+        """Boolean mask of active Sims in the given state"""
+        return self.active & (self.state == state)
+
+    def count_in_state(self, state: int) -> int:
+        """Number of active Sims in the given state"""
+        return int(np.count_nonzero(self.mask_in_state(state)))
+
+    def held_by_cars(self) -> np.ndarray:
+        """Mask of active Sims queued for or riding in an elevator car"""
+        return self.active & ((self.leg_wait == HELD_BY_CAR) | (self.ride_remaining == HELD_BY_CAR))
+
+    def count_moving(self) -> int:
+        """Number of active Sims that are not idle inside a room"""
+        return int(np.count_nonzero(self.active & (self.state != SIM_STATE_IDLE)))
+
+    def add_to_hash(self, hasher):
+        """Feed component state of active Sims into a StateHasher, in id order"""
+        ids = self.active_ids()
+        hasher.add_bytes(ids.astype(np.int64))
+        for name in COMPONENTS:
+            if name != 'active':
+                hasher.add_bytes(np.ascontiguousarray(getattr(self, name)[ids]))
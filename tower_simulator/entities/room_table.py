@@ -0,0 +1,53 @@
+"""
+Column-oriented room table for vectorized simulation systems
+"""
+import numpy as np
+
+from tower_simulator.constants import ENTITY_DATA
+from tower_simulator.entities.room import RoomEntity
+
+# Stable integer codes for room types (index into this tuple)
+ROOM_TYPE_CODES = tuple(ENTITY_DATA.keys())
+ROOM_TYPE_UNKNOWN = len(ROOM_TYPE_CODES)
+_ROOM_TYPE_INDEX = {room_type: code for code, room_type in enumerate(ROOM_TYPE_CODES)}
+
+
+def room_type_code(room_type: str) -> int:
+    """Integer code for a room type (ROOM_TYPE_UNKNOWN for basement floors etc.)"""
+    return _ROOM_TYPE_INDEX.get(room_type, ROOM_TYPE_UNKNOWN)
+
+
+class RoomTable:
+    """
+    Rooms as parallel NumPy arrays. A room's id is its index in the game's
+    room list, which is append-only, so ids stay valid as the tower grows.
+    """
+
+    def __init__(self, rooms: list[RoomEntity]):
+        """Build the table from the game's room list"""
+        count = len(rooms)
+        self.level = np.empty(count, dtype=np.int16)
+        self.segment = np.empty(count, dtype=np.int16)
+        self.width = np.empty(count, dtype=np.int16)
+        self.height = np.empty(count, dtype=np.int16)
+        self.type_code = np.empty(count, dtype=np.uint8)
+        self.capacity = np.zeros(count, dtype=np.int32)
+
+        for room_id, room in enumerate(rooms):
+            self.level[room_id] = room.coordinate.level
+            self.segment[room_id] = room.coordinate.segment
+            self.width[room_id] = room.width
+            self.height[room_id] = room.height
+            self.type_code[room_id] = room_type_code(room.room_type)
+            capacity = ENTITY_DATA.get(room.room_type, {}).get('capacity')
+            self.capacity[room_id] = capacity or 0
+
+        # Sims enter and leave rooms at their horizontal center
+        self.center = (self.segment + self.width / 2.0).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.level)
+
+    def ids_of_type(self, room_type: str) -> np.ndarray:
+        """Ids of all rooms of the given type, ascending"""
+        return np.flatnonzero(self.type_code == room_type_code(room_type))
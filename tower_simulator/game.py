@@ -8,17 +8,41 @@ from tower_simulator.world.camera import Camera
 from tower_simulator.world.coordinate import Grid, Coordinate
 from tower_simulator.entities.room import RoomEntity
 from tower_simulator.entities.rooms.lobby import Lobby
-from tower_simulator.constants import INITIAL_FUNDS, ENTITY_DATA
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.entities.ecs import SimWorld
+from tower_simulator.constants import (
+    INITIAL_FUNDS, ENTITY_DATA, SIM_TICK_SECONDS, DEFAULT_SIMULATION_SEED, STATE_HASH_LOG_INTERVAL,
+    LOD_LEVEL_MARGIN,
+)
 from tower_simulator.ui.toolbox import Toolbox
 from tower_simulator.ui.status_bar import StatusBar
 from tower_simulator.ui.ghost_room import GhostRoom
+from tower_simulator.ui.reachability_overlay import ReachabilityOverlay
 from tower_simulator.systems.placement_validator import PlacementValidator
+from tower_simulator.systems.time_manager import (
+    TimeManager, EVENT_DAY_START, EVENT_QUARTER_START, EVENT_YEAR_START, EVENT_STATE_HASH,
+)
+from tower_simulator.systems.time_warp import TimeWarp
+from tower_simulator.systems.sim_systems import MovementSystem, StressSystem, SchedulingSystem, LOBBY_LEVEL
+from tower_simulator.systems.sim_lod import SimLevelOfDetail
+from tower_simulator.systems.sim_transit import TransitSystem
+from tower_simulator.systems.trip_planner import TripPlanner, TripQueue, TripTable
+from tower_simulator.systems.elevator_dispatch import ElevatorDispatcher
+from tower_simulator.systems.elevator_motion import ElevatorMotion
+from tower_simulator.systems.elevator_prepositioning import ElevatorPrepositioner
+from tower_simulator.systems.reachability import ReachabilityMap
+from tower_simulator.systems.route_table import RouteTable
+from tower_simulator.systems.route_weights import CongestionWeights
+from tower_simulator.systems.transit_graph import TransitGraph
+from tower_simulator.systems.walkways import WalkingModel
+from tower_simulator.systems.zone_router import ZoneRouter
+from tower_simulator.utils.determinism import SimulationRNG, StateHasher, StateHashLogger
 
 
 class TowerSimulatorGame:
     """Main game class"""
 
-    def __init__(self):
+    def __init__(self, seed: int = DEFAULT_SIMULATION_SEED, hash_interval_ticks: int = STATE_HASH_LOG_INTERVAL):
         """Initialize the game"""
         pygame.init()
         
@@ -46,6 +70,64 @@ class TowerSimulatorGame:
         self.population = 0
         self.star_rating = 1
         
+        # World Clock - systems subscribe to its events instead of polling
+        self.time_manager = TimeManager()
+        self.time_manager.install_default_schedule()
+        self.time_manager.subscribe(EVENT_DAY_START, self._on_day_start)
+        self.time_manager.subscribe(EVENT_QUARTER_START, self._on_quarter_start)
+        self.time_manager.subscribe(EVENT_YEAR_START, self._on_year_start)
+        self.time_warp = TimeWarp(self.time_manager, step_callback=self._simulation_step,
+                                  is_idle=self._is_simulation_idle)
+        
+        # Determinism - independent seeded streams per subsystem
+        self.rng = SimulationRNG(seed)
+        self.state_hash_logger = None
+        if hash_interval_ticks > 0:
+            interval = hash_interval_ticks * SIM_TICK_SECONDS
+            self.state_hash_logger = StateHashLogger(hash_interval_ticks)
+            self.time_manager.schedule_in(interval, EVENT_STATE_HASH, interval=interval)
+            self.time_manager.subscribe(EVENT_STATE_HASH, self._on_state_hash)
+        
+        # Sim agents (ECS) and the systems that drive them
+        self.sims = SimWorld()
+        self.room_table = RoomTable(self.rooms)
+        self.movement_system = MovementSystem()
+        self.stress_system = StressSystem()
+        self.scheduling_system = SchedulingSystem(self.sims, self.room_table)
+        
+        # Level of detail - Sims far from the viewport run in the aggregate flow model
+        self.sim_lod = SimLevelOfDetail(self.sims, self.stress_system)
+        self.dormant_scheduling_system = SchedulingSystem(self.sim_lod.dormant, self.room_table,
+                                                          behavior=self.scheduling_system.behavior,
+                                                          journey_callback=self._on_dormant_journeys)
+        self.sim_lod.stressed_callback = self.dormant_scheduling_system.on_stressed
+        
+        # Daily trip table - the whole day's travel demand, drained by the World Clock
+        self.trip_planner = TripPlanner(self.rng)
+        self.trip_queue = TripQueue(self.time_manager, self._on_trips_due)
+        
+        # Elevators - SCAN dispatch over per-shaft call bitmasks
+        self.elevators = ElevatorDispatcher()
+        self.elevator_motion = ElevatorMotion(self.time_manager, self.elevators)
+        self.elevator_prepositioner = ElevatorPrepositioner(self.time_manager, self.elevator_motion,
+                                                            self.room_table)
+        
+        # Transit graph - levels joined by stairs, escalators and shafts, edited in place
+        self.transit_graph = TransitGraph()
+        self.walkways = WalkingModel(self.transit_graph)
+        self.route_table = RouteTable(self.transit_graph, walkways=self.walkways)
+        self.route_weights = CongestionWeights(self.time_manager, self.transit_graph, self.route_table)
+        self.zone_router = ZoneRouter(self.route_table)
+        self.reachability = ReachabilityMap(self.route_table)
+        
+        # Transit legs - waiting Sims ride the cars on screen and timed legs everywhere else
+        self.transit_system = TransitSystem(self.sims, self.route_table, self.elevator_motion,
+                                            weights=self.route_weights)
+        self.elevator_motion.on_doors_open = self.transit_system.on_doors_open
+        self.dormant_transit_system = TransitSystem(self.sim_lod.dormant, self.route_table)
+        self.sim_lod.plan_callback = self.dormant_transit_system.update
+        self.scheduling_system.journey_callback = self.transit_system.plan_journeys
+        
         # UI elements
         self.toolbox = Toolbox()
         self.status_bar = StatusBar(self.WIDTH)
@@ -57,15 +139,22 @@ class TowerSimulatorGame:
         
         # Create default lobby at level 1
         self._initialize_default_layout()
+        # Trips for the rest of today; later days are planned at day rollover
+        self.trip_queue.load(self.trip_planner.plan_day(self.room_table, self.time_manager.day,
+                                                        start_time=self.time_manager.now))
         
         # Grid display toggle
         self.show_grid = True
+        # Unreachable-room overlay toggle
+        self.show_reachability = False
+        self.reachability_overlay = ReachabilityOverlay()
         
         print("Tower Simulator initialized!")
         print(f"Resolution: {self.WIDTH}x{self.HEIGHT}")
         print(f"Grid: {Grid.WIDTH} segments x {Grid.HEIGHT} levels")
         print(f"Pixel size: {Grid.PIXELS_PER_SEGMENT}px per segment, {Grid.PIXELS_PER_LEVEL}px per level")
-        print("Controls: WASD to scroll, G to toggle grid, ESC to exit")
+        print("Controls: WASD to scroll, G to toggle grid, R to show unreachable rooms, ESC to exit")
+        print("Time: 1-4 for 1x/10x/100x/MAX speed, N to toggle skip-to-next-event")
 
     def _initialize_default_layout(self):
         """Initialize the default tower layout with basement floors and ground lobby floor"""
@@ -81,12 +170,14 @@ class TowerSimulatorGame:
                 color=basement_color
             )
             self.rooms.append(basement_floor)
+            self.walkways.add_room(len(self.rooms) - 1, basement_floor)
         
         # Note: Level 0 is reserved for LOBBY placement
         # No default ground entity - level 0 is for player-placed lobby segments
         
         # Update validator with all rooms
         self.validator.update_rooms(self.rooms)
+        self._refresh_room_table()
 
     def _create_ghost_room(self, tool_id: str):
         """Create a ghost room preview for the selected tool"""
@@ -107,50 +198,67 @@ class TowerSimulatorGame:
         self.selected_tool = tool_id
 
     def _place_room(self):
+        """Place the current ghost room if valid, then clear the selection"""
+        if not self.ghost_room:
+            return
+        if self.place_room(self.ghost_room.room_type, self.ghost_room.coordinate,
+                           self.ghost_room.width, self.ghost_room.height):
+            # Clear ghost room and selection
+            self.ghost_room = None
+            self.selected_tool = None
+
+    def place_room(self, room_type: str, coordinate: Coordinate, width: int, height: int = 1) -> RoomEntity | None:
         """
-        Place the current ghost room if valid.
+        Place a room if valid.
         Handles fund deduction, entity creation, and game state updates.
+        Returns the placed room, or None if it could not be placed.
         """
-        # Validation checks
-        if not self.ghost_room:
-            return
-        
         # Perform a final, logged validation check before placing
         can_place_final, reason = self.validator.can_place(
-            self.ghost_room.room_type,
-            self.ghost_room.coordinate,
-            self.ghost_room.width,
-            self.ghost_room.height,
+            room_type,
+            coordinate,
+            width,
+            height,
             log_attempt=True  # Enable logging for this specific attempt
         )
         
         if not can_place_final:
-            print(f"❌ Cannot place {self.ghost_room.room_type} at {self.ghost_room.coordinate} - Reason: {reason}")
-            # The ghost room is already red, so just returning is enough
-            return
+            print(f"❌ Cannot place {room_type} at {coordinate} - Reason: {reason}")
+            return None
         
-        # Get room type and entity data
-        room_type = self.ghost_room.room_type
+        # Get entity data
         entity_data = ENTITY_DATA.get(room_type)
         
         if not entity_data:
             print(f"❌ Unknown room type: {room_type}")
-            return
+            return None
         
         # Calculate cost
-        cost = self._calculate_room_cost(room_type, entity_data)
+        cost = self._calculate_room_cost(room_type, entity_data, width)
         
         # Check if player has enough funds
         if self.funds < cost:
             print(f"❌ Insufficient funds! Cost: ${cost:,}, Available: ${self.funds:,}")
-            return
+            return None
         
         # Create the actual room entity
-        new_room = self._create_room_entity(room_type, entity_data)
+        new_room = self._create_room_entity(room_type, entity_data, coordinate, width, height)
         
         if not new_room:
             print(f"❌ Failed to create room entity for {room_type}")
-            return
+            return None
+        
+        # Elevator shafts also get a dispatcher shaft over the levels they span
+        shaft = None
+        if room_type == 'elevator_shaft':
+            try:
+                shaft = self.elevators.add_shaft(new_room.coordinate.level,
+                                         new_room.coordinate.level + new_room.height - 1,
+                                         entity_data.get('cars_per_shaft_default', 1),
+                                         new_room.coordinate.segment)
+            except ValueError as error:
+                print(f"❌ Cannot place {room_type}: {error}")
+                return None
         
         # Deduct funds
         self.funds -= cost
@@ -159,22 +267,35 @@ class TowerSimulatorGame:
         
         # Add room to game world
         self.rooms.append(new_room)
+        self.transit_graph.add_room(len(self.rooms) - 1, new_room)
+        self.walkways.add_room(len(self.rooms) - 1, new_room)
+        self.reachability.add_room(len(self.rooms) - 1, new_room)
+        if shaft is not None:
+            self.transit_system.add_shaft(len(self.rooms) - 1, shaft)
+        if entity_data.get('type') not in ('transit', 'transport'):
+            commute = self.commute_seconds(new_room.coordinate.level)
+            if commute == float('inf'):
+                print(f"   ⚠️ No route from the lobby to level {new_room.coordinate.level} yet")
+            else:
+                print(f"   Commute from the lobby: {commute:.0f} s")
         
         # Update validator with new room list
         self.validator.update_rooms(self.rooms)
-        
-        # Clear ghost room and selection
-        self.ghost_room = None
-        self.selected_tool = None
+        self._refresh_room_table()
+        return new_room
 
-    def _calculate_room_cost(self, room_type: str, entity_data: dict) -> int:
+    def commute_seconds(self, level: int) -> float:
+        """Expected seconds from the lobby to a level (inf if Sims cannot get there)"""
+        return self.zone_router.route_cost(LOBBY_LEVEL, level)
+
+    def _calculate_room_cost(self, room_type: str, entity_data: dict, width: int) -> int:
         """
         Calculate the cost to place a room.
         Some items have per-segment costs (lobby), others have fixed costs.
         """
         # Items with per-segment cost
         if room_type == 'lobby':
-            return entity_data.get('cost_per_segment', 500) * self.ghost_room.width
+            return entity_data.get('cost_per_segment', 500) * width
         
         if room_type == 'elevator_shaft':
             # Cost: shaft cost + per-car cost
@@ -186,7 +307,8 @@ class TowerSimulatorGame:
         # Standard fixed cost
         return entity_data.get('cost', 0)
 
-    def _create_room_entity(self, room_type: str, entity_data: dict) -> RoomEntity:
+    def _create_room_entity(self, room_type: str, entity_data: dict, coordinate: Coordinate,
+                            width: int, height: int) -> RoomEntity:
         """
         Create the appropriate room entity based on type.
         Uses factory pattern for different room types.
@@ -195,18 +317,18 @@ class TowerSimulatorGame:
             # Lobby - special handling
             if room_type == 'lobby':
                 return Lobby(
-                    coordinate=self.ghost_room.coordinate,
-                    width=self.ghost_room.width
+                    coordinate=coordinate,
+                    width=width
                 )
             
             # Standard room entity
             color = entity_data.get('color', (200, 200, 200))
-            cost = self._calculate_room_cost(room_type, entity_data)
+            cost = self._calculate_room_cost(room_type, entity_data, width)
             
             return RoomEntity(
-                coordinate=self.ghost_room.coordinate,
-                width=self.ghost_room.width,
-                height=self.ghost_room.height,
+                coordinate=coordinate,
+                width=width,
+                height=height,
                 room_type=room_type,
                 cost=cost,
                 color=color
@@ -249,6 +371,14 @@ class TowerSimulatorGame:
                     self.running = False
                 elif event.key == pygame.K_g:
                     self.show_grid = not self.show_grid
+                elif event.key == pygame.K_r:
+                    self.show_reachability = not self.show_reachability
+                elif event.key in (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4):
+                    self.time_warp.set_speed(event.key - pygame.K_1)
+                    print(f"⏩ Time warp: {self.time_warp.label}")
+                elif event.key == pygame.K_n:
+                    self.time_warp.toggle_skip_mode()
+                    print(f"⏩ Time warp: {self.time_warp.label}")
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
                     mouse_x, mouse_y = pygame.mouse.get_pos()
@@ -258,11 +388,77 @@ class TowerSimulatorGame:
                     elif self.ghost_room:
                         self._place_room()
 
+    def _refresh_room_table(self):
+        """Rebuild the vectorized room table after the layout changes"""
+        self.room_table = RoomTable(self.rooms)
+        self.scheduling_system.set_room_table(self.room_table)
+        self.dormant_scheduling_system.set_room_table(self.room_table)
+        self.elevator_prepositioner.set_room_table(self.room_table)
+
+    def _simulation_step(self, dt: int):
+        """Run one simulation tick of the Sim systems"""
+        if self.sim_lod.population == 0:
+            return
+        self.transit_system.update()
+        self.movement_system.update(self.sims, dt)
+        # Red crossings are tallied per room inside the stress system
+        crossings = self.stress_system.update(self.sims, dt)
+        self.scheduling_system.on_stressed(crossings.red)
+        self.sim_lod.update(dt)
+        self.scheduling_system.update()
+        self.dormant_scheduling_system.update()
+
+    def _is_simulation_idle(self) -> bool:
+        """True when nothing in the tower is moving (no Sims in transit)"""
+        return self.sims.count_moving() == 0 and self.sim_lod.dormant.count_moving() == 0
+
+    def compute_state_hash(self) -> str:
+        """Hash of the simulation state, identical for identical seeded runs"""
+        hasher = StateHasher()
+        hasher.add_int(self.time_manager.now)
+        hasher.add_int(self.funds)
+        hasher.add_int(self.population)
+        hasher.add_int(self.star_rating)
+        hasher.add_rooms(self.rooms)
+        self.sim_lod.flush()
+        self.sims.add_to_hash(hasher)
+        self.sim_lod.dormant.add_to_hash(hasher)
+        return hasher.hexdigest()
+
+    def _on_state_hash(self, event):
+        """World Clock: periodic state hash for reproducibility checks"""
+        self.state_hash_logger.record(self.time_manager.now // SIM_TICK_SECONDS, self.compute_state_hash())
+
+    def _on_trips_due(self, batch: TripTable):
+        """Trip queue: start a batch of trips, looking in the dormant world for Sims not on screen"""
+        unmatched = self.scheduling_system.execute_trips(batch)
+        self.dormant_scheduling_system.execute_trips(unmatched, spawn_arrivals=False)
+
+    def _on_dormant_journeys(self, ids):
+        """Dormant scheduling: note when the Sims set off, then resolve their routes in bulk"""
+        self.sim_lod.mark_joined(ids)
+        self.dormant_transit_system.plan_journeys(ids)
+
+    def _on_day_start(self, event):
+        """World Clock: a new day has begun"""
+        self.trip_queue.load(self.trip_planner.plan_day(self.room_table, self.time_manager.day))
+        print(f"📅 Day {self.time_manager.day_of_year + 1} of Year {self.time_manager.year}")
+
+    def _on_quarter_start(self, event):
+        """World Clock: quarter rollover (rent collection and maintenance trigger)"""
+        print(f"📊 Quarter {self.time_manager.quarter + 1} begins")
+
+    def _on_year_start(self, event):
+        """World Clock: annual rollover"""
+        print(f"🎆 Year {self.time_manager.year} begins")
+
     def update(self):
         """Update game logic"""
         keys = pygame.key.get_pressed()
         self.camera.handle_input(keys)
+        self.sim_lod.set_visible_levels(*self.camera.visible_levels(LOD_LEVEL_MARGIN))
         self._update_ghost_room_position()
+        self.time_warp.update(self.clock.get_time())
 
     def draw_grid(self):
         """Draw the grid overlay"""
@@ -331,6 +527,14 @@ class TowerSimulatorGame:
         label_rect = label.get_rect(center=(screen_x + width_px // 2, screen_y + height_px // 2))
         self.screen.blit(label, label_rect)
 
+    def draw_elevator_cars(self):
+        """Draw elevator cars on screen at their interpolated positions"""
+        car_width = ENTITY_DATA['elevator_shaft']['width'] * Grid.PIXELS_PER_SEGMENT
+        for shaft, car, level in self.elevator_motion.visible_cars(*self.camera.visible_levels()):
+            screen_x, screen_y = self.camera.world_to_screen(shaft.segment * Grid.PIXELS_PER_SEGMENT,
+                                                             int(level * Grid.PIXELS_PER_LEVEL))
+            pygame.draw.rect(self.screen, (60, 60, 60), (screen_x, screen_y, car_width, Grid.PIXELS_PER_LEVEL))
+
 
     def draw(self):
         """Render the game"""
@@ -339,6 +543,10 @@ class TowerSimulatorGame:
         
         # Draw all rooms (including basement floors)
         self.draw_rooms()
+        self.draw_elevator_cars()
+        if self.show_reachability:
+            self.reachability_overlay.draw(self.screen, self.camera, self.rooms, self.reachability,
+                                           self.room_table)
         
         # Draw ghost room if active
         if self.ghost_room:
@@ -349,7 +557,9 @@ class TowerSimulatorGame:
             self.draw_grid()
         
         # Draw UI (on top)
-        self.status_bar.update(self.funds, self.population, self.star_rating)
+        self.status_bar.update(self.funds, self.population, self.star_rating,
+                               self.time_manager.hour, self.time_manager.minute,
+                               self.time_warp.label)
         self.status_bar.draw(self.screen)
         
         self.toolbox.draw(self.screen, self.font)
@@ -0,0 +1,120 @@
+"""
+Per-floor elevator boarding queues.
+Waiting Sims are held in FIFO ring buffers of Sim ids, one per shaft,
+floor and direction (and assigned car, in destination dispatch shafts).
+A car that opens its doors takes a whole batch, up to its free capacity,
+in one operation and gets back the boarded ids together with a bitmask of
+the stops they pressed. Nothing is ever popped from the front of a list
+and the Sims on a floor are never rescanned.
+"""
+import numpy as np
+
+INITIAL_QUEUE_SLOTS = 16  # Ring buffer size of a new queue; doubles when full
+
+
+def stops_mask(stops: np.ndarray) -> int:
+    """Bitmask with one bit per distinct stop index"""
+    mask = 0
+    for stop in np.unique(stops).tolist():
+        mask |= 1 << stop
+    return mask
+
+
+class RingQueue:
+    """FIFO of (Sim id, destination stop) pairs in two parallel ring buffers"""
+
+    __slots__ = ('ids', 'stops', 'head', 'size')
+
+    def __init__(self, slots: int = INITIAL_QUEUE_SLOTS):
+        self.ids = np.empty(slots, dtype=np.int32)
+        self.stops = np.empty(slots, dtype=np.int16)
+        self.head = 0  # Slot of the oldest waiting Sim
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, sim_id: int, stop: int):
+        """Append a Sim at the back of the queue. Amortized O(1)."""
+        slots = len(self.ids)
+        if self.size == slots:
+            self._grow()
+            slots = len(self.ids)
+        tail = (self.head + self.size) % slots
+        self.ids[tail] = sim_id
+        self.stops[tail] = stop
+        self.size += 1
+
+    def take(self, count: int) -> tuple[np.ndarray, np.ndarray]:
+        """Remove up to `count` Sims from the front; returns (ids, stops) in queue order"""
+        count = min(count, self.size)
+        slots = len(self.ids)
+        start, end = self.head, self.head + count
+        if end <= slots:
+            ids, stops = self.ids[start:end].copy(), self.stops[start:end].copy()
+        else:
+            # The batch wraps around the end of the buffer
+            ids = np.concatenate((self.ids[start:], self.ids[:end - slots]))
+            stops = np.concatenate((self.stops[start:], self.stops[:end - slots]))
+        self.head = end % slots
+        self.size -= count
+        if self.size == 0:
+            self.head = 0
+        return ids, stops
+
+    def _grow(self):
+        """Double the buffer, unrolling the queue to start at slot 0"""
+        order = (self.head + np.arange(self.size)) % len(self.ids)
+        ids = np.empty(2 * len(self.ids), dtype=self.ids.dtype)
+        stops = np.empty(2 * len(self.stops), dtype=self.stops.dtype)
+        ids[:self.size] = self.ids[order]
+        stops[:self.size] = self.stops[order]
+        self.ids, self.stops, self.head = ids, stops, 0
+
+
+class BoardingQueues:
+    """
+    Every waiting Sim of a dispatcher, queued by (shaft, stop, direction)
+    and, where destination dispatch assigned one, the car it waits for.
+    """
+
+    def __init__(self):
+        self.queues: dict[tuple, RingQueue] = {}
+        self.counts: dict[tuple, int] = {}  # Waiting Sims per (shaft, stop, direction), all cars
+
+        # Statistics
+        self.pushed = 0
+        self.boarded = 0
+        self.batches = 0
+
+    def push(self, shaft, stop: int, direction: int, sim_id: int, destination_stop: int, car=None):
+        """Queue a Sim at a floor. `car` is its assigned car in destination dispatch shafts."""
+        key = (shaft, stop, direction, car)
+        queue = self.queues.get(key)
+        if queue is None:
+            queue = self.queues[key] = RingQueue()
+        queue.push(sim_id, destination_stop)
+        self.counts[key[:3]] = self.counts.get(key[:3], 0) + 1
+        self.pushed += 1
+
+    def waiting(self, shaft, stop: int, direction: int, car=None) -> int:
+        """Sims waiting at a floor for a direction: all of them, or only those assigned to `car`"""
+        if car is None:
+            return self.counts.get((shaft, stop, direction), 0)
+        queue = self.queues.get((shaft, stop, direction, car))
+        return len(queue) if queue is not None else 0
+
+    def board(self, shaft, stop: int, direction: int, capacity: int, car=None) -> tuple[np.ndarray, int]:
+        """
+        Board up to `capacity` Sims from the front of a queue in one batch.
+        Returns the boarded Sim ids, oldest first, and the bitmask of their
+        destination stops for the car to press.
+        """
+        queue = self.queues.get((shaft, stop, direction, car))
+        if queue is None or not queue.size or capacity <= 0:
+            return np.empty(0, dtype=np.int32), 0
+        ids, stops = queue.take(capacity)
+        self.counts[shaft, stop, direction] -= len(ids)
+        self.boarded += len(ids)
+        self.batches += 1
+        return ids, stops_mask(stops)
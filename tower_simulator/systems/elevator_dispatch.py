@@ -0,0 +1,358 @@
+"""
+SCAN elevator dispatching on integer bitmasks.
+Each shaft keeps its up and down hall calls, and each car its car calls,
+as Python ints with one bit per served level (bit 0 = the shaft's bottom
+level). "Next stop in the current direction" and "any calls below" are
+then a handful of bit operations instead of scans over a list of floors.
+In destination dispatch mode the hall calls live on the car each Sim was
+assigned to, and the same SCAN sweep runs over that car's own masks.
+Corridor mode does the same for cars stacked in one hoistway, with the
+assignment made by systems/shaft_scheduler.py.
+"""
+from tower_simulator.constants import (
+    SCAN_ALGORITHM_ENABLED, MAX_ELEVATOR_SHAFTS, MAX_CARS_PER_SHAFT,
+    WAITING_CAR_RESPONSE_RANGE, STANDARD_FLOOR_DEPARTURE,
+)
+
+DIRECTION_DOWN = -1
+DIRECTION_IDLE = 0
+DIRECTION_UP = 1
+
+# Shaft dispatch modes
+DISPATCH_SCAN = 0  # Shared up/down hall buttons; any car answers
+DISPATCH_DESTINATION = 1  # Sims enter their floor at the hall; each is assigned a car
+DISPATCH_CORRIDOR = 2  # Destination entry for cars stacked in one hoistway (systems/shaft_scheduler.py)
+
+# Car phases (driven by World Clock events, see systems/elevator_motion.py)
+CAR_IDLE = 0  # Parked with doors closed
+CAR_MOVING = 1  # Travelling from origin to target
+CAR_DOORS_OPEN = 2  # Stopped at a floor until the floor departure time is up
+
+
+def lowest_bit(mask: int) -> int:
+    """Index of the lowest set bit (mask must be non-zero)"""
+    return (mask & -mask).bit_length() - 1
+
+
+def highest_bit(mask: int) -> int:
+    """Index of the highest set bit (mask must be non-zero)"""
+    return mask.bit_length() - 1
+
+
+def bits_above(index: int) -> int:
+    """Mask of every bit strictly above index"""
+    return -1 << (index + 1)
+
+
+def bits_below(index: int) -> int:
+    """Mask of every bit strictly below index"""
+    return (1 << index) - 1
+
+
+class ElevatorCar:
+    """One car in a shaft. Positions are bit indices relative to the shaft bottom."""
+
+    __slots__ = ('index', 'position', 'direction', 'car_calls', 'up_calls', 'down_calls', 'assigned', 'pending',
+                 'phase', 'target', 'target_direction', 'depart_time', 'arrival_time', 'event')
+
+    def __init__(self, index: int, position: int = 0):
+        self.index = index  # Car number within its shaft
+        self.position = position  # Stop index the car is at (the origin while moving)
+        self.direction = DIRECTION_IDLE
+        self.car_calls = 0  # Destination buttons pressed inside the car
+
+        # Destination dispatch: pickups and destinations of Sims assigned to this car
+        self.up_calls = 0
+        self.down_calls = 0
+        self.assigned = 0  # Destinations of assigned Sims, until all of them have boarded
+        self.pending = 0  # Assigned Sims not yet boarded
+
+        # Current journey; positions in between are interpolated, never stepped
+        self.phase = CAR_IDLE
+        self.target = position
+        self.target_direction = DIRECTION_IDLE
+        self.depart_time = 0
+        self.arrival_time = 0
+        self.event = None  # Pending World Clock event (arrival or doors close)
+
+    def __repr__(self) -> str:
+        return f"ElevatorCar({self.index}, position={self.position}, direction={self.direction})"
+
+
+class ElevatorShaft:
+    """
+    A shaft serving a contiguous range of levels with up to
+    MAX_CARS_PER_SHAFT cars. Every dispatch query is O(1) in the number of
+    floors: a few masks, one `bit_length` each.
+    """
+
+    def __init__(self, bottom_level: int, top_level: int, car_count: int = 1, segment: int = 0,
+                 scan: bool = SCAN_ALGORITHM_ENABLED, mode: int = DISPATCH_SCAN):
+        """Create a shaft with its cars parked at the bottom level"""
+        if top_level < bottom_level:
+            raise ValueError(f"Elevator shaft top level {top_level} is below its bottom level {bottom_level}")
+        if not 1 <= car_count <= MAX_CARS_PER_SHAFT:
+            raise ValueError(f"Elevator shaft supports 1-{MAX_CARS_PER_SHAFT} cars, got {car_count}")
+
+        self.bottom_level = bottom_level
+        self.top_level = top_level
+        self.segment = segment
+        self.scan = scan
+        self.mode = mode
+        self.departure_seconds = STANDARD_FLOOR_DEPARTURE[0]  # Doors held this long after a Sim boards
+        self.waiting_car_response = WAITING_CAR_RESPONSE_RANGE[0]  # Floors a moving car may be from a call
+        self.stop_count = top_level - bottom_level + 1
+        self.all_stops = (1 << self.stop_count) - 1
+
+        self.up_calls = 0  # Hall calls waiting to go up (SCAN mode)
+        self.down_calls = 0  # Hall calls waiting to go down (SCAN mode)
+        self.cars = [ElevatorCar(index) for index in range(car_count)]
+
+    # ------------------------------------------------------------------
+    # Levels
+    # ------------------------------------------------------------------
+    def serves(self, level: int) -> bool:
+        """True if the shaft stops at this level"""
+        return self.bottom_level <= level <= self.top_level
+
+    def stop_index(self, level: int) -> int:
+        """Bit index of a served level"""
+        if not self.serves(level):
+            raise ValueError(f"Level {level} is outside shaft range {self.bottom_level}-{self.top_level}")
+        return level - self.bottom_level
+
+    def level_of(self, stop: int) -> int:
+        """Level of a bit index"""
+        return self.bottom_level + stop
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+    def call(self, level: int, direction: int):
+        """Register a hall call at a level"""
+        bit = 1 << self.stop_index(level)
+        if direction == DIRECTION_UP:
+            self.up_calls |= bit
+        elif direction == DIRECTION_DOWN:
+            self.down_calls |= bit
+        else:
+            raise ValueError("Hall call direction must be up or down")
+
+    def press(self, car: ElevatorCar, level: int):
+        """Register a destination pressed inside a car"""
+        car.car_calls |= 1 << self.stop_index(level)
+
+    def press_stops(self, car: ElevatorCar, stops: int):
+        """Register a batch of destinations (a bitmask of stop indices) inside a car"""
+        car.car_calls |= stops
+
+    @property
+    def hall_calls(self) -> int:
+        """Every level with a waiting passenger"""
+        calls = self.up_calls | self.down_calls
+        for car in self.cars:
+            calls |= car.up_calls | car.down_calls
+        return calls
+
+    def _hall(self, car: ElevatorCar):
+        """Holder of the hall calls a car answers: the shaft in SCAN mode, otherwise the car itself"""
+        return self if self.mode == DISPATCH_SCAN else car
+
+    def car_hall_calls(self, car: ElevatorCar) -> int:
+        """Hall calls this car may answer"""
+        hall = self._hall(car)
+        return hall.up_calls | hall.down_calls
+
+    def has_calls_above(self, car: ElevatorCar) -> bool:
+        """Any hall or car call above the car"""
+        return bool((self.car_hall_calls(car) | car.car_calls) & bits_above(car.position))
+
+    def has_calls_below(self, car: ElevatorCar) -> bool:
+        """Any hall or car call below the car"""
+        return bool((self.car_hall_calls(car) | car.car_calls) & bits_below(car.position))
+
+    # ------------------------------------------------------------------
+    # Destination dispatch
+    # ------------------------------------------------------------------
+    def zone_of(self, stop: int) -> int:
+        """Destination zone of a stop: the served range split into one band per car"""
+        return stop * len(self.cars) // self.stop_count
+
+    def assign(self, origin_level: int, destination_level: int, capacity: int) -> ElevatorCar:
+        """
+        Assign a Sim who entered its destination at the hall to a car.
+        Each car owns the zone of its index; a trip belongs to the zone of
+        its upper floor (the destination going up, the origin coming down),
+        so a car's passengers share few stops. Within that, prefer the car
+        that needs the fewest extra stops, then the least loaded. Cars with
+        `capacity` Sims waiting to board are skipped while any has room.
+        """
+        origin, destination = self.stop_index(origin_level), self.stop_index(destination_level)
+        stops = (1 << origin) | (1 << destination)
+        zone = self.zone_of(max(origin, destination))
+        open_cars = [car for car in self.cars if car.pending < capacity] or self.cars
+        car = min(open_cars, key=lambda c: (
+            c.index != zone, (stops & ~(c.assigned | c.car_calls | c.up_calls | c.down_calls)).bit_count(),
+            c.pending, c.index))
+        self.commit(car, origin, destination)
+        return car
+
+    def commit(self, car: ElevatorCar, origin: int, destination: int):
+        """Give a car the pickup and destination (stop indices) of one assigned Sim"""
+        if destination > origin:
+            car.up_calls |= 1 << origin
+        else:
+            car.down_calls |= 1 << origin
+        car.assigned |= 1 << destination
+        car.pending += 1
+
+    def boarded(self, car: ElevatorCar, count: int, level: int, direction: int, waiting_left: bool):
+        """
+        Assigned Sims got on at a level. If some are still waiting (the car
+        filled up) the car keeps the pickup and comes back for them. Once
+        every assigned Sim is aboard, their destinations are all car calls.
+        """
+        car.pending -= count
+        if not car.pending:
+            car.assigned = 0
+        bit = 1 << self.stop_index(level)
+        if direction == DIRECTION_UP:
+            car.up_calls = car.up_calls | bit if waiting_left else car.up_calls & ~bit
+        else:
+            car.down_calls = car.down_calls | bit if waiting_left else car.down_calls & ~bit
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+    def next_stop(self, car: ElevatorCar) -> tuple[int | None, int]:
+        """
+        Decide the car's next stop and travel direction. Returns
+        (stop index, direction), or (None, DIRECTION_IDLE) with no calls.
+
+        SCAN: keep going while there is anything ahead - the nearest car
+        call or same-direction hall call ahead, otherwise the farthest
+        opposite-direction hall call ahead (where the sweep reverses).
+        With nothing ahead, sweep the other way. An idle car heads for the
+        nearest call, which may be at its own level.
+        """
+        if not self.scan:
+            return self._nearest_stop(car)
+
+        if car.direction == DIRECTION_UP:
+            stop = self._sweep_up(car)
+            if stop is not None:
+                return stop, DIRECTION_UP
+            stop = self._sweep_down(car)
+            if stop is not None:
+                return stop, DIRECTION_DOWN
+        elif car.direction == DIRECTION_DOWN:
+            stop = self._sweep_down(car)
+            if stop is not None:
+                return stop, DIRECTION_DOWN
+            stop = self._sweep_up(car)
+            if stop is not None:
+                return stop, DIRECTION_UP
+        # Idle, or the only call left is at the car's own level
+        return self._nearest_stop(car)
+
+    def _sweep_up(self, car: ElevatorCar) -> int | None:
+        """Next stop while moving up from the car's position, or None"""
+        hall = self._hall(car)
+        above = bits_above(car.position)
+        ahead = (car.car_calls | hall.up_calls) & above
+        if ahead:
+            return lowest_bit(ahead)
+        reverse = hall.down_calls & above
+        if reverse:
+            return highest_bit(reverse)
+        return None
+
+    def _sweep_down(self, car: ElevatorCar) -> int | None:
+        """Next stop while moving down from the car's position, or None"""
+        hall = self._hall(car)
+        below = bits_below(car.position)
+        ahead = (car.car_calls | hall.down_calls) & below
+        if ahead:
+            return highest_bit(ahead)
+        reverse = hall.up_calls & below
+        if reverse:
+            return lowest_bit(reverse)
+        return None
+
+    def _nearest_stop(self, car: ElevatorCar) -> tuple[int | None, int]:
+        """Closest call in either direction (ties go up). A loaded car moves on rather than reopen."""
+        here = 1 << car.position
+        calls = self.car_hall_calls(car) | car.car_calls
+        if calls & here and not car.car_calls & ~here:
+            return car.position, DIRECTION_IDLE
+        above = calls & bits_above(car.position)
+        below = calls & bits_below(car.position)
+        if not above and not below:
+            return None, DIRECTION_IDLE
+        up = lowest_bit(above) if above else None
+        down = highest_bit(below) if below else None
+        if down is None or (up is not None and up - car.position <= car.position - down):
+            return up, DIRECTION_UP
+        return down, DIRECTION_DOWN
+
+    def arrive(self, car: ElevatorCar, stop: int, direction: int) -> int:
+        """
+        Car stops at `stop` heading `direction`: clear its car call and the
+        hall call it answers. Returns the direction the car now serves
+        (it reverses at the end of a sweep and goes idle with no calls).
+        """
+        bit = 1 << stop
+        hall = self._hall(car)
+        was_idle = car.direction == DIRECTION_IDLE
+        car.position = stop
+        car.car_calls &= ~bit
+
+        if not self.scan:
+            # Nearest-first has no sweep: everyone waiting here boards
+            hall.up_calls &= ~bit
+            hall.down_calls &= ~bit
+        else:
+            if direction == DIRECTION_IDLE:
+                direction = DIRECTION_UP if hall.up_calls & bit else DIRECTION_DOWN
+            elif direction == DIRECTION_UP and not hall.up_calls & bit:
+                # End of the sweep, or an idle car sent to a down call: reverse here
+                if (was_idle and hall.down_calls & bit) or not self.has_calls_above(car):
+                    direction = DIRECTION_DOWN
+            elif direction == DIRECTION_DOWN and not hall.down_calls & bit:
+                if (was_idle and hall.up_calls & bit) or not self.has_calls_below(car):
+                    direction = DIRECTION_UP
+
+            if direction == DIRECTION_UP:
+                hall.up_calls &= ~bit
+            else:
+                hall.down_calls &= ~bit
+
+        if not (hall.up_calls | hall.down_calls | car.car_calls):
+            direction = DIRECTION_IDLE
+        car.direction = direction
+        return direction
+
+    def __repr__(self) -> str:
+        return (f"ElevatorShaft(levels {self.bottom_level}-{self.top_level}, cars={len(self.cars)}, "
+                f"up={self.up_calls:#x}, down={self.down_calls:#x})")
+
+
+class ElevatorDispatcher:
+    """All elevator shafts in the tower (at most MAX_ELEVATOR_SHAFTS)"""
+
+    def __init__(self, scan: bool = SCAN_ALGORITHM_ENABLED):
+        self.scan = scan
+        self.shafts: list[ElevatorShaft] = []
+
+    def add_shaft(self, bottom_level: int, top_level: int, car_count: int = 1, segment: int = 0,
+                  mode: int = DISPATCH_SCAN) -> ElevatorShaft:
+        """Create a shaft, enforcing the tower-wide shaft limit"""
+        if len(self.shafts) >= MAX_ELEVATOR_SHAFTS:
+            raise ValueError(f"Tower already has the maximum of {MAX_ELEVATOR_SHAFTS} elevator shafts")
+        shaft = ElevatorShaft(bottom_level, top_level, car_count, segment, self.scan, mode)
+        self.shafts.append(shaft)
+        return shaft
+
+    def shafts_serving(self, level: int) -> list[ElevatorShaft]:
+        """Shafts with a stop at the given level"""
+        return [shaft for shaft in self.shafts if shaft.serves(level)]
@@ -0,0 +1,301 @@
+"""
+Headless elevator dispatch harness.
+Replays a stream of passengers (arrival time, origin level, destination
+level) through the dispatcher and event-driven cars on a private World
+Clock, and reports wait-time statistics. Passengers are Sims of a private
+SimWorld, queued and boarded by the game's own TransitSystem. Used by the offline benchmark
+(benchmarks/bench_elevator_dispatch.py) to compare dispatch policies
+without running the game.
+"""
+import json
+import time
+import numpy as np
+
+from tower_simulator.constants import (
+    SCAN_ALGORITHM_ENABLED, DEFAULT_SIMULATION_SEED, ENTITY_DATA, ELEVATOR_CAR_CAPACITY,
+    ELEVATOR_SECONDS_PER_LEVEL, STRESS_LEVEL_PINK, STRESS_LEVEL_RED, SECONDS_PER_HOUR, SECONDS_PER_DAY,
+    PREPOSITION_LEAD_SECONDS,
+)
+from tower_simulator.entities.ecs import (
+    SimWorld, NO_ROOM, SIM_STATE_IDLE, SIM_STATE_WAITING,
+    TRIP_TO_WORK, TRIP_LUNCH_OUT, TRIP_LUNCH_RETURN, TRIP_FROM_WORK,
+)
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.systems.elevator_dispatch import (
+    ElevatorDispatcher, ElevatorShaft, ElevatorCar, DIRECTION_UP, DIRECTION_DOWN, DISPATCH_SCAN,
+)
+from tower_simulator.systems.elevator_motion import ElevatorMotion
+from tower_simulator.systems.elevator_prepositioning import ElevatorPrepositioner
+from tower_simulator.systems.route_table import RouteTable
+from tower_simulator.systems.sim_systems import LOBBY_LEVEL
+from tower_simulator.systems.sim_transit import TransitSystem
+from tower_simulator.systems.time_manager import TimeManager
+from tower_simulator.systems.transit_graph import TransitGraph
+from tower_simulator.systems.trip_planner import TripPlanner, TripTable
+from tower_simulator.utils.determinism import SimulationRNG
+
+# Trip kinds replayed for each synthetic traffic pattern
+TRAFFIC_PATTERNS = {
+    'up_peak': (TRIP_TO_WORK,),  # Morning: lobby to offices
+    'lunch': (TRIP_LUNCH_OUT, TRIP_LUNCH_RETURN),  # Two-way: offices to restaurants and back
+    'down_peak': (TRIP_FROM_WORK,),  # Evening: offices to lobby
+}
+
+DRAIN_SECONDS = 3 * SECONDS_PER_HOUR  # Time allowed after the last arrival for cars to finish
+_SEAT_STRIDE = 1 << 16
+
+
+class PassengerTrace:
+    """Hall calls to replay, one row per passenger, sorted by arrival time"""
+
+    def __init__(self, time: np.ndarray, origin: np.ndarray, destination: np.ndarray):
+        order = np.argsort(time, kind='stable')
+        self.time = np.asarray(time, dtype=np.int64)[order]  # Absolute game second
+        self.origin = np.asarray(origin, dtype=np.int16)[order]  # Level
+        self.destination = np.asarray(destination, dtype=np.int16)[order]  # Level
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def save(self, path: str):
+        """Write the trace as JSON"""
+        with open(path, 'w') as f:
+            json.dump({'time': self.time.tolist(), 'origin': self.origin.tolist(),
+                       'destination': self.destination.tolist()}, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'PassengerTrace':
+        """Read a trace written by save() (or recorded elsewhere in the same format)"""
+        with open(path) as f:
+            data = json.load(f)
+        return cls(np.array(data['time']), np.array(data['origin']), np.array(data['destination']))
+
+
+def dispatcher_for_layout(rooms: list[RoomEntity], scan: bool = SCAN_ALGORITHM_ENABLED,
+                          cars_per_shaft: int | None = None) -> ElevatorDispatcher:
+    """A dispatcher with one shaft per elevator_shaft room, as placed in the game"""
+    dispatcher = ElevatorDispatcher(scan)
+    cars = cars_per_shaft or ENTITY_DATA['elevator_shaft'].get('cars_per_shaft_default', 1)
+    for room in rooms:
+        if room.room_type == 'elevator_shaft':
+            dispatcher.add_shaft(room.coordinate.level, room.coordinate.level + room.height - 1,
+                                 cars, room.coordinate.segment)
+    return dispatcher
+
+
+def apply_shaft_settings(dispatcher: ElevatorDispatcher, settings: list[tuple[int, int]]):
+    """Set (waiting car response floors, floor departure seconds) on each shaft in order"""
+    for shaft, (response, departure) in zip(dispatcher.shafts, settings):
+        shaft.waiting_car_response = response
+        shaft.departure_seconds = departure
+
+
+def synthetic_trace(rooms: list[RoomEntity], pattern: str, seed: int = DEFAULT_SIMULATION_SEED,
+                    day: int = 0) -> PassengerTrace:
+    """
+    Passengers for a traffic pattern, taken from the day's trip table so
+    synthetic traffic follows the same schedule as the game. Trips that
+    stay on one level need no elevator and are dropped.
+    """
+    table = RoomTable(rooms)
+    trips = TripPlanner(SimulationRNG(seed)).plan_day(table, day)
+    trips = trips.rows(np.isin(trips.kind, TRAFFIC_PATTERNS[pattern]))
+
+    origin_room = _origin_rooms(trips)
+    origin = np.where(origin_room == NO_ROOM, LOBBY_LEVEL, table.level[origin_room])
+    destination = np.where(trips.dest_room == NO_ROOM, LOBBY_LEVEL, table.level[trips.dest_room])
+    moving = origin != destination
+    return PassengerTrace(trips.time[moving], origin[moving], destination[moving])
+
+
+def synthetic_day_trace(rooms: list[RoomEntity], seed: int = DEFAULT_SIMULATION_SEED,
+                        day: int = 0) -> PassengerTrace:
+    """Every traffic pattern of a day in one trace"""
+    traces = [synthetic_trace(rooms, pattern, seed, day) for pattern in TRAFFIC_PATTERNS]
+    return PassengerTrace(*(np.concatenate([getattr(trace, column) for trace in traces])
+                            for column in ('time', 'origin', 'destination')))
+
+
+def _origin_rooms(trips: TripTable) -> np.ndarray:
+    """Room each trip starts from (NO_ROOM for the lobby)"""
+    origin = trips.room.copy()
+    origin[trips.kind == TRIP_TO_WORK] = NO_ROOM
+
+    # Lunch returns start at the restaurant of the matching lunch-out trip
+    returns = np.flatnonzero(trips.kind == TRIP_LUNCH_RETURN)
+    outs = np.flatnonzero(trips.kind == TRIP_LUNCH_OUT)
+    if len(returns) and len(outs):
+        out_keys = trips.room[outs].astype(np.int64) * _SEAT_STRIDE + trips.seat[outs]
+        order = np.argsort(out_keys)
+        return_keys = trips.room[returns].astype(np.int64) * _SEAT_STRIDE + trips.seat[returns]
+        match = outs[order[np.searchsorted(out_keys[order], return_keys)]]
+        origin[returns] = trips.dest_room[match]
+    return origin
+
+
+class DispatchHarness:
+    """
+    Runs passenger traces through a fresh dispatcher for a layout.
+    Each passenger picks the least busy shaft serving both of its levels
+    and is queued there by a TransitSystem, exactly as a Sim in the game:
+    it waits in a FIFO at its origin, boards when a car heading its way
+    opens its doors there, and presses its destination. In destination
+    dispatch and corridor shafts the passenger enters its floor at the hall
+    instead and waits for the car it was assigned; corridor shafts may make
+    it wait for a car to be assigned at all until stacked cars make room.
+    With `preposition`, the run's clock carries the tower's default
+    schedule and idle cars are parked ahead of its peaks. `window_hours`
+    adds statistics for the passengers arriving in that span of the day.
+    Passengers still waiting at the horizon (DRAIN_SECONDS after the last
+    arrival) count as unserved, and as having waited until then.
+    """
+
+    def __init__(self, rooms: list[RoomEntity], scan: bool = SCAN_ALGORITHM_ENABLED,
+                 car_capacity: int = ELEVATOR_CAR_CAPACITY, seconds_per_level: int = ELEVATOR_SECONDS_PER_LEVEL,
+                 cars_per_shaft: int | None = None, shaft_settings: list[tuple[int, int]] | None = None,
+                 modes: int | list[int] = DISPATCH_SCAN, preposition: bool = False,
+                 window_hours: tuple[float, float] | None = None):
+        self.rooms = rooms
+        self.scan = scan
+        self.car_capacity = car_capacity
+        self.seconds_per_level = seconds_per_level
+        self.cars_per_shaft = cars_per_shaft
+        self.shaft_settings = shaft_settings  # (waiting car response, floor departure) per shaft
+        self.modes = modes  # Dispatch mode for every shaft, or one per shaft
+        self.preposition = preposition
+        self.window_hours = window_hours  # (start, end) fractional hours of the trace's day
+
+    def build_dispatcher(self) -> ElevatorDispatcher:
+        """Dispatcher the next run uses, with any per-shaft settings applied"""
+        dispatcher = dispatcher_for_layout(self.rooms, self.scan, self.cars_per_shaft)
+        if self.shaft_settings is not None:
+            apply_shaft_settings(dispatcher, self.shaft_settings)
+        modes = self.modes if isinstance(self.modes, list) else [self.modes] * len(dispatcher.shafts)
+        for shaft, mode in zip(dispatcher.shafts, modes):
+            shaft.mode = mode
+        return dispatcher
+
+    def run(self, trace: PassengerTrace) -> dict:
+        """Replay a trace and return the wait-time report (JSON-serializable)"""
+        cpu_start = time.process_time()
+        count = len(trace)
+        self.trace = trace
+        self.board_time = np.full(count, -1, dtype=np.int64)
+        self.done_time = np.full(count, -1, dtype=np.int64)
+
+        # One Sim per passenger (Sim id = passenger index), idle until it arrives
+        self.world = SimWorld(capacity=max(count, 1), growth_factor=1.0)
+        self.world.spawn(count, floor=trace.origin, segment=0.0)
+        self.world.target_floor[:count] = trace.destination
+
+        self.dispatcher = self.build_dispatcher()
+        start = int(trace.time[0]) if count else 0
+        if self.preposition:
+            start = max(0, start - PREPOSITION_LEAD_SECONDS)  # Early enough to park cars for the first peak
+        self.time_manager = TimeManager(start_time=start)
+        self.motion = ElevatorMotion(self.time_manager, self.dispatcher, self.seconds_per_level,
+                                     on_doors_open=self._on_doors_open)
+        self.transit = TransitSystem(self.world, RouteTable(TransitGraph.from_rooms(self.rooms)), self.motion,
+                                     self.car_capacity)
+        self.transit.boarding_callback = self._on_board
+        shaft_rooms = [room_id for room_id, room in enumerate(self.rooms) if room.room_type == 'elevator_shaft']
+        self.links = dict(zip(self.dispatcher.shafts, shaft_rooms))
+        for shaft, link_id in self.links.items():
+            self.transit.add_shaft(link_id, shaft)
+        self.schedulers = self.transit.schedulers
+        self.prepositioner = None
+        if self.preposition:
+            self.time_manager.install_default_schedule()
+            self.prepositioner = ElevatorPrepositioner(self.time_manager, self.motion, RoomTable(self.rooms))
+
+        routed = np.zeros(count, dtype=bool)
+        for passenger in range(count):
+            self.time_manager.advance_to(int(trace.time[passenger]))
+            routed[passenger] = self._call(passenger)
+        self.horizon = (int(trace.time[-1]) if count else 0) + DRAIN_SECONDS
+        while self.time_manager.pending_count and self.time_manager.now < self.horizon:
+            self.time_manager.advance_to(min(self.time_manager.next_event_time(), self.horizon))
+
+        report = self._report(routed)
+        cpu_ms = (time.process_time() - cpu_start) * 1000.0
+        report['cpu_ms_per_1k_calls'] = round(cpu_ms * 1000.0 / count, 3) if count else 0.0
+        return report
+
+    def _call(self, passenger: int) -> bool:
+        """Send a passenger's Sim to the least busy shaft serving its trip"""
+        origin, destination = int(self.trace.origin[passenger]), int(self.trace.destination[passenger])
+        schedulers = self.transit.schedulers
+        shafts = [shaft for shaft in self.dispatcher.shafts_serving(origin) if shaft.serves(destination)
+                  and (shaft not in schedulers or schedulers[shaft].can_serve(
+                      shaft.stop_index(origin), shaft.stop_index(destination)))]
+        if not shafts:
+            return False
+
+        direction = DIRECTION_UP if destination > origin else DIRECTION_DOWN
+        queues, deferred = self.transit.queues, self.transit.deferred_count
+        shaft = min(shafts, key=lambda s: queues.waiting(s, s.stop_index(origin), direction) + deferred[s])
+        world = self.world
+        world.state[passenger] = SIM_STATE_WAITING
+        world.leg_link[passenger] = self.links[shaft]
+        world.leg_floor[passenger] = destination
+        self.transit.queue(shaft, np.array([passenger]))
+        return True
+
+    def _on_board(self, ids: np.ndarray):
+        """TransitSystem callback: passengers got on a car"""
+        self.board_time[ids] = self.time_manager.now
+
+    def _on_doors_open(self, shaft: ElevatorShaft, car: ElevatorCar) -> int:
+        """Riders for this floor get off, then waiting passengers get on"""
+        riders = np.array(self.transit.riders.get(car, []), dtype=np.int64)
+        boarded = self.transit.on_doors_open(shaft, car)
+        self.done_time[riders[self.world.state[riders] == SIM_STATE_IDLE]] = self.time_manager.now
+        return boarded
+
+    def _report(self, routed: np.ndarray) -> dict:
+        """Wait-time statistics for the finished run"""
+        boarded = self.board_time >= 0
+        unserved = routed & ~boarded
+        # Passengers never picked up have waited until the horizon, at least
+        board_time = np.where(unserved, self.horizon, self.board_time)
+        counted = boarded | unserved
+        waits = (board_time - self.trace.time)[counted]
+        trips = (self.done_time - self.trace.time)[self.done_time >= 0]
+
+        def stat(values: np.ndarray, fn) -> float:
+            return round(float(fn(values)), 3) if len(values) else 0.0
+
+        report = {
+            'passengers': len(self.trace),
+            'served': int(np.count_nonzero(self.done_time >= 0)),
+            'unserved': int(np.count_nonzero(unserved)),
+            'unroutable': int(np.count_nonzero(~routed)),
+            'avg_wait_s': stat(waits, np.mean),
+            'p95_wait_s': stat(waits, lambda w: np.percentile(w, 95)),
+            'p99_wait_s': stat(waits, lambda w: np.percentile(w, 99)),
+            'max_wait_s': stat(waits, np.max),
+            'avg_trip_s': stat(trips, np.mean),
+            'stress_crossings': {
+                'pink': int(np.count_nonzero(waits >= STRESS_LEVEL_PINK)),
+                'red': int(np.count_nonzero(waits >= STRESS_LEVEL_RED)),
+            },
+            'car_departures': self.motion.departures,
+        }
+        if self.prepositioner is not None:
+            report['preposition_moves'] = self.prepositioner.moves
+        if self.window_hours is not None and len(self.trace):
+            day = int(self.trace.time[0]) // SECONDS_PER_DAY
+            start, end = (TimeManager.time_at(day, hour) for hour in self.window_hours)
+            arrived = (self.trace.time >= start) & (self.trace.time < end)
+            window = (board_time - self.trace.time)[arrived & counted]
+            report['window'] = {
+                'hours': list(self.window_hours),
+                'passengers': int(np.count_nonzero(arrived)),
+                'unserved': int(np.count_nonzero(arrived & unserved)),
+                'avg_wait_s': stat(window, np.mean),
+                'p50_wait_s': stat(window, np.median),
+                'p95_wait_s': stat(window, lambda w: np.percentile(w, 95)),
+                'p99_wait_s': stat(window, lambda w: np.percentile(w, 99)),
+            }
+        return report
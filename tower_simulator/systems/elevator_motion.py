@@ -0,0 +1,211 @@
+"""
+Event-driven elevator kinematics.
+Cars are never stepped per tick. A departure schedules one World Clock
+timer for the arrival at the next stop; the arrival opens the doors and
+schedules their closing after the shaft's floor departure time, which in
+turn dispatches the next journey. These short, often retargeted or held
+waits go on the clock's timing wheel rather than its heap. Idle and cruising cars cost nothing
+between events, and positions are interpolated only for cars on screen.
+"""
+import math
+from typing import Callable, Iterator
+
+from tower_simulator.constants import ELEVATOR_SECONDS_PER_LEVEL, ELEVATOR_DOOR_SECONDS
+from tower_simulator.systems.elevator_dispatch import (
+    ElevatorDispatcher, ElevatorShaft, ElevatorCar,
+    DIRECTION_IDLE, CAR_IDLE, CAR_MOVING, CAR_DOORS_OPEN,
+)
+from tower_simulator.systems.time_manager import (
+    TimeManager, EVENT_ELEVATOR_ARRIVE, EVENT_ELEVATOR_DOORS_CLOSE,
+)
+
+
+class ElevatorMotion:
+    """
+    Drives every car of a dispatcher from World Clock events.
+    on_doors_open(shaft, car) is called whenever a car stops at a floor,
+    which is where passengers board and alight; it returns how many Sims
+    boarded (None if unknown, which always holds the doors). on_idle(shaft,
+    car) is called whenever a car parks with nothing left to do.
+    """
+
+    def __init__(self, time_manager: TimeManager, dispatcher: ElevatorDispatcher,
+                 seconds_per_level: int = ELEVATOR_SECONDS_PER_LEVEL,
+                 on_doors_open: Callable[[ElevatorShaft, ElevatorCar], int | None] | None = None,
+                 on_idle: Callable[[ElevatorShaft, ElevatorCar], None] | None = None):
+        self.time_manager = time_manager
+        self.dispatcher = dispatcher
+        self.seconds_per_level = seconds_per_level
+        self.on_doors_open = on_doors_open
+        self.on_idle = on_idle
+        time_manager.subscribe(EVENT_ELEVATOR_ARRIVE, self._on_arrive)
+        time_manager.subscribe(EVENT_ELEVATOR_DOORS_CLOSE, self._on_doors_close)
+
+        # Statistics
+        self.departures = 0
+        self.arrivals = 0
+        self.retargets = 0
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+    def call(self, shaft: ElevatorShaft, level: int, direction: int):
+        """Register a hall call and get a car moving towards it"""
+        stop = shaft.stop_index(level)
+        for car in shaft.cars:
+            if car.phase == CAR_DOORS_OPEN and car.position == stop and car.direction in (direction, DIRECTION_IDLE):
+                car.direction = direction
+                return  # A car is already here with its doors open
+        shaft.call(level, direction)
+        self.wake(shaft, level)
+
+    def press(self, shaft: ElevatorShaft, car: ElevatorCar, level: int):
+        """Register a destination inside a car"""
+        shaft.press(car, level)
+        if car.phase == CAR_IDLE:
+            self._depart(shaft, car)
+        elif car.phase == CAR_MOVING:
+            self._retarget(shaft, car)
+
+    def press_stops(self, shaft: ElevatorShaft, car: ElevatorCar, stops: int):
+        """Register the destinations of a boarding batch (a bitmask of stop indices)"""
+        shaft.press_stops(car, stops)
+        self.wake_car(shaft, car)
+
+    def assign(self, shaft: ElevatorShaft, origin_level: int, destination_level: int,
+               capacity: int) -> ElevatorCar:
+        """Destination dispatch: assign a Sim to a car and get that car moving"""
+        car = shaft.assign(origin_level, destination_level, capacity)
+        self.wake_car(shaft, car)
+        return car
+
+    def wake_car(self, shaft: ElevatorShaft, car: ElevatorCar):
+        """Start an idle car, or let a moving one stop for a new call on its way"""
+        if car.phase == CAR_IDLE:
+            self._depart(shaft, car)
+        elif car.phase == CAR_MOVING:
+            self._retarget(shaft, car)
+
+    def wake(self, shaft: ElevatorShaft, level: int | None = None):
+        """
+        Get a car to a new hall call. A moving car heading for the level and
+        within the shaft's Waiting Car Response takes it on its way;
+        otherwise the idle car nearest the call is dispatched, and only with
+        no idle car left does a farther moving car stop for it.
+        """
+        idle = [car for car in shaft.cars if car.phase == CAR_IDLE]
+        moving = [car for car in shaft.cars if car.phase == CAR_MOVING]
+        if level is not None and idle:
+            nearby = [car for car in moving
+                      if (level - self.car_level(shaft, car)) * car.target_direction >= 0
+                      and abs(level - self.car_level(shaft, car)) <= shaft.waiting_car_response]
+            if not nearby:
+                stop = shaft.stop_index(level)
+                self._depart(shaft, min(idle, key=lambda car: abs(car.position - stop)))
+                return
+        if any(self._retarget(shaft, car) for car in moving):
+            return
+        # Idle cars with a stop to go to, and how far each has to travel
+        distances = {}
+        for car in idle:
+            stop, _ = shaft.next_stop(car)
+            if stop is not None:
+                distances[car] = abs(stop - car.position)
+        if distances:
+            self._depart(shaft, min(distances, key=distances.get))
+
+    def hold_doors(self, shaft: ElevatorShaft, car: ElevatorCar):
+        """A Sim boarded late: keep the doors open a full floor departure time from now"""
+        if car.phase != CAR_DOORS_OPEN or car.event.time >= self.time_manager.now + shaft.departure_seconds:
+            return
+        self.time_manager.cancel(car.event)
+        car.event = self.time_manager.schedule_timer(shaft.departure_seconds, EVENT_ELEVATOR_DOORS_CLOSE,
+                                                  (shaft, car))
+
+    # ------------------------------------------------------------------
+    # Journeys
+    # ------------------------------------------------------------------
+    def _depart(self, shaft: ElevatorShaft, car: ElevatorCar):
+        """Dispatch the car to its next stop, or park it if there is none"""
+        stop, direction = shaft.next_stop(car)
+        if stop is None:
+            car.phase = CAR_IDLE
+            car.direction = DIRECTION_IDLE
+            car.event = None
+            if self.on_idle is not None:
+                self.on_idle(shaft, car)
+            return
+        if stop == car.position:
+            self._open_doors(shaft, car, stop, direction)
+            return
+
+        now = self.time_manager.now
+        car.phase = CAR_MOVING
+        car.target = stop
+        car.target_direction = direction
+        car.depart_time = now
+        car.arrival_time = now + abs(stop - car.position) * self.seconds_per_level
+        car.event = self.time_manager.schedule_timer_at(car.arrival_time, EVENT_ELEVATOR_ARRIVE, (shaft, car))
+        self.departures += 1
+
+    def _retarget(self, shaft: ElevatorShaft, car: ElevatorCar) -> bool:
+        """
+        Stop a moving car short of its target if a new stop lies between
+        the next level it can still brake at and the current target.
+        """
+        stop, direction = shaft.next_stop(car)
+        if stop is None or direction != car.target_direction or stop == car.position:
+            return False
+        travelled = math.ceil((self.time_manager.now - car.depart_time) / self.seconds_per_level)
+        reachable = car.position + direction * travelled
+        if (stop - reachable) * direction < 0 or (car.target - stop) * direction <= 0:
+            return False
+
+        self.time_manager.cancel(car.event)
+        car.target = stop
+        car.arrival_time = car.depart_time + abs(stop - car.position) * self.seconds_per_level
+        car.event = self.time_manager.schedule_timer_at(car.arrival_time, EVENT_ELEVATOR_ARRIVE, (shaft, car))
+        self.retargets += 1
+        return True
+
+    def _open_doors(self, shaft: ElevatorShaft, car: ElevatorCar, stop: int, direction: int):
+        """Stop at a floor: clear the calls served here and hold the doors open"""
+        shaft.arrive(car, stop, direction)
+        car.phase = CAR_DOORS_OPEN
+        car.target = stop
+        boarded = self.on_doors_open(shaft, car) if self.on_doors_open is not None else None
+        # Standard Floor Departure: wait for others only after someone boarded
+        dwell = ELEVATOR_DOOR_SECONDS if boarded == 0 else shaft.departure_seconds
+        car.event = self.time_manager.schedule_timer(dwell, EVENT_ELEVATOR_DOORS_CLOSE, (shaft, car))
+
+    def _on_arrive(self, event):
+        """World Clock: a car reached its stop"""
+        shaft, car = event.payload
+        self.arrivals += 1
+        self._open_doors(shaft, car, car.target, car.target_direction)
+
+    def _on_doors_close(self, event):
+        """World Clock: floor departure time is up; head for the next stop"""
+        shaft, car = event.payload
+        car.phase = CAR_IDLE
+        self._depart(shaft, car)
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+    def car_level(self, shaft: ElevatorShaft, car: ElevatorCar) -> float:
+        """Interpolated level of a car at the current game time"""
+        if car.phase != CAR_MOVING:
+            return shaft.level_of(car.position)
+        progress = (self.time_manager.now - car.depart_time) / (car.arrival_time - car.depart_time)
+        return shaft.level_of(car.position) + (car.target - car.position) * min(1.0, max(0.0, progress))
+
+    def visible_cars(self, low_level: int, high_level: int) -> Iterator[tuple[ElevatorShaft, ElevatorCar, float]]:
+        """(shaft, car, level) for cars of shafts overlapping the visible levels"""
+        for shaft in self.dispatcher.shafts:
+            if shaft.top_level < low_level or shaft.bottom_level > high_level:
+                continue
+            for car in shaft.cars:
+                level = self.car_level(shaft, car)
+                if low_level - 1 < level < high_level + 1:
+                    yield shaft, car, level
@@ -0,0 +1,131 @@
+"""
+Predictive elevator pre-positioning.
+Reads the World Clock's upcoming schedule once a day and, a little before
+each demand peak it announces, parks idle cars where that peak's trips
+start: at the lobby for the morning up-peak, and spread over the office
+floors, weighted by their seats, for the lunch rush. Until the peak is
+over, every car that runs out of work heads back to its post instead of
+parking wherever its last passenger got off.
+"""
+import numpy as np
+
+from tower_simulator.constants import (
+    GRID_MIN_LEVEL, GRID_MAX_LEVEL, SECONDS_PER_HOUR,
+    COMMUTE_SPREAD_HOURS, LUNCH_START, LUNCH_END, LUNCH_BREAK_HOURS, PREPOSITION_LEAD_SECONDS,
+)
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.systems.elevator_dispatch import ElevatorShaft, ElevatorCar, CAR_IDLE, DISPATCH_CORRIDOR
+from tower_simulator.systems.elevator_motion import ElevatorMotion
+from tower_simulator.systems.sim_systems import LOBBY_LEVEL
+from tower_simulator.systems.time_manager import (
+    TimeManager, EVENT_DAY_START, EVENT_OFFICE_WORK_START, EVENT_LUNCH_START, EVENT_ELEVATOR_PREPOSITION,
+)
+
+PEAK_UP = 'up_peak'  # Lobby to offices, in the hour before work starts
+PEAK_LUNCH = 'lunch'  # Offices out to restaurants
+
+# Schedule event -> (peak, hours from the event to the peak's first trips, peak length in hours)
+PEAK_EVENTS = {
+    EVENT_OFFICE_WORK_START: (PEAK_UP, -COMMUTE_SPREAD_HOURS, COMMUTE_SPREAD_HOURS),
+    EVENT_LUNCH_START: (PEAK_LUNCH, 0.0, LUNCH_END - LUNCH_BREAK_HOURS - LUNCH_START),
+}
+
+
+class ElevatorPrepositioner:
+    """
+    Parks idle cars ahead of the peaks on the World Clock. Takes over the
+    motion's on_idle callback. Corridor shafts are left alone: their
+    stacked cars are parked by the corridor scheduler.
+    """
+
+    def __init__(self, time_manager: TimeManager, motion: ElevatorMotion, room_table: RoomTable,
+                 lead_seconds: int = PREPOSITION_LEAD_SECONDS):
+        self.time_manager = time_manager
+        self.motion = motion
+        self.lead_seconds = lead_seconds
+        self.peak: str | None = None  # Peak being served
+        self.peak_end = 0  # Game second the peak's last trips start
+        self.set_room_table(room_table)
+
+        # Statistics
+        self.peaks = 0
+        self.moves = 0  # Idle cars sent to their post
+
+        motion.on_idle = self._on_idle
+        time_manager.subscribe(EVENT_DAY_START, self._on_day_start)
+        time_manager.subscribe(EVENT_ELEVATOR_PREPOSITION, self._on_preposition)
+        self.plan_day()
+
+    def set_room_table(self, room_table: RoomTable):
+        """Office seats per level (index = level - GRID_MIN_LEVEL), the lunch-time occupancy"""
+        offices = room_table.ids_of_type('office')
+        self.occupancy = np.bincount(room_table.level[offices] - GRID_MIN_LEVEL,
+                                     weights=room_table.capacity[offices],
+                                     minlength=GRID_MAX_LEVEL - GRID_MIN_LEVEL + 1)
+        self._posts: dict[tuple[ElevatorShaft, str], list[int] | None] = {}
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+    def plan_day(self) -> list:
+        """Schedule pre-positioning ahead of the peaks the clock holds for the rest of today"""
+        time_manager = self.time_manager
+        now = time_manager.now
+        scheduled = []
+        for event in time_manager.upcoming(tuple(PEAK_EVENTS), time_manager.time_at(time_manager.day + 1, 0) - 1):
+            peak, offset, length = PEAK_EVENTS[event.name]
+            start = event.time + int(offset * SECONDS_PER_HOUR)
+            end = start + int(length * SECONDS_PER_HOUR)
+            if end <= now:
+                continue
+            scheduled.append(time_manager.schedule_at(max(now, start - self.lead_seconds),
+                                                      EVENT_ELEVATOR_PREPOSITION, (peak, end)))
+        return scheduled
+
+    def posts(self, shaft: ElevatorShaft, peak: str) -> list[int] | None:
+        """
+        Stop each car of a shaft waits at during a peak, or None if the
+        shaft has no part in it. For lunch the cars split the shaft's office
+        seats evenly: car i waits at the (i + 1/2) / cars quantile floor.
+        """
+        if peak == PEAK_UP:
+            return [shaft.stop_index(LOBBY_LEVEL)] * len(shaft.cars) if shaft.serves(LOBBY_LEVEL) else None
+        seats = self.occupancy[shaft.bottom_level - GRID_MIN_LEVEL:shaft.top_level - GRID_MIN_LEVEL + 1]
+        total = seats.sum()
+        if not total:
+            return None
+        quantiles = (np.arange(len(shaft.cars)) + 0.5) / len(shaft.cars) * total
+        return np.searchsorted(np.cumsum(seats), quantiles).tolist()
+
+    # ------------------------------------------------------------------
+    # World Clock
+    # ------------------------------------------------------------------
+    def _on_day_start(self, event):
+        """World Clock: plan the new day's peaks"""
+        self.plan_day()
+
+    def _on_preposition(self, event):
+        """World Clock: a peak is about to start; send every idle car to its post"""
+        self.peak, self.peak_end = event.payload
+        self.peaks += 1
+        for shaft in self.motion.dispatcher.shafts:
+            for car in shaft.cars:
+                self._send_to_post(shaft, car)
+
+    def _on_idle(self, shaft: ElevatorShaft, car: ElevatorCar):
+        """A car ran out of work: during a peak it goes back to its post"""
+        if self.peak is not None and self.time_manager.now < self.peak_end:
+            self._send_to_post(shaft, car)
+
+    def _send_to_post(self, shaft: ElevatorShaft, car: ElevatorCar):
+        """Move an idle car to its post for the current peak"""
+        if car.phase != CAR_IDLE or shaft.mode == DISPATCH_CORRIDOR:
+            return
+        key = (shaft, self.peak)
+        if key not in self._posts:
+            self._posts[key] = self.posts(shaft, self.peak)
+        posts = self._posts[key]
+        if posts is None or posts[car.index] == car.position:
+            return
+        self.moves += 1
+        self.motion.press_stops(shaft, car, 1 << posts[car.index])
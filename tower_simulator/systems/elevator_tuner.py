@@ -0,0 +1,115 @@
+"""
+Parallel tuner for per-shaft Waiting Car Response and Standard Floor
+Departure settings.
+Each candidate setting is scored by replaying a whole simulated day
+through the headless dispatch harness. Candidates are independent
+day-long runs, so they are spread over a process pool one run per task
+and wall time scales with the number of worker processes.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tower_simulator.constants import (
+    SCAN_ALGORITHM_ENABLED, WAITING_CAR_RESPONSE_RANGE, STANDARD_FLOOR_DEPARTURE,
+)
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.systems.elevator_harness import DispatchHarness, PassengerTrace, dispatcher_for_layout
+from tower_simulator.utils.layout import layout_to_dict, layout_from_dict
+
+DEPARTURE_STEP_SECONDS = 10  # Floor departure values tried between the range limits
+UNSERVED_PENALTY_SECONDS = 24 * 3600  # Score added per passenger left waiting at the horizon
+RESPONSE_CHOICES = tuple(range(WAITING_CAR_RESPONSE_RANGE[0], WAITING_CAR_RESPONSE_RANGE[1] + 1))
+DEPARTURE_CHOICES = tuple(range(STANDARD_FLOOR_DEPARTURE[0], STANDARD_FLOOR_DEPARTURE[1] + 1, DEPARTURE_STEP_SECONDS))
+
+# Per-process harness, built once by the pool initializer
+_worker_harness: DispatchHarness | None = None
+_worker_trace: PassengerTrace | None = None
+
+
+def _init_worker(layout: dict, trace_columns: tuple, scan: bool, cars_per_shaft: int | None):
+    """Pool initializer: rebuild the layout and trace once per worker process"""
+    global _worker_harness, _worker_trace
+    _worker_harness = DispatchHarness(layout_from_dict(layout), scan, cars_per_shaft=cars_per_shaft)
+    _worker_trace = PassengerTrace(*trace_columns)
+
+
+def _evaluate(settings: tuple[tuple[int, int], ...]) -> dict:
+    """Run the day with one candidate's per-shaft settings"""
+    _worker_harness.shaft_settings = list(settings)
+    return _worker_harness.run(_worker_trace)
+
+
+def score(report: dict) -> float:
+    """Tuning score of a harness report (lower is better); stranding passengers outweighs any wait"""
+    return report['p95_wait_s'] + UNSERVED_PENALTY_SECONDS * report['unserved']
+
+
+class ElevatorTuner:
+    """
+    Coordinate descent over shafts: each round sweeps every (response,
+    departure) pair for one shaft at a time, holding the other shafts at
+    their best settings so far, and keeps the pair with the lowest score:
+    p95 wait plus UNSERVED_PENALTY_SECONDS per unserved passenger (ties
+    broken by average wait, then by the current setting).
+    """
+
+    def __init__(self, rooms: list[RoomEntity], trace: PassengerTrace, scan: bool = SCAN_ALGORITHM_ENABLED,
+                 cars_per_shaft: int | None = None, workers: int | None = None):
+        self.rooms = rooms
+        self.trace = trace
+        self.scan = scan
+        self.cars_per_shaft = cars_per_shaft
+        self.workers = workers or os.cpu_count() or 1
+        self.shaft_count = len(dispatcher_for_layout(rooms, scan, cars_per_shaft).shafts)
+
+        self.best_settings: list[tuple[int, int]] | None = None  # Pass to apply_shaft_settings()
+
+        # Statistics
+        self.evaluations = 0
+
+    def tune(self, rounds: int = 1) -> dict:
+        """Return the best settings found, their report and timing"""
+        start = time.perf_counter()
+        initargs = (layout_to_dict(self.rooms), (self.trace.time, self.trace.origin, self.trace.destination),
+                    self.scan, self.cars_per_shaft)
+        best = tuple((RESPONSE_CHOICES[0], DEPARTURE_CHOICES[0]) for _ in range(self.shaft_count))
+
+        if self.workers > 1:
+            with ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=initargs) as pool:
+                best, report = self._descend(best, rounds, lambda candidates: list(pool.map(_evaluate, candidates)))
+        else:
+            _init_worker(*initargs)
+            best, report = self._descend(best, rounds, lambda candidates: [_evaluate(c) for c in candidates])
+        self.best_settings = list(best)
+
+        return {
+            'settings': [{'waiting_car_response': response, 'floor_departure_s': departure}
+                         for response, departure in best],
+            'report': report,
+            'unserved': report['unserved'],
+            'evaluations': self.evaluations,
+            'workers': self.workers,
+            'wall_s': round(time.perf_counter() - start, 3),
+        }
+
+    def _descend(self, best: tuple, rounds: int, evaluate) -> tuple[tuple, dict]:
+        """Coordinate descent; `evaluate` maps a list of candidates to reports"""
+        best_report = evaluate([best])[0]
+        self.evaluations += 1
+        grid = [(response, departure) for response in RESPONSE_CHOICES for departure in DEPARTURE_CHOICES]
+
+        for _ in range(rounds):
+            for shaft in range(self.shaft_count):
+                candidates = [best[:shaft] + (pair,) + best[shaft + 1:] for pair in grid]
+                reports = evaluate(candidates)
+                self.evaluations += len(candidates)
+
+                scores = np.array([(score(r), r['avg_wait_s'], c != best)
+                                   for c, r in zip(candidates, reports)], dtype=float)
+                # The current setting is in the grid, so the winner is never worse
+                winner = int(np.lexsort(scores.T[::-1])[0])
+                best, best_report = candidates[winner], reports[winner]
+        return best, best_report
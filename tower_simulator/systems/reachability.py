@@ -0,0 +1,154 @@
+"""
+Reachability map.
+Sims enter the tower at the level-0 lobby and at any metro station, and
+make at most MAX_SIM_TRIPS transit legs per journey. The RouteTable Sims
+are routed with owns what is reachable: the minimum trip count of every
+level is the fewest legs from any entrance level in its rows, brought up
+to date for the entrance rows alone and folded into a single per-level
+array, so walkway gaps between transit links count here as they do for
+Sims. With walkways a room above or below the entrances must also share
+a walkable run with the stop where some entrance's best route to its
+level gets off, the way Sims walk on from there (rooms on entrance levels
+only need the level). Edits that cannot change the answer (links no Sim
+can board within the trip limit) are skipped, and anything else re-reads
+the table lazily. `version` only moves when the answer actually changes,
+so overlays built from the map are rebuilt only then.
+"""
+import numpy as np
+
+from tower_simulator.constants import GRID_MIN_LEVEL, GRID_HEIGHT, ENTITY_DATA
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.entities.room_table import RoomTable, ROOM_TYPE_UNKNOWN, room_type_code
+from tower_simulator.systems.route_table import RouteTable
+from tower_simulator.systems.sim_systems import LOBBY_LEVEL
+
+UNREACHABLE = -1  # Trip count of levels no entrance reaches within MAX_SIM_TRIPS legs
+
+# Rooms that are part of the way in rather than somewhere Sims go
+_ROUTE_TYPE_CODES = np.array([room_type_code(room_type) for room_type, data in ENTITY_DATA.items()
+                              if data.get('type') in ('transit', 'transport')] + [ROOM_TYPE_UNKNOWN])
+
+
+class ReachabilityMap:
+    """
+    Minimum trips from the nearest entrance to every level, kept in step
+    with a RouteTable. Indexed by level offset by GRID_MIN_LEVEL.
+    """
+
+    def __init__(self, route_table: RouteTable):
+        self.route_table = route_table
+        self.max_trips = route_table.max_trips
+        self.trips = np.full(GRID_HEIGHT, UNREACHABLE, dtype=np.int8)
+        self.arrivals: set[tuple[int, int]] = set()  # (level, walkable run) where best routes from entrances end
+        self.metro_levels: dict[int, range] = {}  # Metro station room id -> levels it spans
+        self.dirty = True
+        self.version = 0  # Bumped whenever `trips` or `arrivals` changes
+
+        # Statistics
+        self.searches = 0
+        self.skipped_edits = 0
+
+        route_table.graph.subscribe(self.invalidate)
+        if route_table.walkways is not None:
+            route_table.walkways.subscribe(self.walkways_changed)
+
+    # ------------------------------------------------------------------
+    # Entrances and edits
+    # ------------------------------------------------------------------
+    def add_room(self, room_id: int, room: RoomEntity):
+        """A placed metro station is another entrance"""
+        if room.room_type == 'metro_station':
+            self.metro_levels[room_id] = range(*room.get_levels())
+            self.dirty = True
+
+    def invalidate(self, levels: range):
+        """
+        Transit graph callback. A link can only change trip
+        counts if a Sim can board it, i.e. one of its levels is reached in
+        fewer than max_trips legs; edits to any other link are skipped.
+        """
+        trips = self.trips[levels.start - GRID_MIN_LEVEL:levels.stop - GRID_MIN_LEVEL]
+        if ((trips >= 0) & (trips < self.max_trips)).any():
+            self.dirty = True
+        else:
+            self.skipped_edits += 1
+
+    def walkways_changed(self, levels: range):
+        """
+        Walkway callback. On top of what invalidate() checks, a walkway edit
+        on any reached level can renumber its runs or move a room out of
+        the run where Sims get off, so those are never skipped.
+        """
+        trips = self.trips[levels.start - GRID_MIN_LEVEL:levels.stop - GRID_MIN_LEVEL]
+        if (trips > 0).any():
+            self.dirty = True
+        else:
+            self.invalidate(levels)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def refresh(self) -> bool:
+        """Re-run the search if anything changed; True if the trip counts or arrival runs moved"""
+        if not self.dirty:
+            return False
+        self.dirty = False
+        trips, arrivals = self._search()
+        if np.array_equal(trips, self.trips) and arrivals == self.arrivals:
+            return False
+        self.trips, self.arrivals = trips, arrivals
+        self.version += 1
+        return True
+
+    def _search(self) -> tuple[np.ndarray, set[tuple[int, int]]]:
+        """
+        Fewest legs from any entrance level, read from the route table's
+        entrance rows, and the walkable run each row's best route ends in
+        """
+        table = self.route_table
+        entrances = np.array(sorted({LOBBY_LEVEL}.union(*self.metro_levels.values())), dtype=np.intp)
+        table.resolve(entrances, entrances)  # Recomputes only the stale entrance rows
+        rows = entrances - GRID_MIN_LEVEL
+        hops = table.hops[rows]
+        fewest = np.where(hops == UNREACHABLE, np.iinfo(np.int8).max, hops).min(axis=0)
+        self.searches += 1
+
+        arrivals = set()
+        if table.walkways is not None:
+            legs = table.trips[rows]
+            for row, level in zip(*np.nonzero(legs > 0)):
+                link = table.graph.links[int(table.links[rows[row], level, legs[row, level] - 1])]
+                arrivals.add((int(level) + GRID_MIN_LEVEL, table.walkways.run_at(int(level) + GRID_MIN_LEVEL,
+                                                                                   link.segment)))
+        return np.where(fewest == np.iinfo(np.int8).max, UNREACHABLE, fewest).astype(np.int8), arrivals
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def trips_to(self, level: int) -> int:
+        """Fewest trips from any entrance to a level (UNREACHABLE if beyond the limit)"""
+        self.refresh()
+        return int(self.trips[level - GRID_MIN_LEVEL])
+
+    def is_reachable(self, room: RoomEntity) -> bool:
+        """True if Sims can get from an entrance to the room's level and walk to the room"""
+        level = room.coordinate.level
+        return self._connected(level, room.coordinate.segment + room.width / 2.0, self.trips_to(level))
+
+    def unreachable_rooms(self, room_table: RoomTable) -> np.ndarray:
+        """Ids of every destination room Sims cannot get to; lobbies and transit are left out"""
+        self.refresh()
+        trips = self.trips[room_table.level.astype(np.intp) - GRID_MIN_LEVEL]
+        candidates = np.flatnonzero(~np.isin(room_table.type_code, _ROUTE_TYPE_CODES))
+        cut_off = [room_id for room_id, level, center, count in zip(
+            candidates.tolist(), room_table.level[candidates].tolist(), room_table.center[candidates].tolist(),
+            trips[candidates].tolist()) if not self._connected(level, center, count)]
+        return np.array(cut_off, dtype=np.intp)
+
+    def _connected(self, level: int, segment: float, trips: int) -> bool:
+        """True if a position on a level reached in `trips` legs is walkable from where Sims get off there"""
+        if trips == UNREACHABLE:
+            return False
+        if trips == 0 or self.route_table.walkways is None:
+            return True
+        return (level, self.route_table.walkways.run_at(level, segment)) in self.arrivals
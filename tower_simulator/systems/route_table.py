@@ -0,0 +1,321 @@
+"""
+Precomputed floor-to-floor route table.
+Sims make at most MAX_SIM_TRIPS transit legs per journey and the tower
+has only GRID_HEIGHT levels, so the best route between every pair of
+levels fits in a few small NumPy arrays indexed [origin, destination].
+Routes are found with a layered search: layer k holds the cheapest cost
+of reaching each level in at most k legs, relaxed from layer k - 1
+through every transit link at once. A spawning Sim's route is one array
+read. When the transit graph changes, only the origin rows that could
+reach an edited level in fewer than MAX_SIM_TRIPS legs are recomputed.
+Crowds (metro injection, event halls letting out) are routed in bulk:
+thousands of spawns share a few dozen distinct level pairs, so pairs are
+deduplicated, only their origin rows are brought up to date, and the
+results are scattered back to every spawn.
+Given a WalkingModel, the search tracks the transit endpoint each route
+arrives at rather than just the level: boarding another link at a
+transfer level costs the walk between the two endpoints, and a link
+across a walkway gap from where the Sim got off cannot be boarded there.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from tower_simulator.constants import GRID_MIN_LEVEL, GRID_HEIGHT, MAX_SIM_TRIPS
+from tower_simulator.systems.transit_graph import TransitGraph
+from tower_simulator.systems.walkways import WalkingModel
+
+NO_LINK = -1  # Padding after the last leg of a route
+UNREACHABLE = -1  # Trip count of pairs with no route within MAX_SIM_TRIPS legs
+FROM_ORIGIN = -1  # Boarding back pointer of endpoints boarded at the origin level
+
+
+class EndpointLayout(NamedTuple):
+    """Every link's stop at every level it serves, numbered link by link from its bottom level"""
+    first: dict[int, int]  # Link id -> endpoint number of its bottom level
+    link: np.ndarray  # Link of each endpoint
+    level: np.ndarray  # Level index of each endpoint (offset by GRID_MIN_LEVEL)
+    walks: list[tuple[int, np.ndarray, np.ndarray]]  # (level index, endpoints there, walking seconds between them)
+
+
+class RouteBatch(NamedTuple):
+    """Routes of a bulk request, one row per requested pair"""
+    trips: np.ndarray  # Legs of the best route (UNREACHABLE if none)
+    cost: np.ndarray  # Expected seconds
+    links: np.ndarray  # [pair, leg] link ids, NO_LINK after the last leg
+    stops: np.ndarray  # [pair, leg] level each leg ends at
+    unique_pairs: int  # Distinct (origin, destination) pairs actually resolved
+
+
+class RouteTable:
+    """
+    Best route (fewest expected seconds, then fewest legs) between every
+    pair of levels, kept in step with a TransitGraph. Rows are origin
+    levels and columns destination levels, both offset by GRID_MIN_LEVEL.
+    """
+
+    def __init__(self, graph: TransitGraph, max_trips: int = MAX_SIM_TRIPS, walkways: WalkingModel | None = None):
+        self.graph = graph
+        self.max_trips = max_trips
+        self.walkways = walkways
+        levels = GRID_HEIGHT
+        self.cost = np.full((levels, levels), np.inf, dtype=np.float32)  # Expected seconds
+        self.trips = np.full((levels, levels), UNREACHABLE, dtype=np.int8)  # Legs of the best route
+        self.hops = np.full((levels, levels), UNREACHABLE, dtype=np.int8)  # Fewest legs of any route
+        self.links = np.full((levels, levels, max_trips), NO_LINK, dtype=np.int32)  # Link of each leg
+        self.stops = np.full((levels, levels, max_trips), NO_LINK, dtype=np.int16)  # Level each leg ends at
+        self.dirty = np.ones(levels, dtype=bool)  # Origin rows to recompute
+        self._layout: EndpointLayout | None = None  # Built on demand when walking, dropped on edits
+
+        # Statistics
+        self.refreshes = 0
+        self.rows_recomputed = 0
+        self.bulk_requests = 0
+        self.bulk_pairs = 0  # Pairs requested in bulk
+        self.bulk_unique_pairs = 0  # ... of which distinct
+
+        graph.subscribe(self.invalidate)
+        if walkways is not None:
+            walkways.subscribe(self.invalidate)
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def route(self, origin_level: int, destination_level: int) -> tuple[int, float, np.ndarray, np.ndarray]:
+        """(legs, expected seconds, link ids, levels each leg ends at) of the best route"""
+        if self.dirty.any():
+            self.refresh()
+        o, d = origin_level - GRID_MIN_LEVEL, destination_level - GRID_MIN_LEVEL
+        legs = int(self.trips[o, d])
+        return legs, float(self.cost[o, d]), self.links[o, d, :max(legs, 0)], self.stops[o, d, :max(legs, 0)]
+
+    def trips_between(self, origin_levels: np.ndarray, destination_levels: np.ndarray) -> np.ndarray:
+        """Legs of the best route for whole arrays of level pairs (UNREACHABLE if none)"""
+        if self.dirty.any():
+            self.refresh()
+        origins = np.asarray(origin_levels) - GRID_MIN_LEVEL
+        return self.trips[origins, np.asarray(destination_levels) - GRID_MIN_LEVEL]
+
+    def resolve(self, origin_levels: np.ndarray, destination_levels: np.ndarray) -> RouteBatch:
+        """
+        Routes for whole arrays of level pairs. Each distinct pair is looked
+        up once and only the dirty rows of the origins involved are
+        recomputed.
+        """
+        origins = np.asarray(origin_levels, dtype=np.intp) - GRID_MIN_LEVEL
+        destinations = np.asarray(destination_levels, dtype=np.intp) - GRID_MIN_LEVEL
+        keys, inverse = np.unique(origins * GRID_HEIGHT + destinations, return_inverse=True)
+        unique_origins, unique_destinations = np.divmod(keys, GRID_HEIGHT)
+
+        rows = np.unique(unique_origins)
+        rows = rows[self.dirty[rows]]
+        if len(rows):
+            self._compute(rows)
+            self.dirty[rows] = False
+            self.refreshes += 1
+            self.rows_recomputed += len(rows)
+
+        self.bulk_requests += 1
+        self.bulk_pairs += len(inverse)
+        self.bulk_unique_pairs += len(keys)
+        inverse = inverse.reshape(-1)
+        return RouteBatch(self.trips[unique_origins, unique_destinations][inverse],
+                          self.cost[unique_origins, unique_destinations][inverse],
+                          self.links[unique_origins, unique_destinations][inverse],
+                          self.stops[unique_origins, unique_destinations][inverse],
+                          len(keys))
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def invalidate(self, levels: range):
+        """
+        Transit graph callback: mark the rows whose routes may use an edited
+        link. A route can only start using (or stop using) a link if it gets
+        to one of the link's levels in fewer than max_trips legs without it,
+        which the current hop counts tell for every row at once. Also the
+        WalkingModel callback, for walkway edits on levels transit stops at.
+        """
+        self._layout = None
+        columns = np.arange(levels.start, levels.stop) - GRID_MIN_LEVEL
+        hops = self.hops[:, columns]
+        self.dirty |= ((hops >= 0) & (hops < self.max_trips)).any(axis=1)
+
+    def refresh(self) -> int:
+        """Recompute every dirty row; returns how many there were"""
+        rows = np.flatnonzero(self.dirty)
+        if len(rows):
+            self._compute(rows)
+            self.dirty[rows] = False
+            self.refreshes += 1
+            self.rows_recomputed += len(rows)
+        return len(rows)
+
+    def _compute(self, rows: np.ndarray):
+        """Layered search from each origin in `rows`, then read the routes back out"""
+        if self.walkways is not None:
+            self._compute_walking(rows)
+            return
+        count, levels = len(rows), self.cost.shape[1]
+        best = np.full((count, levels), np.inf, dtype=np.float32)
+        best[np.arange(count), rows] = 0.0
+        hops = np.where(np.isfinite(best), 0, UNREACHABLE).astype(np.int8)
+        # Per layer: link that improved each level (NO_LINK = carried over) and the level it left from
+        via_link, via_level = [], []
+
+        for layer in range(1, self.max_trips + 1):
+            previous = best
+            best = previous.copy()
+            link_ids = np.full((count, levels), NO_LINK, dtype=np.int32)
+            from_levels = np.zeros((count, levels), dtype=np.int16)
+            for link in self.graph.links.values():
+                low, high = link.bottom_level - GRID_MIN_LEVEL, link.top_level - GRID_MIN_LEVEL + 1
+                block = previous[:, low:high]
+                active = np.flatnonzero(np.isfinite(block).any(axis=1))
+                if not len(active):
+                    continue
+                span = np.arange(high - low)
+                ride = (link.expected_wait + np.abs(span[:, None] - span[None, :]) * link.seconds_per_level)
+                candidates = block[active][:, :, None] + ride.astype(np.float32)  # [row, from, to]
+                start = candidates.argmin(axis=1)
+                value = np.take_along_axis(candidates, start[:, None, :], axis=1)[:, 0, :]
+                better = value < best[active, low:high]
+                best[active, low:high] = np.where(better, value, best[active, low:high])
+                link_ids[active, low:high] = np.where(better, link.link_id, link_ids[active, low:high])
+                from_levels[active, low:high] = np.where(better, start + low, from_levels[active, low:high])
+            hops[(hops == UNREACHABLE) & np.isfinite(best)] = layer
+            via_link.append(link_ids)
+            via_level.append(from_levels)
+
+        # Walk each destination back through the layers, collecting legs last to first
+        index = np.arange(count)[:, None]
+        current = np.tile(np.arange(levels), (count, 1))
+        legs = np.zeros((count, levels), dtype=np.int8)
+        back_links = np.full((count, levels, self.max_trips), NO_LINK, dtype=np.int32)
+        back_stops = np.full((count, levels, self.max_trips), NO_LINK, dtype=np.int16)
+        for layer in reversed(range(self.max_trips)):
+            link_ids = via_link[layer][index, current]
+            took = link_ids != NO_LINK
+            slot = legs[..., None].astype(np.intp)  # Next free slot; fewer legs so far than layers walked
+            np.put_along_axis(back_links, slot, np.where(took, link_ids, NO_LINK)[..., None], axis=2)
+            stops = np.where(took, current + GRID_MIN_LEVEL, NO_LINK)
+            np.put_along_axis(back_stops, slot, stops[..., None], axis=2)
+            current = np.where(took, via_level[layer][index, current], current)
+            legs += took
+
+        self._store(rows, best, hops, legs, back_links, back_stops)
+
+    def _endpoint_layout(self) -> EndpointLayout | None:
+        """Endpoint numbering and per-level walking times, rebuilt after edits (None without walkways)"""
+        if self.walkways is None or self._layout is not None:
+            return self._layout
+        first, link_ids, levels = {}, [], []
+        for link in self.graph.links.values():
+            first[link.link_id] = len(levels)
+            served = range(link.bottom_level - GRID_MIN_LEVEL, link.top_level - GRID_MIN_LEVEL + 1)
+            link_ids.extend([link.link_id] * len(served))
+            levels.extend(served)
+        walks = []
+        for level in sorted(set(levels)):
+            endpoints = self.walkways.endpoints(level + GRID_MIN_LEVEL)
+            ids = np.array([first[link_id] + level - (self.graph.links[link_id].bottom_level - GRID_MIN_LEVEL)
+                            for link_id in endpoints.link_ids.tolist()], dtype=np.intp)
+            walks.append((level, ids, endpoints.seconds.astype(np.float32)))
+        self._layout = EndpointLayout(first, np.array(link_ids, dtype=np.int32),
+                                      np.array(levels, dtype=np.intp), walks)
+        return self._layout
+
+    def _compute_walking(self, rows: np.ndarray):
+        """
+        Layered search over transit endpoints. Layer k holds the cheapest
+        cost of getting off at each endpoint in at most k legs; a leg
+        boards from the origin level, or walks over from the endpoint the
+        previous leg got off at.
+        """
+        layout = self._endpoint_layout()
+        count, levels, endpoints = len(rows), self.cost.shape[1], len(layout.level)
+        best = np.full((count, levels), np.inf, dtype=np.float32)
+        best[np.arange(count), rows] = 0.0
+        hops = np.where(np.isfinite(best), 0, UNREACHABLE).astype(np.int8)
+        arrive = np.full((count, endpoints), np.inf, dtype=np.float32)
+        arrive_legs = np.zeros((count, endpoints), dtype=np.int8)
+        # Per layer: endpoint each improved arrival boarded at (NO_LINK = carried over), and the
+        # arrival each boarding walked over from
+        via_board, via_arrival = [], []
+
+        for layer in range(1, self.max_trips + 1):
+            previous = arrive
+            board = np.full((count, endpoints), np.inf, dtype=np.float32)
+            board_from = np.full((count, endpoints), FROM_ORIGIN, dtype=np.int32)
+            for level, ids, walk in layout.walks:
+                at_origin = rows == level
+                reached = previous[:, ids]
+                if not at_origin.any() and not np.isfinite(reached).any():
+                    continue
+                via = reached[:, :, None] + walk[None]  # [row, got off at, boards at]
+                came = via.argmin(axis=1)
+                value = np.take_along_axis(via, came[:, None, :], axis=1)[:, 0, :]
+                board[:, ids] = np.where(at_origin[:, None], 0.0, value)
+                board_from[:, ids] = np.where(at_origin[:, None], FROM_ORIGIN, ids[came])
+
+            arrive = previous.copy()
+            boarded_at = np.full((count, endpoints), NO_LINK, dtype=np.int32)
+            for link in self.graph.links.values():
+                first = layout.first[link.link_id]
+                stop = first + link.top_level - link.bottom_level + 1
+                block = board[:, first:stop]
+                active = np.flatnonzero(np.isfinite(block).any(axis=1))
+                if not len(active):
+                    continue
+                span = np.arange(stop - first)
+                ride = (link.expected_wait + np.abs(span[:, None] - span[None, :]) * link.seconds_per_level)
+                candidates = block[active][:, :, None] + ride.astype(np.float32)  # [row, from, to]
+                start = candidates.argmin(axis=1)
+                value = np.take_along_axis(candidates, start[:, None, :], axis=1)[:, 0, :]
+                better = value < arrive[active, first:stop]
+                arrive[active, first:stop] = np.where(better, value, arrive[active, first:stop])
+                arrive_legs[active, first:stop] = np.where(better, layer, arrive_legs[active, first:stop])
+                boarded_at[active, first:stop] = np.where(better, start + first, boarded_at[active, first:stop])
+            for level, ids, _ in layout.walks:
+                best[:, level] = np.minimum(best[:, level], arrive[:, ids].min(axis=1))
+            hops[(hops == UNREACHABLE) & np.isfinite(best)] = layer
+            via_board.append(boarded_at)
+            via_arrival.append(board_from)
+
+        # Each destination's route ends at its cheapest endpoint there, the one reached in fewest legs on a tie
+        index = np.arange(count)[:, None]
+        current = np.full((count, levels), FROM_ORIGIN, dtype=np.int32)
+        for level, ids, _ in layout.walks:
+            order = np.lexsort((arrive_legs[:, ids], arrive[:, ids]), axis=1)[:, 0]
+            ends = np.isfinite(best[:, level]) & (rows != level)
+            current[:, level] = np.where(ends, ids[order], FROM_ORIGIN)
+
+        # Walk each destination back through the layers, collecting legs last to first
+        legs = np.zeros((count, levels), dtype=np.int8)
+        back_links = np.full((count, levels, self.max_trips), NO_LINK, dtype=np.int32)
+        back_stops = np.full((count, levels, self.max_trips), NO_LINK, dtype=np.int16)
+        for layer in reversed(range(self.max_trips if endpoints else 0)):
+            arrived = np.maximum(current, 0)
+            boarded_at = via_board[layer][index, arrived]
+            took = (current != FROM_ORIGIN) & (boarded_at != NO_LINK)
+            slot = legs[..., None].astype(np.intp)
+            np.put_along_axis(back_links, slot, np.where(took, layout.link[arrived], NO_LINK)[..., None], axis=2)
+            stops = np.where(took, layout.level[arrived] + GRID_MIN_LEVEL, NO_LINK)
+            np.put_along_axis(back_stops, slot, stops[..., None], axis=2)
+            current = np.where(took, via_arrival[layer][index, np.maximum(boarded_at, 0)], current)
+            legs += took
+        self._store(rows, best, hops, legs, back_links, back_stops)
+
+    def _store(self, rows: np.ndarray, best: np.ndarray, hops: np.ndarray, legs: np.ndarray,
+               back_links: np.ndarray, back_stops: np.ndarray):
+        """Reverse each route into travel order and write the rows"""
+        position = legs[..., None].astype(np.int32) - 1 - np.arange(self.max_trips)
+        valid = position >= 0
+        position = np.maximum(position, 0)
+        reachable = np.isfinite(best)
+        self.cost[rows] = best
+        self.trips[rows] = np.where(reachable, legs, UNREACHABLE)
+        self.hops[rows] = hops
+        self.links[rows] = np.where(valid, np.take_along_axis(back_links, position, axis=2), NO_LINK)
+        self.stops[rows] = np.where(valid, np.take_along_axis(back_stops, position, axis=2), NO_LINK)
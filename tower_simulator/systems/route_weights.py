@@ -0,0 +1,117 @@
+"""
+Congestion-aware route weights.
+Waits measured at each elevator shaft are pooled as they happen, but
+nothing is re-weighted per Sim: a recurring World Clock event folds the
+pool into a rolling average per shaft, moves the expected wait of every
+shaft whose average left its hysteresis band, and refreshes the routes
+that depended on them, all in one batch. Sims then pick routes around
+congested banks without routes flipping back and forth on noise.
+"""
+from collections import deque
+
+import numpy as np
+
+from tower_simulator.constants import (
+    CONGESTION_REFRESH_SECONDS, CONGESTION_WINDOW_REFRESHES,
+    CONGESTION_HYSTERESIS_SECONDS, CONGESTION_HYSTERESIS_RATIO,
+)
+from tower_simulator.systems.route_table import RouteTable
+from tower_simulator.systems.transit_graph import TransitGraph, MODE_ELEVATOR
+from tower_simulator.systems.time_manager import TimeManager, EVENT_ROUTE_WEIGHTS_REFRESH
+
+
+class CongestionWeights:
+    """
+    Rolling per-shaft wait statistics feeding the transit graph's expected
+    waits. A shaft with no samples in the whole window drifts back to the
+    wait it was placed with, so a bank Sims stopped using can win them back.
+    """
+
+    def __init__(self, time_manager: TimeManager, graph: TransitGraph, route_table: RouteTable,
+                 interval: int = CONGESTION_REFRESH_SECONDS, window: int = CONGESTION_WINDOW_REFRESHES,
+                 hysteresis_seconds: float = CONGESTION_HYSTERESIS_SECONDS,
+                 hysteresis_ratio: float = CONGESTION_HYSTERESIS_RATIO):
+        self.graph = graph
+        self.route_table = route_table
+        self.window = window
+        self.hysteresis_seconds = hysteresis_seconds
+        self.hysteresis_ratio = hysteresis_ratio
+
+        self._pending: dict[int, list[float]] = {}  # Link id -> [wait sum, samples] since the last refresh
+        self.history: dict[int, deque] = {}  # Link id -> (wait sum, samples) of the last `window` refreshes
+        self.baseline: dict[int, float] = {}  # Expected wait each shaft was placed with
+
+        # Statistics
+        self.samples_total = 0
+        self.refreshes = 0
+        self.weight_updates = 0
+        self.routes_changed = 0  # Level pairs whose route changed in the last refresh
+        self.routes_changed_total = 0
+
+        time_manager.subscribe(EVENT_ROUTE_WEIGHTS_REFRESH, self._on_refresh)
+        self.event = time_manager.schedule_in(interval, EVENT_ROUTE_WEIGHTS_REFRESH, interval=interval)
+
+    # ------------------------------------------------------------------
+    # Samples
+    # ------------------------------------------------------------------
+    def record_wait(self, link_id: int, seconds: float):
+        """A Sim boarded a shaft after waiting `seconds`"""
+        pending = self._pending.setdefault(link_id, [0.0, 0])
+        pending[0] += seconds
+        pending[1] += 1
+        self.samples_total += 1
+
+    def record_waits(self, link_ids: np.ndarray, seconds: np.ndarray):
+        """A whole batch of boardings at once"""
+        links, index = np.unique(np.asarray(link_ids), return_inverse=True)
+        sums = np.bincount(index, weights=seconds, minlength=len(links))
+        counts = np.bincount(index, minlength=len(links))
+        for link_id, total, count in zip(links.tolist(), sums.tolist(), counts.tolist()):
+            pending = self._pending.setdefault(link_id, [0.0, 0])
+            pending[0] += total
+            pending[1] += count
+        self.samples_total += len(index)
+
+    # ------------------------------------------------------------------
+    # Batch refresh
+    # ------------------------------------------------------------------
+    def refresh(self) -> int:
+        """
+        Roll the window, re-weight shafts whose average left the hysteresis
+        band and recompute the affected routes. Returns how many level
+        pairs now take a different route.
+        """
+        pending, self._pending = self._pending, {}
+        table = self.route_table
+        # Bring rows stale from layout edits up to date first, so only re-weighting is counted
+        table.refresh()
+        for link_id, link in self.graph.links.items():
+            if link.mode != MODE_ELEVATOR:
+                continue
+            baseline = self.baseline.setdefault(link_id, link.expected_wait)
+            history = self.history.get(link_id)
+            if history is None:
+                history = self.history[link_id] = deque(maxlen=self.window)
+            history.append(tuple(pending.get(link_id, (0.0, 0))))
+
+            samples = sum(count for _, count in history)
+            measured = sum(total for total, _ in history) / samples if samples else baseline
+            current = link.expected_wait
+            if abs(measured - current) > max(self.hysteresis_seconds, self.hysteresis_ratio * current):
+                self.graph.set_expected_wait(link_id, measured)
+                self.weight_updates += 1
+        for link_id in [link_id for link_id in self.history if link_id not in self.graph.links]:
+            del self.history[link_id]  # Removed shafts
+            self.baseline.pop(link_id, None)
+
+        rows = np.flatnonzero(table.dirty)
+        before = table.links[rows].copy()
+        table.refresh()
+        self.routes_changed = int(np.count_nonzero((table.links[rows] != before).any(axis=2)))
+        self.routes_changed_total += self.routes_changed
+        self.refreshes += 1
+        return self.routes_changed
+
+    def _on_refresh(self, event):
+        """World Clock: refresh period is up"""
+        self.refresh()
@@ -0,0 +1,206 @@
+"""
+Corridor scheduling for elevator cars stacked in one hoistway.
+Cars sharing a shaft cannot pass each other, so car i always stays below
+car i + 1. A car's corridor is the span of stops it is committed to: its
+position, the target it is travelling to and every pickup, destination
+and car call it holds. Trips are only given to a car whose corridor,
+grown to cover the trip, stays clear of its two neighbours' corridors.
+Each car then sweeps inside its own corridor and can never meet another,
+so nothing is compared while cars move: ordering is checked once per
+assignment, against the two neighbours of each candidate car.
+"""
+import numpy as np
+
+from tower_simulator.systems.elevator_dispatch import (
+    ElevatorShaft, ElevatorCar, CAR_MOVING, lowest_bit, highest_bit,
+)
+
+
+class CorridorScheduler:
+    """
+    Assigns trips in a DISPATCH_CORRIDOR shaft. When no car can take a
+    trip yet, idle cars in the way are sent to park clear of it and the
+    trip is deferred; the caller retries it after the next car stops.
+    The first deferred trip claims its span for one car so that busy
+    neighbours drain out of it instead of starving it with new work.
+    """
+
+    def __init__(self, shaft: ElevatorShaft):
+        """Take over a shaft's cars, parking them evenly from bottom to top"""
+        if len(shaft.cars) > shaft.stop_count:
+            raise ValueError(f"{len(shaft.cars)} stacked cars do not fit in a shaft of {shaft.stop_count} stops")
+        self.shaft = shaft
+        self.cars = shaft.cars
+        last = len(self.cars) - 1
+        for car in self.cars:
+            car.position = car.target = car.index * (shaft.stop_count - 1) // last if last else 0
+
+        # The first deferred trip's span, reserved for one car: (car, low stop, high stop)
+        self.claim: tuple[ElevatorCar, int, int] | None = None
+
+        # Statistics
+        self.assignments = 0
+        self.deferrals = 0
+        self.yields = 0  # Idle cars moved out of another car's way
+
+    # ------------------------------------------------------------------
+    # Corridors
+    # ------------------------------------------------------------------
+    def corridor(self, car: ElevatorCar) -> tuple[int, int]:
+        """Lowest and highest stop the car is committed to"""
+        span = car.car_calls | car.up_calls | car.down_calls | car.assigned | (1 << car.position)
+        if car.phase == CAR_MOVING:
+            span |= 1 << car.target
+        return lowest_bit(span), highest_bit(span)
+
+    def state(self) -> tuple:
+        """Every car's corridor and load: trips refused in one state are refused again until it changes"""
+        return tuple((*self.corridor(car), car.pending, car.phase == CAR_MOVING) for car in self.cars)
+
+    def is_free(self, car: ElevatorCar) -> bool:
+        """Stopped with nothing to do, so it may be moved out of the way"""
+        return car.phase != CAR_MOVING and not (car.car_calls | car.up_calls | car.down_calls | car.assigned)
+
+    def can_serve(self, origin: int, destination: int) -> bool:
+        """
+        True if some car can ever make the trip (stop indices): car i never
+        gets lower than stop i or higher than i stops below the top car's
+        highest stop, so trips longer than that range are impossible.
+        """
+        return abs(destination - origin) <= self.shaft.stop_count - len(self.cars)
+
+    # ------------------------------------------------------------------
+    # Assignment
+    # ------------------------------------------------------------------
+    def assign(self, origin_level: int, destination_level: int,
+               capacity: int) -> tuple[ElevatorCar | None, list[ElevatorCar]]:
+        """
+        Assign one Sim's trip to a car. Among cars whose grown corridor stays
+        clear of their neighbours, prefer the one whose corridor grows least
+        (leaving the most room to the others), then the fewest extra stops,
+        the least loaded and the closest. Returns (car, []) on success, or
+        (None, cars sent to park out of the way) when the trip has to wait.
+        """
+        shaft = self.shaft
+        origin, destination = shaft.stop_index(origin_level), shaft.stop_index(destination_level)
+        low, high = min(origin, destination), max(origin, destination)
+        stops = (1 << origin) | (1 << destination)
+        corridors = [self.corridor(car) for car in self.cars]
+        growth = [max(car_low - low, 0) + max(high - car_high, 0) for car_low, car_high in corridors]
+        last = len(self.cars) - 1
+
+        claim = self.claim
+        best, best_key = None, None
+        for car in self.cars:
+            index = car.index
+            if car.pending >= capacity:
+                continue
+            car_low, car_high = corridors[index]
+            new_low, new_high = min(car_low, low), max(car_high, high)
+            if index > 0 and corridors[index - 1][1] >= new_low:
+                continue
+            if index < last and corridors[index + 1][0] <= new_high:
+                continue
+            if claim is not None and car is not claim[0] and new_low <= claim[2] and new_high >= claim[1]:
+                continue  # Keep out of another car's claimed span
+            committed = car.assigned | car.car_calls | car.up_calls | car.down_calls
+            key = (growth[index], (stops & ~committed).bit_count(), car.pending, abs(car.position - origin), index)
+            if best_key is None or key < best_key:
+                best, best_key = car, key
+
+        if best is None:
+            self.deferrals += 1
+            if claim is None or claim[1:] == (low, high):
+                # Claim for the car that can reach both ends of the trip (index <= low and
+                # high <= top stop - cars above) and whose corridor grows least
+                reach = range(max(0, high - shaft.stop_count + len(self.cars)), min(low, last) + 1)
+                owner = min((self.cars[index] for index in reach), key=lambda c: (
+                    growth[c.index], abs(c.position - origin), c.index))
+                self.claim = (owner, low, high)
+                return None, self._make_room(low, high, origin)
+            return None, []  # Only the claiming trip pushes cars, or two trips could push one back and forth
+        if claim is not None and best is claim[0] and (low, high) == claim[1:]:
+            self.claim = None
+        shaft.commit(best, origin, destination)
+        self.assignments += 1
+        return best, []
+
+    def fits(self, lows: np.ndarray, highs: np.ndarray, capacity: int) -> np.ndarray:
+        """
+        Which trips (spans of stop indices) some car could take right now,
+        for a whole batch of deferred trips at once: the cheap filter before
+        retrying assign(). The claimed trip always passes, and so does the
+        first trip while there is no claim, so that room keeps being made.
+        """
+        fits = np.zeros(len(lows), dtype=bool)
+        corridors = [self.corridor(car) for car in self.cars]
+        last = len(self.cars) - 1
+        claim = self.claim
+        for car in self.cars:
+            if car.pending >= capacity:
+                continue
+            index = car.index
+            below = corridors[index - 1][1] if index > 0 else -1
+            above = corridors[index + 1][0] if index < last else self.shaft.stop_count
+            ok = (lows > below) & (highs < above)
+            if claim is not None and car is not claim[0]:
+                car_low, car_high = corridors[index]
+                ok &= (np.maximum(highs, car_high) < claim[1]) | (np.minimum(lows, car_low) > claim[2])
+            fits |= ok
+        if claim is not None:
+            fits |= (lows == claim[1]) & (highs == claim[2])
+        elif len(fits):
+            fits[0] = True
+        return fits
+
+    def _make_room(self, low: int, high: int, origin: int) -> list[ElevatorCar]:
+        """
+        Find the claiming car, or else the car closest to the trip, whose
+        neighbours could be pushed outwards, one stop apart, to clear the
+        trip's span. Only free cars are pushed, and only the outermost car
+        of each chain moves now: the cars behind it follow on later retries
+        once their own way is clear, so pushed cars never share a stop.
+        """
+        count, top = len(self.cars), self.shaft.stop_count - 1
+        owner = self.claim[0] if self.claim is not None else None
+        for car in sorted(self.cars, key=lambda c: (c is not owner, abs(c.position - origin), c.index)):
+            car_low, car_high = self.corridor(car)
+            moves = []
+
+            chain = None
+            limit = min(car_low, low) - 1  # Highest stop the next car down may use
+            for index in range(car.index - 1, -1, -1):
+                neighbour = self.cars[index]
+                if self.corridor(neighbour)[1] <= limit:
+                    break
+                if not self.is_free(neighbour) or limit < index:
+                    moves = None
+                    break
+                chain = (neighbour, limit)
+                limit -= 1
+            if moves is None:
+                continue
+            if chain is not None:
+                moves.append(chain)
+
+            chain = None
+            limit = max(car_high, high) + 1  # Lowest stop the next car up may use
+            for index in range(car.index + 1, count):
+                neighbour = self.cars[index]
+                if self.corridor(neighbour)[0] >= limit:
+                    break
+                if not self.is_free(neighbour) or limit > top - (count - 1 - index):
+                    moves = None
+                    break
+                chain = (neighbour, limit)
+                limit += 1
+            if moves is None:
+                continue
+            if chain is not None:
+                moves.append(chain)
+
+            for neighbour, stop in moves:
+                neighbour.car_calls |= 1 << stop
+            self.yields += len(moves)
+            return [neighbour for neighbour, _ in moves]
+        return []
@@ -0,0 +1,137 @@
+"""
+Sim behavioral state machine compiled into lookup tables.
+Behavior per Sim profile is data (the rules below), not subclasses: the
+rules are compiled into uint8 arrays indexed by [profile, state, event],
+and a whole batch of Sims transitions in one fancy-indexing lookup.
+"""
+import numpy as np
+
+from tower_simulator.entities.ecs import (
+    TRIP_TO_WORK, TRIP_LUNCH_OUT, TRIP_LUNCH_RETURN, TRIP_FROM_WORK,
+    TRIP_HOTEL_CHECKOUT, TRIP_HOTEL_CHECKIN, TRIP_CONDO_OUT, TRIP_CONDO_RETURN,
+    PROFILE_OFFICE_WORKER, PROFILE_CONDO_RESIDENT, PROFILE_HOTEL_GUEST, PROFILE_SHOPPER,
+    BEHAVIOR_OUTSIDE, BEHAVIOR_HEADING_IN, BEHAVIOR_IN_ROOM, BEHAVIOR_HEADING_OUT,
+    BEHAVIOR_VISITING, BEHAVIOR_HEADING_BACK, BEHAVIOR_LEAVING,
+)
+
+PROFILE_COUNT = 4
+BEHAVIOR_COUNT = 7
+
+# Behavior events
+SIM_EVENT_ENTER = 0  # Arrival trip: come into the tower
+SIM_EVENT_VISIT = 1  # Go out to another room (lunch, shopping)
+SIM_EVENT_RETURN = 2  # Go back to the Sim's own room
+SIM_EVENT_LEAVE = 3  # Leave the tower via the lobby
+SIM_EVENT_ARRIVED = 4  # Reached the destination of the current journey
+SIM_EVENT_STRESSED = 5  # Waiting time crossed the red threshold
+SIM_EVENT_COUNT = 6
+
+# Actions carried out after a transition
+ACTION_NONE = 0
+ACTION_TRAVEL = 1  # Start a journey to the event's destination room (lobby if none)
+ACTION_DESPAWN = 2  # Sim has left the tower
+ACTION_INVALID = 255  # Event does not apply in this state; state is left unchanged
+
+# Behavior states in which the Sim is on a journey (an ARRIVED event is expected)
+HEADING_STATES = (BEHAVIOR_HEADING_IN, BEHAVIOR_HEADING_OUT, BEHAVIOR_HEADING_BACK, BEHAVIOR_LEAVING)
+
+# Trip kind -> behavior event (index with the `trip` component or TripTable.kind)
+TRIP_EVENTS = np.zeros(TRIP_CONDO_RETURN + 1, dtype=np.uint8)
+TRIP_EVENTS[[TRIP_TO_WORK, TRIP_HOTEL_CHECKIN, TRIP_CONDO_RETURN]] = SIM_EVENT_ENTER
+TRIP_EVENTS[TRIP_LUNCH_OUT] = SIM_EVENT_VISIT
+TRIP_EVENTS[TRIP_LUNCH_RETURN] = SIM_EVENT_RETURN
+TRIP_EVENTS[[TRIP_FROM_WORK, TRIP_HOTEL_CHECKOUT, TRIP_CONDO_OUT]] = SIM_EVENT_LEAVE
+
+# Arrival trip kind -> profile of the Sim it brings in
+TRIP_PROFILES = np.full(TRIP_CONDO_RETURN + 1, PROFILE_SHOPPER, dtype=np.uint8)
+TRIP_PROFILES[TRIP_TO_WORK] = PROFILE_OFFICE_WORKER
+TRIP_PROFILES[TRIP_HOTEL_CHECKIN] = PROFILE_HOTEL_GUEST
+TRIP_PROFILES[TRIP_CONDO_RETURN] = PROFILE_CONDO_RESIDENT
+
+# Shared rules: (state, event, next state, action)
+_RESIDENT_RULES = [
+    (BEHAVIOR_OUTSIDE, SIM_EVENT_ENTER, BEHAVIOR_HEADING_IN, ACTION_TRAVEL),
+    (BEHAVIOR_HEADING_IN, SIM_EVENT_ARRIVED, BEHAVIOR_IN_ROOM, ACTION_NONE),
+    (BEHAVIOR_IN_ROOM, SIM_EVENT_LEAVE, BEHAVIOR_LEAVING, ACTION_TRAVEL),
+    (BEHAVIOR_LEAVING, SIM_EVENT_ARRIVED, BEHAVIOR_OUTSIDE, ACTION_DESPAWN),
+    # Still on the way in when it is time to go, or the wait got too long: turn back to the lobby
+    (BEHAVIOR_HEADING_IN, SIM_EVENT_LEAVE, BEHAVIOR_LEAVING, ACTION_TRAVEL),
+    (BEHAVIOR_HEADING_IN, SIM_EVENT_STRESSED, BEHAVIOR_LEAVING, ACTION_TRAVEL),
+]
+
+# Sims that cannot even get back to the lobby give up and walk out
+_GIVE_UP_RULES = [
+    (BEHAVIOR_LEAVING, SIM_EVENT_STRESSED, BEHAVIOR_OUTSIDE, ACTION_DESPAWN),
+]
+
+BEHAVIOR_RULES = {
+    PROFILE_OFFICE_WORKER: _RESIDENT_RULES + _GIVE_UP_RULES + [
+        (BEHAVIOR_IN_ROOM, SIM_EVENT_VISIT, BEHAVIOR_HEADING_OUT, ACTION_TRAVEL),
+        (BEHAVIOR_HEADING_OUT, SIM_EVENT_ARRIVED, BEHAVIOR_VISITING, ACTION_NONE),
+        (BEHAVIOR_VISITING, SIM_EVENT_RETURN, BEHAVIOR_HEADING_BACK, ACTION_TRAVEL),
+        (BEHAVIOR_HEADING_BACK, SIM_EVENT_ARRIVED, BEHAVIOR_IN_ROOM, ACTION_NONE),
+        # Lunch ran late: go home straight from the restaurant, or from wherever they got to
+        (BEHAVIOR_VISITING, SIM_EVENT_LEAVE, BEHAVIOR_LEAVING, ACTION_TRAVEL),
+        (BEHAVIOR_HEADING_OUT, SIM_EVENT_LEAVE, BEHAVIOR_LEAVING, ACTION_TRAVEL),
+        (BEHAVIOR_HEADING_BACK, SIM_EVENT_LEAVE, BEHAVIOR_LEAVING, ACTION_TRAVEL),
+        # Stuck on the way to or from lunch: give up on the day
+        (BEHAVIOR_HEADING_OUT, SIM_EVENT_STRESSED, BEHAVIOR_LEAVING, ACTION_TRAVEL),
+        (BEHAVIOR_HEADING_BACK, SIM_EVENT_STRESSED, BEHAVIOR_LEAVING, ACTION_TRAVEL),
+    ],
+    PROFILE_CONDO_RESIDENT: _RESIDENT_RULES + _GIVE_UP_RULES,
+    PROFILE_HOTEL_GUEST: _RESIDENT_RULES + _GIVE_UP_RULES,
+    PROFILE_SHOPPER: _GIVE_UP_RULES + [
+        (BEHAVIOR_OUTSIDE, SIM_EVENT_ENTER, BEHAVIOR_HEADING_OUT, ACTION_TRAVEL),
+        (BEHAVIOR_HEADING_OUT, SIM_EVENT_ARRIVED, BEHAVIOR_VISITING, ACTION_NONE),
+        (BEHAVIOR_VISITING, SIM_EVENT_LEAVE, BEHAVIOR_LEAVING, ACTION_TRAVEL),
+        (BEHAVIOR_HEADING_OUT, SIM_EVENT_LEAVE, BEHAVIOR_LEAVING, ACTION_TRAVEL),
+        (BEHAVIOR_LEAVING, SIM_EVENT_ARRIVED, BEHAVIOR_OUTSIDE, ACTION_DESPAWN),
+        # Shoppers give up and go home when the wait gets too long
+        (BEHAVIOR_HEADING_OUT, SIM_EVENT_STRESSED, BEHAVIOR_LEAVING, ACTION_TRAVEL),
+    ],
+}
+
+
+def compile_transition_table(rules: dict = BEHAVIOR_RULES) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compile rules into (next_state, action) uint8 tables of shape
+    [PROFILE_COUNT, BEHAVIOR_COUNT, SIM_EVENT_COUNT]. Unlisted pairs keep
+    the state; ARRIVED and STRESSED are harmless no-ops there, any other
+    event is ACTION_INVALID.
+    """
+    shape = (PROFILE_COUNT, BEHAVIOR_COUNT, SIM_EVENT_COUNT)
+    next_state = np.broadcast_to(np.arange(BEHAVIOR_COUNT, dtype=np.uint8)[None, :, None], shape).copy()
+    action = np.full(shape, ACTION_INVALID, dtype=np.uint8)
+    action[:, :, [SIM_EVENT_ARRIVED, SIM_EVENT_STRESSED]] = ACTION_NONE
+
+    for profile, profile_rules in rules.items():
+        for state, event, target, rule_action in profile_rules:
+            next_state[profile, state, event] = target
+            action[profile, state, event] = rule_action
+    return next_state, action
+
+
+class BehaviorStateMachine:
+    """
+    Vectorized transitions over uint8 profile/state/event arrays.
+    transition() is the whole core loop: one lookup per table, no Python
+    dispatch per Sim.
+    """
+
+    def __init__(self, rules: dict = BEHAVIOR_RULES):
+        self.next_state, self.action = compile_transition_table(rules)
+        self.is_heading = np.zeros(BEHAVIOR_COUNT, dtype=bool)
+        self.is_heading[list(HEADING_STATES)] = True
+
+        # Statistics
+        self.transitions_total = 0
+        self.invalid_total = 0
+
+    def transition(self, profile: np.ndarray, state: np.ndarray, event) -> tuple[np.ndarray, np.ndarray]:
+        """Next states and actions for a batch (event may be a scalar or an array)"""
+        next_state = self.next_state[profile, state, event]
+        action = self.action[profile, state, event]
+        invalid = int(np.count_nonzero(action == ACTION_INVALID))
+        self.transitions_total += len(action) - invalid
+        self.invalid_total += invalid
+        return next_state, action
@@ -0,0 +1,350 @@
+"""
+Simulation level of detail: individual Sims near the viewport, an aggregate
+flow model everywhere else
+"""
+from collections import Counter
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from tower_simulator.constants import (
+    SIM_TICK_SECONDS, SIM_WALK_SPEED, TRANSIT_SECONDS_PER_LEVEL, GRID_MIN_LEVEL, GRID_MAX_LEVEL, GRID_HEIGHT,
+    LOD_BUCKET_SECONDS, LOD_FLOW_HISTORY_BUCKETS, LOD_COMPACT_RATIO,
+)
+from tower_simulator.entities.ecs import (
+    SimWorld, NO_LEG, HELD_BY_CAR, STRESS_RED, SIM_STATE_IDLE, SIM_STATE_WALKING, SIM_STATE_WAITING, SIM_STATE_RIDING,
+)
+from tower_simulator.systems.sim_systems import StressSystem, StressCrossings, land
+
+
+class LevelFlows(NamedTuple):
+    """Per-level Sim counts for one time bucket, indexed by level - GRID_MIN_LEVEL"""
+    queued: np.ndarray  # Joined the transit queue on this level
+    departed: np.ndarray  # Finished a ride that started on this level
+    arrived: np.ndarray  # Finished a ride that ended on this level
+
+
+class LinkFlows(NamedTuple):
+    """Sim counts into and out of one transit link for one time bucket, by level"""
+    boarded: dict[int, int]  # Level -> Sims that started a leg on the link there
+    alighted: dict[int, int]  # Level -> Sims the link set down there
+
+
+class AggregateFlowModel:
+    """
+    Advances off-screen Sims in whole time buckets instead of every tick.
+    Walk, leg wait and ride completion times are solved in closed form per
+    Sim, so a bucket of any length lands every Sim where tick-by-tick
+    simulation would (same state, position, stress and threshold crossings)
+    as long as no Sim needs a new leg planned mid-bucket; Sims that do
+    wait for the next bucket. Sims that joined partway through the span
+    are only advanced from the second they joined. Movement is recorded
+    per bucket as per-level queue and ride counts and, for timed legs, as
+    counts into and out of each transit link at each level.
+    """
+
+    def __init__(self, walk_speed: float = SIM_WALK_SPEED, stress_system: StressSystem | None = None,
+                 bucket_seconds: int = LOD_BUCKET_SECONDS, history: int = LOD_FLOW_HISTORY_BUCKETS,
+                 seconds_per_level: float = TRANSIT_SECONDS_PER_LEVEL):
+        self.walk_speed = walk_speed
+        self.seconds_per_level = seconds_per_level
+        self.stress_system = stress_system or StressSystem()
+        self.bucket_seconds = bucket_seconds
+
+        # Ring of flow buckets; row `_bucket` is the one being filled
+        self._queued = np.zeros((history, GRID_HEIGHT), dtype=np.int32)
+        self._departed = np.zeros((history, GRID_HEIGHT), dtype=np.int32)
+        self._arrived = np.zeros((history, GRID_HEIGHT), dtype=np.int32)
+        self._boarded = [Counter() for _ in range(history)]  # (link id, level) -> Sims
+        self._alighted = [Counter() for _ in range(history)]
+        self._bucket = 0
+        self._bucket_elapsed = 0
+
+    def flows(self, buckets_ago: int = 0) -> LevelFlows:
+        """Flow counts of the current bucket (0) or an earlier one"""
+        row = (self._bucket - buckets_ago) % len(self._queued)
+        return LevelFlows(self._queued[row], self._departed[row], self._arrived[row])
+
+    def link_flows(self, link_id: int, buckets_ago: int = 0) -> LinkFlows:
+        """Counts into and out of a transit link in the current bucket (0) or an earlier one"""
+        row = (self._bucket - buckets_ago) % len(self._queued)
+        return LinkFlows({level: count for (link, level), count in self._boarded[row].items() if link == link_id},
+                         {level: count for (link, level), count in self._alighted[row].items() if link == link_id})
+
+    def advance(self, world: SimWorld, seconds: int, joined: np.ndarray | None = None) -> StressCrossings:
+        """
+        Advance every active Sim in `world` by whole ticks covering `seconds`.
+        `joined` (indexed by Sim id) holds the second of the span at which
+        each Sim joined; it is advanced over the rest of the span only.
+        """
+        ticks = int(seconds // SIM_TICK_SECONDS)
+        empty = np.empty(0, dtype=np.int64)
+        if ticks <= 0:
+            return StressCrossings(empty, empty)
+        span = np.full(world.capacity, ticks, dtype=np.int64)
+        if joined is not None:
+            span -= joined[:world.capacity] // SIM_TICK_SECONDS
+
+        # Sims already queued wait until their leg departs; collect before walkers join them
+        waiting, wait_ticks = self._advance_waiting(world, span)
+        queued, queue_ticks = self._advance_walking(world, span)
+        landed, landed_ticks = self._advance_riding(world, span)
+
+        ids = np.concatenate((waiting, queued, landed))
+        waited = np.concatenate((wait_ticks, queue_ticks, landed_ticks)) * np.float32(SIM_TICK_SECONDS)
+        crossings = self._accumulate_stress(world, ids, waited)
+
+        self._bucket_elapsed += ticks * SIM_TICK_SECONDS
+        while self._bucket_elapsed >= self.bucket_seconds:
+            self._bucket_elapsed -= self.bucket_seconds
+            self._bucket = (self._bucket + 1) % len(self._queued)
+            self._queued[self._bucket] = 0
+            self._departed[self._bucket] = 0
+            self._arrived[self._bucket] = 0
+            self._boarded[self._bucket].clear()
+            self._alighted[self._bucket].clear()
+        return crossings
+
+    def _advance_waiting(self, world: SimWorld, span: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Count down planned leg waits and start the rides that come due.
+        Returns the waiting Sims and the ticks each waited; a ride starts on
+        its due tick (which is not spent waiting) and is ridden from there.
+        """
+        ids = world.ids_in_state(SIM_STATE_WAITING)
+        waited = span[ids]
+        planned = world.leg_link[ids] >= 0
+        timed = ids[planned]
+        if len(timed) == 0:
+            return ids, waited
+
+        ticks = span[timed]
+        due_ticks = np.maximum(1, np.ceil(world.leg_wait[timed] / np.float32(SIM_TICK_SECONDS))).astype(np.int64)
+        world.leg_wait[timed] = np.maximum(world.leg_wait[timed] - (ticks * SIM_TICK_SECONDS).astype(np.float32),
+                                           0.0)
+        due = due_ticks <= ticks
+        waited[np.flatnonzero(planned)[due]] = due_ticks[due] - 1
+
+        boarding = timed[due]
+        self._count_links(self._boarded, world.leg_link[boarding], world.floor[boarding])
+        world.leg_wait[boarding] = 0.0
+        levels = np.abs(world.leg_floor[boarding].astype(np.int32) - world.floor[boarding])
+        world.ride_remaining[boarding] = levels * np.float32(self.seconds_per_level)
+        world.trips[boarding] += 1
+        world.state[boarding] = SIM_STATE_RIDING
+        # Riding starts on the due tick itself: credit the ticks before it so the ride sees only its own
+        world.ride_remaining[boarding] += (due_ticks[due] - 1) * np.float32(SIM_TICK_SECONDS)
+        return ids, waited
+
+    def _advance_walking(self, world: SimWorld, span: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Move walkers; return ids that joined a transit queue and the ticks each has waited"""
+        ids = world.ids_in_state(SIM_STATE_WALKING)
+        if len(ids) == 0:
+            return ids, ids
+
+        ticks = span[ids]
+        step = np.float32(self.walk_speed * SIM_TICK_SECONDS)
+        position = world.segment[ids]
+        delta = world.target_segment[ids] - position
+        # A walker arrives on the first tick its remaining distance is within one step
+        walk_ticks = np.maximum(1, np.ceil(np.abs(delta) / step)).astype(np.int64)
+        arrived = walk_ticks <= ticks
+        world.segment[ids] = np.where(arrived, world.target_segment[ids],
+                                      position + np.sign(delta) * step * ticks)
+
+        arrived_ids = ids[arrived]
+        needs_transit = world.floor[arrived_ids] != world.target_floor[arrived_ids]
+        world.state[arrived_ids] = np.where(needs_transit, SIM_STATE_WAITING, SIM_STATE_IDLE)
+
+        queued = arrived_ids[needs_transit]
+        np.add.at(self._queued[self._bucket], world.floor[queued] - GRID_MIN_LEVEL, 1)
+        # Stress starts counting on the arrival tick itself
+        return queued, ticks[arrived][needs_transit] - walk_ticks[arrived][needs_transit] + 1
+
+    def _advance_riding(self, world: SimWorld, span: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Count down rides and set finished riders down at the end of their leg.
+        Returns the riders set down short of their target (now waiting for
+        their next leg) and the ticks each has waited since.
+        """
+        ids = world.ids_in_state(SIM_STATE_RIDING)
+        if len(ids) == 0:
+            return ids, ids
+
+        ticks = span[ids]
+        remaining = world.ride_remaining[ids]
+        ride_ticks = np.maximum(1, np.ceil(remaining / np.float32(SIM_TICK_SECONDS))).astype(np.int64)
+        world.ride_remaining[ids] = np.maximum(remaining - (ticks * SIM_TICK_SECONDS).astype(np.float32), 0.0)
+
+        finished = ride_ticks <= ticks
+        done = ids[finished]
+        np.add.at(self._departed[self._bucket], world.floor[done] - GRID_MIN_LEVEL, 1)
+        self._count_links(self._alighted, world.leg_link[done], world.leg_floor[done])
+        land(world, done)
+        np.add.at(self._arrived[self._bucket], world.floor[done] - GRID_MIN_LEVEL, 1)
+        # Stress starts counting on the landing tick itself
+        transfer = world.state[done] == SIM_STATE_WAITING
+        return done[transfer], ticks[finished][transfer] - ride_ticks[finished][transfer] + 1
+
+    def _count_links(self, counters: list[Counter], links: np.ndarray, levels: np.ndarray):
+        """Add Sims entering or leaving transit links at levels to the current bucket"""
+        planned = links >= 0  # Rides started without a planned leg belong to no link
+        if not planned.any():
+            return
+        pairs, counts = np.unique(np.stack((links[planned], levels[planned].astype(links.dtype))),
+                                  axis=1, return_counts=True)
+        counter = counters[self._bucket]
+        for link_id, level, count in zip(pairs[0].tolist(), pairs[1].tolist(), counts.tolist()):
+            counter[link_id, level] += count
+
+    def _accumulate_stress(self, world: SimWorld, ids: np.ndarray, waited: np.ndarray) -> StressCrossings:
+        """Add waiting time in bulk and report crossings to the stress system"""
+        stress = self.stress_system
+        # A Sim can wait twice in one span (before and after a leg)
+        ids, index = np.unique(ids, return_inverse=True)
+        waited = np.bincount(index.reshape(-1), weights=waited, minlength=len(ids))
+        # Sims whose leg departed on the first tick never waited (and the stress system never saw them)
+        ids, waited = ids[waited > 0], waited[waited > 0]
+        before = world.stress[ids]
+        after = before + waited.astype(np.float32)
+        world.stress[ids] = after
+        world.stress_level[ids] = ((after >= stress.pink_threshold).astype(np.uint8)
+                                   + (after >= stress.red_threshold))
+
+        pink = ids[(before < stress.pink_threshold) & (after >= stress.pink_threshold)]
+        red = ids[(before < stress.red_threshold) & (after >= stress.red_threshold)]
+        stress.record_crossings(world, pink, red)
+        return StressCrossings(pink, red)
+
+
+class SimLevelOfDetail:
+    """
+    Keeps Sims on levels near the viewport as individual agents in `world`
+    and moves everyone else into `dormant`, a second SimWorld advanced by the
+    AggregateFlowModel once per bucket. Sims are transferred with every
+    component intact, so converting back and forth loses nothing (Sim ids
+    are slot indices and change on transfer, and when demotions leave the
+    on-screen world sparse it is compacted so its per-tick systems only scan
+    about as many slots as it has Sims). Sims queued for or riding in
+    an elevator car stay individual until the car sets them down. Sims
+    that are demoted, or start a journey in the dormant world, partway
+    through a bucket are marked (mark_joined) so the bucket's advance
+    starts them where they joined.
+    """
+
+    def __init__(self, world: SimWorld, stress_system: StressSystem | None = None,
+                 walk_speed: float = SIM_WALK_SPEED, bucket_seconds: int = LOD_BUCKET_SECONDS,
+                 stressed_callback: Callable[[np.ndarray], None] | None = None,
+                 plan_callback: Callable[[], None] | None = None):
+        self.world = world
+        # Receives dormant Sim ids that turned red, before any are promoted
+        self.stressed_callback = stressed_callback
+        # Plans transit legs for dormant Sims waiting without one, before each advance
+        self.plan_callback = plan_callback
+        self.dormant = SimWorld(capacity=world.capacity, growth_factor=world.growth_factor)
+        self.flow_model = AggregateFlowModel(walk_speed, stress_system, bucket_seconds)
+        self.bucket_seconds = bucket_seconds
+
+        # Whole tower individually simulated until a viewport is set
+        self.low_level = GRID_MIN_LEVEL
+        self.high_level = GRID_MAX_LEVEL
+        self._pending_seconds = 0
+        self._joined = np.zeros(self.dormant.capacity, dtype=np.int64)  # Dormant Sim id -> second of the bucket
+
+        # Statistics
+        self.promoted_total = 0
+        self.demoted_total = 0
+
+    @property
+    def population(self) -> int:
+        """Sims in both fidelities"""
+        return self.world.active_count + self.dormant.active_count
+
+    def set_visible_levels(self, low: int, high: int):
+        """Set the individually simulated level range (viewport plus margin)"""
+        if (low, high) == (self.low_level, self.high_level):
+            return
+        self.low_level = low
+        self.high_level = high
+        # Bring dormant Sims up to date so the ones being woken are exact
+        self.flush()
+        self._demote()
+        self._promote()
+
+    def update(self, dt: int):
+        """Call once per simulation tick after the individual systems have run"""
+        self._pending_seconds += dt
+        # Riders that just landed on an off-screen level
+        self._demote()
+        if self._pending_seconds >= self.bucket_seconds:
+            self.flush()
+            self._promote()
+
+    def flush(self):
+        """Advance the dormant Sims over all pending time"""
+        if self._pending_seconds and self.dormant.active_count:
+            if self.plan_callback is not None:
+                self.plan_callback()
+            crossings = self.flow_model.advance(self.dormant, self._pending_seconds, self._joined)
+            if self.stressed_callback is not None and len(crossings.red):
+                self.stressed_callback(crossings.red)
+        self._pending_seconds = 0
+        self._joined[:] = 0
+
+    def mark_joined(self, ids: np.ndarray):
+        """Record that dormant Sims changed hands or started moving at this point in the bucket"""
+        if len(self._joined) < self.dormant.capacity:
+            grown = np.zeros(self.dormant.capacity, dtype=np.int64)
+            grown[:len(self._joined)] = self._joined
+            self._joined = grown
+        self._joined[ids] = self._pending_seconds
+
+    def _in_view(self, world: SimWorld) -> np.ndarray:
+        """Mask over the world's active span of the Sims on individually simulated levels"""
+        floor = world.floor[:world.extent]
+        return world.active[:world.extent] & (floor >= self.low_level) & (floor <= self.high_level)
+
+    def _demote(self):
+        """Move Sims on off-screen levels into the aggregate model"""
+        world = self.world
+        if world.active_count == 0:
+            return
+        extent = world.extent
+        ids = np.flatnonzero(world.active[:extent] & ~self._in_view(world)
+                             & (world.leg_wait[:extent] != HELD_BY_CAR) & (world.ride_remaining[:extent] != HELD_BY_CAR))
+        if len(ids):
+            self.mark_joined(world.transfer_to(self.dormant, ids))
+            self.demoted_total += len(ids)
+            if world.active_count * LOD_COMPACT_RATIO < world.extent:
+                # Most of the span is holes now: pack the Sims left on screen (car riders keep their ids)
+                world.compact(world.held_by_cars())
+
+    def _promote(self):
+        """Move dormant Sims on visible levels back to individual simulation"""
+        if self.dormant.active_count == 0:
+            return
+        ids = np.flatnonzero(self._in_view(self.dormant))
+        if len(ids):
+            ids = self.dormant.transfer_to(self.world, ids)
+            # Legs not yet under way are planned again, through the cars where there are some
+            state = self.world.state[ids]
+            waiting = ids[(state == SIM_STATE_WAITING) | (state == SIM_STATE_WALKING)]
+            self.world.leg_link[waiting] = NO_LEG
+            self.world.leg_wait[waiting] = 0.0
+            self.promoted_total += len(ids)
+
+    def population_by_level(self) -> np.ndarray:
+        """Sims per level (index level - GRID_MIN_LEVEL) across both fidelities"""
+        counts = np.zeros(GRID_HEIGHT, dtype=np.int64)
+        for world in (self.world, self.dormant):
+            ids = world.active_ids()
+            counts += np.bincount(world.floor[ids] - GRID_MIN_LEVEL, minlength=GRID_HEIGHT)
+        return counts
+
+    def stress_distribution(self) -> np.ndarray:
+        """Sim counts per stress color (black, pink, red) across both fidelities"""
+        counts = np.zeros(STRESS_RED + 1, dtype=np.int64)
+        for world in (self.world, self.dormant):
+            ids = world.active_ids()
+            counts += np.bincount(world.stress_level[ids], minlength=STRESS_RED + 1)
+        return counts
@@ -0,0 +1,353 @@
+"""
+Vectorized Sim systems operating on SimWorld component arrays
+"""
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from tower_simulator.constants import (
+    SIM_WALK_SPEED, TRANSIT_SECONDS_PER_LEVEL, STRESS_LEVEL_PINK, STRESS_LEVEL_RED,
+)
+from tower_simulator.entities.ecs import (
+    SimWorld, NO_ROOM, NO_LEG, STRESS_BLACK,
+    SIM_STATE_IDLE, SIM_STATE_WALKING, SIM_STATE_WAITING, SIM_STATE_RIDING,
+    TRIP_TO_WORK, TRIP_LUNCH_OUT, TRIP_LUNCH_RETURN, TRIP_FROM_WORK, TRIP_HOTEL_CHECKIN, TRIP_CONDO_RETURN,
+)
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.systems.sim_behavior import (
+    BehaviorStateMachine, TRIP_EVENTS, TRIP_PROFILES, SIM_EVENT_ARRIVED, SIM_EVENT_STRESSED,
+    ACTION_TRAVEL, ACTION_DESPAWN, ACTION_INVALID,
+)
+
+LOBBY_LEVEL = 0
+
+# Trips whose travelling Sim is found by its work room (the rest by home room)
+_WORK_ROOM_TRIPS = (TRIP_LUNCH_OUT, TRIP_LUNCH_RETURN, TRIP_FROM_WORK)
+_ARRIVAL_TRIPS = (TRIP_TO_WORK, TRIP_HOTEL_CHECKIN, TRIP_CONDO_RETURN)
+_SEAT_STRIDE = 1 << 16
+
+
+def land(world: SimWorld, ids: np.ndarray):
+    """
+    Set riders down at the end of their leg: idle if that is their target
+    floor, otherwise waiting for the next leg. Rides with no planned leg
+    go straight to the target floor.
+    """
+    planned = world.leg_link[ids] != NO_LEG
+    world.floor[ids] = np.where(planned, world.leg_floor[ids], world.target_floor[ids])
+    world.ride_remaining[ids] = 0.0
+    world.leg_link[ids] = NO_LEG
+    world.leg_wait[ids] = 0.0
+    arrived = world.floor[ids] == world.target_floor[ids]
+    world.state[ids] = np.where(arrived, SIM_STATE_IDLE, SIM_STATE_WAITING)
+
+
+class MovementSystem:
+    """
+    Moves walking Sims along their floor, starts timed legs once their wait
+    is over and moves riding Sims between levels. Elevator legs are left to
+    the cars (see systems/sim_transit.py).
+    """
+
+    def __init__(self, walk_speed: float = SIM_WALK_SPEED,
+                 seconds_per_level: float = TRANSIT_SECONDS_PER_LEVEL):
+        self.walk_speed = walk_speed
+        self.seconds_per_level = seconds_per_level
+
+    def update(self, world: SimWorld, dt: float):
+        """Advance all moving Sims by dt game seconds"""
+        self._update_walking(world, dt)
+        self._update_waiting(world, dt)
+        self._update_riding(world, dt)
+
+    def _update_walking(self, world: SimWorld, dt: float):
+        """Walk towards target_segment; on arrival go idle or start waiting for transit"""
+        ids = world.ids_in_state(SIM_STATE_WALKING)
+        if len(ids) == 0:
+            return
+
+        position = world.segment[ids]
+        delta = world.target_segment[ids] - position
+        max_step = self.walk_speed * dt
+        arrived = np.abs(delta) <= max_step
+        world.segment[ids] = np.where(arrived, world.target_segment[ids],
+                                      position + np.sign(delta) * max_step)
+
+        arrived_ids = ids[arrived]
+        needs_transit = world.floor[arrived_ids] != world.target_floor[arrived_ids]
+        world.state[arrived_ids] = np.where(needs_transit, SIM_STATE_WAITING, SIM_STATE_IDLE)
+
+    def _update_waiting(self, world: SimWorld, dt: float):
+        """Count down the wait of planned timed legs and start the rides that are due"""
+        ids = world.ids_in_state(SIM_STATE_WAITING)
+        ids = ids[world.leg_link[ids] >= 0]
+        if len(ids) == 0:
+            return
+
+        remaining = world.leg_wait[ids] - dt
+        world.leg_wait[ids] = np.maximum(remaining, 0.0)
+        due = ids[remaining <= 0.0]
+        if len(due):
+            self.start_ride(world, due, world.leg_floor[due])
+
+    def _update_riding(self, world: SimWorld, dt: float):
+        """Count down ride time; on arrival set Sims down at the end of their leg"""
+        ids = world.ids_in_state(SIM_STATE_RIDING)
+        if len(ids) == 0:
+            return
+
+        remaining = world.ride_remaining[ids] - dt
+        world.ride_remaining[ids] = np.maximum(remaining, 0.0)
+        land(world, ids[remaining <= 0.0])
+
+    def start_ride(self, world: SimWorld, ids: np.ndarray, stops: np.ndarray | None = None):
+        """Move waiting Sims onto vertical transit (one trip leg each, to `stops` or their target floor)"""
+        ids = np.asarray(ids)
+        if stops is None:
+            stops = world.target_floor[ids]
+        world.leg_floor[ids] = stops
+        levels = np.abs(world.leg_floor[ids].astype(np.int32) - world.floor[ids])
+        world.ride_remaining[ids] = levels * self.seconds_per_level
+        world.trips[ids] += 1
+        world.state[ids] = SIM_STATE_RIDING
+
+
+class StressCrossings(NamedTuple):
+    """Sims whose waiting time crossed a stress threshold during one update"""
+    pink: np.ndarray  # Sim ids that just turned pink
+    red: np.ndarray  # Sim ids that just turned red
+
+    def __len__(self) -> int:
+        return len(self.pink) + len(self.red)
+
+
+class StressSystem:
+    """
+    Accumulates stress (seconds spent waiting) for every waiting Sim in one
+    vector update. Threshold crossings are found by comparing the stress
+    before and after the update, and are returned as a batch of Sim ids.
+    Red crossings are tallied against each Sim's home and work room for
+    room evaluation.
+    """
+
+    def __init__(self, pink_threshold: float = STRESS_LEVEL_PINK,
+                 red_threshold: float = STRESS_LEVEL_RED, room_count: int = 0):
+        self.pink_threshold = pink_threshold
+        self.red_threshold = red_threshold
+        self.red_counts_by_room = np.zeros(room_count, dtype=np.int32)
+
+        # Statistics
+        self.pink_total = 0
+        self.red_total = 0
+
+    def update(self, world: SimWorld, dt: float) -> StressCrossings:
+        """Add dt to the stress of all waiting Sims and return threshold crossings"""
+        ids = world.ids_in_state(SIM_STATE_WAITING)
+        before = world.stress[ids]
+        after = before + np.float32(dt)
+        world.stress[ids] = after
+
+        # Renderer color state: 0 black, 1 pink, 2 red
+        world.stress_level[ids] = ((after >= self.pink_threshold).astype(np.uint8)
+                                   + (after >= self.red_threshold))
+
+        pink = ids[(before < self.pink_threshold) & (after >= self.pink_threshold)]
+        red = ids[(before < self.red_threshold) & (after >= self.red_threshold)]
+        self.record_crossings(world, pink, red)
+        return StressCrossings(pink, red)
+
+    def record_crossings(self, world: SimWorld, pink: np.ndarray, red: np.ndarray):
+        """Add a batch of crossings (found here or by the aggregate flow model) to the totals"""
+        if len(red):
+            self._tally_rooms(world, red)
+        self.pink_total += len(pink)
+        self.red_total += len(red)
+
+    def _tally_rooms(self, world: SimWorld, red_ids: np.ndarray):
+        """Count red crossings against home and work rooms"""
+        rooms = np.concatenate((world.home_room[red_ids], world.work_room[red_ids]))
+        rooms = rooms[rooms != NO_ROOM]
+        if len(rooms) == 0:
+            return
+        counts = np.bincount(rooms)
+        if len(counts) > len(self.red_counts_by_room):
+            grown = np.zeros(len(counts), dtype=np.int32)
+            grown[:len(self.red_counts_by_room)] = self.red_counts_by_room
+            self.red_counts_by_room = grown
+        self.red_counts_by_room[:len(counts)] += counts.astype(np.int32)
+
+    def reset_room_tally(self):
+        """Clear red crossing counts (e.g. after a room evaluation pass)"""
+        self.red_counts_by_room[:] = 0
+
+
+class SchedulingSystem:
+    """
+    Starts Sim journeys.
+    In the game, trips from the daily trip table and journey arrivals are
+    fed through the behavior state machine (execute_trips / update), whose
+    actions start journeys and despawn departing Sims. on_work_start and
+    on_work_end send every office worker at once, for tools and tests that
+    skip the trip table.
+    """
+
+    def __init__(self, world: SimWorld, room_table: RoomTable, behavior: BehaviorStateMachine | None = None,
+                 journey_callback: Callable[[np.ndarray], None] | None = None):
+        self.world = world
+        self.room_table = room_table
+        self.behavior = behavior or BehaviorStateMachine()
+        # Receives the ids of Sims that just started a journey
+        self.journey_callback = journey_callback
+
+        # Statistics
+        self.trips_started = 0
+        self.departed_total = 0
+
+    def set_room_table(self, room_table: RoomTable):
+        """Replace the room table after the tower layout changes"""
+        self.room_table = room_table
+
+    def send_to_rooms(self, ids: np.ndarray, room_ids: np.ndarray):
+        """Start journeys for Sims towards the given rooms"""
+        world = self.world
+        world.target_floor[ids] = self.room_table.level[room_ids]
+        world.target_segment[ids] = self.room_table.center[room_ids]
+        self._start_journey(ids)
+
+    def send_to_level(self, ids: np.ndarray, level: int):
+        """Start journeys for Sims towards a level, keeping their horizontal position"""
+        world = self.world
+        world.target_floor[ids] = level
+        world.target_segment[ids] = world.segment[ids]
+        self._start_journey(ids)
+
+    def _start_journey(self, ids: np.ndarray):
+        """Reset per-journey components and set Sims walking"""
+        world = self.world
+        world.stress[ids] = 0.0
+        world.stress_level[ids] = STRESS_BLACK
+        world.trips[ids] = 0
+        world.leg_link[ids] = NO_LEG
+        world.leg_wait[ids] = 0.0
+        world.state[ids] = SIM_STATE_WALKING
+        if self.journey_callback is not None:
+            self.journey_callback(ids)
+
+    def on_work_start(self):
+        """Send idle office workers to their offices"""
+        world = self.world
+        ids = np.flatnonzero(world.mask_in_state(SIM_STATE_IDLE) & (world.work_room != NO_ROOM))
+        if len(ids):
+            self.send_to_rooms(ids, world.work_room[ids])
+
+    def on_work_end(self):
+        """Send office workers home, or to the lobby if they live outside the tower"""
+        world = self.world
+        workers = world.mask_in_state(SIM_STATE_IDLE) & (world.work_room != NO_ROOM)
+        residents = np.flatnonzero(workers & (world.home_room != NO_ROOM))
+        commuters = np.flatnonzero(workers & (world.home_room == NO_ROOM))
+        if len(residents):
+            self.send_to_rooms(residents, world.home_room[residents])
+        if len(commuters):
+            self.send_to_level(commuters, LOBBY_LEVEL)
+
+    # ------------------------------------------------------------------
+    # Behavior state machine
+    # ------------------------------------------------------------------
+    def fire(self, ids: np.ndarray, events, dest_rooms=NO_ROOM, trip_kinds=None):
+        """
+        Apply behavior events to Sims and carry out the resulting actions.
+        Invalid events (see sim_behavior.ACTION_INVALID) leave the Sim untouched.
+        """
+        world = self.world
+        ids = np.asarray(ids)
+        if len(ids) == 0:
+            return
+        next_state, action = self.behavior.transition(world.profile[ids], world.behavior[ids], events)
+        valid = action != ACTION_INVALID
+        world.behavior[ids[valid]] = next_state[valid]
+        if trip_kinds is not None:
+            world.trip[ids[valid]] = np.broadcast_to(trip_kinds, ids.shape)[valid]
+
+        dest = np.broadcast_to(np.asarray(dest_rooms, dtype=np.int32), ids.shape)
+        travel = action == ACTION_TRAVEL
+        to_room = travel & (dest != NO_ROOM)
+        to_lobby = travel & (dest == NO_ROOM)
+        if to_room.any():
+            self.send_to_rooms(ids[to_room], dest[to_room])
+        if to_lobby.any():
+            self.send_to_level(ids[to_lobby], LOBBY_LEVEL)
+        self.trips_started += int(np.count_nonzero(travel))
+
+        departed = ids[action == ACTION_DESPAWN]
+        if len(departed):
+            world.despawn(departed)
+            self.departed_total += len(departed)
+
+    def update(self):
+        """Fire ARRIVED for Sims whose journey has just ended"""
+        world = self.world
+        if world.active_count == 0:
+            return
+        ids = np.flatnonzero(world.mask_in_state(SIM_STATE_IDLE) & self.behavior.is_heading[world.behavior])
+        self.fire(ids, SIM_EVENT_ARRIVED)
+
+    def on_stressed(self, red_ids: np.ndarray):
+        """Fire STRESSED for Sims whose wait just crossed the red threshold"""
+        self.fire(red_ids, SIM_EVENT_STRESSED)
+
+    # ------------------------------------------------------------------
+    # Daily trip table
+    # ------------------------------------------------------------------
+    def execute_trips(self, batch, spawn_arrivals: bool = True):
+        """
+        Fire the behavior event of every trip in a TripTable batch. Arriving
+        Sims are spawned at the lobby; everyone else is found by (room, seat)
+        among Sims not riding. Returns the trips whose Sim is not in this
+        world, so they can be passed on to another world with
+        spawn_arrivals=False.
+        """
+        world = self.world
+        arriving = np.isin(batch.kind, _ARRIVAL_TRIPS)
+        if spawn_arrivals and arriving.any():
+            arrivals = batch.rows(arriving)
+            is_work = arrivals.kind == TRIP_TO_WORK
+            ids = world.spawn(len(arrivals), floor=LOBBY_LEVEL,
+                              segment=self.room_table.center[arrivals.dest_room],
+                              home_room=np.where(is_work, NO_ROOM, arrivals.room),
+                              work_room=np.where(is_work, arrivals.room, NO_ROOM),
+                              seat=arrivals.seat, profile=TRIP_PROFILES[arrivals.kind])
+            self.fire(ids, TRIP_EVENTS[arrivals.kind], arrivals.dest_room, arrivals.kind)
+
+        travelling = batch.rows(~arriving)
+        if len(travelling) == 0:
+            return travelling
+        by_work = np.isin(travelling.kind, _WORK_ROOM_TRIPS)
+        ids = np.full(len(travelling), -1, dtype=np.int64)
+        ids[by_work] = self._find_occupants(world.work_room, travelling.room[by_work], travelling.seat[by_work])
+        ids[~by_work] = self._find_occupants(world.home_room, travelling.room[~by_work], travelling.seat[~by_work])
+
+        found = ids >= 0
+        trips = travelling.rows(found)
+        self.fire(ids[found], TRIP_EVENTS[trips.kind], trips.dest_room, trips.kind)
+        return travelling.rows(~found)
+
+    def _find_occupants(self, room_component: np.ndarray, rooms: np.ndarray, seats: np.ndarray) -> np.ndarray:
+        """Id of the non-riding Sim occupying each (room, seat), -1 where there is none"""
+        world = self.world
+        result = np.full(len(rooms), -1, dtype=np.int64)
+        if len(rooms) == 0:
+            return result
+        candidates = np.flatnonzero(world.active & (world.state != SIM_STATE_RIDING)
+                                    & (room_component != NO_ROOM) & (world.seat >= 0))
+        if len(candidates) == 0:
+            return result
+
+        keys = room_component[candidates].astype(np.int64) * _SEAT_STRIDE + world.seat[candidates]
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        wanted = rooms.astype(np.int64) * _SEAT_STRIDE + seats
+        position = np.minimum(np.searchsorted(sorted_keys, wanted), len(sorted_keys) - 1)
+        hit = sorted_keys[position] == wanted
+        result[hit] = candidates[order[position[hit]]]
+        return result
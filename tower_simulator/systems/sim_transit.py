@@ -0,0 +1,407 @@
+"""
+Sim transit legs.
+Journeys are routed in bulk as they start: a crowd setting off together
+brings the route table up to date in one deduplicated lookup, and each Sim
+is given the first leg of its route (or marked as having none) before it
+reaches the transit. With walkways, the journey's walk - from the Sim's
+room to the first link, between links and on to its destination room - is
+added to that first leg, and a room a walkway gap cuts off from the
+transit has no route. Every tick the Sims waiting without a leg - set down
+short of their target floor, or back from the aggregate model - are routed
+the same way. Elevator legs join the per-floor boarding queues and press
+the hall button once the Sim is waiting at the shaft; cars board them in
+batches when their doors open and set them down at their stop. Stairs and
+escalators, and every leg in a world with no cars (the dormant world), are
+timed legs: the Sim waits the link's expected wait, then rides (see
+MovementSystem). In destination dispatch and corridor shafts each queued
+Sim is assigned a car instead of pressing a hall button (corridor shafts
+may hold it back until stacked cars make room), and only its car boards it.
+"""
+from collections import Counter, deque
+from itertools import compress
+
+import numpy as np
+
+from tower_simulator.constants import ELEVATOR_CAR_CAPACITY
+from tower_simulator.entities.ecs import (
+    SimWorld, NO_LEG, NO_ROUTE, HELD_BY_CAR, SIM_STATE_WALKING, SIM_STATE_WAITING, SIM_STATE_RIDING,
+)
+from tower_simulator.systems.boarding_queues import BoardingQueues
+from tower_simulator.systems.elevator_dispatch import (
+    ElevatorShaft, ElevatorCar, DIRECTION_UP, DIRECTION_DOWN, DIRECTION_IDLE, CAR_DOORS_OPEN,
+    DISPATCH_SCAN, DISPATCH_CORRIDOR,
+)
+from tower_simulator.systems.elevator_motion import ElevatorMotion
+from tower_simulator.systems.route_table import RouteTable, UNREACHABLE
+from tower_simulator.systems.route_weights import CongestionWeights
+from tower_simulator.systems.shaft_scheduler import CorridorScheduler
+from tower_simulator.systems.sim_systems import land
+
+
+class TransitSystem:
+    """
+    Plans and boards transit legs for the Sims of one world. Without
+    `motion` every leg is timed. Elevator legs are boarded through the
+    dispatcher shaft registered for their link, in whichever dispatch mode
+    it runs, and with `weights` each boarding reports how long the Sim
+    queued. boarding_callback(ids), if set, is called with every batch of
+    Sims that gets on a car.
+    """
+
+    def __init__(self, world: SimWorld, route_table: RouteTable, motion: ElevatorMotion | None = None,
+                 car_capacity: int = ELEVATOR_CAR_CAPACITY, weights: CongestionWeights | None = None):
+        self.world = world
+        self.route_table = route_table
+        self.motion = motion
+        self.car_capacity = car_capacity
+        self.weights = weights
+        self.queues = BoardingQueues()
+        self.shafts: dict[int, ElevatorShaft] = {}  # Link id -> shaft boarded through its cars
+        self._links: dict[ElevatorShaft, int] = {}
+        self.riders: dict[ElevatorCar, list[int]] = {}
+        self._queued_at: dict[int, int] = {}  # Sim id -> game second it joined a car queue
+        self._bound_for_car: dict[int, float] = {}  # Sim id -> game second it can reach the car it is planned on
+        self.schedulers: dict[ElevatorShaft, CorridorScheduler] = {}  # Corridor shafts
+        # Corridor shafts: Sims not yet given a car, by (origin, destination) level in arrival order
+        self.deferred: dict[ElevatorShaft, dict[tuple[int, int], deque]] = {}
+        self.deferred_count = Counter()
+        self._refused_state: dict[ElevatorShaft, tuple] = {}  # Scheduler state of the last retry
+        self._retrying: set[ElevatorShaft] = set()
+        self.boarding_callback = None
+
+        # Statistics
+        self.legs_planned = 0
+        self.unroutable = 0  # Sims found with no route to their target floor
+        self.boarded = 0
+        self.set_down = 0
+
+        route_table.graph.subscribe(self._on_transit_edit)
+        if route_table.walkways is not None:
+            route_table.walkways.subscribe(self._on_transit_edit)
+
+    def add_shaft(self, link_id: int, shaft: ElevatorShaft):
+        """Board the legs of an elevator link through a dispatcher shaft's cars"""
+        self.shafts[link_id] = shaft
+        self._links[shaft] = link_id
+        if shaft.mode == DISPATCH_CORRIDOR:
+            self.schedulers[shaft] = CorridorScheduler(shaft)
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+    def update(self):
+        """Give every Sim waiting without a leg the next leg of its route, and queue Sims that reached their car"""
+        world = self.world
+        ids = world.ids_in_state(SIM_STATE_WAITING)
+        ids = ids[world.leg_link[ids] == NO_LEG]
+        if len(ids):
+            self._route(ids)
+        if self._bound_for_car:
+            self._queue_arrivals()
+
+    def plan_journeys(self, ids: np.ndarray):
+        """
+        Scheduling callback: route the Sims starting journeys in one bulk
+        lookup and store the first leg of each route, so update() has
+        nothing left to resolve for them. A timed leg's wait runs once the
+        Sim reaches the transit; a Sim bound for a car joins its queue then.
+        """
+        world = self.world
+        if self._queued_at:
+            self._forget(ids)  # Anyone still in a car queue has left it
+        ids = ids[world.floor[ids] != world.target_floor[ids]]
+        if len(ids):
+            self._route(ids)
+
+    def _route(self, ids: np.ndarray):
+        """
+        Route Sims in one bulk lookup and plan their next leg. A Sim that has
+        not ridden yet is charged its whole journey's walk on the first leg,
+        less the walk along its floor it is still making, and is marked
+        NO_ROUTE if a walkway gap cuts its room off from the transit.
+        """
+        world = self.world
+        batch = self.route_table.resolve(world.floor[ids], world.target_floor[ids])
+        routed = batch.trips != UNREACHABLE
+        extra = np.zeros(len(ids), dtype=np.float32)  # Seconds added to the leg for walking
+        ready = np.zeros(len(ids), dtype=np.float32)  # Seconds until the Sim is at the transit
+        walkways = self.route_table.walkways
+        starting = routed & (world.trips[ids] == 0)
+        if walkways is not None and starting.any():
+            walk = self._route_walks(ids[starting], batch.trips[starting], batch.links[starting], batch.stops[starting])
+            routed[starting] = ~np.isnan(walk)
+            walking = world.state[ids[starting]] == SIM_STATE_WALKING
+            on_floor = np.where(walking, np.abs(world.target_segment[ids[starting]] - world.segment[ids[starting]])
+                                / walkways.walk_speed, 0.0)
+            extra[starting] = np.maximum(walk - on_floor, 0.0)
+            ready[starting] = np.maximum(walk, on_floor)
+        world.leg_link[ids[~routed]] = NO_ROUTE
+        self.unroutable += int(np.count_nonzero(~routed))
+        self._plan_legs(ids[routed], batch.links[routed, 0], batch.stops[routed, 0], extra[routed], ready[routed])
+
+    def _route_walks(self, ids: np.ndarray, trips: np.ndarray, links: np.ndarray, stops: np.ndarray) -> np.ndarray:
+        """
+        Walking seconds of each Sim's route: to the first link, between links
+        and from the last link to its target segment (NaN across a walkway
+        gap). Sims setting off from one spot for the same place share a lookup.
+        """
+        world, walkways = self.world, self.route_table.walkways
+        keys = np.stack((world.floor[ids], world.segment[ids], world.target_floor[ids], world.target_segment[ids]),
+                        axis=1).astype(np.float64)
+        unique, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        seconds = np.empty(len(unique))
+        for row, (index, (level, segment, _, target)) in enumerate(zip(first.tolist(), unique.tolist())):
+            legs = int(trips[index])
+            walk = walkways.route_walk_seconds(int(level), segment, target, links[index, :legs], stops[index, :legs])
+            seconds[row] = np.nan if walk is None else walk
+        return seconds[inverse.reshape(-1)]
+
+    def _plan_legs(self, ids: np.ndarray, links: np.ndarray, stops: np.ndarray, extra: np.ndarray,
+                   ready: np.ndarray):
+        """
+        Store the next leg of Sims. Timed legs wait their link's expected wait
+        plus `extra` walking seconds; Sims bound for a car are queued once
+        they wait at the transit and `ready` seconds have passed.
+        """
+        if len(ids) == 0:
+            return
+        world = self.world
+        world.leg_link[ids] = links
+        world.leg_floor[ids] = stops
+        self.legs_planned += len(ids)
+        graph = self.route_table.graph
+        for link_id in np.unique(links).tolist():
+            on_link = links == link_id
+            if link_id in self.shafts and self.motion is not None:
+                world.leg_wait[ids[on_link]] = HELD_BY_CAR  # Keeps the Sim's id while it walks to the car
+                now = self.motion.time_manager.now
+                self._bound_for_car.update(zip(ids[on_link].tolist(), (now + ready[on_link]).tolist()))
+            else:
+                world.leg_wait[ids[on_link]] = graph.links[link_id].expected_wait + extra[on_link]
+
+    def _queue_arrivals(self):
+        """Queue the Sims with a planned elevator leg that have walked to the transit"""
+        world = self.world
+        ids = np.fromiter(self._bound_for_car.keys(), dtype=np.int64, count=len(self._bound_for_car))
+        due = np.fromiter(self._bound_for_car.values(), dtype=np.float64, count=len(self._bound_for_car))
+        state = world.state[ids]
+        # A Sim sent elsewhere or despawned on the way has dropped its leg
+        planned = (world.active[ids] & (world.leg_wait[ids] == HELD_BY_CAR)
+                   & ((state == SIM_STATE_WALKING) | (state == SIM_STATE_WAITING)))
+        arrived = planned & (state == SIM_STATE_WAITING) & (due <= self.motion.time_manager.now)
+        for sim_id in ids[~planned | arrived].tolist():
+            del self._bound_for_car[sim_id]
+        ids = ids[arrived]
+        links = world.leg_link[ids]
+        for link_id in np.unique(links).tolist():
+            self.queue(self.shafts[link_id], ids[links == link_id])
+
+    def _on_transit_edit(self, levels: range):
+        """Transit graph and walkway callback: Sims with no route try again"""
+        world = self.world
+        world.leg_link[world.active & (world.leg_link == NO_ROUTE)] = NO_LEG
+
+    # ------------------------------------------------------------------
+    # Elevators
+    # ------------------------------------------------------------------
+    def queue(self, shaft: ElevatorShaft, ids: np.ndarray):
+        """
+        Queue Sims for their planned leg on a shaft. In SCAN shafts they
+        press the hall button for their direction; otherwise each enters its
+        destination and waits for the car it is assigned.
+        """
+        world = self.world
+        world.leg_wait[ids] = HELD_BY_CAR
+        now = self.motion.time_manager.now
+        trips = list(zip(ids.tolist(), world.floor[ids].tolist(), world.leg_floor[ids].tolist()))
+        for sim_id, _, _ in trips:
+            self._queued_at[sim_id] = now
+
+        if shaft.mode != DISPATCH_SCAN:
+            scheduler = self.schedulers.get(shaft)
+            for sim_id, level, stop in trips:
+                if scheduler is not None and not scheduler.can_serve(shaft.stop_index(level), shaft.stop_index(stop)):
+                    # Too long a ride for stacked cars: no car will ever take it
+                    world.leg_link[sim_id] = NO_ROUTE
+                    world.leg_wait[sim_id] = 0.0
+                    del self._queued_at[sim_id]
+                    self.unroutable += 1
+                    continue
+                car = self._assign(shaft, sim_id, level, stop)
+                if car is None:
+                    self.deferred.setdefault(shaft, {}).setdefault((level, stop), deque()).append(sim_id)
+                    self.deferred_count[shaft] += 1
+                else:
+                    self._board_open_car(shaft, [car], level, DIRECTION_UP if stop > level else DIRECTION_DOWN)
+            return
+
+        calls = set()
+        for sim_id, level, stop in trips:
+            direction = DIRECTION_UP if stop > level else DIRECTION_DOWN
+            self.queues.push(shaft, shaft.stop_index(level), direction, sim_id, shaft.stop_index(stop))
+            calls.add((level, direction))
+        for level, direction in sorted(calls):
+            self.motion.call(shaft, level, direction)
+            self._board_open_car(shaft, shaft.cars, level, direction)
+
+    def _assign(self, shaft: ElevatorShaft, sim_id: int, level: int, stop: int) -> ElevatorCar | None:
+        """Give a Sim a car in a destination or corridor shaft and queue it for that car (None: no car yet)"""
+        if shaft.mode == DISPATCH_CORRIDOR:
+            car, moved = self.schedulers[shaft].assign(level, stop, self.car_capacity)
+            for other in moved:
+                self.motion.wake_car(shaft, other)
+            if car is None:
+                return None
+        else:
+            car = shaft.assign(level, stop, self.car_capacity)
+        direction = DIRECTION_UP if stop > level else DIRECTION_DOWN
+        self.queues.push(shaft, shaft.stop_index(level), direction, sim_id, shaft.stop_index(stop), car)
+        self.motion.wake_car(shaft, car)
+        return car
+
+    def _board_open_car(self, shaft: ElevatorShaft, cars: list[ElevatorCar], level: int, direction: int):
+        """Sims arriving at a car that already has its doors open get straight on"""
+        stop = shaft.stop_index(level)
+        for car in cars:
+            if car.phase == CAR_DOORS_OPEN and car.position == stop and car.direction in (direction, DIRECTION_IDLE):
+                if self._board(shaft, car):
+                    self.motion.hold_doors(shaft, car)
+                break
+
+    def _retry_deferred(self, shaft: ElevatorShaft, stopped: ElevatorCar):
+        """
+        A corridor shaft car stopped: try again to give waiting Sims a car,
+        oldest trip first. The scheduler filters the whole batch of deferred
+        trips in one pass, and Sims making the same trip get the same
+        answer, so one refusal skips the rest of that trip's queue.
+        """
+        scheduler = self.schedulers[shaft]
+        trips = self.deferred[shaft]
+        self._retrying.add(shaft)  # Waking a car can open its doors, and so call back here
+        progress = True
+        while trips and progress:
+            progress = False
+            keys = list(trips)
+            levels = np.array(keys) - shaft.bottom_level
+            fits = scheduler.fits(levels.min(axis=1), levels.max(axis=1), self.car_capacity)
+            for trip in compress(keys, fits):
+                waiting = trips[trip]
+                while waiting:
+                    sim_id = waiting[0]
+                    if not self._still_deferred(sim_id, shaft, trip):
+                        waiting.popleft()
+                        self.deferred_count[shaft] -= 1
+                        self._forget(np.array([sim_id]))
+                        continue
+                    car = self._assign(shaft, sim_id, *trip)
+                    if car is None:
+                        break
+                    waiting.popleft()
+                    self.deferred_count[shaft] -= 1
+                    progress = True
+                    if car is not stopped:
+                        # The stopped car boards its new Sims itself once the retry is done
+                        level, stop = trip
+                        self._board_open_car(shaft, [car], level, DIRECTION_UP if stop > level else DIRECTION_DOWN)
+                if not waiting:
+                    del trips[trip]
+        self._retrying.discard(shaft)
+        self._refused_state[shaft] = scheduler.state()
+
+    def _still_deferred(self, sim_id: int, shaft: ElevatorShaft, trip: tuple[int, int]) -> bool:
+        """True if a deferred Sim still waits to be given a car for this trip"""
+        world = self.world
+        return bool(world.active[sim_id] and world.state[sim_id] == SIM_STATE_WAITING
+                    and world.leg_link[sim_id] == self._links[shaft] and world.leg_wait[sim_id] == HELD_BY_CAR
+                    and (world.floor[sim_id], world.leg_floor[sim_id]) == trip)
+
+    def on_doors_open(self, shaft: ElevatorShaft, car: ElevatorCar) -> int:
+        """ElevatorMotion callback: riders for this floor get off, then waiting Sims get on"""
+        world = self.world
+        level = shaft.level_of(car.position)
+        riders = self.riders.get(car, [])
+        if riders:
+            ids = np.array(riders, dtype=np.int64)
+            # Riders sent on another journey mid-ride are no longer the car's
+            ids = ids[world.active[ids] & (world.state[ids] == SIM_STATE_RIDING)
+                      & (world.ride_remaining[ids] == HELD_BY_CAR)]
+            off = world.leg_floor[ids] == level
+            land(world, ids[off])
+            self.set_down += int(np.count_nonzero(off))
+            self.riders[car] = ids[~off].tolist()
+        if (self.deferred.get(shaft) and shaft not in self._retrying
+                and self.schedulers[shaft].state() != self._refused_state.get(shaft)):
+            self._retry_deferred(shaft, car)
+        return self._board(shaft, car)
+
+    def _board(self, shaft: ElevatorShaft, car: ElevatorCar) -> int:
+        """
+        Fill the car from the queue for its direction (either, if it is
+        idle). Queue entries outlive Sims that gave up, started another
+        journey or were despawned; those are dropped as they come up and
+        take no room in the car. Only Sims with a queue time board, so one
+        that set off again over the same leg waits until it queues anew. Returns the number boarded.
+        """
+        world = self.world
+        link_id = self._links[shaft]
+        level = shaft.level_of(car.position)
+        riders = self.riders.setdefault(car, [])
+        assigned = None if shaft.mode == DISPATCH_SCAN else car
+        directions = (car.direction,) if car.direction != DIRECTION_IDLE else (DIRECTION_UP, DIRECTION_DOWN)
+        for direction in directions:
+            if not self.queues.waiting(shaft, car.position, direction, assigned):
+                continue
+            car.direction = direction
+            taken_count, boarded, queued_at = 0, [], []
+            while len(riders) < self.car_capacity and self.queues.waiting(shaft, car.position, direction, assigned):
+                taken, _ = self.queues.board(shaft, car.position, direction, self.car_capacity - len(riders),
+                                             assigned)
+                taken_count += len(taken)
+                ids = taken.astype(np.int64)
+                stops = world.leg_floor[ids]
+                valid = (world.active[ids] & (world.state[ids] == SIM_STATE_WAITING)
+                         & (world.leg_link[ids] == link_id) & (world.leg_wait[ids] == HELD_BY_CAR)
+                         & (world.floor[ids] == level) & ((stops > level) == (direction == DIRECTION_UP))
+                         & np.array([sim_id in self._queued_at for sim_id in ids.tolist()], dtype=bool))
+                self._forget(ids[~valid])
+                ids = np.unique(ids[valid])
+                world.state[ids] = SIM_STATE_RIDING
+                world.leg_wait[ids] = 0.0
+                world.ride_remaining[ids] = HELD_BY_CAR
+                world.trips[ids] += 1
+                # Taken off the books now: a stale duplicate in a later take must not forget them
+                queued_at.extend(self._queued_at.pop(sim_id) for sim_id in ids.tolist())
+                riders.extend(ids.tolist())
+                boarded.append(ids)
+            ids = np.concatenate(boarded) if boarded else np.empty(0, dtype=np.int64)
+            if len(ids):
+                if self.weights is not None:
+                    waits = self.motion.time_manager.now - np.array(queued_at, dtype=np.float64)
+                    self.weights.record_waits(np.full(len(ids), link_id), waits)
+                mask = 0
+                for stop in np.unique(world.leg_floor[ids]).tolist():
+                    mask |= 1 << shaft.stop_index(stop)
+                self.motion.press_stops(shaft, car, mask)
+                self.boarded += len(ids)
+                if self.boarding_callback is not None:
+                    self.boarding_callback(ids)
+            left_behind = self.queues.waiting(shaft, car.position, direction, assigned) > 0
+            if assigned is not None:
+                # Anyone left behind stays assigned to this car, which comes back
+                shaft.boarded(car, taken_count, level, direction, left_behind)
+                if len(directions) == 2 and self.queues.waiting(shaft, car.position, -direction, assigned):
+                    # An idle car picked one direction; its Sims going the other way keep their pickup
+                    shaft.boarded(car, 0, level, -direction, True)
+            elif left_behind:
+                # Car is full: call another car for the Sims left behind
+                shaft.call(level, direction)
+                self.motion.wake(shaft, level)
+            return len(ids)
+        return 0
+
+    def _forget(self, ids: np.ndarray):
+        """Drop the queueing times of Sims no longer waiting for any car"""
+        world = self.world
+        held = world.active[ids] & (world.state[ids] == SIM_STATE_WAITING) & (world.leg_wait[ids] == HELD_BY_CAR)
+        for sim_id in ids[~held].tolist():
+            self._queued_at.pop(sim_id, None)
@@ -0,0 +1,384 @@
+"""
+World Clock - discrete-event scheduler driving the 12-day annual cycle.
+Calendar events live in a heap; short waits that are mostly rescheduled
+or cancelled (elevator arrivals and door closings) live in a
+hierarchical timing wheel, where scheduling and cancelling are O(1).
+Both fire through the same subscriptions, in (time, priority) order:
+timers run at PRIORITY_DEFAULT, so rollovers due in the same second fire
+before them, and ties at equal priority go to the wheel first.
+"""
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from tower_simulator.systems.timing_wheel import HierarchicalTimingWheel, TimerHandle
+
+from tower_simulator.constants import (
+    WEEKDAY_1, WEEKDAY_2, WEEKEND,
+    DAYS_PER_YEAR, DAYS_PER_QUARTER, DAYS_PER_WEEK, QUARTERS_PER_YEAR,
+    SECONDS_PER_MINUTE, SECONDS_PER_HOUR, SECONDS_PER_DAY, CLOCK_START_HOUR,
+    OFFICE_WORK_START, OFFICE_WORK_END, LUNCH_START, LUNCH_END,
+    CONDO_SALES_START, CONDO_SALES_END,
+    HOTEL_CHECKOUT_START, HOTEL_CHECKOUT_END, HOTEL_CHECKIN_START, HOTEL_CHECKIN_END,
+)
+
+# Event names broadcast by the default schedule
+EVENT_DAY_START = 'day_start'
+EVENT_QUARTER_START = 'quarter_start'  # Midnight opening a new quarter
+EVENT_YEAR_START = 'year_start'  # Midnight opening a new year
+EVENT_OFFICE_WORK_START = 'office_work_start'
+EVENT_OFFICE_WORK_END = 'office_work_end'
+EVENT_LUNCH_START = 'lunch_start'
+EVENT_LUNCH_END = 'lunch_end'
+EVENT_CONDO_SALES_START = 'condo_sales_start'
+EVENT_CONDO_SALES_END = 'condo_sales_end'
+EVENT_HOTEL_CHECKOUT_START = 'hotel_checkout_start'
+EVENT_HOTEL_CHECKOUT_END = 'hotel_checkout_end'
+EVENT_HOTEL_CHECKIN_START = 'hotel_checkin_start'
+EVENT_HOTEL_CHECKIN_END = 'hotel_checkin_end'
+EVENT_STATE_HASH = 'state_hash'  # Periodic determinism check (see utils/determinism.py)
+EVENT_TRIPS_DUE = 'trips_due'  # Head of the daily trip queue (see systems/trip_planner.py)
+EVENT_ELEVATOR_ARRIVE = 'elevator_arrive'  # A car reaches its next stop (see systems/elevator_motion.py)
+EVENT_ELEVATOR_DOORS_CLOSE = 'elevator_doors_close'  # A car's floor departure time is up
+EVENT_ROUTE_WEIGHTS_REFRESH = 'route_weights_refresh'  # Batch update of congestion weights (see systems/route_weights.py)
+EVENT_ELEVATOR_PREPOSITION = 'elevator_preposition'  # Park idle cars ahead of a peak (see systems/elevator_prepositioning.py)
+
+# Rollovers fire before anything else scheduled at the same instant
+PRIORITY_YEAR_ROLLOVER = -3
+PRIORITY_QUARTER_ROLLOVER = -2
+PRIORITY_DAY_ROLLOVER = -1
+PRIORITY_DEFAULT = 0
+
+WEEKDAYS = (WEEKDAY_1, WEEKDAY_2)
+
+
+@dataclass(order=True)
+class ScheduledEvent:
+    """A timestamped entry in the World Clock's priority queue"""
+
+    time: int  # Absolute game second at which the event fires
+    priority: int  # Lower fires first when times are equal
+    sequence: int  # Insertion order, keeps equal-time firing deterministic
+    name: str = field(compare=False)
+    payload: Any = field(default=None, compare=False)
+    interval: int | None = field(default=None, compare=False)  # Seconds between repeats
+    cancelled: bool = field(default=False, compare=False)
+    queued: bool = field(default=False, compare=False)  # Still in the heap (False once a one-shot fired)
+    timer: TimerHandle | None = field(default=None, compare=False)  # Set for timing-wheel events
+
+    @property
+    def recurring(self) -> bool:
+        """True if the event re-arms itself after firing"""
+        return self.interval is not None
+
+
+class TimeManager:
+    """
+    Central World Clock.
+    Keeps a heap of scheduled events and dispatches each one to the systems
+    subscribed to its name, so facilities wake only when their event fires.
+    Scheduling, firing and cancelling are all O(log n) in the number of
+    pending events (cancelled entries are dropped lazily).
+    """
+
+    def __init__(self, start_time: int | None = None):
+        """Initialize the clock at the given absolute game second"""
+        if start_time is None:
+            start_time = int(CLOCK_START_HOUR * SECONDS_PER_HOUR)
+        self.now = start_time
+
+        self._queue: list[ScheduledEvent] = []
+        self._sequence = itertools.count()
+        self._cancelled_count = 0
+        self._subscribers: dict[str, list[Callable[[ScheduledEvent], None]]] = {}
+        self.timers = HierarchicalTimingWheel(start_tick=start_time)  # Kept at `now`
+
+        # Statistics
+        self.events_fired = 0
+
+    # ------------------------------------------------------------------
+    # Calendar
+    # ------------------------------------------------------------------
+    @property
+    def day(self) -> int:
+        """Days elapsed since the start of the game"""
+        return self.now // SECONDS_PER_DAY
+
+    @property
+    def day_of_week(self) -> int:
+        """WEEKDAY_1, WEEKDAY_2 or WEEKEND"""
+        return self.day % DAYS_PER_WEEK
+
+    @property
+    def is_weekday(self) -> bool:
+        """True on Weekday 1 and Weekday 2"""
+        return self.day_of_week != WEEKEND
+
+    @property
+    def day_of_year(self) -> int:
+        """Day index inside the current 12-day year (0-11)"""
+        return self.day % DAYS_PER_YEAR
+
+    @property
+    def quarter(self) -> int:
+        """Quarter index inside the current year (0-3)"""
+        return (self.day_of_year // DAYS_PER_QUARTER) % QUARTERS_PER_YEAR
+
+    @property
+    def year(self) -> int:
+        """Current year, starting at 1"""
+        return self.day // DAYS_PER_YEAR + 1
+
+    @property
+    def seconds_into_day(self) -> int:
+        """Game seconds since midnight"""
+        return self.now % SECONDS_PER_DAY
+
+    @property
+    def hour(self) -> int:
+        """Hour of day (0-23)"""
+        return self.seconds_into_day // SECONDS_PER_HOUR
+
+    @property
+    def minute(self) -> int:
+        """Minute of hour (0-59)"""
+        return (self.seconds_into_day % SECONDS_PER_HOUR) // SECONDS_PER_MINUTE
+
+    @property
+    def time_of_day(self) -> float:
+        """Fractional hour of day, comparable with constants like OFFICE_WORK_START"""
+        return self.seconds_into_day / SECONDS_PER_HOUR
+
+    @staticmethod
+    def time_at(day: int, hour: float) -> int:
+        """Absolute game second for a fractional hour on the given day"""
+        return day * SECONDS_PER_DAY + int(round(hour * SECONDS_PER_HOUR))
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+    def subscribe(self, name: str, callback: Callable[[ScheduledEvent], None]):
+        """Register a callback invoked every time an event with this name fires"""
+        self._subscribers.setdefault(name, []).append(callback)
+
+    def unsubscribe(self, name: str, callback: Callable[[ScheduledEvent], None]):
+        """Remove a previously registered callback"""
+        callbacks = self._subscribers.get(name)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def schedule_at(self, time: int, name: str, payload: Any = None,
+                    interval: int | None = None, priority: int = PRIORITY_DEFAULT) -> ScheduledEvent:
+        """Schedule an event at an absolute game second. O(log n)."""
+        if time < self.now:
+            raise ValueError(f"Cannot schedule '{name}' in the past ({time} < {self.now})")
+        if interval is not None and interval <= 0:
+            raise ValueError("Recurring interval must be positive")
+
+        event = ScheduledEvent(time, priority, next(self._sequence), name, payload, interval, queued=True)
+        heapq.heappush(self._queue, event)
+        return event
+
+    def schedule_in(self, delay: int, name: str, payload: Any = None,
+                    interval: int | None = None, priority: int = PRIORITY_DEFAULT) -> ScheduledEvent:
+        """Schedule an event a number of game seconds from now"""
+        return self.schedule_at(self.now + delay, name, payload, interval, priority)
+
+    def schedule_daily(self, hour: float, name: str, payload: Any = None,
+                       priority: int = PRIORITY_DEFAULT) -> ScheduledEvent:
+        """Schedule an event every day at the given fractional hour"""
+        first = self.time_at(self.day, hour)
+        if first < self.now:
+            first += SECONDS_PER_DAY
+        return self.schedule_at(first, name, payload, SECONDS_PER_DAY, priority)
+
+    def schedule_weekly(self, day_of_week: int, hour: float, name: str, payload: Any = None,
+                        priority: int = PRIORITY_DEFAULT) -> ScheduledEvent:
+        """Schedule an event once per 3-day week on the given day (WEEKDAY_1, WEEKDAY_2, WEEKEND)"""
+        day = self.day + (day_of_week - self.day_of_week) % DAYS_PER_WEEK
+        first = self.time_at(day, hour)
+        if first < self.now:
+            first += DAYS_PER_WEEK * SECONDS_PER_DAY
+        return self.schedule_at(first, name, payload, DAYS_PER_WEEK * SECONDS_PER_DAY, priority)
+
+    def schedule_timer(self, delay: int, name: str, payload: Any = None) -> ScheduledEvent:
+        """Schedule a short one-shot wait on the timing wheel. O(1) to schedule and cancel."""
+        return self.schedule_timer_at(self.now + delay, name, payload)
+
+    def schedule_timer_at(self, time: int, name: str, payload: Any = None) -> ScheduledEvent:
+        """
+        Timing-wheel event at an absolute game second. Falls back to the
+        heap for the current second and for times beyond the wheel's horizon.
+        """
+        if time <= self.now or not self.timers.fits(time):
+            return self.schedule_at(time, name, payload)
+        event = ScheduledEvent(time, PRIORITY_DEFAULT, next(self._sequence), name, payload)
+        event.timer = self.timers.schedule_at(time, event)
+        return event
+
+    def cancel(self, event: ScheduledEvent):
+        """Cancel a pending event (including all future repeats of a recurring one)"""
+        if event.cancelled:
+            return
+        event.cancelled = True
+        if event.timer is not None:
+            self.timers.cancel(event.timer)
+            return
+        if not event.queued:
+            return  # Already fired: nothing left in the heap to skip
+        self._cancelled_count += 1
+
+        # Rebuild once dead entries dominate so the heap stays O(live events)
+        if self._cancelled_count > 64 and self._cancelled_count * 2 > len(self._queue):
+            for dead in self._queue:
+                dead.queued = not dead.cancelled
+            self._queue = [e for e in self._queue if not e.cancelled]
+            heapq.heapify(self._queue)
+            self._cancelled_count = 0
+
+    @property
+    def pending_count(self) -> int:
+        """Number of live (non-cancelled) events in the queue and on the timing wheel"""
+        return len(self._queue) - self._cancelled_count + len(self.timers)
+
+    def next_event_time(self) -> int | None:
+        """
+        Game second of the next live event, or None if nothing is scheduled.
+        May be early (never late) for a timer more than a wheel slot away.
+        """
+        self._drop_cancelled_head()
+        times = [time for time in (self._queue[0].time if self._queue else None,
+                                   self.timers.next_expiry_lower_bound()) if time is not None]
+        return min(times) if times else None
+
+    def upcoming(self, names: tuple[str, ...], until: int) -> list[ScheduledEvent]:
+        """
+        Live heap events with one of the given names due by `until`, in
+        firing order, so systems can prepare for what the schedule holds.
+        Timing-wheel waits are not included. Scans the whole queue: O(n),
+        meant for occasional planning, not per tick.
+        """
+        return sorted(event for event in self._queue
+                      if not event.cancelled and event.name in names and event.time <= until)
+
+    # ------------------------------------------------------------------
+    # Advancing time
+    # ------------------------------------------------------------------
+    def advance(self, seconds: int) -> int:
+        """Advance the clock, firing every event that falls due. Returns the number fired."""
+        return self.advance_to(self.now + seconds)
+
+    def advance_to(self, target: int) -> int:
+        """Advance the clock to an absolute game second, firing due events in (time, priority) order"""
+        fired = 0
+        timers = self.timers
+        while True:
+            self._drop_cancelled_head()
+            head = self._queue[0].time if self._queue else None
+
+            # Timers first when due before the heap head, or with it unless the head
+            # outranks PRIORITY_DEFAULT (the bound may be a coarse wheel slot that
+            # expires nothing; the loop then looks again)
+            bound = timers.next_expiry_lower_bound()
+            if bound is not None and bound <= target and (
+                    head is None or bound < head
+                    or (bound == head and self._queue[0].priority >= PRIORITY_DEFAULT)):
+                self.now = bound
+                for event in timers.advance_to(bound):
+                    self._dispatch(event)
+                    fired += 1
+                continue
+
+            if head is None or head > target:
+                break
+
+            event = heapq.heappop(self._queue)
+            self.now = event.time
+            timers.advance_to(self.now - 1)  # Nothing on the wheel is due before the head; timers due with it come next
+
+            # Re-arm before dispatch so a subscriber may cancel the series
+            if event.interval is not None:
+                event.time += event.interval
+                event.sequence = next(self._sequence)
+                heapq.heappush(self._queue, event)
+            else:
+                event.queued = False
+
+            self._dispatch(event)
+            fired += 1
+
+        if target > self.now:
+            self.now = target
+        timers.advance_to(self.now)
+        self.events_fired += fired
+        return fired
+
+    def _dispatch(self, event: ScheduledEvent):
+        """Deliver an event to its subscribers"""
+        for callback in list(self._subscribers.get(event.name, ())):
+            callback(event)
+
+    def _drop_cancelled_head(self):
+        """Pop cancelled events sitting at the front of the heap"""
+        while self._queue and self._queue[0].cancelled:
+            heapq.heappop(self._queue).queued = False
+            self._cancelled_count -= 1
+
+    # ------------------------------------------------------------------
+    # Default tower schedule
+    # ------------------------------------------------------------------
+    def install_default_schedule(self) -> list[ScheduledEvent]:
+        """
+        Register the tower's standing schedule: day/quarter/year rollovers,
+        office and condo windows (weekdays only), lunch and hotel windows.
+        """
+        events = []
+
+        # Rollovers at midnight - quarter and year boundaries fall on day boundaries
+        next_day = self.day + 1
+        next_quarter_day = (self.day // DAYS_PER_QUARTER + 1) * DAYS_PER_QUARTER
+        next_year_day = (self.day // DAYS_PER_YEAR + 1) * DAYS_PER_YEAR
+        events.append(self.schedule_at(self.time_at(next_year_day, 0), EVENT_YEAR_START,
+                                       interval=DAYS_PER_YEAR * SECONDS_PER_DAY,
+                                       priority=PRIORITY_YEAR_ROLLOVER))
+        events.append(self.schedule_at(self.time_at(next_quarter_day, 0), EVENT_QUARTER_START,
+                                       interval=DAYS_PER_QUARTER * SECONDS_PER_DAY,
+                                       priority=PRIORITY_QUARTER_ROLLOVER))
+        events.append(self.schedule_at(self.time_at(next_day, 0), EVENT_DAY_START,
+                                       interval=SECONDS_PER_DAY,
+                                       priority=PRIORITY_DAY_ROLLOVER))
+
+        # Weekday-only windows
+        weekday_windows = [
+            (OFFICE_WORK_START, EVENT_OFFICE_WORK_START),
+            (OFFICE_WORK_END, EVENT_OFFICE_WORK_END),
+            (CONDO_SALES_START, EVENT_CONDO_SALES_START),
+            (CONDO_SALES_END, EVENT_CONDO_SALES_END),
+        ]
+        for hour, name in weekday_windows:
+            for day_of_week in WEEKDAYS:
+                events.append(self.schedule_weekly(day_of_week, hour, name))
+
+        # Daily windows
+        daily_windows = [
+            (HOTEL_CHECKOUT_START, EVENT_HOTEL_CHECKOUT_START),
+            (HOTEL_CHECKOUT_END, EVENT_HOTEL_CHECKOUT_END),
+            (LUNCH_START, EVENT_LUNCH_START),
+            (LUNCH_END, EVENT_LUNCH_END),
+            (HOTEL_CHECKIN_START, EVENT_HOTEL_CHECKIN_START),
+            (HOTEL_CHECKIN_END, EVENT_HOTEL_CHECKIN_END),
+        ]
+        for hour, name in daily_windows:
+            events.append(self.schedule_daily(hour, name))
+
+        logging.info("TimeManager: default schedule installed (%d recurring events).", len(events))
+        return events
+
+    def __repr__(self) -> str:
+        return (f"TimeManager(year={self.year}, day={self.day_of_year + 1}, "
+                f"{self.hour:02d}:{self.minute:02d}, pending={self.pending_count})")
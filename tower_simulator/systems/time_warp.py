@@ -0,0 +1,153 @@
+"""
+Time warp controller - batched simulation steps and fast-forwarding to the next event
+"""
+import math
+import time
+from typing import Callable
+
+from tower_simulator.constants import (
+    SIMULATION_SPEED, SECONDS_PER_MINUTE, SIM_TICK_SECONDS,
+    TIME_WARP_SPEEDS, TIME_WARP_MAX_FRAME_BUDGET_MS,
+)
+from tower_simulator.systems.time_manager import TimeManager
+
+
+class TimeWarp:
+    """
+    Decides how much game time to simulate each frame. At 1x the clock follows
+    SIMULATION_SPEED; higher speeds run many simulation steps back-to-back per
+    frame. At max speed, and when skipping to the next event, steps run until
+    the per-frame budget is spent. Every frame is still rendered: the frame
+    rate cap holds either way, so warping comes from steps per frame.
+    """
+
+    # How often (in steps) the max-speed loop checks the wall clock
+    BUDGET_CHECK_INTERVAL = 64
+
+    def __init__(self, time_manager: TimeManager,
+                 step_callback: Callable[[int], None] | None = None,
+                 is_idle: Callable[[], bool] | None = None):
+        """
+        Args:
+            time_manager: World Clock to advance
+            step_callback: Called with SIM_TICK_SECONDS before each simulation step.
+                           When None, the clock is advanced in a single batch.
+            is_idle: Returns True when nothing in the tower is moving
+        """
+        self.time_manager = time_manager
+        self.step_callback = step_callback
+        self.is_idle = is_idle or (lambda: True)
+
+        self.speed_index = 0
+        self.skip_mode = False  # Fast-forward to the next scheduled event while idle
+
+        self._pending_game_seconds = 0.0
+
+        # Statistics
+        self.steps_last_frame = 0
+        self.seconds_skipped = 0
+
+    @property
+    def speed(self) -> int | None:
+        """Current multiplier, or None at max speed"""
+        return TIME_WARP_SPEEDS[self.speed_index]
+
+    @property
+    def label(self) -> str:
+        """Short speed label for the HUD"""
+        if self.skip_mode:
+            return "SKIP"
+        return "MAX" if self.speed is None else f"{self.speed}x"
+
+    def set_speed(self, index: int):
+        """Select a speed by its index in TIME_WARP_SPEEDS"""
+        if not 0 <= index < len(TIME_WARP_SPEEDS):
+            raise ValueError(f"Invalid time warp index: {index}")
+        self.speed_index = index
+        self._pending_game_seconds = 0.0
+
+    def toggle_skip_mode(self) -> bool:
+        """Toggle skip-to-next-event mode; returns the new state"""
+        self.skip_mode = not self.skip_mode
+        return self.skip_mode
+
+    def game_seconds_for(self, real_ms: float) -> float:
+        """Game seconds that correspond to a real-time interval at the current speed"""
+        multiplier = self.speed or 1
+        return (real_ms / 1000.0) / SIMULATION_SPEED * SECONDS_PER_MINUTE * multiplier
+
+    def update(self, real_ms: float) -> int:
+        """
+        Simulate the game time owed for one frame.
+        Returns the number of simulation steps executed.
+        """
+        if self.skip_mode and self.is_idle():
+            steps = self.skip_to_next_event(TIME_WARP_MAX_FRAME_BUDGET_MS) // SIM_TICK_SECONDS
+            self.steps_last_frame = steps
+            return steps
+
+        if self.speed is None:
+            steps = self._run_for_budget(TIME_WARP_MAX_FRAME_BUDGET_MS)
+        else:
+            self._pending_game_seconds += self.game_seconds_for(real_ms)
+            steps = int(self._pending_game_seconds // SIM_TICK_SECONDS)
+            self._pending_game_seconds -= steps * SIM_TICK_SECONDS
+            self._run_steps(steps)
+
+        self.steps_last_frame = steps
+        return steps
+
+    def skip_to_next_event(self, budget_ms: float | None = None) -> int:
+        """
+        Fast-forward to the next scheduled event if nothing is moving, by
+        running simulation steps back-to-back, so Sims and stress advance
+        through the skipped time. With a budget, stops once that much wall
+        time is spent (the next frame carries on). Returns game seconds run.
+        """
+        if not self.is_idle():
+            return 0
+        target = self.time_manager.next_event_time()
+        if target is None:
+            return 0
+
+        start = self.time_manager.now
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000.0
+        while self.time_manager.now < target:
+            remaining = math.ceil((target - self.time_manager.now) / SIM_TICK_SECONDS)
+            self._run_steps(min(remaining, self.BUDGET_CHECK_INTERVAL))
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        skipped = self.time_manager.now - start
+        self.seconds_skipped += skipped
+        return skipped
+
+    def run_for(self, seconds: int) -> int:
+        """Run simulation steps covering a span of game time, frame budget aside; returns steps run"""
+        steps = math.ceil(seconds / SIM_TICK_SECONDS)
+        self._run_steps(steps)
+        return steps
+
+    def _run_steps(self, steps: int):
+        """Run a batch of simulation steps back-to-back"""
+        if steps <= 0:
+            return
+        if self.step_callback is None:
+            self.time_manager.advance(steps * SIM_TICK_SECONDS)
+            return
+
+        step = self.step_callback
+        advance = self.time_manager.advance
+        for _ in range(steps):
+            step(SIM_TICK_SECONDS)
+            advance(SIM_TICK_SECONDS)
+
+    def _run_for_budget(self, budget_ms: float) -> int:
+        """Run steps until the wall-clock budget is spent; returns steps run"""
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        steps = 0
+        while True:
+            self._run_steps(self.BUDGET_CHECK_INTERVAL)
+            steps += self.BUDGET_CHECK_INTERVAL
+            if time.perf_counter() >= deadline:
+                return steps
@@ -0,0 +1,202 @@
+"""
+Hierarchical timing wheel for short-horizon simulation timers
+"""
+from typing import Any
+
+# Slots per wheel level, innermost first. With 1-second ticks the levels
+# span 256 s, ~4.5 h, ~12 days and ~2 years respectively.
+DEFAULT_LEVEL_BITS = (8, 6, 6, 6)
+
+
+class TimerHandle:
+    """A pending timer. Keep it to cancel the timer later."""
+
+    __slots__ = ('expires', 'payload', 'key', 'level', 'slot')
+
+    def __init__(self, expires: int, payload: Any, key: int):
+        self.expires = expires  # Absolute tick at which the timer fires
+        self.payload = payload
+        self.key = key  # Unique id, also keeps expiry order deterministic
+        self.level = -1  # Wheel level holding the timer, -1 when not pending
+        self.slot = -1
+
+    @property
+    def active(self) -> bool:
+        """True while the timer is waiting to fire"""
+        return self.level >= 0
+
+    def __repr__(self) -> str:
+        return f"TimerHandle(expires={self.expires}, payload={self.payload!r}, active={self.active})"
+
+
+class HierarchicalTimingWheel:
+    """
+    Timer service with O(1) schedule and cancel.
+    Timers sit in the finest level whose range covers their expiry and
+    cascade down towards level 0 as time approaches. Each tick expires
+    one level-0 slot in bulk and returns its payloads as a batch, so
+    thousands of Sim stress timers that are mostly cancelled on boarding
+    never touch a heap.
+    """
+
+    def __init__(self, level_bits: tuple[int, ...] = DEFAULT_LEVEL_BITS, start_tick: int = 0):
+        """Initialize an empty wheel at the given tick"""
+        self.level_bits = level_bits
+        self.level_sizes = [1 << bits for bits in level_bits]
+        self.level_masks = [size - 1 for size in self.level_sizes]
+
+        self.level_shifts = []
+        shift = 0
+        for bits in level_bits:
+            self.level_shifts.append(shift)
+            shift += bits
+        self.horizon = 1 << shift  # Longest delay the wheel can hold
+
+        # wheels[level][slot] -> {key: TimerHandle}; dicts give O(1) removal
+        # while preserving insertion order for deterministic expiry
+        self.wheels = [[{} for _ in range(size)] for size in self.level_sizes]
+
+        self.current_tick = start_tick
+        self._next_key = 0
+        self._count = 0
+
+        # Statistics
+        self.scheduled_total = 0
+        self.cancelled_total = 0
+        self.expired_total = 0
+
+    def __len__(self) -> int:
+        """Number of pending timers"""
+        return self._count
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def schedule(self, delay: int, payload: Any = None) -> TimerHandle:
+        """Schedule a timer to fire `delay` ticks from now (delay >= 1). O(1)."""
+        return self.schedule_at(self.current_tick + delay, payload)
+
+    def schedule_at(self, tick: int, payload: Any = None) -> TimerHandle:
+        """Schedule a timer at an absolute tick. O(1)."""
+        delay = tick - self.current_tick
+        if delay < 1:
+            raise ValueError(f"Timer must fire in the future (delay={delay})")
+        if not self.fits(tick):
+            raise ValueError(f"Delay {delay} exceeds timing wheel horizon {self.horizon}")
+
+        handle = TimerHandle(tick, payload, self._next_key)
+        self._next_key += 1
+        self._insert(handle)
+        self._count += 1
+        self.scheduled_total += 1
+        return handle
+
+    def fits(self, tick: int) -> bool:
+        """
+        True if a timer at this tick lands inside the top level. The top
+        level's range is counted from its current slot, so near a slot
+        boundary it holds less than `horizon` ticks ahead.
+        """
+        shift = self.level_shifts[-1]
+        return (tick >> shift) - (self.current_tick >> shift) < self.level_sizes[-1]
+
+    def cancel(self, handle: TimerHandle) -> bool:
+        """Cancel a pending timer. O(1). Returns False if it already fired or was cancelled."""
+        if handle.level < 0:
+            return False
+        del self.wheels[handle.level][handle.slot][handle.key]
+        handle.level = -1
+        handle.slot = -1
+        self._count -= 1
+        self.cancelled_total += 1
+        return True
+
+    def reschedule(self, handle: TimerHandle, delay: int) -> TimerHandle:
+        """Cancel a timer (if pending) and schedule its payload again"""
+        self.cancel(handle)
+        return self.schedule(delay, handle.payload)
+
+    # ------------------------------------------------------------------
+    # Advancing
+    # ------------------------------------------------------------------
+    def advance(self, ticks: int = 1) -> list[Any]:
+        """Advance the wheel and return the payloads of every timer that expired, in order"""
+        return self.advance_to(self.current_tick + ticks)
+
+    def advance_to(self, tick: int) -> list[Any]:
+        """Advance to an absolute tick, returning expired payloads in expiry order"""
+        expired = []
+        while self.current_tick < tick:
+            if self._count == 0:
+                # Nothing pending - jump straight to the target
+                self.current_tick = tick
+                break
+            expired.extend(self._tick())
+        return expired
+
+    def _tick(self) -> list[Any]:
+        """Advance exactly one tick and expire the current level-0 slot"""
+        self.current_tick += 1
+        tick = self.current_tick
+
+        # Cascade coarser levels whose boundary was just crossed, outermost first
+        top = 0
+        for level in range(1, len(self.level_sizes)):
+            if tick & ((1 << self.level_shifts[level]) - 1):
+                break
+            top = level
+        for level in range(top, 0, -1):
+            slot_index = (tick >> self.level_shifts[level]) & self.level_masks[level]
+            slot = self.wheels[level][slot_index]
+            if slot:
+                self.wheels[level][slot_index] = {}
+                for handle in slot.values():
+                    self._insert(handle)
+
+        # Bulk expiry of the level-0 slot
+        slot_index = tick & self.level_masks[0]
+        slot = self.wheels[0][slot_index]
+        if not slot:
+            return []
+        self.wheels[0][slot_index] = {}
+
+        payloads = []
+        for handle in slot.values():
+            handle.level = -1
+            handle.slot = -1
+            payloads.append(handle.payload)
+        self._count -= len(payloads)
+        self.expired_total += len(payloads)
+        return payloads
+
+    def _insert(self, handle: TimerHandle):
+        """Place a handle in the finest level whose range covers its expiry"""
+        for level, shift in enumerate(self.level_shifts):
+            if (handle.expires >> shift) - (self.current_tick >> shift) < self.level_sizes[level]:
+                slot_index = (handle.expires >> shift) & self.level_masks[level]
+                self.wheels[level][slot_index][handle.key] = handle
+                handle.level = level
+                handle.slot = slot_index
+                return
+        raise ValueError(f"Timer at tick {handle.expires} is beyond the wheel horizon")
+
+    def next_expiry_lower_bound(self) -> int | None:
+        """
+        Cheap bound for skip-ahead: no pending timer fires before the returned tick.
+        Exact when the earliest timer is already on level 0. None if nothing is pending.
+        """
+        if self._count == 0:
+            return None
+        best = None
+        for level, shift in enumerate(self.level_shifts):
+            base = self.current_tick >> shift
+            if best is not None and (base + 1) << shift >= best:
+                break  # This level (and every coarser one) starts no earlier than `best`
+            for offset in range(1, self.level_sizes[level] + 1):
+                if self.wheels[level][(base + offset) & self.level_masks[level]]:
+                    # Level 0 slots are exact ticks; coarser slots start a tick range
+                    candidate = (base + offset) << shift
+                    if best is None or candidate < best:
+                        best = candidate
+                    break
+        return best
@@ -0,0 +1,159 @@
+"""
+Transit graph for Sim pathfinding.
+Levels are the nodes. Every stairs, escalator and elevator shaft is a
+link that a Sim boards at one level it serves and leaves at any other:
+one use of a link is one trip. The adjacency list maps each level to the
+links serving it, so placing or removing a transit object only touches
+the levels that object spans; nothing is ever rebuilt. Caches built on
+the graph subscribe to edits and invalidate only what those levels touch.
+"""
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from tower_simulator.constants import (
+    ENTITY_DATA, ELEVATOR_CAR_CAPACITY, ELEVATOR_SECONDS_PER_LEVEL, TRANSIT_SECONDS_PER_LEVEL,
+)
+from tower_simulator.entities.room import RoomEntity
+
+# Link modes
+MODE_STAIRS = 0
+MODE_ESCALATOR = 1
+MODE_ELEVATOR = 2
+
+TRANSIT_MODES = {
+    'stairs': MODE_STAIRS,
+    'escalator': MODE_ESCALATOR,
+    'elevator_shaft': MODE_ELEVATOR,
+}
+
+
+@dataclass
+class TransitLink:
+    """One transit object, as an edge between every pair of levels it serves"""
+
+    link_id: int  # Room id of the transit object
+    mode: int  # MODE_STAIRS, MODE_ESCALATOR or MODE_ELEVATOR
+    bottom_level: int
+    top_level: int
+    segment: float  # Horizontal center, where Sims get on and off
+    capacity: int | None  # Sims carried per departure (None = unlimited)
+    expected_wait: float  # Seconds a Sim waits before the trip starts
+    seconds_per_level: float  # Travel time once under way
+
+    def serves(self, level: int) -> bool:
+        """True if Sims can get on or off at this level"""
+        return self.bottom_level <= level <= self.top_level
+
+    def cost(self, origin_level: int, destination_level: int) -> float:
+        """Expected seconds for one trip between two served levels, waiting included"""
+        return self.expected_wait + abs(destination_level - origin_level) * self.seconds_per_level
+
+
+def link_for_room(link_id: int, room: RoomEntity) -> TransitLink | None:
+    """The link a placed room adds to the graph, or None if it is not a transit object"""
+    mode = TRANSIT_MODES.get(room.room_type)
+    if mode is None:
+        return None
+    bottom, top = room.coordinate.level, room.coordinate.level + room.height - 1
+    segment = room.coordinate.segment + room.width / 2.0
+    if mode == MODE_ELEVATOR:
+        cars = ENTITY_DATA['elevator_shaft'].get('cars_per_shaft_default', 1)
+        # On average a car is half a round trip away, shared between the cars
+        round_trip = 2 * (top - bottom) * ELEVATOR_SECONDS_PER_LEVEL
+        return TransitLink(link_id, mode, bottom, top, segment, cars * ELEVATOR_CAR_CAPACITY,
+                           round_trip / (2.0 * cars), ELEVATOR_SECONDS_PER_LEVEL)
+    return TransitLink(link_id, mode, bottom, top, segment, ENTITY_DATA[room.room_type].get('capacity'),
+                       0.0, TRANSIT_SECONDS_PER_LEVEL)
+
+
+class TransitGraph:
+    """
+    Adjacency list of levels and the transit links serving them. Adding
+    or removing a link is O(levels it spans). Subscribers are called with
+    the range of levels of every edited link, before any other edit.
+    """
+
+    def __init__(self):
+        self.links: dict[int, TransitLink] = {}
+        self.adjacency: dict[int, set[int]] = {}  # Level -> ids of links serving it
+        self._subscribers: list[Callable[[range], None]] = []
+
+        # Statistics
+        self.edits = 0
+
+    @classmethod
+    def from_rooms(cls, rooms: list[RoomEntity]) -> 'TransitGraph':
+        """Build the graph from scratch for a room list (room id = list index)"""
+        graph = cls()
+        for room_id, room in enumerate(rooms):
+            graph.add_room(room_id, room)
+        return graph
+
+    # ------------------------------------------------------------------
+    # Edits
+    # ------------------------------------------------------------------
+    def add_room(self, room_id: int, room: RoomEntity) -> TransitLink | None:
+        """Add a placed room's link, if it is a transit object"""
+        link = link_for_room(room_id, room)
+        if link is not None:
+            self.add_link(link)
+        return link
+
+    def add_link(self, link: TransitLink):
+        """Connect every level the link serves"""
+        if link.link_id in self.links:
+            raise ValueError(f"Transit link {link.link_id} is already in the graph")
+        self.links[link.link_id] = link
+        for level in range(link.bottom_level, link.top_level + 1):
+            self.adjacency.setdefault(level, set()).add(link.link_id)
+        self._changed(link)
+
+    def remove_room(self, room_id: int) -> TransitLink | None:
+        """Disconnect a removed room's link; returns it, or None if it had none"""
+        link = self.links.pop(room_id, None)
+        if link is None:
+            return None
+        for level in range(link.bottom_level, link.top_level + 1):
+            serving = self.adjacency[level]
+            serving.discard(room_id)
+            if not serving:
+                del self.adjacency[level]
+        self._changed(link)
+        return link
+
+    def set_expected_wait(self, link_id: int, seconds: float):
+        """Update a link's expected wait (e.g. from measured elevator waits)"""
+        link = self.links[link_id]
+        if link.expected_wait != seconds:
+            link.expected_wait = seconds
+            self._changed(link)
+
+    def subscribe(self, callback: Callable[[range], None]):
+        """Register a callback invoked with the levels of every edited link"""
+        self._subscribers.append(callback)
+
+    def _changed(self, link: TransitLink):
+        """Tell subscribers which levels an edit touched"""
+        self.edits += 1
+        levels = range(link.bottom_level, link.top_level + 1)
+        for callback in self._subscribers:
+            callback(levels)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def links_at(self, level: int) -> list[TransitLink]:
+        """Links a Sim can board at a level"""
+        return [self.links[link_id] for link_id in self.adjacency.get(level, ())]
+
+    def neighbours(self, level: int) -> Iterator[tuple[int, TransitLink]]:
+        """(level, link) for every level one trip away"""
+        for link in self.links_at(level):
+            for other in range(link.bottom_level, link.top_level + 1):
+                if other != level:
+                    yield other, link
+
+    def edges(self) -> list[tuple]:
+        """Every directed edge as (origin, destination, link id, mode, capacity, expected wait), sorted"""
+        return sorted((level, other, link.link_id, link.mode, link.capacity, link.expected_wait)
+                      for level in self.adjacency for other, link in self.neighbours(level))
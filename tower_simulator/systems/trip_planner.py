@@ -0,0 +1,177 @@
+"""
+Daily trip tables - the whole day's Sim travel demand generated in one
+vectorized batch at day rollover and drained by the World Clock
+"""
+from typing import Callable
+
+import numpy as np
+
+from tower_simulator.constants import (
+    DAYS_PER_WEEK, WEEKEND, SECONDS_PER_DAY, SECONDS_PER_HOUR,
+    OFFICE_WORK_START, OFFICE_WORK_END, LUNCH_START, LUNCH_END, LUNCH_BREAK_HOURS,
+    HOTEL_CHECKOUT_START, HOTEL_CHECKOUT_END, HOTEL_CHECKIN_START, HOTEL_CHECKIN_END,
+    COMMUTE_SPREAD_HOURS,
+)
+from tower_simulator.entities.ecs import (
+    NO_ROOM, TRIP_TO_WORK, TRIP_LUNCH_OUT, TRIP_LUNCH_RETURN, TRIP_FROM_WORK,
+    TRIP_HOTEL_CHECKOUT, TRIP_HOTEL_CHECKIN, TRIP_CONDO_OUT, TRIP_CONDO_RETURN,
+)
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.systems.time_manager import TimeManager, ScheduledEvent, EVENT_TRIPS_DUE
+from tower_simulator.utils.determinism import SimulationRNG, STREAM_TRIPS
+
+HOTEL_ROOM_TYPES = ('hotel_single', 'hotel_twin', 'hotel_suite')
+
+
+class TripTable:
+    """
+    One row per Sim trip, sorted by departure time.
+    `room` and `seat` identify the travelling occupant; `dest_room` is
+    where the trip ends (NO_ROOM for the lobby).
+    """
+
+    def __init__(self, time: np.ndarray, kind: np.ndarray, room: np.ndarray,
+                 seat: np.ndarray, dest_room: np.ndarray):
+        self.time = time  # Absolute game second, ascending
+        self.kind = kind
+        self.room = room
+        self.seat = seat
+        self.dest_room = dest_room
+
+    @classmethod
+    def empty(cls) -> 'TripTable':
+        """A table with no trips"""
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.int32),
+                   np.empty(0, dtype=np.int16), np.empty(0, dtype=np.int32))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def rows(self, index) -> 'TripTable':
+        """Subset of rows (slice, mask or index array) as a new table"""
+        return TripTable(self.time[index], self.kind[index], self.room[index],
+                         self.seat[index], self.dest_room[index])
+
+
+class TripPlanner:
+    """
+    Generates a day's trips from the room table.
+    Offices send `capacity` workers in, out to lunch and home on weekdays;
+    hotel rooms check guests out in the morning and in at night every day;
+    condo residents commute on weekdays. Departure times are drawn in bulk
+    from the simulation's trips stream keyed by day, so a day's table
+    depends only on the seed, the day and the layout.
+    """
+
+    def __init__(self, rng: SimulationRNG | None = None):
+        self.rng = rng or SimulationRNG()
+
+    def plan_day(self, room_table: RoomTable, day: int, start_time: int | None = None) -> TripTable:
+        """Build the trip table for a day, dropping trips before start_time"""
+        rng = self.rng.generator(STREAM_TRIPS, day)
+        day_start = day * SECONDS_PER_DAY
+        weekday = day % DAYS_PER_WEEK != WEEKEND
+        parts = []
+
+        def add(kind: int, rooms: np.ndarray, seats: np.ndarray, dest_rooms, low: float, high: float):
+            hours = rng.uniform(low, high, len(rooms))
+            times = day_start + np.round(hours * SECONDS_PER_HOUR).astype(np.int64)
+            parts.append((times, np.full(len(rooms), kind, dtype=np.uint8), rooms, seats,
+                          np.broadcast_to(np.asarray(dest_rooms, dtype=np.int32), rooms.shape)))
+            return times
+
+        if weekday:
+            rooms, seats = self._occupants(room_table, room_table.ids_of_type('office'))
+            add(TRIP_TO_WORK, rooms, seats, rooms, OFFICE_WORK_START - COMMUTE_SPREAD_HOURS, OFFICE_WORK_START)
+            restaurants = room_table.ids_of_type('fast_food')
+            if len(rooms) and len(restaurants):
+                out = add(TRIP_LUNCH_OUT, rooms, seats, rng.choice(restaurants, len(rooms)),
+                          LUNCH_START, LUNCH_END - LUNCH_BREAK_HOURS)
+                parts.append((out + int(LUNCH_BREAK_HOURS * SECONDS_PER_HOUR),
+                              np.full(len(rooms), TRIP_LUNCH_RETURN, dtype=np.uint8), rooms, seats, rooms))
+            add(TRIP_FROM_WORK, rooms, seats, NO_ROOM, OFFICE_WORK_END, OFFICE_WORK_END + COMMUTE_SPREAD_HOURS)
+
+            rooms, seats = self._occupants(room_table, room_table.ids_of_type('condo'))
+            add(TRIP_CONDO_OUT, rooms, seats, NO_ROOM, OFFICE_WORK_START - COMMUTE_SPREAD_HOURS, OFFICE_WORK_START)
+            add(TRIP_CONDO_RETURN, rooms, seats, rooms, OFFICE_WORK_END, OFFICE_WORK_END + COMMUTE_SPREAD_HOURS)
+
+        hotels = np.concatenate([room_table.ids_of_type(room_type) for room_type in HOTEL_ROOM_TYPES])
+        rooms, seats = self._occupants(room_table, np.sort(hotels))
+        add(TRIP_HOTEL_CHECKOUT, rooms, seats, NO_ROOM, HOTEL_CHECKOUT_START, HOTEL_CHECKOUT_END)
+        add(TRIP_HOTEL_CHECKIN, rooms, seats, rooms, HOTEL_CHECKIN_START, HOTEL_CHECKIN_END)
+
+        table = TripTable(*(np.concatenate(column) for column in zip(*parts)))
+        # Stable sort keeps equal-time trips in generation order (deterministic)
+        table = table.rows(np.argsort(table.time, kind='stable'))
+        if start_time is not None:
+            table = table.rows(slice(np.searchsorted(table.time, start_time), None))
+        return table
+
+    @staticmethod
+    def _occupants(room_table: RoomTable, room_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """One (room, seat) row per occupant, `capacity` occupants per room"""
+        capacity = room_table.capacity[room_ids]
+        rooms = np.repeat(room_ids, capacity).astype(np.int32)
+        # Seat index restarts at 0 for every room
+        starts = np.repeat(np.cumsum(capacity) - capacity, capacity)
+        seats = (np.arange(len(rooms)) - starts).astype(np.int16)
+        return rooms, seats
+
+
+class TripQueue:
+    """
+    A loaded TripTable drained in time order by the World Clock.
+    Only the head of the queue is scheduled with the TimeManager: when it
+    fires, every trip due by now is handed to the callback as one batch
+    and the event is re-armed at the next departure time.
+    """
+
+    def __init__(self, time_manager: TimeManager, callback: Callable[[TripTable], None]):
+        self.time_manager = time_manager
+        self.callback = callback
+        self.table = TripTable.empty()
+        self._cursor = 0
+        self._event: ScheduledEvent | None = None
+        time_manager.subscribe(EVENT_TRIPS_DUE, self._on_trips_due)
+
+        # Statistics
+        self.batches_dispatched = 0
+        self.trips_dispatched = 0
+
+    def __len__(self) -> int:
+        """Trips not yet dispatched"""
+        return len(self.table) - self._cursor
+
+    def load(self, table: TripTable):
+        """Replace the queue with a new day's table"""
+        self.table = table
+        self._cursor = 0
+        self._arm()
+
+    def drain(self, until: int) -> TripTable:
+        """Remove and return all trips departing at or before `until`"""
+        end = int(np.searchsorted(self.table.time, until, side='right'))
+        batch = self.table.rows(slice(self._cursor, max(end, self._cursor)))
+        self._cursor = max(end, self._cursor)
+        return batch
+
+    def _arm(self):
+        """Schedule the clock event for the next departure"""
+        if self._event is not None:
+            self.time_manager.cancel(self._event)
+            self._event = None
+        if self._cursor < len(self.table):
+            head = max(int(self.table.time[self._cursor]), self.time_manager.now)
+            self._event = self.time_manager.schedule_at(head, EVENT_TRIPS_DUE)
+
+    def _on_trips_due(self, event: ScheduledEvent):
+        """World Clock: dispatch every trip due now"""
+        if event is not self._event:
+            return
+        self._event = None
+        batch = self.drain(self.time_manager.now)
+        self._arm()
+        if len(batch):
+            self.batches_dispatched += 1
+            self.trips_dispatched += len(batch)
+            self.callback(batch)
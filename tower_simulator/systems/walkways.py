@@ -0,0 +1,165 @@
+"""
+Horizontal walking model.
+Sims walk along a level only where something is built on it, so each
+level is a sorted list of walkable runs: maximal spans of segments covered
+by rooms, stored as parallel start/end lists. Placing a room merges its
+span into its levels' runs with bisect, so finding the run under a
+segment, or telling that two points are cut off from each other by a gap,
+is O(log n) without scanning segments. Within each run the walking time
+between every pair of transit endpoints (where Sims board stairs,
+escalators and shafts) is precomputed per level and rebuilt only for the
+levels a placement or transit edit touched.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from tower_simulator.constants import SIM_WALK_SPEED
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.systems.transit_graph import TransitGraph
+
+
+class LevelEndpoints(NamedTuple):
+    """Transit endpoints of one level, sorted by segment"""
+    link_ids: np.ndarray  # Link of each endpoint
+    segments: np.ndarray  # Where Sims get on and off
+    runs: np.ndarray  # Walkable run each endpoint stands in (-1: none)
+    seconds: np.ndarray  # Walking seconds between endpoints (inf across a gap)
+    index: dict[int, int]  # Link id -> endpoint row
+
+
+class WalkingModel:
+    """
+    Walkable runs of every level, and walking times between the transit
+    endpoints sharing a run. A run is identified by its index in its
+    level's sorted list.
+    """
+
+    def __init__(self, graph: TransitGraph, walk_speed: float = SIM_WALK_SPEED):
+        self.graph = graph
+        self.walk_speed = walk_speed
+        self.starts: dict[int, list[int]] = {}  # Level -> sorted run starts
+        self.ends: dict[int, list[int]] = {}  # Level -> run ends (exclusive), same order
+        self.spans: dict[int, dict[int, tuple[int, int]]] = {}  # Level -> room id -> (start, end)
+        self._endpoints: dict[int, LevelEndpoints] = {}  # Cached per level, dropped on edits
+        self._subscribers: list[Callable[[range], None]] = []
+
+        # Statistics
+        self.endpoint_rebuilds = 0
+
+        graph.subscribe(self._on_transit_edit)
+
+    # ------------------------------------------------------------------
+    # Placement
+    # ------------------------------------------------------------------
+    def add_room(self, room_id: int, room: RoomEntity):
+        """Make a placed room's segments walkable on every level it covers"""
+        span = room.get_segments()
+        for level in range(*room.get_levels()):
+            self.spans.setdefault(level, {})[room_id] = span
+            starts = self.starts.setdefault(level, [])
+            ends = self.ends.setdefault(level, [])
+            start, end = span
+            first = bisect_left(ends, start)  # First run ending at or after the new span (touching merges)
+            last = bisect_right(starts, end)  # Runs from `first` up to here overlap or touch it
+            if first < last:
+                start, end = min(start, starts[first]), max(end, ends[last - 1])
+            starts[first:last] = [start]
+            ends[first:last] = [end]
+            self._endpoints.pop(level, None)
+        self._changed(range(*room.get_levels()))
+
+    def remove_room(self, room_id: int, room: RoomEntity):
+        """Rebuild the runs of the levels a removed room covered from the rooms left on them"""
+        for level in range(*room.get_levels()):
+            spans = self.spans.get(level, {})
+            spans.pop(room_id, None)
+            starts, ends = [], []
+            for start, end in sorted(spans.values()):
+                if ends and start <= ends[-1]:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            self.starts[level], self.ends[level] = starts, ends
+            self._endpoints.pop(level, None)
+        self._changed(range(*room.get_levels()))
+
+    def subscribe(self, callback: Callable[[range], None]):
+        """Register a callback invoked with the levels of every edit that moved a transit endpoint's run"""
+        self._subscribers.append(callback)
+
+    def _changed(self, levels: range):
+        """Tell subscribers about edited runs, unless no transit stops on those levels"""
+        if any(self.graph.adjacency.get(level) for level in levels):
+            for callback in self._subscribers:
+                callback(levels)
+
+    def _on_transit_edit(self, levels: range):
+        """Transit graph callback: endpoints on these levels changed"""
+        for level in levels:
+            self._endpoints.pop(level, None)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def run_at(self, level: int, segment: float) -> int | None:
+        """Index of the walkable run containing a segment position, or None over a gap. O(log n)."""
+        starts = self.starts.get(level)
+        if not starts:
+            return None
+        index = bisect_right(starts, segment) - 1
+        if index < 0 or segment > self.ends[level][index]:
+            return None
+        return index
+
+    def walk_seconds(self, level: int, from_segment: float, to_segment: float) -> float | None:
+        """Seconds to walk between two positions on a level, or None if a gap separates them"""
+        run = self.run_at(level, from_segment)
+        if run is None or run != self.run_at(level, to_segment):
+            return None
+        return abs(to_segment - from_segment) / self.walk_speed
+
+    def endpoints(self, level: int) -> LevelEndpoints:
+        """Transit endpoints of a level and the walking times between them"""
+        cached = self._endpoints.get(level)
+        if cached is not None:
+            return cached
+        links = sorted(self.graph.links_at(level), key=lambda link: (link.segment, link.link_id))
+        link_ids = np.array([link.link_id for link in links], dtype=np.int32)
+        segments = np.array([link.segment for link in links], dtype=np.float64)
+        runs = np.array([-1 if (run := self.run_at(level, segment)) is None else run
+                         for segment in segments.tolist()], dtype=np.int32)
+        seconds = np.abs(segments[:, None] - segments[None, :]) / self.walk_speed
+        apart = (runs[:, None] != runs[None, :]) | (runs[:, None] < 0)
+        seconds[apart] = np.inf
+        index = {link_id: row for row, link_id in enumerate(link_ids.tolist())}
+        cached = self._endpoints[level] = LevelEndpoints(link_ids, segments, runs, seconds, index)
+        self.endpoint_rebuilds += 1
+        return cached
+
+    def transfer_seconds(self, level: int, from_link: int, to_link: int) -> float:
+        """Walking seconds between two links' endpoints on a level (inf if a gap separates them)"""
+        endpoints = self.endpoints(level)
+        return float(endpoints.seconds[endpoints.index[from_link], endpoints.index[to_link]])
+
+    def route_walk_seconds(self, origin_level: int, origin_segment: float, destination_segment: float,
+                           links: np.ndarray, stops: np.ndarray) -> float | None:
+        """
+        Total walking time of a route from the route table: to the first
+        link, between links at each transfer and from the last link to the
+        destination. None if any of those walks crosses a gap.
+        """
+        if not len(links):
+            return self.walk_seconds(origin_level, origin_segment, destination_segment)
+        links, stops = links.tolist(), stops.tolist()
+        total = self.walk_seconds(origin_level, origin_segment, self.graph.links[links[0]].segment)
+        if total is None:
+            return None
+        for (arriving, level), departing in zip(zip(links, stops), links[1:]):
+            total += self.transfer_seconds(level, arriving, departing)
+        last = self.walk_seconds(stops[-1], self.graph.links[links[-1]].segment, destination_segment)
+        if last is None or total == np.inf:
+            return None
+        return total + last
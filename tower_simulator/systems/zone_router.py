@@ -0,0 +1,176 @@
+"""
+Hierarchical zone-based pathfinding.
+The tower is cut into blocks of ZONE_LEVELS levels. Within a block,
+routes between its levels are precomputed for every trip budget using
+only the parts of links inside the block. Between blocks, Sims travel
+hub-and-spoke: each block's hub (its skylobby) is the level served by
+the most links leaving the block, and a small zone graph of hubs joined
+by those links is solved for every pair of blocks. A query combines the
+origin's block, the zone graph and the destination's block, so its cost
+depends on the number of blocks and trip budget, not on the number of
+levels. Editing transit only invalidates the blocks it spans; the zone
+graph is rebuilt only when a link crossing blocks changes.
+Hub routes are an estimate: they can miss routes that never pass a hub,
+overprice others and know nothing of walkway gaps. Route costs are
+therefore always answered from the RouteTable the router wraps, bringing
+just the origin's row up to date if an edit left it stale; `hub_cost`
+keeps the estimate for callers that only need a bound.
+"""
+import numpy as np
+
+from tower_simulator.constants import GRID_MIN_LEVEL, ZONE_LEVELS
+from tower_simulator.systems.route_table import RouteTable
+from tower_simulator.systems.transit_graph import TransitLink
+
+
+def zone_of(level: int) -> int:
+    """Block index of a level (basement levels form block -1)"""
+    return level // ZONE_LEVELS
+
+
+def layered_costs(links: list[tuple[TransitLink, int, int]], levels: int, max_trips: int) -> np.ndarray:
+    """
+    Cheapest cost between every pair of `levels` consecutive levels with at
+    most k legs, for k = 0..max_trips: array [k, origin, destination].
+    `links` are (link, first index, last index) clipped to those levels.
+    """
+    layers = np.full((max_trips + 1, levels, levels), np.inf)
+    np.fill_diagonal(layers[0], 0.0)
+    for layer in range(1, max_trips + 1):
+        best = layers[layer - 1].copy()
+        for link, low, high in links:
+            span = np.arange(high - low + 1)
+            ride = link.expected_wait + np.abs(span[:, None] - span[None, :]) * link.seconds_per_level
+            # [origin, boarding level, alighting level] -> min over the boarding level
+            reached = (layers[layer - 1][:, low:high + 1, None] + ride[None, :, :]).min(axis=1)
+            best[:, low:high + 1] = np.minimum(best[:, low:high + 1], reached)
+        layers[layer] = best
+    return layers
+
+
+class ZoneRouter:
+    """
+    Route costs through block hubs, with one cache per block, backed by
+    the exact costs of a RouteTable. Routes a single link makes directly
+    are always considered too, so levels a shaft joins across a block
+    boundary are not forced through hubs.
+    """
+
+    def __init__(self, route_table: RouteTable):
+        self.route_table = route_table
+        self.graph = route_table.graph
+        self.max_trips = route_table.max_trips
+        self._blocks: dict[int, tuple[int, np.ndarray]] = {}  # Block -> (hub level, layered costs)
+        self._hubs: np.ndarray | None = None  # Zone graph: [k, block, block] hub-to-hub costs
+        self._zone_index: dict[int, int] = {}  # Block -> row of the zone graph
+
+        # Statistics
+        self.block_builds = 0
+        self.zone_graph_builds = 0
+        self.row_refreshes = 0  # Route costs that first had to recompute their origin's row
+
+        self.graph.subscribe(self.invalidate)
+
+    def invalidate(self, levels: range):
+        """
+        Transit graph callback: drop the blocks an edited link spans. A link
+        inside one block neither moves its hub nor joins two hubs, so the
+        zone graph survives it.
+        """
+        first, last = zone_of(levels.start), zone_of(levels.stop - 1)
+        for zone in range(first, last + 1):
+            self._blocks.pop(zone, None)
+        if first != last:
+            # A link crossing blocks: hubs and hub-to-hub costs may both have moved
+            self._hubs = None
+
+    # ------------------------------------------------------------------
+    # Caches
+    # ------------------------------------------------------------------
+    def block(self, zone: int) -> tuple[int, np.ndarray]:
+        """(hub level, layered costs within the block) of a block, built on first use"""
+        cached = self._blocks.get(zone)
+        if cached is not None:
+            return cached
+        bottom = zone * ZONE_LEVELS
+        top = bottom + ZONE_LEVELS - 1
+        clipped, leaving = [], np.zeros(ZONE_LEVELS, dtype=np.int32)
+        for link in {link.link_id: link for level in range(bottom, top + 1)
+                     for link in self.graph.links_at(level)}.values():
+            low, high = max(link.bottom_level, bottom), min(link.top_level, top)
+            clipped.append((link, low - bottom, high - bottom))
+            if link.bottom_level < bottom or link.top_level > top:
+                leaving[low - bottom:high - bottom + 1] += 1
+        hub = bottom + int(np.argmax(leaving))  # Lowest of the best-connected levels
+        cached = self._blocks[zone] = (hub, layered_costs(clipped, ZONE_LEVELS, self.max_trips))
+        self.block_builds += 1
+        return cached
+
+    def zone_graph(self) -> np.ndarray:
+        """Hub-to-hub costs between blocks with at most k legs: [k, block row, block row]"""
+        if self._hubs is not None:
+            return self._hubs
+        zones = sorted({zone for link in self.graph.links.values()
+                        for zone in range(zone_of(link.bottom_level), zone_of(link.top_level) + 1)})
+        self._zone_index = {zone: row for row, zone in enumerate(zones)}
+        hubs = [self.block(zone)[0] for zone in zones]
+        count = len(zones)
+        direct = np.full((count, count), np.inf)  # One leg between hubs
+        for link in self.graph.links.values():
+            served = [row for row, hub in enumerate(hubs) if link.serves(hub)]
+            for a in served:
+                for b in served:
+                    if a != b:
+                        direct[a, b] = min(direct[a, b], link.cost(hubs[a], hubs[b]))
+        layers = np.full((self.max_trips + 1, count, count), np.inf)
+        np.fill_diagonal(layers[0], 0.0)
+        for layer in range(1, self.max_trips + 1):
+            layers[layer] = np.minimum(layers[layer - 1],
+                                       (layers[layer - 1][:, :, None] + direct[None, :, :]).min(axis=1))
+        self._hubs = layers
+        self.zone_graph_builds += 1
+        return layers
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def route_cost(self, origin_level: int, destination_level: int) -> float:
+        """Expected seconds from one level to another within max_trips legs (inf if unreachable)"""
+        table, origin = self.route_table, origin_level - GRID_MIN_LEVEL
+        if table.dirty[origin]:
+            self.row_refreshes += 1  # Resolving the pair recomputes this one row
+        return float(table.resolve([origin_level], [destination_level]).cost[0])
+
+    def hub_cost(self, origin_level: int, destination_level: int) -> float:
+        """
+        Cheapest direct or hub-and-spoke route within max_trips legs (inf if
+        there is none). Never below the exact cost, but blind to walkways.
+        """
+        if origin_level == destination_level:
+            return 0.0
+        best = min((link.cost(origin_level, destination_level) for link in self.graph.links_at(origin_level)
+                    if link.serves(destination_level)), default=np.inf)
+
+        origin_zone, destination_zone = zone_of(origin_level), zone_of(destination_level)
+        origin_hub, origin_costs = self.block(origin_zone)
+        origin, origin_hub = origin_level - origin_zone * ZONE_LEVELS, origin_hub - origin_zone * ZONE_LEVELS
+        if origin_zone == destination_zone:
+            destination = destination_level - destination_zone * ZONE_LEVELS
+            return min(best, float(origin_costs[self.max_trips, origin, destination]))
+
+        destination_hub, destination_costs = self.block(destination_zone)
+        destination = destination_level - destination_zone * ZONE_LEVELS
+        destination_hub -= destination_zone * ZONE_LEVELS
+        hubs = self.zone_graph()
+        a, b = self._zone_index.get(origin_zone), self._zone_index.get(destination_zone)
+        if a is None or b is None:
+            return best
+        # Legs to the hub, between hubs and from the hub, within the trip budget
+        to_hub = origin_costs[:, origin, origin_hub]
+        between = hubs[:, a, b]
+        from_hub = destination_costs[:, destination_hub, destination]
+        for first in range(self.max_trips + 1):
+            for middle in range(self.max_trips + 1 - first):
+                last = self.max_trips - first - middle
+                best = min(best, float(to_hub[first] + between[middle] + from_hub[last]))
+        return best
@@ -0,0 +1,49 @@
+"""
+Overlay shading the rooms Sims cannot reach
+"""
+import pygame
+
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.entities.room_table import RoomTable
+from tower_simulator.systems.reachability import ReachabilityMap
+
+
+class ReachabilityOverlay:
+    """
+    Translucent red over every unreachable room. The room list is taken
+    from the reachability map only when its version changes or the game
+    hands over a rebuilt room table, and one shaded surface is kept per
+    room size, so a frame only blits.
+    """
+
+    def __init__(self, color: tuple[int, int, int, int] = (220, 30, 30, 110)):
+        self.color = color
+        self._version = None  # Map version the cached ids were taken at
+        self._room_table: RoomTable | None = None  # ... and the room table they index
+        self._room_ids: list[int] = []
+        self._surfaces: dict[tuple[int, int], pygame.Surface] = {}
+
+    def unreachable(self, reachability: ReachabilityMap, room_table: RoomTable) -> list[int]:
+        """Ids of the rooms to shade, recomputed only when the map or the layout changed"""
+        reachability.refresh()
+        if reachability.version != self._version or room_table is not self._room_table:
+            self._room_ids = reachability.unreachable_rooms(room_table).tolist()
+            self._version, self._room_table = reachability.version, room_table
+        return self._room_ids
+
+    def _surface(self, width_px: int, height_px: int) -> pygame.Surface:
+        """Shaded surface for one room size, created on first use"""
+        surface = self._surfaces.get((width_px, height_px))
+        if surface is None:
+            surface = pygame.Surface((width_px, height_px), pygame.SRCALPHA)
+            surface.fill(self.color)
+            self._surfaces[(width_px, height_px)] = surface
+        return surface
+
+    def draw(self, screen: pygame.Surface, camera, rooms: list[RoomEntity],
+             reachability: ReachabilityMap, room_table: RoomTable):
+        """Shade the unreachable rooms"""
+        for room_id in self.unreachable(reachability, room_table):
+            world_x, world_y, width_px, height_px = rooms[room_id].get_pixel_bounds()
+            screen_x, screen_y = camera.world_to_screen(world_x, world_y)
+            screen.blit(self._surface(width_px, height_px), (screen_x, screen_y))
@@ -2,33 +2,43 @@
 Status bar UI for world details and information
 """
 import pygame
-from datetime import datetime
 
 
 class StatusBar:
     """Top status bar showing funds, population, time, and ratings"""
-    
+
     def __init__(self, screen_width: int, height: int = 50):
         """Initialize the status bar"""
         self.screen_width = screen_width
         self.height = height
         self.background_color = (100, 100, 100)
         self.text_color = (255, 255, 255)
-        
+
         # Game state references (will be set by game)
         self.funds = 0
         self.population = 0
         self.rating = 1
         self.time_hour = 5
         self.time_minute = 0
+        self.speed_label = ""
+
+        # Cached text surfaces - only re-rendered when their text changes,
+        # so a fast-running clock re-renders the time label and nothing else
+        self._font = None
+        self._details_text = None
+        self._details_surface = None
+        self._time_text = None
+        self._time_surface = None
 
-    def update(self, funds: int, population: int, rating: int, hour: int = 5, minute: int = 0):
+    def update(self, funds: int, population: int, rating: int, hour: int = 5, minute: int = 0,
+               speed_label: str = ""):
         """Update status bar values"""
         self.funds = funds
         self.population = population
         self.rating = rating
         self.time_hour = hour
         self.time_minute = minute
+        self.speed_label = speed_label
 
     def _format_time(self) -> str:
         """Format time as HH:MM AM/PM"""
@@ -38,23 +48,48 @@ class StatusBar:
             display_hour = 12
         return f"{display_hour:02d}:{self.time_minute:02d} {period}"
 
+    def _get_font(self) -> pygame.font.Font:
+        """Create the font once, on first draw"""
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+        return self._font
+
+    def _details_string(self) -> str:
+        """Funds, population and rating portion of the bar"""
+        rating_str = '★' * self.rating
+        return f"Funds: ${self.funds:,}  |  Population: {self.population}  |  Rating: {rating_str}  |  "
+
+    def _time_string(self) -> str:
+        """Time (and warp speed) portion of the bar"""
+        time_str = f"Time: {self._format_time()}"
+        if self.speed_label:
+            time_str += f"  [{self.speed_label}]"
+        return time_str
+
     def draw(self, surface: pygame.Surface):
         """Draw the status bar"""
         # Draw background
         pygame.draw.rect(surface, self.background_color, (0, 0, self.screen_width, self.height))
         pygame.draw.line(surface, (200, 200, 200), (0, self.height - 1), (self.screen_width, self.height - 1), 2)
-        
-        # Prepare text
-        font = pygame.font.Font(None, 20)
-        time_str = self._format_time()
-        rating_str = '★' * self.rating
-        
-        status_text = f"Funds: ${self.funds:,}  |  Population: {self.population}  |  Rating: {rating_str}  |  Time: {time_str}"
-        
-        # Draw text
-        text_surface = font.render(status_text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=(self.screen_width // 2, self.height // 2))
-        surface.blit(text_surface, text_rect)
+
+        # Re-render text only when it has changed
+        font = self._get_font()
+        details_text = self._details_string()
+        if details_text != self._details_text:
+            self._details_text = details_text
+            self._details_surface = font.render(details_text, True, self.text_color)
+
+        time_text = self._time_string()
+        if time_text != self._time_text:
+            self._time_text = time_text
+            self._time_surface = font.render(time_text, True, self.text_color)
+
+        # Draw text centered as a single line
+        total_width = self._details_surface.get_width() + self._time_surface.get_width()
+        x = (self.screen_width - total_width) // 2
+        y = (self.height - self._details_surface.get_height()) // 2
+        surface.blit(self._details_surface, (x, y))
+        surface.blit(self._time_surface, (x + self._details_surface.get_width(), y))
 
     def get_height(self) -> int:
         """Get the height of the status bar"""
@@ -0,0 +1,42 @@
+"""
+Tower layouts as JSON, so tools can load a tower without running the game
+"""
+import json
+
+from tower_simulator.constants import ENTITY_DATA
+from tower_simulator.entities.room import RoomEntity
+from tower_simulator.entities.rooms.lobby import Lobby
+from tower_simulator.world.coordinate import Coordinate
+
+
+def layout_to_dict(rooms: list[RoomEntity]) -> dict:
+    """Serializable form of a room list (one entry per room, in room id order)"""
+    return {'rooms': [{'type': room.room_type, 'segment': room.coordinate.segment,
+                       'level': room.coordinate.level, 'width': room.width, 'height': room.height}
+                      for room in rooms]}
+
+
+def layout_from_dict(data: dict) -> list[RoomEntity]:
+    """Rebuild the room list; costs and colors come from ENTITY_DATA"""
+    rooms = []
+    for entry in data['rooms']:
+        coordinate = Coordinate(entry['segment'], entry['level'])
+        if entry['type'] == 'lobby':
+            rooms.append(Lobby(coordinate, entry['width']))
+            continue
+        entity_data = ENTITY_DATA.get(entry['type'], {})
+        rooms.append(RoomEntity(coordinate, entry['width'], entry.get('height', 1), entry['type'],
+                                entity_data.get('cost', 0), tuple(entity_data.get('color', (200, 200, 200)))))
+    return rooms
+
+
+def save_layout(path: str, rooms: list[RoomEntity]):
+    """Write a room list to a JSON layout file"""
+    with open(path, 'w') as f:
+        json.dump(layout_to_dict(rooms), f, indent=1)
+
+
+def load_layout(path: str) -> list[RoomEntity]:
+    """Read a room list from a JSON layout file"""
+    with open(path) as f:
+        return layout_from_dict(json.load(f))
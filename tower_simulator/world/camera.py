@@ -94,6 +94,12 @@ class Camera:
         """Get camera bounds as (x, y, width, height)"""
         return self.x, self.y, self.screen_width, self.screen_height
 
+    def visible_levels(self, margin: int = 0) -> tuple[int, int]:
+        """Get the lowest and highest level on screen, widened by margin levels"""
+        low = self.y // PIXELS_PER_LEVEL - margin
+        high = (self.y + self.screen_height) // PIXELS_PER_LEVEL + margin
+        return max(GRID_MIN_LEVEL, low), min(GRID_MAX_LEVEL, high)
+
     def reset(self):
         """Reset camera to origin"""
         self.x = 0